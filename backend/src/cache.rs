@@ -0,0 +1,69 @@
+use std::collections::{BTreeMap, HashMap};
+use std::hash::Hash;
+use std::sync::Mutex;
+
+/// Bounded cache shared by all requests (query embeddings, search responses).
+/// Least recently used entries are evicted first; the backend warms it with
+/// frequent queries from the query log before /ready turns green.
+pub struct QueryCache<K, V> {
+    capacity: usize,
+    inner: Mutex<Lru<K, V>>,
+}
+
+/// Entries with the tick of their last use, and the keys ordered by that tick
+struct Lru<K, V> {
+    tick: u64,
+    entries: HashMap<K, (V, u64)>,
+    order: BTreeMap<u64, K>,
+}
+
+impl<K: Eq + Hash + Clone, V: Clone> QueryCache<K, V> {
+    pub fn new(capacity: usize) -> Self {
+        Self {
+            capacity,
+            inner: Mutex::new(Lru {
+                tick: 0,
+                entries: HashMap::new(),
+                order: BTreeMap::new(),
+            }),
+        }
+    }
+
+    pub fn get(&self, key: &K) -> Option<V> {
+        let mut guard = self.inner.lock().unwrap();
+        let Lru {
+            tick,
+            entries,
+            order,
+        } = &mut *guard;
+        let (value, used) = entries.get_mut(key)?;
+        order.remove(&*used);
+        *tick += 1;
+        *used = *tick;
+        order.insert(*tick, key.clone());
+        Some(value.clone())
+    }
+
+    pub fn put(&self, key: K, value: V) {
+        if self.capacity == 0 {
+            return;
+        }
+        let mut guard = self.inner.lock().unwrap();
+        let Lru {
+            tick,
+            entries,
+            order,
+        } = &mut *guard;
+        *tick += 1;
+        if let Some((_, used)) = entries.insert(key.clone(), (value, *tick)) {
+            order.remove(&used);
+        }
+        order.insert(*tick, key);
+        while entries.len() > self.capacity {
+            let Some((_, oldest)) = order.pop_first() else {
+                break;
+            };
+            entries.remove(&oldest);
+        }
+    }
+}
@@ -17,7 +17,11 @@ impl GeminiClient {
         }
     }
 
-    pub async fn embed_text(&self, text: &str) -> Result<Vec<f32>> {
+    pub async fn embed_text(
+        &self,
+        text: &str,
+        output_dimensionality: Option<u32>,
+    ) -> Result<Vec<f32>> {
         let url = format!(
             "https://generativelanguage.googleapis.com/v1beta/models/text-embedding-004:embedContent?key={}",
             self.api_key
@@ -26,13 +30,17 @@ impl GeminiClient {
         // Normalize text simple cleanup (remove newlines)
         let cleaned_text = text.replace('\n', " ");
 
-        let body = json!({
+        let mut body = json!({
             "model": "models/text-embedding-004",
             "content": {
                 "parts": [{ "text": cleaned_text }]
             },
             "taskType": "RETRIEVAL_DOCUMENT" // Matching Python behavior
         });
+        // Must match the width the index was built with (see query_transform.json)
+        if let Some(dim) = output_dimensionality {
+            body["outputDimensionality"] = json!(dim);
+        }
 
         let resp = self
             .client
@@ -0,0 +1,188 @@
+use anyhow::Context;
+use serde::de::DeserializeOwned;
+use std::path::{Path, PathBuf};
+use std::sync::{Arc, RwLock};
+
+use crate::models::{Corpus, LawCentroids, QueryTransform};
+
+// Index generations published by the exporter (src/infrastructure/generations.py).
+// data/CURRENT names the live directory under data/generations/. The exporter
+// writes and checks a whole generation before replacing CURRENT, so a reader
+// never sees a half-written index. Without CURRENT the flat data/index.json
+// layout of older exports is loaded.
+pub const DATA_DIR: &str = "data";
+const POINTER_FILE: &str = "CURRENT";
+const GENERATIONS_DIR: &str = "generations";
+const MANIFEST_FILE: &str = "manifest.json";
+const LEGACY_NAME: &str = "legacy";
+
+#[derive(serde::Deserialize)]
+struct Manifest {
+    documents: usize,
+    dimension: usize,
+}
+
+/// Everything loaded from one generation; swapped as a whole on reload.
+pub struct IndexGeneration {
+    pub name: String,
+    pub corpus: Corpus,
+    pub law_names: Vec<String>, // For candidates
+    pub query_transform: QueryTransform,
+    pub law_centroids: LawCentroids,
+}
+
+/// Generation named by data/CURRENT (None for the legacy flat layout)
+pub fn current_name(data_dir: &Path) -> Option<String> {
+    let text = std::fs::read_to_string(data_dir.join(POINTER_FILE)).ok()?;
+    let name = text.trim();
+    if name.is_empty() {
+        None
+    } else {
+        Some(name.to_string())
+    }
+}
+
+/// Published generation names, newest first
+pub fn generation_names(data_dir: &Path) -> Vec<String> {
+    let Ok(entries) = std::fs::read_dir(data_dir.join(GENERATIONS_DIR)) else {
+        return Vec::new();
+    };
+    let mut names: Vec<String> = entries
+        .filter_map(|entry| entry.ok())
+        .filter(|entry| entry.path().is_dir())
+        .filter_map(|entry| entry.file_name().into_string().ok())
+        .filter(|name| !name.is_empty() && name.bytes().all(|b| b.is_ascii_digit()))
+        .collect();
+    names.sort_unstable_by(|a, b| b.cmp(a));
+    names
+}
+
+// Optional files fall back to their defaults when missing
+fn read_optional<T: DeserializeOwned + Default>(path: &Path) -> anyhow::Result<T> {
+    match std::fs::read_to_string(path) {
+        Ok(text) => serde_json::from_str(&text)
+            .with_context(|| format!("Failed to parse {}", path.display())),
+        Err(_) => Ok(T::default()),
+    }
+}
+
+impl IndexGeneration {
+    /// Startup load: if the generation in CURRENT fails its checks, serve the
+    /// newest other generation that loads and matches its manifest instead of
+    /// not starting at all.
+    pub fn load_or_fallback(data_dir: &Path, name: Option<&str>) -> anyhow::Result<Self> {
+        let error = match Self::load(data_dir, name) {
+            Ok(index) => return Ok(index),
+            Err(e) => e,
+        };
+        let Some(name) = name else {
+            return Err(error);
+        };
+        eprintln!("Generation {} failed to load: {:#}", name, error);
+        for candidate in generation_names(data_dir) {
+            if candidate == name {
+                continue;
+            }
+            match Self::load(data_dir, Some(&candidate)) {
+                Ok(index) => {
+                    eprintln!("Falling back to generation {}.", candidate);
+                    return Ok(index);
+                }
+                Err(e) => eprintln!("Generation {} failed to load: {:#}", candidate, e),
+            }
+        }
+        Err(error)
+    }
+
+    /// Blocking; run it on a blocking thread when the server is already up.
+    pub fn load(data_dir: &Path, name: Option<&str>) -> anyhow::Result<Self> {
+        let dir: PathBuf = match name {
+            Some(name) => data_dir.join(GENERATIONS_DIR).join(name),
+            None => data_dir.to_path_buf(),
+        };
+        let index_path = dir.join("index.json");
+        let text = std::fs::read_to_string(&index_path).with_context(|| {
+            format!(
+                "Could not read {}. Did you run export?",
+                index_path.display()
+            )
+        })?;
+        let corpus = Corpus::from_json(&text).context("Failed to parse index.json")?;
+
+        // The exporter verified checksums before publishing; re-check the shape
+        // so a generation edited or truncated afterwards is never swapped in.
+        if name.is_some() {
+            let manifest_path = dir.join(MANIFEST_FILE);
+            let manifest: Manifest = serde_json::from_str(
+                &std::fs::read_to_string(&manifest_path)
+                    .with_context(|| format!("Could not read {}", manifest_path.display()))?,
+            )
+            .context("Failed to parse manifest.json")?;
+            anyhow::ensure!(
+                corpus.docs.len() == manifest.documents,
+                "index.json has {} docs, manifest says {}",
+                corpus.docs.len(),
+                manifest.documents
+            );
+            anyhow::ensure!(
+                corpus
+                    .docs
+                    .iter()
+                    .all(|d| d.embedding.len() == manifest.dimension),
+                "index.json has embeddings that are not {}-dim",
+                manifest.dimension
+            );
+        }
+
+        let query_transform: QueryTransform = read_optional(&dir.join("query_transform.json"))?;
+        if let Some(projection) = &query_transform.projection {
+            anyhow::ensure!(
+                projection
+                    .components
+                    .iter()
+                    .all(|row| row.len() == projection.mean.len()),
+                "query_transform.json has projection rows that are not {}-dim",
+                projection.mean.len()
+            );
+        }
+        let law_centroids: LawCentroids = read_optional(&dir.join("law_centroids.json"))?;
+
+        let mut law_names: Vec<String> = corpus
+            .laws
+            .iter()
+            .map(|l| l.law_full_name.clone())
+            .collect();
+        law_names.sort();
+        law_names.dedup();
+
+        Ok(Self {
+            name: name.unwrap_or(LEGACY_NAME).to_string(),
+            corpus,
+            law_names,
+            query_transform,
+            law_centroids,
+        })
+    }
+}
+
+/// The generation requests read from. A request clones the Arc once and keeps
+/// using it, so a swap never changes the index under an in-flight search.
+pub struct LiveIndex {
+    current: RwLock<Arc<IndexGeneration>>,
+}
+
+impl LiveIndex {
+    pub fn new(generation: IndexGeneration) -> Self {
+        Self {
+            current: RwLock::new(Arc::new(generation)),
+        }
+    }
+
+    pub fn get(&self) -> Arc<IndexGeneration> {
+        self.current.read().unwrap().clone()
+    }
+
+    pub fn swap(&self, generation: IndexGeneration) {
+        *self.current.write().unwrap() = Arc::new(generation);
+    }
+}
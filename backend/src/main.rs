@@ -1,70 +1,107 @@
-use anyhow::Context;
 use axum::{
     Router,
     extract::{Json, State},
+    http::StatusCode,
     routing::{get, post},
 };
 use dotenv::dotenv;
 use std::env;
 use std::net::SocketAddr;
+use std::path::{Path, PathBuf};
 use std::sync::Arc;
-use tokio::fs;
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::time::Duration;
 use tower_http::cors::CorsLayer;
 
+mod cache;
 mod gemini;
+mod generation;
 mod guardrails;
 mod models;
 mod static_data;
+mod warmup;
 
+use cache::QueryCache;
 use gemini::GeminiClient;
+use generation::{IndexGeneration, LiveIndex};
 use guardrails::{ValidationResult, validate_input}; // Import guardrails
-use models::{LawDocument, SearchResult, cosine_similarity};
+use models::{SearchResult, cosine_similarity};
 use static_data::{
     get_boost_articles, get_child_keywords, get_law_alias_map, get_penalty_keywords,
     get_user_penalty_request_keywords,
 };
 
+// Cached query embeddings and full responses (query, client targets, ambiguous).
+// Keys carry the generation name so entries never outlive a reload.
+const EMBEDDING_CACHE_SIZE: usize = 4096;
+const RESULT_CACHE_SIZE: usize = 1024;
+type EmbeddingKey = (String, String);
+type ResultKey = (String, String, Option<Vec<String>>, bool);
+
+// How often data/CURRENT is checked for a newly published generation
+const RELOAD_INTERVAL: Duration = Duration::from_secs(5);
+
 #[derive(Clone)]
 struct AppState {
-    docs: Arc<Vec<LawDocument>>,
+    index: Arc<LiveIndex>,
     gemini_client: GeminiClient,
-    law_names: Arc<Vec<String>>, // For candidates
+    embedding_cache: Arc<QueryCache<EmbeddingKey, Vec<f32>>>,
+    result_cache: Arc<QueryCache<ResultKey, SearchResponse>>,
+    // Set once the startup warm-up has replayed the query log (see /ready)
+    ready: Arc<AtomicBool>,
 }
 
 #[derive(serde::Deserialize)]
 struct SearchRequest {
     query: String,
+    // Targets resolved by the client-side law matcher (src/core/law_matcher.py).
+    // When present, the static alias scan is skipped and the LLM intent step
+    // only runs if the client marked the query as ambiguous.
+    #[serde(default)]
+    target_laws: Option<Vec<String>>,
+    #[serde(default)]
+    ambiguous: bool,
 }
 
-#[derive(serde::Serialize)]
+#[derive(serde::Serialize, Clone)]
 struct SearchResponse {
     results: Vec<SearchResult>,
     intent: Option<String>,
     targeted_laws: Vec<String>,
+    // true when served from the result cache (recorded in the client's query log)
+    cached: bool,
 }
 
 #[tokio::main]
 async fn main() -> anyhow::Result<()> {
     dotenv().ok();
 
-    // Load Index
-    println!("Loading index from data/index.json...");
-    let index_data = fs::read_to_string("data/index.json")
-        .await
-        .context("Could not read index.json. Did you run export?")?;
-    let docs: Vec<LawDocument> =
-        serde_json::from_str(&index_data).context("Failed to parse index.json")?;
-    println!("Loaded {} documents.", docs.len());
-
-    // Extract unique law names for LLM candidates
-    println!("Extracting law names...");
-    let mut law_names: Vec<String> = docs
-        .iter()
-        .filter_map(|d| d.metadata["law_full_name"].as_str().map(|s| s.to_string()))
-        .collect();
-    law_names.sort();
-    law_names.dedup();
-    println!("Extracted {} unique laws.", law_names.len());
+    // Load Index (the published generation, or the legacy flat data/index.json)
+    let data_dir = PathBuf::from(generation::DATA_DIR);
+    let current = generation::current_name(&data_dir);
+    println!(
+        "Loading index generation {}...",
+        current.as_deref().unwrap_or("(data/index.json)")
+    );
+    let index = IndexGeneration::load_or_fallback(&data_dir, current.as_deref())?;
+    println!(
+        "Loaded generation {} ({} documents).",
+        index.name,
+        index.corpus.docs.len()
+    );
+
+    // Optional: reduced output width / PCA projection the index was built with
+    if let Some(p) = &index.query_transform.projection {
+        println!(
+            "Query projection: {} -> {} dims",
+            p.mean.len(),
+            p.components.len()
+        );
+    }
+
+    // Optional: per-law centroids for targeting without the LLM
+    println!("Loaded {} law centroids.", index.law_centroids.laws.len());
+    println!("Extracted {} unique laws.", index.law_names.len());
 
     println!("Loading API Key...");
     match dotenv::dotenv() {
@@ -85,9 +122,11 @@ async fn main() -> anyhow::Result<()> {
     let gemini_client = GeminiClient::new(api_key);
 
     let state = AppState {
-        docs: Arc::new(docs),
+        index: Arc::new(LiveIndex::new(index)),
         gemini_client,
-        law_names: Arc::new(law_names),
+        embedding_cache: Arc::new(QueryCache::new(EMBEDDING_CACHE_SIZE)),
+        result_cache: Arc::new(QueryCache::new(RESULT_CACHE_SIZE)),
+        ready: Arc::new(AtomicBool::new(false)),
     };
 
     #[derive(serde::Deserialize)]
@@ -101,7 +140,7 @@ async fn main() -> anyhow::Result<()> {
     }
 
     async fn list_laws_handler(State(state): State<AppState>) -> Json<Vec<String>> {
-        let mut names = state.law_names.as_ref().clone();
+        let mut names = state.index.get().law_names.clone();
         names.sort();
         Json(names)
     }
@@ -111,15 +150,18 @@ async fn main() -> anyhow::Result<()> {
         Json(payload): Json<LawContentRequest>,
     ) -> Json<LawContentResponse> {
         let target = payload.law_name;
-        let articles: Vec<SearchResult> = state
+        let index = state.index.get();
+        let corpus = &index.corpus;
+        let articles: Vec<SearchResult> = corpus
             .docs
             .iter()
-            .filter(|d| d.metadata["law_full_name"].as_str().unwrap_or("") == target)
+            .filter(|d| corpus.law_full_name(d) == target)
             .map(|d| SearchResult {
-                document: d.text.clone(),
-                metadata: d.metadata.clone(),
+                document: corpus.text(d),
+                metadata: corpus.metadata(d),
                 distance: 0.0,
                 relevance: 1.0,
+                related: corpus.related(d),
             })
             .collect();
 
@@ -133,11 +175,15 @@ async fn main() -> anyhow::Result<()> {
 
     let app = Router::new()
         .route("/health", get(|| async { "OK" }))
+        .route("/ready", get(ready_handler))
         .route("/search", post(search_handler))
         .route("/laws", get(list_laws_handler))
         .route("/laws/content", post(get_law_content_handler))
         .layer(CorsLayer::permissive())
-        .with_state(state);
+        .with_state(state.clone());
+
+    tokio::spawn(warm_up(state.clone()));
+    tokio::spawn(watch_generations(state, data_dir));
 
     let addr = SocketAddr::from(([0, 0, 0, 0], 3000));
     println!("Listening on {}", addr);
@@ -146,11 +192,116 @@ async fn main() -> anyhow::Result<()> {
     Ok(())
 }
 
+// /health only says the process is up; /ready turns green once the caches
+// have been warmed, so traffic is not sent to a cold backend.
+async fn ready_handler(State(state): State<AppState>) -> (StatusCode, &'static str) {
+    if state.ready.load(Ordering::Acquire) {
+        (StatusCode::OK, "OK")
+    } else {
+        (StatusCode::SERVICE_UNAVAILABLE, "Warming up")
+    }
+}
+
+// Replays the most frequent logged requests through the normal search path
+// (filling the embedding and result caches), then marks the backend ready.
+// QUERY_LOG_PATH="" or WARM_TOP_QUERIES=0 skips the replay.
+async fn warm_up(state: AppState) {
+    let path = env::var("QUERY_LOG_PATH").unwrap_or_else(|_| warmup::QUERY_LOG.to_string());
+    let top_n = env::var("WARM_TOP_QUERIES")
+        .ok()
+        .and_then(|v| v.parse().ok())
+        .unwrap_or(warmup::WARM_TOP_QUERIES);
+    let requests = if path.is_empty() || top_n == 0 {
+        Vec::new()
+    } else {
+        tokio::task::spawn_blocking(move || warmup::top_queries(Path::new(&path), top_n))
+            .await
+            .unwrap_or_default()
+    };
+    if !requests.is_empty() {
+        println!("Warming caches with {} frequent queries...", requests.len());
+        let total = requests.len();
+        for request in requests {
+            search_handler(State(state.clone()), Json(request)).await;
+        }
+        println!("Warmed {} queries.", total);
+    }
+    state.ready.store(true, Ordering::Release);
+    println!("Ready.");
+}
+
+// Hot reload: a new generation is loaded on a blocking thread (SIGHUP or a
+// changed data/CURRENT) and swapped in only if it loads and matches its
+// manifest. Requests keep serving the old generation until then.
+async fn watch_generations(state: AppState, data_dir: PathBuf) {
+    let mut ticker = tokio::time::interval(RELOAD_INTERVAL);
+    #[cfg(unix)]
+    let mut hangup = match tokio::signal::unix::signal(tokio::signal::unix::SignalKind::hangup()) {
+        Ok(signal) => Some(signal),
+        Err(e) => {
+            eprintln!("SIGHUP reload unavailable: {}", e);
+            None
+        }
+    };
+    let mut failed: Option<String> = None;
+    loop {
+        #[cfg(unix)]
+        match hangup.as_mut() {
+            Some(signal) => {
+                tokio::select! {
+                    _ = ticker.tick() => {}
+                    _ = signal.recv() => {
+                        println!("SIGHUP: checking for a new index generation");
+                        failed = None;
+                    }
+                }
+            }
+            None => {
+                ticker.tick().await;
+            }
+        }
+        #[cfg(not(unix))]
+        ticker.tick().await;
+
+        let Some(name) = generation::current_name(&data_dir) else {
+            continue;
+        };
+        if name == state.index.get().name || failed.as_deref() == Some(name.as_str()) {
+            continue;
+        }
+        let dir = data_dir.clone();
+        let target = name.clone();
+        let loaded =
+            tokio::task::spawn_blocking(move || IndexGeneration::load(&dir, Some(&target))).await;
+        match loaded {
+            Ok(Ok(index)) => {
+                println!(
+                    "Swapped in index generation {} ({} documents).",
+                    name,
+                    index.corpus.docs.len()
+                );
+                state.index.swap(index);
+                failed = None;
+            }
+            Ok(Err(e)) => {
+                eprintln!("Keeping current index; generation {} failed: {:#}", name, e);
+                failed = Some(name);
+            }
+            Err(e) => {
+                eprintln!("Reload task for generation {} failed: {}", name, e);
+                failed = Some(name);
+            }
+        }
+    }
+}
+
 async fn search_handler(
     State(state): State<AppState>,
     Json(payload): Json<SearchRequest>,
 ) -> Json<SearchResponse> {
     let query = payload.query;
+    let client_targets = payload.target_laws;
+    let client_ambiguous = payload.ambiguous;
 
     println!("Search Query: {}", query);
 
@@ -161,29 +312,71 @@ async fn search_handler(
             results: vec![],
             intent: Some(format!("Security Block: {}", reason)),
             targeted_laws: vec![],
+            cached: false,
         });
     }
     // -------------------------
 
+    // One generation for the whole request, even if a reload lands meanwhile
+    let index = state.index.get();
+
+    let cache_key: ResultKey = (
+        index.name.clone(),
+        query.trim().to_string(),
+        client_targets.clone(),
+        client_ambiguous,
+    );
+    if let Some(mut hit) = state.result_cache.get(&cache_key) {
+        hit.cached = true;
+        return Json(hit);
+    }
+
     // 1. Embedding
-    let query_vec = match state.gemini_client.embed_text(&query).await {
-        Ok(v) => v,
+    let transform = &index.query_transform;
+    let embedding_key: EmbeddingKey = (cache_key.0.clone(), cache_key.1.clone());
+    let embedded = match state.embedding_cache.get(&embedding_key) {
+        Some(v) => Ok(v),
+        None => state
+            .gemini_client
+            .embed_text(&query, transform.output_dimensionality)
+            .await
+            .and_then(|v| match &transform.projection {
+                Some(projection) => projection.apply(&v),
+                None => Ok(v),
+            }),
+    };
+    let query_vec = match embedded {
+        Ok(v) => {
+            state.embedding_cache.put(embedding_key, v.clone());
+            v
+        }
         Err(e) => {
             eprintln!("Embedding error: {}", e);
             return Json(SearchResponse {
                 results: vec![],
                 intent: Some("Embedding Failed".to_string()),
                 targeted_laws: vec![],
+                cached: false,
             });
         }
     };
 
     // 2. Intent Detection
-    // A. Static
-    let alias_map = get_law_alias_map();
     let mut target_laws: Vec<String> = Vec::new();
     let mut intent_msg: Option<String> = None;
 
+    // 0. Client-side match (already a single pass over the query)
+    let use_client = client_targets.is_some();
+    if let Some(laws) = client_targets {
+        if !laws.is_empty() {
+            target_laws = laws;
+            intent_msg = Some("Instant Match".to_string());
+        }
+    }
+
+    // A. Static
+    let alias_map = get_law_alias_map();
+
     // Check aliases (Longest match)
     // Keys sorted by length desc handled by loop logic if we sort keys
     let mut sorted_keys: Vec<&str> = alias_map.keys().cloned().collect();
@@ -191,6 +384,9 @@ async fn search_handler(
     sorted_keys.reverse(); // descending
 
     for alias in sorted_keys {
+        if use_client {
+            break;
+        }
         if query.contains(alias) {
             if let Some(laws) = alias_map.get(alias) {
                 target_laws = laws.iter().map(|s| s.to_string()).collect();
@@ -200,13 +396,22 @@ async fn search_handler(
         }
     }
 
-    // B. AI Intent (if static failed)
-    if target_laws.is_empty() {
+    // B. Centroid Match (nearest law centroids; skips the LLM when confident)
+    if target_laws.is_empty() && (!use_client || client_ambiguous) {
+        let laws = index.law_centroids.target_laws(&query_vec);
+        if !laws.is_empty() {
+            target_laws = laws;
+            intent_msg = Some("Centroid Match".to_string());
+        }
+    }
+
+    // C. AI Intent (if static failed and the client could not decide)
+    if target_laws.is_empty() && (!use_client || client_ambiguous) {
         // Attempt LLM
         // println!("Triggering LLM Intent...");
         if let Ok(suggestions) = state
             .gemini_client
-            .generate_intent(&query, &state.law_names)
+            .generate_intent(&query, &index.law_names)
             .await
         {
             if !suggestions.is_empty() {
@@ -228,7 +433,8 @@ async fn search_handler(
     let user_wants_penalty = user_penalty_keywords.iter().any(|k| query.contains(k));
     let query_contains_child = child_keywords.iter().any(|k| query.contains(k));
 
-    let mut scored_results: Vec<SearchResult> = state
+    let corpus = &index.corpus;
+    let mut scored_results: Vec<SearchResult> = corpus
         .docs
         .iter()
         .map(|doc| {
@@ -236,9 +442,9 @@ async fn search_handler(
             let mut dist = 1.0 - sim;
 
             // Apply Logic
-            let law_name = doc.metadata["law_full_name"].as_str().unwrap_or("");
-            let article_num = doc.metadata["article_number"].as_str().unwrap_or("");
-            let doc_text = &doc.text;
+            let law_name = corpus.law_full_name(doc);
+            let article_num = doc.article_number.as_str();
+            let doc_text = corpus.text(doc);
 
             // Logic from app.py:
             // 1. Child Welfare Law Penalty
@@ -280,14 +486,15 @@ async fn search_handler(
             }
 
             SearchResult {
-                document: doc_text.clone(),
-                metadata: doc.metadata.clone(),
+                document: doc_text,
+                metadata: corpus.metadata(doc),
                 distance: final_dist, // Modified distance
                 relevance: if final_dist > 1.0 {
                     0.0
                 } else {
                     1.0 - final_dist
                 },
+                related: vec![],
             }
         })
         .collect();
@@ -306,9 +513,12 @@ async fn search_handler(
         .take(15) // Top 15
         .collect();
 
-    Json(SearchResponse {
+    let response = SearchResponse {
         results: final_results,
         intent: intent_msg,
         targeted_laws: target_laws,
-    })
+        cached: false,
+    };
+    state.result_cache.put(cache_key, response.clone());
+    Json(response)
 }
@@ -1,12 +1,229 @@
 
+use base64::{Engine, engine::general_purpose::STANDARD};
 use serde::{Deserialize, Serialize};
 
-#[derive(Debug, Deserialize, Serialize, Clone)]
+#[derive(Debug, Deserialize, Clone)]
+pub struct LawEntry {
+    pub law_id: String,
+    pub law_full_name: String,
+}
+
+/// One article of index.json. `law` and `hierarchy` index into the `Corpus` tables.
+/// With `export --compress-text` the content arrives as base64 zstd frames
+/// (`content_zstd`, decoded length `content_size`) and is restored at load.
+#[derive(Debug, Deserialize, Clone)]
 pub struct LawDocument {
-    pub id: String,
-    pub text: String,
-    pub metadata: serde_json::Value,
+    pub law: usize,
+    pub article_number: String,
+    pub hierarchy: Option<usize>,
+    #[serde(default)]
+    pub content: String,
+    #[serde(default)]
+    content_zstd: Option<String>,
+    #[serde(default)]
+    content_size: usize,
     pub embedding: Vec<f32>,
+    /// Precomputed similar articles: (index into docs, cosine similarity)
+    #[serde(default)]
+    pub related: Vec<(usize, f32)>,
+}
+
+#[derive(Debug, Deserialize)]
+struct TextCodec {
+    name: String,
+    dictionary: String,
+}
+
+/// data/index.json as written by the exporter: law / heading tables plus
+/// hierarchy nodes as [parent, title] pairs (parents come before children).
+#[derive(Debug, Deserialize)]
+struct CompactIndex {
+    laws: Vec<LawEntry>,
+    titles: Vec<String>,
+    hierarchy: Vec<(Option<usize>, usize)>,
+    docs: Vec<LawDocument>,
+    #[serde(default)]
+    text_codec: Option<TextCodec>,
+}
+
+pub struct Corpus {
+    pub laws: Vec<LawEntry>,
+    /// Full "A > B" path of each hierarchy node, resolved once at load
+    pub paths: Vec<String>,
+    pub docs: Vec<LawDocument>,
+}
+
+impl Corpus {
+    pub fn from_json(text: &str) -> anyhow::Result<Self> {
+        let mut index: CompactIndex = serde_json::from_str(text)?;
+        if let Some(codec) = &index.text_codec {
+            anyhow::ensure!(
+                codec.name == "zstd",
+                "Unsupported text codec: {}",
+                codec.name
+            );
+            let dictionary = STANDARD.decode(&codec.dictionary)?;
+            let mut decompressor = zstd::bulk::Decompressor::with_dictionary(&dictionary)?;
+            for doc in &mut index.docs {
+                if let Some(packed) = doc.content_zstd.take() {
+                    let bytes =
+                        decompressor.decompress(&STANDARD.decode(packed)?, doc.content_size)?;
+                    doc.content = String::from_utf8(bytes)?;
+                }
+            }
+        }
+        let mut paths: Vec<String> = Vec::with_capacity(index.hierarchy.len());
+        for (parent, title) in &index.hierarchy {
+            let title = &index.titles[*title];
+            let path = match parent {
+                Some(p) => format!("{} > {}", paths[*p], title),
+                None => title.clone(),
+            };
+            paths.push(path);
+        }
+        Ok(Corpus {
+            laws: index.laws,
+            paths,
+            docs: index.docs,
+        })
+    }
+
+    pub fn law_full_name(&self, doc: &LawDocument) -> &str {
+        &self.laws[doc.law].law_full_name
+    }
+
+    pub fn hierarchy(&self, doc: &LawDocument) -> &str {
+        doc.hierarchy.map_or("", |h| self.paths[h].as_str())
+    }
+
+    /// Same layout as CorpusDocument.embedding_text() on the Python side
+    pub fn text(&self, doc: &LawDocument) -> String {
+        format!(
+            "{} {}\n{}\n{}",
+            self.law_full_name(doc),
+            doc.article_number,
+            self.hierarchy(doc),
+            doc.content
+        )
+    }
+
+    /// "See also" links for the browse view, read straight from the export
+    pub fn related(&self, doc: &LawDocument) -> Vec<RelatedArticle> {
+        doc.related
+            .iter()
+            .filter_map(|&(i, score)| {
+                let other = self.docs.get(i)?;
+                Some(RelatedArticle {
+                    law_full_name: self.law_full_name(other).to_string(),
+                    article_number: other.article_number.clone(),
+                    score,
+                })
+            })
+            .collect()
+    }
+
+    /// Same keys as CorpusDocument.metadata() on the Python side
+    pub fn metadata(&self, doc: &LawDocument) -> serde_json::Value {
+        serde_json::json!({
+            "law_id": self.laws[doc.law].law_id,
+            "law_full_name": self.law_full_name(doc),
+            "article_number": doc.article_number,
+            "hierarchy": self.hierarchy(doc),
+        })
+    }
+}
+
+/// Query-side settings written next to index.json by the exporter
+/// (data/query_transform.json). Missing file = full-width vectors, no projection.
+#[derive(Debug, Deserialize, Default, Clone)]
+pub struct QueryTransform {
+    #[serde(default)]
+    pub output_dimensionality: Option<u32>,
+    #[serde(default)]
+    pub projection: Option<Projection>,
+}
+
+/// PCA projection fitted on the corpus: (x - mean) · componentsᵀ
+#[derive(Debug, Deserialize, Clone)]
+pub struct Projection {
+    pub mean: Vec<f32>,
+    pub components: Vec<Vec<f32>>,
+}
+
+impl Projection {
+    /// Fails on a query of the wrong width instead of searching the projected
+    /// vectors with an unprojected query.
+    pub fn apply(&self, v: &[f32]) -> anyhow::Result<Vec<f32>> {
+        anyhow::ensure!(
+            v.len() == self.mean.len(),
+            "query embedding has {} dims but the projection expects {}",
+            v.len(),
+            self.mean.len()
+        );
+        let centered: Vec<f32> = v.iter().zip(&self.mean).map(|(x, m)| x - m).collect();
+        Ok(self
+            .components
+            .iter()
+            .map(|row| row.iter().zip(&centered).map(|(a, b)| a * b).sum())
+            .collect())
+    }
+}
+
+/// Per-law centroids written by the exporter (data/law_centroids.json).
+/// Used to pick target laws without the LLM when one or a few laws clearly
+/// stand out. Missing file = no laws, so the LLM step runs as before.
+#[derive(Debug, Deserialize, Default, Clone)]
+pub struct LawCentroids {
+    #[serde(default)]
+    pub margin: f32,
+    #[serde(default)]
+    pub max_laws: usize,
+    #[serde(default)]
+    pub laws: Vec<LawCentroid>,
+}
+
+#[derive(Debug, Deserialize, Clone)]
+pub struct LawCentroid {
+    pub law_full_name: String,
+    pub centroid: Vec<f32>,
+}
+
+impl LawCentroids {
+    /// Laws within `margin` of the best centroid, or none when more than
+    /// `max_laws` are that close (not confident enough to restrict the search).
+    pub fn target_laws(&self, query: &[f32]) -> Vec<String> {
+        let mut scored: Vec<(f32, &str)> = self
+            .laws
+            .iter()
+            .map(|law| {
+                (
+                    cosine_similarity(query, &law.centroid),
+                    law.law_full_name.as_str(),
+                )
+            })
+            .collect();
+        scored.sort_by(|a, b| b.0.total_cmp(&a.0));
+        let Some(&(best, _)) = scored.first() else {
+            return Vec::new();
+        };
+        let close: Vec<String> = scored
+            .iter()
+            .take_while(|(score, _)| *score >= best - self.margin)
+            .map(|(_, name)| name.to_string())
+            .collect();
+        if close.len() > self.max_laws {
+            Vec::new()
+        } else {
+            close
+        }
+    }
+}
+
+#[derive(Serialize, Clone)]
+pub struct RelatedArticle {
+    pub law_full_name: String,
+    pub article_number: String,
+    pub score: f32,
 }
 
 #[derive(Serialize, Clone)]
@@ -15,6 +232,9 @@ pub struct SearchResult {
     pub metadata: serde_json::Value,
     pub distance: f32,
     pub relevance: f32,
+    // Only filled for /laws/content
+    #[serde(skip_serializing_if = "Vec::is_empty")]
+    pub related: Vec<RelatedArticle>,
 }
 
 pub fn cosine_similarity(a: &[f32], b: &[f32]) -> f32 {
@@ -82,7 +82,7 @@ pub fn get_child_keywords() -> Vec<&'static str> {
         "児",
         "母子",
         "虐待",
-        "障蓋児",
+        "障害児",
         "未成年",
     ]
 }
@@ -0,0 +1,44 @@
+use std::collections::HashMap;
+use std::path::Path;
+
+use crate::SearchRequest;
+
+/// Query log written by the frontend (src/infrastructure/query_log.py),
+/// relative to the backend directory. QUERY_LOG_PATH overrides it.
+pub const QUERY_LOG: &str = "../cache/query_log.jsonl";
+/// How many of the most frequent requests are replayed (WARM_TOP_QUERIES)
+pub const WARM_TOP_QUERIES: usize = 50;
+
+type RequestKey = (String, Option<Vec<String>>, bool);
+
+/// The `n` most frequent /search requests in the log, counted per query and
+/// filters like top_queries() in query_log.py. Ties keep first-seen order.
+/// A missing log or broken lines are skipped.
+pub fn top_queries(path: &Path, n: usize) -> Vec<SearchRequest> {
+    let Ok(text) = std::fs::read_to_string(path) else {
+        return Vec::new();
+    };
+    let mut counts: HashMap<RequestKey, (usize, usize)> = HashMap::new();
+    for line in text.lines() {
+        let Ok(request) = serde_json::from_str::<SearchRequest>(line) else {
+            continue;
+        };
+        if request.query.is_empty() {
+            continue;
+        }
+        let seen = counts.len();
+        let key = (request.query, request.target_laws, request.ambiguous);
+        counts.entry(key).or_insert((0, seen)).0 += 1;
+    }
+    let mut ranked: Vec<(RequestKey, (usize, usize))> = counts.into_iter().collect();
+    ranked.sort_by(|a, b| b.1.0.cmp(&a.1.0).then(a.1.1.cmp(&b.1.1)));
+    ranked
+        .into_iter()
+        .take(n)
+        .map(|((query, target_laws, ambiguous), _)| SearchRequest {
+            query,
+            target_laws,
+            ambiguous,
+        })
+        .collect()
+}
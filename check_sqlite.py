@@ -6,7 +6,8 @@ def check_sqlite_laws():
     cursor = conn.cursor()
 
     cursor.execute(
-        "SELECT law_full_name, count(*) FROM laws JOIN articles ON laws.law_id = articles.law_id GROUP BY law_full_name"
+        "SELECT law_full_name, count(*) FROM laws "
+        "JOIN articles ON laws.law_key = articles.law_key GROUP BY law_full_name"
     )
     rows = cursor.fetchall()
 
@@ -1,42 +1,30 @@
-import chromadb
-from chromadb.config import Settings
-from src.rag_engine.config import Config
-from src.rag_engine.embedder import Embedder
+from src.infrastructure.corpus_store import CorpusStore
+from src.rag_engine.embedder import embedder_for_model
+from src.rag_engine.vector_engine import VectorEngine
 
 
 def debug_search(query):
     print(f"🔍 Debug Search Query: '{query}'")
 
     # Init Components
-    embedder = Embedder()
-    client = chromadb.Client(
-        Settings(
-            chroma_db_impl="duckdb+parquet", persist_directory=Config.CHROMA_DB_DIR
-        )
-    )
-    collection = client.get_collection(name=Config.COLLECTION_NAME)
+    engine = VectorEngine.from_store(CorpusStore())
+    # ベクトルファイルと同じモデルでクエリを埋め込む
+    embedder = embedder_for_model(engine.vectors.model)
 
     # Embed
-    query_vecs = embedder.embed_texts([query])
+    query_vec = embedder.embed_query(query)
 
     # Search
-    results = collection.query(
-        query_embeddings=query_vecs,
-        n_results=10,  # Top 10を見る
-        include=["documents", "metadatas", "distances"],
-    )
+    hits = engine.search(query_vec, n_results=10)  # Top 10を見る
 
     print("\n🏆 Top 10 Results:")
     print("-" * 60)
-    docs = results["documents"][0]
-    metas = results["metadatas"][0]
-    dists = results["distances"][0]
-
-    for i, (doc, meta, dist) in enumerate(zip(docs, metas, dists)):
-        law_name = meta.get("law_full_name", "Unknown")
-        article_num = meta.get("article_number", "?")
-        print(f"{i + 1}. [{dist:.4f}] {law_name} {article_num}")
-        print(f"   Sample: {doc[:50]}...")
+    for i, hit in enumerate(hits):
+        doc = hit.document
+        law_name = doc.law_full_name if doc else "Unknown"
+        article_num = doc.article_number if doc else "?"
+        print(f"{i + 1}. [{hit.distance:.4f}] {law_name} {article_num}")
+        print(f"   Sample: {doc.content[:50] if doc else ''}...")
     print("-" * 60)
 
 
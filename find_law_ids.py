@@ -1,48 +1,39 @@
-import requests
-import xml.etree.ElementTree as ET
+from src.infrastructure.law_catalog import LawCatalog
 
+# 法令一覧は一度だけ取得してローカルにキャッシュし、以降はインデックスを引く
+catalog = LawCatalog()
 
-def search_law_id(keyword):
-    url = "https://elaws.e-gov.go.jp/api/1/lawlists/1"
-    print(f"Downloading law list to search for '{keyword}'...")
-    try:
-        resp = requests.get(url, timeout=30)
-        if resp.status_code == 200:
-            root = ET.fromstring(resp.content)
-            found = False
-            with open("found_ids.txt", "a", encoding="utf-8") as f:
-                for law in root.findall(".//LawNameListInfo"):
-                    name = law.find("LawName").text
-                    if keyword in name:
-                        lid = law.find("LawId").text
-                        print(f"🎯 Found: {name} -> {lid}")
-                        f.write(f"{name}: {lid}\n")
-                        found = True
-            if not found:
-                print(f"❌ No law found asking for '{keyword}'")
-        else:
-            print(f"❌ Error fetching list: {resp.status_code}")
-    except Exception as e:
-        print(f"❌ Error: {e}")
 
+def search_law_id(keyword, f):
+    matches = catalog.search(keyword)
+    if not matches:
+        print(f"❌ No law found asking for '{keyword}'")
+        return
+    for entry in matches:
+        print(f"🎯 Found: {entry.law_name} -> {entry.law_id}")
+        f.write(f"{entry.law_name}: {entry.law_id}\n")
 
-# Clear file
-with open("found_ids.txt", "w", encoding="utf-8") as f:
-    pass
 
-# Additional Laws
-search_law_id("生活困窮者自立支援法")
-search_law_id("身体障害者福祉法")
-search_law_id("知的障害者福祉法")
-search_law_id("精神保健及び精神障害者福祉に関する法律")
-search_law_id("児童虐待の防止等に関する法律")
-search_law_id("配偶者からの暴力の防止及び被害者の保護等に関する法律")
-search_law_id("精神保健福祉士法")
-search_law_id("精神保健福祉士法施行令")
-search_law_id("精神保健福祉士法施行規則")
-search_law_id("社会福祉士及び介護福祉士法")
-search_law_id("少年法")
-search_law_id("災害対策基本法")
-search_law_id("災害救助法")
-search_law_id("刑法")
-search_law_id("刑事訴訟法")
+keywords = [
+    # Additional Laws
+    "生活困窮者自立支援法",
+    "身体障害者福祉法",
+    "知的障害者福祉法",
+    "精神保健及び精神障害者福祉に関する法律",
+    "児童虐待の防止等に関する法律",
+    "配偶者からの暴力の防止及び被害者の保護等に関する法律",
+    "精神保健福祉士法",
+    "精神保健福祉士法施行令",
+    "精神保健福祉士法施行規則",
+    "社会福祉士及び介護福祉士法",
+    "少年法",
+    "災害対策基本法",
+    "災害救助法",
+    "刑法",
+    "刑事訴訟法",
+]
+
+print(f"Law catalogue: {len(catalog.entries)} laws (fetched at {catalog.fetched_at})")
+with open("found_ids.txt", "w", encoding="utf-8") as f:
+    for keyword in keywords:
+        search_law_id(keyword, f)
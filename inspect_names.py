@@ -1,27 +1,12 @@
-import chromadb
-from chromadb.config import Settings
+from src.infrastructure.corpus_store import CorpusStore
 
 
 def inspect_exact_names():
-    client = chromadb.Client(
-        Settings(chroma_db_impl="duckdb+parquet", persist_directory="chroma_db")
-    )
+    # 法令名は CorpusStore (SQLite) から直接取得する
+    store = CorpusStore()
+    law_names = {law.law_full_name for law in store.list_laws()}
 
-    collection = client.get_collection("welfare_laws_gemini")
-
-    # 全件取得は重いので、metadataだけ全件なめることはできないか？
-    # collection.get() はlimitなしだと全件...ではなくデフォルトがあるかも。
-    # とりあえず多めに取得してsetにする。
-
-    result = collection.get(limit=10000, include=["metadatas"])
-    metadatas = result["metadatas"]
-
-    law_names = set()
-    for m in metadatas:
-        if m and "law_full_name" in m:
-            law_names.add(m["law_full_name"])
-
-    print("\n=== Exact Law Names in ChromaDB ===")
+    print("\n=== Exact Law Names in CorpusStore ===")
     with open("exact_names_utf8.txt", "w", encoding="utf-8") as f:
         for name in sorted(list(law_names)):
             print(f"'{name}'")
@@ -0,0 +1,148 @@
+"""
+QueryCoalescer のバッチ窓ごとのスループット / p99 ベンチマーク
+
+合成ベクトル (--docs x --dim) に対して、--concurrency 本のスレッドが閉ループで検索する。
+埋め込みは HashingEmbedder に呼び出し1回あたりの固定遅延 (--embed-latency-ms) と
+同時呼び出し数の上限 (--embed-concurrency) を足したもので、API の往復と
+レート制限を模している。窓なし (direct) は1件ずつ
+embed_query + search、それ以外は QueryCoalescer 経由で処理する。
+遅延 0 では行列積 (CPU) の、遅延ありでは API 呼び出し回数の削減効果を見られる。
+
+    python scripts/bench_coalescer.py --concurrency 16
+    python scripts/bench_coalescer.py --embed-latency-ms 0 --windows 0,2
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.infrastructure.corpus_store import VectorSet  # noqa: E402
+from src.rag_engine.coalescer import QueryCoalescer  # noqa: E402
+from src.rag_engine.embedder import HashingEmbedder  # noqa: E402
+from src.rag_engine.vector_engine import VectorEngine  # noqa: E402
+
+QUERIES = [
+    "生活保護の申請手続き",
+    "高齢者虐待の通報義務",
+    "児童相談所の一時保護",
+    "介護保険の要介護認定",
+    "障害福祉サービスの支給決定",
+    "生活困窮者自立支援法の目的",
+    "DV防止法の保護命令",
+    "精神保健福祉法の措置入院",
+]
+
+
+class SlowEmbedder(HashingEmbedder):
+    """呼び出し1回ごとに固定の待ち時間がかかる埋め込み (件数には依存しない)"""
+
+    def __init__(self, dim: int, latency_ms: float, concurrency: int):
+        super().__init__(dim)
+        self.latency = latency_ms / 1000.0
+        self._slots = threading.Semaphore(concurrency)
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        with self._slots:
+            time.sleep(self.latency)
+        return super().embed_texts(texts)
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(
+    search: Callable[[str], object], concurrency: int, requests: int
+) -> Tuple[float, List[float]]:
+    latencies: List[float] = []
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def worker() -> None:
+        while True:
+            with lock:
+                n = next(counter, None)
+            if n is None:
+                return
+            started = time.perf_counter()
+            search(QUERIES[n % len(QUERIES)])
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - started, latencies
+
+
+def report(label: str, elapsed: float, latencies: List[float], extra: str) -> None:
+    ms = [s * 1000 for s in latencies]
+    print(
+        f"  {label:<10} {len(ms) / elapsed:9.1f} req/s  "
+        f"p50 {percentile(ms, 0.50):7.2f} ms  p99 {percentile(ms, 0.99):7.2f} ms  "
+        f"mean {statistics.mean(ms):7.2f} ms  {extra}"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=800)
+    parser.add_argument("--results", type=int, default=100)
+    parser.add_argument("--embed-latency-ms", type=float, default=20.0)
+    parser.add_argument("--embed-concurrency", type=int, default=4)
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=1, help="並行に処理するバッチ数")
+    parser.add_argument("--windows", default="0,1,2,5,10", help="カンマ区切り (ms)")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    ids = [f"LAW{i // 100}_{i}" for i in range(args.docs)]
+    matrix = rng.standard_normal((args.docs, args.dim)).astype(np.float32)
+    engine = VectorEngine(VectorSet(ids, matrix, "synthetic", [""] * args.docs))
+    embedder = SlowEmbedder(args.dim, args.embed_latency_ms, args.embed_concurrency)
+
+    print(
+        f"{args.docs} docs x {args.dim} dim  concurrency={args.concurrency}  "
+        f"requests={args.requests}  embed latency={args.embed_latency_ms} ms"
+    )
+
+    def direct(query: str) -> object:
+        return engine.search(embedder.embed_query(query), n_results=args.results)
+
+    elapsed, latencies = run(direct, args.concurrency, args.requests)
+    report("direct", elapsed, latencies, "batch 1.0")
+
+    for window in (float(w) for w in args.windows.split(",")):
+        coalescer = QueryCoalescer(
+            embedder, engine, window, args.max_batch, args.workers
+        )
+        coalescer.search(QUERIES[0])  # ウォームアップ
+        coalescer.batches = coalescer.queries = 0
+        elapsed, latencies = run(
+            lambda q, c=coalescer: c.search(q, args.results),
+            args.concurrency,
+            args.requests,
+        )
+        coalescer.close()
+        mean_batch = coalescer.queries / max(coalescer.batches, 1)
+        report(f"{window:g} ms", elapsed, latencies, f"batch {mean_batch:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+ローカル LSA 埋め込みと Gemini 埋め込みの比較ベンチマーク
+
+同じコーパスに対して、条文本文の一部をクエリにしたときに元の条文を
+取り出せるか (recall@k / MRR) と、クエリ埋め込みのレイテンシを測る。
+Gemini 側は corpus_vectors/ に Gemini のベクトルがあり、
+GOOGLE_API_KEY が設定されている場合のみ計測する。
+
+    python scripts/bench_embedders.py --queries 200 --k 10
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.core.models import CorpusDocument  # noqa: E402
+from src.infrastructure.corpus_store import CorpusStore  # noqa: E402
+from src.rag_engine.config import Config  # noqa: E402
+from src.rag_engine.local_embedder import LocalLSAEmbedder  # noqa: E402
+
+
+def make_queries(
+    documents: List[CorpusDocument], n: int, seed: int
+) -> List[tuple[str, int]]:
+    """条文本文の途中30文字をクエリにし、元の条文の行番号を正解とする"""
+    rng = random.Random(seed)
+    candidates = [i for i, d in enumerate(documents) if len(d.content) >= 40]
+    picked = rng.sample(candidates, min(n, len(candidates)))
+    queries = []
+    for i in picked:
+        content = documents[i].content.replace("\n", "")
+        start = rng.randrange(0, max(1, len(content) - 30))
+        queries.append((content[start : start + 30], i))
+    return queries
+
+
+def rank_metrics(
+    doc_matrix: np.ndarray, query_matrix: np.ndarray, targets: List[int], k: int
+) -> Dict[str, float]:
+    norms = np.linalg.norm(doc_matrix, axis=1)
+    norms[norms == 0] = 1.0
+    scores = (query_matrix @ doc_matrix.T) / norms
+    hits, reciprocal = 0, 0.0
+    for row, target in zip(scores, targets, strict=True):
+        top = np.argsort(-row)[:k]
+        where = np.nonzero(top == target)[0]
+        if where.size:
+            hits += 1
+            reciprocal += 1.0 / (where[0] + 1)
+    n = max(len(targets), 1)
+    return {"recall": hits / n, "mrr": reciprocal / n}
+
+
+def latency_us(samples: List[float]) -> str:
+    values = np.array(samples) * 1e6
+    return (
+        f"p50 {np.percentile(values, 50):,.0f}us / "
+        f"p99 {np.percentile(values, 99):,.0f}us"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    store = CorpusStore()
+    documents = list(store.iter_documents())
+    if not documents:
+        print("No articles in the corpus store. Run populate_db first.")
+        return
+    queries = make_queries(documents, args.queries, args.seed)
+    targets = [t for _, t in queries]
+    print(f"Corpus: {len(documents)} articles, {len(queries)} queries, k={args.k}")
+
+    # --- Local LSA ---
+    started = time.perf_counter()
+    if os.path.exists(Config.LOCAL_EMBEDDER_PATH):
+        local = LocalLSAEmbedder.load(Config.LOCAL_EMBEDDER_PATH)
+    else:
+        local = LocalLSAEmbedder.fit([d.embedding_text() for d in documents], args.dim)
+    print(f"\n[local] {local.model_name} ready in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    local_docs = local.embed_array([d.embedding_text() for d in documents])
+    print(f"[local] corpus embedded in {time.perf_counter() - started:.1f}s")
+
+    timings = []
+    local_queries = []
+    for text, _ in queries:
+        t0 = time.perf_counter()
+        local_queries.append(local.embed_query(text))
+        timings.append(time.perf_counter() - t0)
+    local_q = np.asarray(local_queries, dtype=np.float32)
+    metrics = rank_metrics(local_docs, local_q, targets, args.k)
+    print(f"[local] query latency {latency_us(timings)}")
+    print(f"[local] recall@{args.k} {metrics['recall']:.3f}  MRR {metrics['mrr']:.3f}")
+
+    # --- Gemini (保存済みベクトル + API でのクエリ埋め込み) ---
+    if not (store.has_vectors() and Config.GOOGLE_API_KEY):
+        print("\n[gemini] skipped (needs Gemini vectors and GOOGLE_API_KEY)")
+        return
+    vectors = store.load_vectors()
+    if vectors.model != Config.EMBEDDING_MODEL:
+        print(f"\n[gemini] skipped (vector file holds {vectors.model})")
+        return
+
+    from src.rag_engine.embedder import GeminiEmbedder
+
+    gemini = GeminiEmbedder()
+    rows = vectors.row_of()
+    present = [i for i, d in enumerate(documents) if d.doc_id in rows]
+    gemini_docs = np.zeros((len(documents), vectors.dim), dtype=np.float32)
+    gemini_docs[present] = vectors.matrix[[rows[documents[i].doc_id] for i in present]]
+
+    timings = []
+    for text, _ in queries[:10]:
+        t0 = time.perf_counter()
+        gemini.embed_query(text)
+        timings.append(time.perf_counter() - t0)
+    gemini_q = np.asarray(
+        gemini.embed_texts([text for text, _ in queries]), dtype=np.float32
+    )
+    metrics = rank_metrics(gemini_docs, gemini_q, targets, args.k)
+    print(f"\n[gemini] query latency {latency_us(timings)} (10 single calls)")
+    print(f"[gemini] recall@{args.k} {metrics['recall']:.3f}  MRR {metrics['mrr']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
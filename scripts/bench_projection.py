@@ -0,0 +1,113 @@
+"""
+PCA 次元削減のベンチマーク (検索速度・メモリ・検索品質)
+
+保存済みベクトル (未射影) があればそれを、なければ実際の埋め込みに近い
+偏った分散を持つ合成ベクトルを使い、次元ごとに PCA を学習して
+1クエリあたりの検索時間・行列サイズ・全次元での top-k に対する recall@k を表示する。
+クエリは元の次元のまま渡し、VectorEngine が自動で射影する。
+
+    python scripts/bench_projection.py
+    python scripts/bench_projection.py --vector-dir corpus_vectors --dims 512,256,128
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.infrastructure.corpus_store import CorpusStore, VectorSet  # noqa: E402
+from src.rag_engine.projection import fit_pca, project_matrix  # noqa: E402
+from src.rag_engine.vector_engine import VectorEngine  # noqa: E402
+
+
+def synthetic(docs: int, dim: int, rank: int, seed: int = 0) -> np.ndarray:
+    """主成分の分散が減衰していく低ランク + ノイズの行列"""
+    rng = np.random.default_rng(seed)
+    scales = 1.0 / np.sqrt(np.arange(1, rank + 1))
+    latent = rng.standard_normal((docs, rank)) * scales
+    basis = np.linalg.qr(rng.standard_normal((dim, rank)))[0].T
+    noise = 0.02 * rng.standard_normal((docs, dim))
+    return (latent @ basis + noise).astype(np.float32)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", default="welfare_laws_v3.db")
+    parser.add_argument("--vector-dir", help="保存済みベクトルを使う場合のディレクトリ")
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--rank", type=int, default=128)
+    parser.add_argument("--dims", default="512,256,128,64")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.vector_dir:
+        vectors = CorpusStore(args.db, args.vector_dir).load_vectors(mmap=False)
+        if vectors.projection is not None:
+            print("Vectors are already projected; benchmark needs full vectors.")
+            return
+        matrix = np.asarray(vectors.matrix, dtype=np.float32)
+        ids = vectors.ids
+        source = f"{args.vector_dir} ({vectors.model})"
+    else:
+        matrix = synthetic(args.docs, args.dim, args.rank)
+        ids = [f"LAW{i // 100}_{i}" for i in range(matrix.shape[0])]
+        source = f"synthetic rank {args.rank}"
+
+    rng = np.random.default_rng(1)
+    picked = rng.choice(matrix.shape[0], args.queries, replace=False)
+    noise = 0.3 * matrix.std() * rng.standard_normal((args.queries, matrix.shape[1]))
+    queries = (matrix[picked] + noise).astype(np.float32).tolist()
+
+    full = VectorEngine(VectorSet(ids, matrix, "bench", []))
+    truth = [
+        {h.doc_id for h in full.search(q, n_results=args.k, resolve=False)}
+        for q in queries
+    ]
+
+    print(f"{matrix.shape[0]} docs x {matrix.shape[1]} dim  ({source})")
+    print(
+        f"  {'dim':>5}  {'variance':>8}  {'matrix':>10}  {'ms/query':>8}  "
+        f"{'recall@' + str(args.k):>9}"
+    )
+    dims = [matrix.shape[1]] + [int(d) for d in args.dims.split(",")]
+    for dim in dims:
+        if dim >= matrix.shape[1]:
+            engine, retained, extra = full, 1.0, 0
+        else:
+            projection, retained = fit_pca(matrix, dim)
+            engine = VectorEngine(
+                VectorSet(
+                    ids,
+                    project_matrix(matrix, projection),
+                    "bench",
+                    [],
+                    projection=projection,
+                )
+            )
+            extra = projection.components.nbytes + projection.mean.nbytes
+
+        started = time.perf_counter()
+        found = [
+            {h.doc_id for h in engine.search(q, n_results=args.k, resolve=False)}
+            for q in queries
+        ]
+        per_query = (time.perf_counter() - started) / len(queries) * 1000
+        recall = np.mean(
+            [len(f & t) / args.k for f, t in zip(found, truth, strict=True)]
+        )
+        size_mib = (engine.matrix.nbytes + extra) / 2**20
+        print(
+            f"  {dim:>5}  {retained:>8.1%}  {size_mib:>6.1f} MiB  "
+            f"{per_query:>8.3f}  {recall:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+章セントロイドによる2段階検索のベンチマーク (全件走査との比較)
+
+保存済みのベクトルがあればそれを、なければ 法令 > 章 > 条 の3階層にまとまった
+合成ベクトルを使う。条文ベクトルにノイズを加えたものをクエリとし、
+走査する章の数・margin ごとに 1クエリあたりの検索時間・全件走査の top-k に対する
+recall@k・全件走査に戻った割合・走査した行の割合を表示する。
+法令セントロイドによる対象法令の推定 (LLM の代わり) の正解率も表示する。
+
+    python scripts/bench_routing.py
+    python scripts/bench_routing.py --vector-dir corpus_vectors --groups 4,8,16
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.infrastructure.corpus_store import CorpusStore, VectorSet  # noqa: E402
+from src.rag_engine.routing import CentroidRouter, build_centroids  # noqa: E402
+from src.rag_engine.vector_engine import VectorEngine, project_query  # noqa: E402
+
+
+def synthetic(
+    laws: int, chapters: int, articles: int, dim: int, spread: float, seed: int = 0
+) -> tuple[VectorSet, Dict[str, str]]:
+    """法令・章ごとに中心のずれたクラスタ (条文ベクトル) と hierarchy"""
+    rng = np.random.default_rng(seed)
+    ids, hierarchies, rows = [], {}, []
+    for law in range(laws):
+        law_center = rng.standard_normal(dim)
+        for chapter in range(chapters):
+            chapter_center = law_center + 0.6 * rng.standard_normal(dim)
+            for article in range(articles):
+                doc_id = f"LAW{law:04d}_第{chapter}章第{article}条"
+                ids.append(doc_id)
+                hierarchies[doc_id] = f"第{chapter}章"
+                rows.append(chapter_center + spread * rng.standard_normal(dim))
+    matrix = np.array(rows, dtype=np.float32)
+    return VectorSet(ids, matrix, "bench", [""] * len(ids)), hierarchies
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", default="welfare_laws_v3.db")
+    parser.add_argument("--vector-dir", help="保存済みベクトルを使う場合のディレクトリ")
+    parser.add_argument("--laws", type=int, default=50)
+    parser.add_argument("--chapters", type=int, default=8)
+    parser.add_argument("--articles", type=int, default=50)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument(
+        "--spread", type=float, default=2.5, help="章の中心からの条文のばらつき"
+    )
+    parser.add_argument("--groups", default="4,8,16")
+    parser.add_argument("--margins", default="0.05,0.1,0.15,0.2")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.vector_dir:
+        store = CorpusStore(args.db, args.vector_dir)
+        vectors = store.load_vectors(mmap=False)
+        hierarchies = {d.doc_id: d.hierarchy for d in store.iter_documents()}
+        source = f"{args.vector_dir} ({vectors.model})"
+    else:
+        vectors, hierarchies = synthetic(
+            args.laws, args.chapters, args.articles, args.dim, args.spread
+        )
+        source = f"synthetic {args.laws} laws x {args.chapters} chapters"
+    centroids = build_centroids(vectors, hierarchies)
+
+    rng = np.random.default_rng(1)
+    matrix = np.asarray(vectors.matrix, dtype=np.float32)
+    picked = rng.choice(matrix.shape[0], min(args.queries, matrix.shape[0]), False)
+    noise = 0.5 * matrix.std() * rng.standard_normal((len(picked), matrix.shape[1]))
+    queries = matrix[picked] + noise
+    source_laws = [vectors.ids[i].partition("_")[0] for i in picked]
+
+    def run(engine: VectorEngine) -> tuple[float, List[set]]:
+        started = time.perf_counter()
+        found = [
+            {h.doc_id for h in engine.search(q, n_results=args.k, resolve=False)}
+            for q in queries
+        ]
+        return (time.perf_counter() - started) / len(queries) * 1000, found
+
+    projected = [project_query(q, vectors.projection) for q in queries]
+    full_ms, truth = run(VectorEngine(vectors))
+    print(f"{len(vectors.ids)} vectors, {len(centroids)} chapters  ({source})")
+    print(f"  full scan: {full_ms:.3f} ms/query")
+
+    targets = [CentroidRouter(centroids).target_laws(q) for q in projected]
+    targeted = [(law, t) for law, t in zip(source_laws, targets, strict=True) if t]
+    print(
+        f"  law targeting: {len(targeted) / len(queries):.1%} of queries targeted, "
+        f"{np.mean([law in t for law, t in targeted] or [0]):.1%} correct, "
+        f"{np.mean([len(t) for _, t in targeted] or [0]):.2f} laws on average"
+    )
+    print(
+        f"  {'groups':>6}  {'margin':>6}  {'ms/query':>8}  "
+        f"{'recall@' + str(args.k):>9}  {'fallback':>8}  {'scanned':>7}"
+    )
+    for n_groups in [int(g) for g in args.groups.split(",")]:
+        for margin in [float(m) for m in args.margins.split(",")]:
+            router = CentroidRouter(centroids, n_groups, margin)
+            ms, found = run(VectorEngine(vectors, router=router))
+            recall = np.mean(
+                [len(f & t) / args.k for f, t in zip(found, truth, strict=True)]
+            )
+            routes = [router.route(q) for q in projected]
+            fallback = np.mean([r is None for r in routes])
+            scanned = np.mean(
+                [1.0 if r is None else r.size / len(vectors.ids) for r in routes]
+            )
+            print(
+                f"  {n_groups:>6}  {margin:>6.2f}  {ms:>8.3f}  {recall:>9.3f}  "
+                f"{fallback:>8.1%}  {scanned:>7.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
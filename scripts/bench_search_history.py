@@ -0,0 +1,129 @@
+"""
+検索履歴のメモリ使用量ベンチマーク
+
+1セッションで連続検索したときの履歴のメモリ増加を tracemalloc で測る。
+旧方式 (描画済みHTMLを無制限に積む) と SearchHistory (条文IDとスコアの
+リングバッファ + 共有条文キャッシュ) を比較する。
+後者の増加分は共有キャッシュが上限 (DOCUMENT_CACHE_SIZE) に近づく分だけで、
+セッション側の履歴は件数上限で頭打ちになる。
+
+    python scripts/bench_search_history.py --searches 1000 --corpus 3000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+from typing import Callable, List, Optional
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.interface.search_history import (  # noqa: E402
+    SearchHistory,
+    render_results_html,
+)
+
+
+def make_corpus(size: int, seed: int) -> List[dict]:
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        law = f"法令{i % 40}"
+        corpus.append(
+            {
+                "document": "".join(
+                    chr(0x4E00 + rng.randrange(2000)) for _ in range(400)
+                ),
+                "metadata": {
+                    "law_id": f"L{i % 40:03d}",
+                    "law_full_name": law,
+                    "article_number": f"第{i}条",
+                },
+            }
+        )
+    return corpus
+
+
+def search_results(corpus: List[dict], rng: random.Random, k: int) -> List[dict]:
+    return [
+        dict(item, relevance=rng.random(), distance=rng.random())
+        for item in rng.sample(corpus, k)
+    ]
+
+
+def measure(
+    label: str,
+    searches: int,
+    step: int,
+    record: Callable[[str, List[dict]], None],
+    corpus: List[dict],
+    k: int,
+    seed: int,
+) -> None:
+    rng = random.Random(seed)
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    curve = []
+    for n in range(1, searches + 1):
+        record(f"質問{n}", search_results(corpus, rng, k))
+        if n % step == 0:
+            current, _ = tracemalloc.get_traced_memory()
+            curve.append(f"{(current - base) / 1024:,.0f}")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"\n[{label}] KiB after every {step} searches:")
+    print("  " + " ".join(curve))
+    print(f"  peak {(peak - base) / 1024:,.0f} KiB")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--searches", type=int, default=1000)
+    parser.add_argument("--corpus", type=int, default=3000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--step", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    corpus = make_corpus(args.corpus, args.seed)
+
+    # 旧方式: 質問と描画済みHTMLをセッションのリストに積み続ける
+    messages: List[dict] = []
+    history = SearchHistory()
+
+    def record_legacy(query: str, results: List[dict]) -> None:
+        messages.insert(0, {"role": "user", "content": query})
+        entry = SearchHistory().add(query, None, results)
+        documents = {
+            doc_id: (
+                item["metadata"]["law_full_name"],
+                item["metadata"]["article_number"],
+                item["document"],
+            )
+            for (doc_id, _), item in zip(entry.hits, results, strict=True)
+        }
+        messages.insert(
+            0, {"role": "assistant", "content": render_results_html(entry, documents)}
+        )
+
+    def record_compact(query: str, results: List[dict]) -> None:
+        history.add(query, None, results)
+
+    measure(
+        "html list", args.searches, args.step, record_legacy, corpus, args.k, args.seed
+    )
+    measure(
+        "ring buffer",
+        args.searches,
+        args.step,
+        record_compact,
+        corpus,
+        args.k,
+        args.seed,
+    )
+    print(f"\nSession entries: html list {len(messages)}, ring buffer {len(history)}")
+    print(f"Shared document cache: {len(history.documents)} articles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+検索APIの同時接続ベンチマーク (Rust バックエンドと Python サービスの比較用)
+
+同じクライアント (BackendClient) から /search を並行に呼び、
+スループットとレイテンシ (p50 / p99) を表示する。
+
+    python -m src.interface.search_service --port 3001 --embedder fake &
+    python scripts/bench_service.py --url http://localhost:3001 --concurrency 8
+    python scripts/bench_service.py --url http://localhost:3000 --concurrency 8
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from typing import List, Optional
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.interface.backend_client import BackendClient  # noqa: E402
+
+DEFAULT_QUERIES = [
+    "生活保護の申請手続き",
+    "高齢者虐待の通報義務",
+    "児童相談所の一時保護",
+    "介護保険の要介護認定",
+    "障害福祉サービスの支給決定",
+    "生活困窮者自立支援法の目的",
+    "DV防止法の保護命令",
+    "精神保健福祉法の措置入院",
+]
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:3000")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--queries-file", help="1行1クエリのファイル")
+    args = parser.parse_args(argv)
+
+    queries = DEFAULT_QUERIES
+    if args.queries_file:
+        with open(args.queries_file, encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+
+    client = BackendClient(args.url, pool_size=args.concurrency)
+    client.search({"query": queries[0]})  # 接続とキャッシュのウォームアップ
+
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    counter = iter(range(args.requests))
+
+    def worker() -> None:
+        while True:
+            with lock:
+                n = next(counter, None)
+            if n is None:
+                return
+            started = time.perf_counter()
+            try:
+                client.search({"query": queries[n % len(queries)]})
+            except Exception:
+                with lock:
+                    errors[0] += 1
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=worker) for _ in range(args.concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    client.close()
+
+    if not latencies:
+        print(f"All {errors[0]} requests failed against {args.url}")
+        return
+    ms = [s * 1000 for s in latencies]
+    print(f"{args.url}  concurrency={args.concurrency}  requests={len(latencies)}")
+    print(f"  throughput {len(latencies) / elapsed:8.1f} req/s  errors {errors[0]}")
+    print(
+        f"  latency    p50 {percentile(ms, 0.50):7.2f} ms  "
+        f"p99 {percentile(ms, 0.99):7.2f} ms  mean {statistics.mean(ms):7.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+ShardedEngine のコア数スケーリングのベンチマーク
+
+合成ベクトル (--docs x --dim) を一時ディレクトリに .npy で書き出し、
+1プロセスの VectorEngine と、シャード数 1..N の ShardedEngine で同じクエリを流して
+スループット・レイテンシ (p50 / p99) と 1シャード比の速度向上を表示する。
+--filtered では各クエリを1法令に絞り、対象外シャードへ送らない効果も見られる。
+
+    python scripts/bench_shards.py --max-shards 8
+    python scripts/bench_shards.py --by hash --batch 16 --filtered
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.infrastructure.corpus_store import VectorSet  # noqa: E402
+from src.rag_engine.sharded_engine import BY_HASH, BY_LAW, ShardedEngine  # noqa: E402
+from src.rag_engine.vector_engine import VectorEngine  # noqa: E402
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(
+    search: Callable[[int], object], concurrency: int, requests: int
+) -> Tuple[float, List[float]]:
+    latencies: List[float] = []
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def worker() -> None:
+        while True:
+            with lock:
+                n = next(counter, None)
+            if n is None:
+                return
+            started = time.perf_counter()
+            search(n)
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - started, latencies
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--laws", type=int, default=500)
+    parser.add_argument("--max-shards", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--by", choices=[BY_LAW, BY_HASH], default=BY_LAW)
+    parser.add_argument("--batch", type=int, default=1, help="1リクエストのクエリ数")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--results", type=int, default=100)
+    parser.add_argument("--filtered", action="store_true", help="各クエリを1法令に絞る")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    ids = [f"LAW{i * args.laws // args.docs:05d}_{i}" for i in range(args.docs)]
+    queries = rng.standard_normal((64, args.dim)).astype(np.float32)
+
+    def filters(n: int) -> Optional[List[Optional[List[str]]]]:
+        if not args.filtered:
+            return None
+        return [[f"LAW{(n + j) % args.laws:05d}"] for j in range(args.batch)]
+
+    def batch(n: int) -> List[List[float]]:
+        return [queries[(n + j) % len(queries)].tolist() for j in range(args.batch)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "vectors.npy")
+        np.save(path, rng.standard_normal((args.docs, args.dim)).astype(np.float32))
+        vectors = VectorSet(ids, np.load(path, mmap_mode="r"), "synthetic", [])
+        print(
+            f"{args.docs} docs x {args.dim} dim  by={args.by}  batch={args.batch}  "
+            f"concurrency={args.concurrency}  filtered={args.filtered}  "
+            f"cpus={os.cpu_count()}"
+        )
+
+        def report(label: str, elapsed: float, latencies: List[float]) -> float:
+            ms = [s * 1000 for s in latencies]
+            qps = len(ms) * args.batch / elapsed
+            p50, p99 = percentile(ms, 0.50), percentile(ms, 0.99)
+            print(
+                f"  {label:<12} {qps:9.1f} q/s  p50 {p50:8.2f} ms  "
+                f"p99 {p99:8.2f} ms  mean {statistics.mean(ms):8.2f} ms",
+                end="",
+            )
+            return qps
+
+        single = VectorEngine(vectors)
+        elapsed, latencies = run(
+            lambda n: single.search_batch(
+                batch(n), args.results, filters(n), resolve=False
+            ),
+            args.concurrency,
+            args.requests,
+        )
+        report("in-process", elapsed, latencies)
+        print()
+
+        base = 0.0
+        for n_shards in range(1, args.max_shards + 1):
+            with ShardedEngine(vectors, n_shards, args.by) as engine:
+                engine.search_batch(batch(0), args.results)  # ウォームアップ
+                elapsed, latencies = run(
+                    lambda n, e=engine: e.search_batch(
+                        batch(n), args.results, filters(n), resolve=False
+                    ),
+                    args.concurrency,
+                    args.requests,
+                )
+            qps = report(f"{n_shards} shards", elapsed, latencies)
+            base = base or qps
+            print(f"  x{qps / base:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+法令キー・階層ノードによる正規化の、ディスクとメモリの削減量
+
+条文ごとに law_id・hierarchy の文字列を持つ旧スキーマ・旧 index.json (条文ごとに
+id・text・metadata を持つ) と、整数キー・文字列表に正規化した現行の形式を比べる。
+SQLite と index.json のファイルサイズ、読み込んだプロセスの RSS の増加量を表示する。
+--db を指定すると既存のDB (一時ディレクトリにコピーして使う) を、
+指定しなければ 21法令相当の合成コーパスを使い、--scale 倍の合成コーパスでも測る。
+
+    python scripts/bench_storage.py
+    python scripts/bench_storage.py --db welfare_laws_v3.db --dim 768
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.core.models import Article, CorpusDocument, Law  # noqa: E402
+from src.infrastructure.corpus_store import CorpusStore, VectorSet  # noqa: E402
+from src.infrastructure.database import LawRepository  # noqa: E402
+from src.interface.export_index import compact_index  # noqa: E402
+
+Corpus = List[Tuple[Law, List[Article]]]
+
+_LEGACY_SCHEMA = [
+    """CREATE TABLE laws (
+        law_id TEXT PRIMARY KEY, law_num TEXT, law_full_name TEXT,
+        last_updated TIMESTAMP, promulgation_date TEXT, amendment_law_num TEXT,
+        amendment_date TEXT, amendment_stamp TEXT)""",
+    """CREATE TABLE articles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT, law_id TEXT, article_number TEXT,
+        hierarchy TEXT, content TEXT, valid_from TEXT)""",
+    "CREATE INDEX idx_articles_law_article ON articles (law_id, article_number)",
+    "CREATE INDEX idx_articles_law_valid ON articles (law_id, valid_from)",
+]
+
+
+def synthetic_corpus(laws: int, articles: int, seed: int = 0) -> Corpus:
+    """章・節の見出しと長い法令名を持つ合成コーパス"""
+    rng = np.random.default_rng(seed)
+    words = ["保護", "支援", "給付", "施設", "市町村", "都道府県", "事業", "申請"]
+    items = []
+    for n in range(laws):
+        law_id = f"4{n:02d}AC00000{n:05d}"
+        name = f"障害者の日常生活及び社会生活を総合的に支援するための法律第{n}号"
+        law = Law(
+            law_id=law_id, law_num="", law_full_name=name, last_updated=datetime.now()
+        )
+        rows = []
+        for a in range(articles):
+            chapter, section = a // 15, a % 15 // 5
+            hierarchy = (
+                f"第{chapter + 1}章 {words[chapter % 8]}等 > "
+                f"第{section + 1}節 {words[section]}の{words[(chapter + 3) % 8]}"
+            )
+            content = "、".join(rng.choice(words, 40)) + "とする。"
+            rows.append(
+                Article(
+                    law_id=law_id,
+                    article_number=f"第{a + 1}条",
+                    hierarchy=hierarchy,
+                    content=content,
+                )
+            )
+        items.append((law, rows))
+    return items
+
+
+def corpus_from_db(db_path: str, workdir: str) -> Corpus:
+    copy = os.path.join(workdir, "source.db")
+    shutil.copy(db_path, copy)
+    by_law: Dict[str, Tuple[Law, List[Article]]] = {}
+    for doc in CorpusStore(copy, workdir).iter_documents():
+        law = Law(
+            law_id=doc.law_id,
+            law_num="",
+            law_full_name=doc.law_full_name,
+            last_updated=datetime.now(),
+        )
+        by_law.setdefault(doc.law_id, (law, []))[1].append(
+            Article(
+                law_id=doc.law_id,
+                article_number=doc.article_number,
+                hierarchy=doc.hierarchy,
+                content=doc.content,
+            )
+        )
+    return list(by_law.values())
+
+
+def write_legacy_db(path: str, corpus: Corpus) -> None:
+    with sqlite3.connect(path) as conn:
+        for statement in _LEGACY_SCHEMA:
+            conn.execute(statement)
+        for law, articles in corpus:
+            conn.execute(
+                "INSERT INTO laws (law_id, law_num, law_full_name) VALUES (?, ?, ?)",
+                (law.law_id, law.law_num, law.law_full_name),
+            )
+            conn.executemany(
+                "INSERT INTO articles (law_id, article_number, hierarchy, content) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (a.law_id, a.article_number, a.hierarchy, a.content)
+                    for a in articles
+                ],
+            )
+    with sqlite3.connect(path) as conn:
+        conn.execute("VACUUM")
+
+
+def write_current_db(path: str, corpus: Corpus) -> None:
+    LawRepository(path).save_laws_batch(corpus)
+    with sqlite3.connect(path) as conn:
+        conn.execute("VACUUM")
+
+
+def legacy_index(documents: List[CorpusDocument], matrix: np.ndarray) -> list:
+    """正規化前の index.json (条文ごとに id・text・metadata を持つ)"""
+    return [
+        {
+            "id": doc.doc_id,
+            "text": doc.embedding_text(),
+            "metadata": doc.metadata(),
+            "embedding": matrix[i].tolist(),
+        }
+        for i, doc in enumerate(documents)
+    ]
+
+
+def _rss_kb() -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def _load(kind: str, path: str, queue) -> None:
+    before = _rss_kb()
+    if kind == "json":
+        with open(path, encoding="utf-8") as f:
+            loaded = json.load(f)
+    elif kind == "legacy-db":
+        with sqlite3.connect(path) as conn:
+            loaded = [
+                CorpusDocument(
+                    doc_id=f"{r[0]}_{r[2]}",
+                    law_id=r[0],
+                    law_full_name=r[1],
+                    article_number=r[2],
+                    hierarchy=r[3],
+                    content=r[4],
+                )
+                for r in conn.execute(
+                    "SELECT a.law_id, l.law_full_name, a.article_number, "
+                    "a.hierarchy, a.content FROM articles a "
+                    "JOIN laws l ON a.law_id = l.law_id ORDER BY a.id"
+                )
+            ]
+    else:
+        loaded = list(CorpusStore(path, os.path.dirname(path)).iter_documents())
+    queue.put((_rss_kb() - before) / 1024)
+    del loaded
+
+
+def rss_growth(kind: str, path: str) -> float:
+    """別プロセスで読み込み、RSS の増加量 (MB) を返す"""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_load, args=(kind, path, queue))
+    process.start()
+    growth = queue.get()
+    process.join()
+    return growth
+
+
+def _mb(path: str) -> float:
+    return os.path.getsize(path) / 1024 / 1024
+
+
+def measure(label: str, corpus: Corpus, dim: int, workdir: str) -> None:
+    legacy_db = os.path.join(workdir, f"{label}-legacy.db")
+    current_db = os.path.join(workdir, f"{label}-current.db")
+    write_legacy_db(legacy_db, corpus)
+    write_current_db(current_db, corpus)
+
+    documents = list(CorpusStore(current_db, workdir).iter_documents())
+    ids = [d.doc_id for d in documents]
+    rng = np.random.default_rng(0)
+    matrix = rng.standard_normal((len(ids), dim)).astype(np.float32)
+    legacy_json = os.path.join(workdir, f"{label}-legacy.json")
+    compact_json = os.path.join(workdir, f"{label}-compact.json")
+    with open(legacy_json, "w", encoding="utf-8") as f:
+        json.dump(legacy_index(documents, matrix), f, ensure_ascii=False)
+    vectors = VectorSet(ids, matrix, "bench", [""] * len(ids))
+    with open(compact_json, "w", encoding="utf-8") as f:
+        json.dump(compact_index(documents, vectors), f, ensure_ascii=False)
+
+    print(f"\n{label}: {len(corpus)} laws, {len(documents)} articles, dim {dim}")
+    print(f"  {'':<26}  {'legacy':>9}  {'current':>9}  {'saved':>6}")
+    rows = [
+        ("SQLite file (MB)", _mb(legacy_db), _mb(current_db)),
+        (
+            "SQLite load RSS (MB)",
+            *[
+                rss_growth(k, p)
+                for k, p in [("legacy-db", legacy_db), ("current-db", current_db)]
+            ],
+        ),
+        ("index.json file (MB)", _mb(legacy_json), _mb(compact_json)),
+        (
+            "index.json load RSS (MB)",
+            *[rss_growth("json", p) for p in [legacy_json, compact_json]],
+        ),
+    ]
+    for name, before, after in rows:
+        saved = 1 - after / before if before else 0.0
+        print(f"  {name:<26}  {before:>9.2f}  {after:>9.2f}  {saved:>6.1%}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", help="既存のDB (指定しなければ合成コーパス)")
+    parser.add_argument("--laws", type=int, default=21)
+    parser.add_argument("--articles", type=int, default=100, help="法令ごとの条文数")
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--dim", type=int, default=0, help="index.json のベクトル次元")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.db:
+            corpus = corpus_from_db(args.db, workdir)
+            measure(os.path.basename(args.db), corpus, args.dim, workdir)
+        else:
+            corpus = synthetic_corpus(args.laws, args.articles)
+            measure("synthetic", corpus, args.dim, workdir)
+        laws = len(corpus) * args.scale
+        measure(
+            f"synthetic x{args.scale}",
+            synthetic_corpus(laws, args.articles),
+            args.dim,
+            workdir,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+条文本文の辞書圧縮の圧縮率と、検索結果1件あたりの復元コスト
+
+使える辞書圧縮 (zstd は zstandard が入っている場合のみ) と辞書なしの zlib について、
+1条ずつ圧縮したときの圧縮率 (辞書を含む) と1条の復元時間を表示する。
+さらに一時DBで本文を圧縮し、検索結果 top-k の解決 (CorpusStore.get_documents) に
+かかる時間を平文の場合と比べる。--db を指定しなければ合成コーパスを使う。
+
+    python scripts/bench_text_codec.py
+    python scripts/bench_text_codec.py --db welfare_laws_v3.db -k 10
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime
+from typing import Callable, List, Optional
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.core.models import Article, Law  # noqa: E402
+from src.infrastructure.corpus_store import CorpusStore  # noqa: E402
+from src.infrastructure.database import LawRepository  # noqa: E402
+from src.infrastructure.text_codec import (  # noqa: E402
+    CODECS,
+    default_codec_name,
+    train_codec,
+)
+
+PHRASES = [
+    "この法律の規定により",
+    "厚生労働省令で定めるところにより",
+    "都道府県知事は、",
+    "市町村長は、",
+    "前項の規定にかかわらず、",
+    "保護の実施機関は、",
+    "第二条に規定する",
+    "必要な措置を講じなければならない。",
+    "ものとする。",
+    "次の各号に掲げる者は、",
+    "政令で定める基準に従い、",
+    "当該申請に係る",
+    "の規定による届出をした者",
+    "社会福祉法人その他の者が",
+    "要保護者の生活の状況を",
+    "その旨を公示しなければならない。",
+]
+NOUNS = ["保護", "扶助", "給付金", "施設", "事業者", "手当", "支給", "調査", "認定"]
+
+
+def synthetic_laws(laws: int, articles: int, seed: int = 0) -> List[Article]:
+    """定型の言い回しと名詞・数字を組み合わせた合成条文"""
+    rng = random.Random(seed)
+    rows = []
+    for n in range(laws):
+        for a in range(articles):
+            parts = []
+            for _ in range(rng.randint(3, 12)):
+                parts.append(rng.choice(PHRASES))
+                parts.append(f"{rng.choice(NOUNS)}（第{rng.randint(1, 80)}条）")
+            rows.append(
+                Article(
+                    law_id=f"LAW{n:03d}",
+                    article_number=f"第{a + 1}条",
+                    hierarchy=f"第{a // 20 + 1}章",
+                    content="".join(parts),
+                )
+            )
+    return rows
+
+
+def _timed(fn: Callable[[], object], repeat: int) -> float:
+    """1回あたりのマイクロ秒"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", help="既存のDB (指定しなければ合成コーパス)")
+    parser.add_argument("--laws", type=int, default=21)
+    parser.add_argument("--articles", type=int, default=100)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    if args.db:
+        source = CorpusStore(args.db)
+        articles = [
+            Article(
+                law_id=d.law_id,
+                article_number=d.article_number,
+                hierarchy=d.hierarchy,
+                content=d.content,
+            )
+            for d in source.iter_documents()
+        ]
+    else:
+        articles = synthetic_laws(args.laws, args.articles)
+    texts = [a.content for a in articles]
+    plain = sum(len(t.encode("utf-8")) for t in texts)
+    print(f"{len(texts)} articles, {plain / 1024:.1f} KiB of text")
+
+    print(f"  {'codec':<18}  {'ratio':>6}  {'dict KiB':>8}  {'decode us':>9}")
+    packed = [zlib.compress(t.encode("utf-8"), 9) for t in texts]
+    decode_us = _timed(lambda: [zlib.decompress(p) for p in packed], 3) / len(texts)
+    print(
+        f"  {'zlib (no dict)':<18}  {plain / sum(map(len, packed)):>6.2f}  "
+        f"{0:>8.1f}  {decode_us:>9.2f}"
+    )
+    # zstd は zstandard が入っている場合のみ
+    available = [n for n in CODECS if n == "zlib" or default_codec_name() == "zstd"]
+    for name in available:
+        codec = train_codec(texts, name)
+        packed = [codec.encode(t) for t in texts]
+        size = sum(map(len, packed)) + len(codec.dictionary)
+        decode_us = _timed(lambda c=codec, p=packed: [c.decode(x) for x in p], 3)
+        print(
+            f"  {name + ' (dict)':<18}  {plain / size:>6.2f}  "
+            f"{len(codec.dictionary) / 1024:>8.1f}  {decode_us / len(texts):>9.2f}"
+        )
+
+    with tempfile.TemporaryDirectory() as workdir:
+        repo = LawRepository(os.path.join(workdir, "laws.db"))
+        by_law: dict = {}
+        for a in articles:
+            by_law.setdefault(a.law_id, []).append(a)
+        repo.save_laws_batch(
+            [
+                (
+                    Law(
+                        law_id=law_id,
+                        law_num="",
+                        law_full_name=law_id,
+                        last_updated=datetime.now(),
+                    ),
+                    rows,
+                )
+                for law_id, rows in by_law.items()
+            ]
+        )
+        store = CorpusStore(repo.db_path, workdir)
+        ids = [f"{a.law_id}_{a.article_number}" for a in articles]
+        rng = random.Random(1)
+        batches = [rng.sample(ids, args.k) for _ in range(args.queries)]
+
+        def resolve() -> None:
+            for batch in batches:
+                store.get_documents(batch)
+
+        resolve()
+        before = _timed(resolve, 3) / len(batches)
+        store.repository.compress_articles(train_codec(texts, default_codec_name()))
+        resolve()
+        after = _timed(resolve, 3) / len(batches)
+        print(
+            f"top-{args.k} resolve ({default_codec_name()}): "
+            f"plain {before:.0f} us, compressed {after:.0f} us "
+            f"(+{(after - before) / args.k:.1f} us per result)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import re
+import unicodedata
+from collections import deque
+from typing import Dict, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from pydantic import BaseModel
+
+from src.core.legal_dates import kanji_to_int
+from src.core.references import article_title
+
+T = TypeVar("T")
+
+_KANJI_NUMBER = "[〇一二三四五六七八九十百千]+"
+_TITLE = re.compile(rf"第({_KANJI_NUMBER})条((?:の{_KANJI_NUMBER})*)")
+# 法令名と条名の間に挟まってよい文字数 (「生活保護法の第二十四条」)
+_ARTICLE_GAP = 2
+
+# パターン種別 (優先度の高い順)
+NAME = "name"
+ALIAS = "alias"
+KEYWORD = "keyword"
+ARTICLE = "article"
+
+
+def normalize_query(text: str) -> str:
+    """全角英数・全角スペースを揃える (パターンとクエリの両方に適用)"""
+    return unicodedata.normalize("NFKC", text)
+
+
+class AhoCorasick(Generic[T]):
+    """
+    複数パターンの同時照合オートマトン
+    build() 後は、テキスト長に比例する1回の走査で全パターンの出現を列挙できる。
+    """
+
+    def __init__(self) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 状態で終わるパターン (長さ, 値)
+        self._terminal: List[List[Tuple[int, T]]] = [[]]
+        # build() で作る出力 (_terminal に失敗リンク先の出力もまとめたもの)
+        self._out: List[List[Tuple[int, T]]] = [[]]
+        self._built = False
+
+    def add(self, pattern: str, value: T) -> None:
+        if not pattern:
+            return
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._terminal.append([])
+            state = nxt
+        self._terminal[state].append((len(pattern), value))
+        self._built = False
+
+    def build(self) -> "AhoCorasick[T]":
+        # 何度呼んでも同じ結果になるよう、出力は毎回 _terminal から作り直す
+        self._out = [list(outputs) for outputs in self._terminal]
+        queue = deque(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+        return self
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, T]]:
+        """(開始位置, 終了位置, 値) を終了位置の順に返す"""
+        if not self._built:
+            self.build()
+        state = 0
+        for end, ch in enumerate(text, start=1):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for length, value in self._out[state]:
+                yield end - length, end, value
+
+
+def leftmost_longest(
+    matches: Iterable[Tuple[int, int, T]],
+) -> List[Tuple[int, int, T]]:
+    """重なる一致から、左にあるもの・長いものを優先して重ならない組を選ぶ"""
+    chosen = []
+    last_end = 0
+    for start, end, value in sorted(matches, key=lambda m: (m[0], m[0] - m[1])):
+        if start >= last_end:
+            chosen.append((start, end, value))
+            last_end = end
+    return chosen
+
+
+def article_variants(title: str) -> List[str]:
+    """「第二十四条の三」-> [第二十四条の三, 第24条の3, 24条の3]"""
+    variants = [title]
+    match = _TITLE.fullmatch(title)
+    if match is None:
+        return variants
+    numbers = [match.group(1)] + [n for n in match.group(2).split("の") if n]
+    ints = [kanji_to_int(n) for n in numbers]
+    if any(n is None for n in ints):
+        return variants
+    arabic = f"{ints[0]}条" + "".join(f"の{n}" for n in ints[1:])
+    variants += [f"第{arabic}", arabic]
+    return variants
+
+
+class ArticleTarget(BaseModel):
+    """クエリ中の条名 (直前の法令名に結び付けられた場合は law_id を持つ)"""
+
+    law_id: Optional[str] = None
+    article: str
+
+
+class QueryTargets(BaseModel):
+    law_ids: List[str] = []
+    law_names: List[str] = []
+    articles: List[ArticleTarget] = []
+    # 一致した語とその種別 (name / alias / keyword / article)
+    matched: List[Tuple[str, str]] = []
+
+    @property
+    def source(self) -> str:
+        """絞り込みの根拠 (法令名・略称なら name、分野キーワードのみなら keyword)"""
+        kinds = {kind for _, kind in self.matched}
+        if kinds & {NAME, ALIAS}:
+            return NAME
+        return KEYWORD if KEYWORD in kinds else ""
+
+    @property
+    def is_ambiguous(self) -> bool:
+        """法令を特定できなかった (LLMによる意図推定が必要な) クエリ"""
+        return not self.law_ids
+
+
+class LawMatcher:
+    """
+    法令名・略称・分野キーワード・条名を1つのオートマトンにまとめた照合器
+    クエリを1回走査するだけで、対象法令と条名を決める。
+    法令名・略称の一致があればそれだけを、なければ最長の分野キーワードの
+    法令群を対象とする (Rust バックエンドの静的マッチと同じ規則)。
+    """
+
+    def __init__(
+        self,
+        law_names: Dict[str, str],
+        aliases: Optional[Dict[str, str]] = None,
+        keywords: Optional[Dict[str, List[str]]] = None,
+        article_titles: Iterable[str] = (),
+    ):
+        # law_id -> 正式名称
+        self.law_names = dict(law_names)
+        automaton: AhoCorasick[Tuple[str, Tuple[str, ...]]] = AhoCorasick()
+        for law_id, name in self.law_names.items():
+            automaton.add(normalize_query(name), (NAME, (law_id,)))
+        for alias, law_id in (aliases or {}).items():
+            if law_id in self.law_names:
+                automaton.add(normalize_query(alias), (ALIAS, (law_id,)))
+        for keyword, law_ids in (keywords or {}).items():
+            known = tuple(i for i in law_ids if i in self.law_names)
+            if known:
+                automaton.add(normalize_query(keyword), (KEYWORD, known))
+        for title in {article_title(t) for t in article_titles}:
+            for variant in article_variants(title):
+                automaton.add(normalize_query(variant), (ARTICLE, (title,)))
+        self._automaton = automaton.build()
+
+    def __len__(self) -> int:
+        return len(self._automaton)
+
+    def match(self, query: str) -> QueryTargets:
+        text = normalize_query(query)
+        matches = leftmost_longest(self._automaton.iter_matches(text))
+
+        specific: List[str] = []
+        keyword_hit: Optional[Tuple[int, Tuple[str, ...]]] = None
+        articles: List[ArticleTarget] = []
+        matched: List[Tuple[str, str]] = []
+        last_law: Optional[Tuple[int, str]] = None  # (終了位置, law_id)
+
+        for start, end, (kind, values) in matches:
+            if kind == ARTICLE and start and text[start - 1].isdigit():
+                # 「21条」の途中の「1条」
+                continue
+            matched.append((text[start:end], kind))
+            if kind in (NAME, ALIAS):
+                law_id = values[0]
+                if law_id not in specific:
+                    specific.append(law_id)
+                last_law = (end, law_id)
+            elif kind == KEYWORD:
+                if keyword_hit is None or end - start > keyword_hit[0]:
+                    keyword_hit = (end - start, values)
+            else:
+                bound = None
+                if last_law is not None and start - last_law[0] <= _ARTICLE_GAP:
+                    bound = last_law[1]
+                articles.append(ArticleTarget(law_id=bound, article=values[0]))
+
+        law_ids = specific or list(keyword_hit[1] if keyword_hit else ())
+        if len(law_ids) == 1:
+            for target in articles:
+                if target.law_id is None:
+                    target.law_id = law_ids[0]
+        return QueryTargets(
+            law_ids=law_ids,
+            law_names=[self.law_names[i] for i in law_ids],
+            articles=articles,
+            matched=matched,
+        )
@@ -0,0 +1,106 @@
+import re
+import unicodedata
+from datetime import date
+from typing import Optional
+
+# 元号 -> 元年の西暦
+ERA_BASE_YEARS = {
+    "Meiji": 1868,
+    "Taisho": 1912,
+    "Showa": 1926,
+    "Heisei": 1989,
+    "Reiwa": 2019,
+    "明治": 1868,
+    "大正": 1912,
+    "昭和": 1926,
+    "平成": 1989,
+    "令和": 2019,
+}
+
+_KANJI_DIGITS = {
+    "〇": 0,
+    "零": 0,
+    "一": 1,
+    "二": 2,
+    "三": 3,
+    "四": 4,
+    "五": 5,
+    "六": 6,
+    "七": 7,
+    "八": 8,
+    "九": 9,
+}
+_KANJI_UNITS = {"十": 10, "百": 100, "千": 1000}
+
+_NUMBER = r"[0-9〇零一二三四五六七八九十百千元]+"
+_JAPANESE_DATE = re.compile(
+    rf"(明治|大正|昭和|平成|令和)({_NUMBER})年({_NUMBER})月({_NUMBER})日"
+)
+
+
+def kanji_to_int(text: str) -> Optional[int]:
+    """
+    漢数字 (「百四十四」「一六〇」のどちらの書き方も可) とアラビア数字を整数に変換
+    「元」(元年) は 1 とする。
+    """
+    text = unicodedata.normalize("NFKC", text).strip()
+    if not text:
+        return None
+    if text == "元":
+        return 1
+    if text.isdigit():
+        return int(text)
+    if not any(ch in _KANJI_UNITS for ch in text):
+        # 位取り表記 (例: 一六〇)
+        digits = [_KANJI_DIGITS.get(ch) for ch in text]
+        if any(d is None for d in digits):
+            return None
+        return int("".join(str(d) for d in digits))
+
+    total, current = 0, 0
+    for ch in text:
+        if ch in _KANJI_DIGITS:
+            current = _KANJI_DIGITS[ch]
+        elif ch in _KANJI_UNITS:
+            total += (current or 1) * _KANJI_UNITS[ch]
+            current = 0
+        else:
+            return None
+    return total + current
+
+
+def int_to_kanji(value: int) -> str:
+    """1〜9999 を条名の漢数字 (「百四十四」「二千三」) にする (kanji_to_int の逆)"""
+    if not 0 < value < 10000:
+        raise ValueError(f"Out of range for kanji numbering: {value}")
+    digits = "〇一二三四五六七八九"
+    parts = []
+    for unit, name in ((1000, "千"), (100, "百"), (10, "十")):
+        count, value = divmod(value, unit)
+        if count:
+            parts.append(("" if count == 1 else digits[count]) + name)
+    if value:
+        parts.append(digits[value])
+    return "".join(parts)
+
+
+def era_to_date(era: str, year: int, month: int = 1, day: int = 1) -> Optional[date]:
+    base = ERA_BASE_YEARS.get(era)
+    if base is None:
+        return None
+    try:
+        return date(base + year - 1, month, day)
+    except ValueError:
+        return None
+
+
+def parse_japanese_date(text: str) -> Optional[date]:
+    """「平成一一年一二月二二日法律第一六〇号」などの先頭の和暦日付を読む"""
+    match = _JAPANESE_DATE.search(unicodedata.normalize("NFKC", text or ""))
+    if match is None:
+        return None
+    era, year, month, day = match.groups()
+    values = [kanji_to_int(v) for v in (year, month, day)]
+    if any(v is None for v in values):
+        return None
+    return era_to_date(era, *values)  # type: ignore[arg-type]
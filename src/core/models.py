@@ -1,7 +1,14 @@
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
-from datetime import datetime
+
+from src.core.references import ArticleReference
+
+
+def make_doc_id(law_id: str, article_number: str) -> str:
+    """条文の安定ID (ChromaのIDと同じ law_id + article_number 形式)"""
+    return f"{law_id}_{article_number}"
 
 
 class Law(BaseModel):
@@ -9,6 +16,21 @@ class Law(BaseModel):
     law_num: str
     law_full_name: str
     last_updated: datetime
+    promulgation_date: Optional[date] = None
+    # 最新の改正法令番号 (SupplProvision の AmendLawNum) と、その公布日
+    amendment_law_num: Optional[str] = None
+    amendment_date: Optional[date] = None
+
+    @property
+    def amendment_stamp(self) -> str:
+        """改正の有無を判定するためのスタンプ (変化したら再取り込みが必要)"""
+        if self.amendment_law_num:
+            return f"{self.amendment_date or ''}|{self.amendment_law_num}"
+        return f"{self.promulgation_date or ''}|{self.law_num}"
+
+    @property
+    def effective_from(self) -> Optional[date]:
+        return self.amendment_date or self.promulgation_date
 
 
 class Article(BaseModel):
@@ -17,3 +39,61 @@ class Article(BaseModel):
     hierarchy: str
     content: str
     raw_xml: Optional[str] = None
+    references: List[ArticleReference] = []
+
+
+class CorpusDocument(BaseModel):
+    """コーパスストア上の1条文 (本文とメタデータの唯一の実体)"""
+
+    doc_id: str
+    law_id: str
+    law_full_name: str
+    article_number: str
+    hierarchy: str
+    content: str
+
+    def embedding_text(self) -> str:
+        # 検索精度向上のため、法律名や階層情報もテキストに含める
+        return (
+            f"{self.law_full_name} {self.article_number}\n"
+            f"{self.hierarchy}\n{self.content}"
+        )
+
+    def metadata(self) -> Dict[str, str]:
+        return {
+            "law_id": self.law_id,
+            "law_full_name": self.law_full_name,
+            "article_number": self.article_number,
+            "hierarchy": self.hierarchy,
+        }
+
+
+class SearchHit(BaseModel):
+    doc_id: str
+    score: float
+    document: Optional[CorpusDocument] = None
+    # 参照関係で追加された結果の場合: 元の結果の doc_id と関係 (cites / cited_by)
+    expanded_from: Optional[str] = None
+    relation: Optional[str] = None
+    # 同じベクトルを共有する重複条文 (重複除去で代表に統合されたもの)
+    duplicates: List[str] = []
+
+    @property
+    def distance(self) -> float:
+        return 1.0 - self.score
+
+
+class LawSummary(BaseModel):
+    law_id: str
+    law_full_name: str
+    article_count: int
+
+
+class CatalogEntry(BaseModel):
+    """e-Gov 法令名一覧 (lawlists) の1件"""
+
+    law_id: str
+    law_name: str
+    law_no: str
+    promulgation_date: str = ""
+    category: str = ""
@@ -0,0 +1,87 @@
+import re
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+_KANJI_NUMBER = "[〇一二三四五六七八九十百千]+"
+# 「第二十四条」「第六条の三」「第二十四条第一項」
+_ARTICLE_REF = re.compile(
+    rf"第(?P<num>{_KANJI_NUMBER})条(?P<sub>(?:の{_KANJI_NUMBER})*)"
+    rf"(?:第(?P<para>{_KANJI_NUMBER})項)?"
+)
+# 名称が分からない他法令 (「地方自治法第…」など) を自法令と誤認しないための判定
+_OTHER_LAW_TAIL = re.compile(r"(?:法律|法|令|規則|附則)$")
+_MAX_LAW_NAME = 40
+
+
+class ArticleReference(BaseModel):
+    """条文から他の条文への参照 (参照先は条名「第六条の三」で持つ)"""
+
+    dst_law_id: str
+    dst_article: str
+    paragraph: Optional[str] = None
+
+
+def article_title(article_number: str) -> str:
+    """「第一条 （目的）」から見出しを除いた条名「第一条」を返す"""
+    return article_number.split(" ", 1)[0].strip()
+
+
+class ReferenceExtractor:
+    """
+    条文本文から「第X条(のY)(第Z項)」形式の参照を抽出する
+    直前に既知の法令名 (または「同法」) があれば他法令への参照、
+    何もなければ自法令内の参照とみなす。
+    """
+
+    def __init__(self, known_laws: Optional[Dict[str, str]] = None):
+        # 法令名・略称 -> law_id
+        self.known_laws = dict(known_laws or {})
+
+    def _law_before(self, text: str, end: int) -> Optional[str]:
+        """end 直前で終わる既知の法令名を最長一致で探す"""
+        for length in range(min(_MAX_LAW_NAME, end), 1, -1):
+            law_id = self.known_laws.get(text[end - length : end])
+            if law_id is not None:
+                return law_id
+        return None
+
+    def extract(
+        self, law_id: str, article_number: str, content: str
+    ) -> List[ArticleReference]:
+        own_title = article_title(article_number)
+        last_law: Optional[str] = None
+        seen = set()
+        references = []
+
+        for match in _ARTICLE_REF.finditer(content):
+            start = match.start()
+            if content[max(0, start - 2) : start] == "同法":
+                if last_law is None:
+                    continue
+                dst_law = last_law
+            else:
+                named = self._law_before(content, start)
+                if named is not None:
+                    dst_law = named
+                    last_law = named
+                elif _OTHER_LAW_TAIL.search(content[max(0, start - 2) : start]):
+                    continue
+                else:
+                    dst_law = law_id
+
+            dst_article = f"第{match.group('num')}条{match.group('sub') or ''}"
+            if dst_law == law_id and dst_article == own_title:
+                continue
+            key = (dst_law, dst_article, match.group("para"))
+            if key in seen:
+                continue
+            seen.add(key)
+            references.append(
+                ArticleReference(
+                    dst_law_id=dst_law,
+                    dst_article=dst_article,
+                    paragraph=match.group("para"),
+                )
+            )
+        return references
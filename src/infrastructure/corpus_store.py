@@ -0,0 +1,448 @@
+import hashlib
+import json
+import os
+import sqlite3
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.models import CorpusDocument, LawSummary
+from src.core.references import article_title
+from src.infrastructure.database import LawRepository
+
+VECTORS_FILE = "vectors.npy"
+VECTORS_META_FILE = "vectors.json"
+PROJECTION_FILE = "projection.npz"
+CENTROIDS_FILE = "centroids.npz"
+METADATA_INDEX_FILE = "metadata_index.npz"
+NEIGHBORS_FILE = "neighbors.npz"
+
+_DOCUMENT_SELECT = """
+    SELECT l.law_id, l.law_full_name, a.article_number, a.hierarchy_id,
+        a.content, a.codec_id, a.content_packed
+    FROM articles a
+    JOIN laws l ON a.law_key = l.law_key
+"""
+
+
+def text_hash(text: str) -> str:
+    """埋め込み対象テキストのハッシュ (再埋め込み要否の判定用)"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class Projection:
+    """埋め込みを低次元に写す線形射影 (PCA): (x - mean) @ components.T"""
+
+    mean: np.ndarray
+    components: np.ndarray
+
+    @property
+    def source_dim(self) -> int:
+        return int(self.components.shape[1])
+
+    @property
+    def dim(self) -> int:
+        return int(self.components.shape[0])
+
+    def apply(self, x: np.ndarray) -> np.ndarray:
+        """元の次元のベクトル (1行でも複数行でも) を射影する"""
+        x = np.asarray(x, dtype=np.float32)
+        return ((x - self.mean) @ self.components.T).astype(np.float32)
+
+
+@dataclass(frozen=True)
+class VectorSet:
+    """doc_id と行番号が対応するベクトル行列 (np.memmap の場合あり)"""
+
+    ids: List[str]
+    matrix: np.ndarray
+    model: str
+    text_hashes: List[str]
+    # 重複除去で代表の行に統合された条文 (重複の doc_id -> 代表の doc_id)
+    aliases: Dict[str, str] = field(default_factory=dict)
+    # 行列が射影済みの場合の射影 (クエリにも同じ射影をかける)
+    projection: Optional[Projection] = None
+
+    @property
+    def dim(self) -> int:
+        return int(self.matrix.shape[1]) if self.matrix.ndim == 2 else 0
+
+    def row_of(self) -> Dict[str, int]:
+        return {doc_id: i for i, doc_id in enumerate(self.ids)}
+
+    def fingerprint(self) -> str:
+        """行の並び・本文・次元が同じなら同じ値 (派生ファイルの鮮度確認用)"""
+        key = [self.model, self.dim, self.ids, self.text_hashes, self.aliases]
+        return hashlib.sha1(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CentroidSet:
+    """
+    法令・章ごとのセントロイド (検索の粗い絞り込み用)
+    グループ i の行は rows[offsets[i]:offsets[i + 1]]。
+    means は正規化した行の平均 (平均自体は正規化しない)。
+    法令単位のセントロイドは行数で重み付けして集約できる。
+    """
+
+    labels: List[str]
+    law_ids: List[str]
+    means: np.ndarray
+    offsets: np.ndarray
+    rows: np.ndarray
+    # 作成元の VectorSet.fingerprint() (ベクトルを保存し直すと一致しなくなる)
+    fingerprint: str
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def group_rows(self, group: int) -> np.ndarray:
+        return self.rows[self.offsets[group] : self.offsets[group + 1]]
+
+    @property
+    def sizes(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+
+@dataclass(frozen=True)
+class PostingLists:
+    """
+    メタデータ索引の保存形式
+    docs[i] (重複除去で統合された条文を含む) のベクトルは doc_rows[i] 行目。
+    keys[j] ("field\tvalue") に該当する条文は postings[offsets[j]:offsets[j + 1]]
+    (docs の添字の昇順)。
+    """
+
+    docs: List[str]
+    doc_rows: np.ndarray
+    keys: List[str]
+    offsets: np.ndarray
+    postings: np.ndarray
+    fingerprint: str
+
+
+@dataclass(frozen=True)
+class NeighborGraph:
+    """
+    行ごとの類似条文 (関連条文) の上位 k 件
+    rows[i] は行 i に近い行の番号 (類似度の降順、足りない分は -1)、
+    scores[i] はそのコサイン類似度。
+    """
+
+    rows: np.ndarray
+    scores: np.ndarray
+    fingerprint: str
+
+    @property
+    def k(self) -> int:
+        return int(self.rows.shape[1])
+
+
+def _write_npz(path: str, **arrays: np.ndarray) -> None:
+    """一時ファイル経由で .npz を書き出す"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+class CorpusStore:
+    """
+    条文コーパスの唯一の保存先
+    本文・メタデータは SQLite (laws / articles) に1回だけ持ち、
+    ベクトルは doc_id をキーにした memmap 可能な .npy に分離して保存する。
+    Chroma・export・検索エンジンはここから doc_id 参照で供給される。
+    """
+
+    def __init__(
+        self, db_path: str = "welfare_laws_v3.db", vector_dir: str = "corpus_vectors"
+    ):
+        self.db_path = db_path
+        self.vector_dir = vector_dir
+        # スキーマはリポジトリ側で管理する
+        self.repository = LawRepository(db_path)
+
+    # --- Documents ---
+
+    def _to_document(self, conn, row: tuple) -> CorpusDocument:
+        law_id, law_name, article_number, hierarchy_id, *content = row
+        return CorpusDocument(
+            doc_id=f"{law_id}_{article_number}",
+            law_id=law_id,
+            law_full_name=law_name or "",
+            article_number=article_number or "",
+            hierarchy=self.repository.hierarchy_path(conn, hierarchy_id),
+            content=self.repository.article_content(conn, *content),
+        )
+
+    def iter_documents(
+        self, law_full_name: Optional[str] = None, limit: Optional[int] = None
+    ) -> Iterator[CorpusDocument]:
+        """全条文 (または指定法令の条文) を挿入順に返す"""
+        sql = _DOCUMENT_SELECT
+        params: list = []
+        if law_full_name is not None:
+            sql += " WHERE l.law_full_name = ?"
+            params.append(law_full_name)
+        sql += " ORDER BY a.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with sqlite3.connect(self.db_path) as conn:
+            for row in conn.execute(sql, params):
+                yield self._to_document(conn, row)
+
+    def get_documents(self, doc_ids: List[str]) -> Dict[str, CorpusDocument]:
+        """doc_id から条文を引く (検索結果の top-k 解決用、同じ条文は1回だけ引く)"""
+        found: Dict[str, CorpusDocument] = {}
+        with sqlite3.connect(self.db_path) as conn:
+            for doc_id in dict.fromkeys(doc_ids):
+                law_id, _, article_number = doc_id.partition("_")
+                row = conn.execute(
+                    _DOCUMENT_SELECT + " WHERE l.law_id = ? AND a.article_number = ?",
+                    (law_id, article_number),
+                ).fetchone()
+                if row is not None:
+                    found[doc_id] = self._to_document(conn, row)
+        return found
+
+    def list_laws(self) -> List[LawSummary]:
+        """登録済み法令と条文数 (Chromaを開かずにメタデータを確認する用)"""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute("""
+                SELECT l.law_id, l.law_full_name, COUNT(a.id)
+                FROM laws l
+                LEFT JOIN articles a ON a.law_key = l.law_key
+                GROUP BY l.law_id, l.law_full_name
+                ORDER BY l.law_full_name
+            """).fetchall()
+        return [
+            LawSummary(law_id=r[0], law_full_name=r[1] or "", article_count=r[2])
+            for r in rows
+        ]
+
+    def article_titles(self) -> List[str]:
+        """コーパスに現れる条名 (見出しを除いた「第六条の三」など) の一覧"""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute("SELECT DISTINCT article_number FROM articles")
+            return sorted({article_title(r[0]) for r in rows if r[0]})
+
+    def iter_reference_edges(self) -> Iterator[Tuple[str, str]]:
+        """
+        参照関係を (参照元 doc_id, 参照先 doc_id) で返す
+        参照先の条名 (第六条の三) を、見出し付きの article_number に解決する。
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            titles: Dict[Tuple[str, str], str] = {}
+            for law_id, article_number in conn.execute(
+                "SELECT l.law_id, a.article_number FROM articles a "
+                "JOIN laws l ON a.law_key = l.law_key ORDER BY a.id"
+            ):
+                titles.setdefault(
+                    (law_id, article_title(article_number)),
+                    f"{law_id}_{article_number}",
+                )
+            for src_law, src_article, dst_law, dst_article in conn.execute(
+                "SELECT DISTINCT src_law_id, src_article_number, dst_law_id, "
+                "dst_article FROM article_references"
+            ):
+                dst_id = titles.get((dst_law, dst_article))
+                if dst_id is not None:
+                    yield f"{src_law}_{src_article}", dst_id
+
+    # --- Vectors ---
+
+    def _projection_path(self) -> str:
+        return os.path.join(self.vector_dir, PROJECTION_FILE)
+
+    def _centroids_path(self) -> str:
+        return os.path.join(self.vector_dir, CENTROIDS_FILE)
+
+    def _metadata_index_path(self) -> str:
+        return os.path.join(self.vector_dir, METADATA_INDEX_FILE)
+
+    def _neighbors_path(self) -> str:
+        return os.path.join(self.vector_dir, NEIGHBORS_FILE)
+
+    def _vector_paths(self) -> tuple[str, str]:
+        return (
+            os.path.join(self.vector_dir, VECTORS_FILE),
+            os.path.join(self.vector_dir, VECTORS_META_FILE),
+        )
+
+    def has_vectors(self) -> bool:
+        return all(os.path.exists(p) for p in self._vector_paths())
+
+    def save_vectors(
+        self,
+        ids: List[str],
+        embeddings: np.ndarray,
+        model: str,
+        text_hashes: Optional[List[str]] = None,
+        aliases: Optional[Dict[str, str]] = None,
+        projection: Optional[Projection] = None,
+    ) -> None:
+        """
+        ベクトルを float32 の .npy として書き出す (一時ファイル経由で置換)
+        aliases: 自身のベクトルを持たず代表の行を共有する条文 (doc_id -> 代表 doc_id)
+        projection: embeddings が射影済みの場合の射影 (projection.npz に保存)
+        """
+        matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(ids):
+            raise ValueError(
+                f"Embedding shape {matrix.shape} does not match {len(ids)} ids."
+            )
+        hashes = text_hashes if text_hashes is not None else [""] * len(ids)
+        if projection is not None and projection.dim != matrix.shape[1]:
+            raise ValueError(
+                f"Projection outputs {projection.dim} dims but vectors have "
+                f"{matrix.shape[1]}."
+            )
+
+        os.makedirs(self.vector_dir, exist_ok=True)
+        npy_path, meta_path = self._vector_paths()
+
+        tmp_npy = npy_path + ".tmp"
+        with open(tmp_npy, "wb") as f:
+            np.save(f, matrix)
+        tmp_meta = meta_path + ".tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "model": model,
+                    "dim": int(matrix.shape[1]),
+                    "ids": ids,
+                    "text_hashes": hashes,
+                    "aliases": aliases or {},
+                    "projection": PROJECTION_FILE if projection is not None else None,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_npy, npy_path)
+        os.replace(tmp_meta, meta_path)
+        # 射影は最後に書き、ベクトルの fingerprint を添える
+        # (途中で中断して古い射影が残っても load_vectors で検出できる)
+        if projection is not None:
+            vectors = VectorSet(ids, matrix, model, hashes, aliases or {})
+            _write_npz(
+                self._projection_path(),
+                mean=projection.mean,
+                components=projection.components,
+                fingerprint=np.array(vectors.fingerprint()),
+            )
+        elif os.path.exists(self._projection_path()):
+            os.remove(self._projection_path())
+
+    def load_vectors(self, mmap: bool = True) -> VectorSet:
+        npy_path, meta_path = self._vector_paths()
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        matrix = np.load(npy_path, mmap_mode="r" if mmap else None)
+        ids = meta["ids"]
+        if matrix.shape[0] != len(ids):
+            raise ValueError(
+                f"Vector file has {matrix.shape[0]} rows but {len(ids)} ids."
+            )
+        vectors = VectorSet(
+            ids=ids,
+            matrix=matrix,
+            model=meta.get("model", ""),
+            text_hashes=meta.get("text_hashes") or [""] * len(ids),
+            aliases=meta.get("aliases") or {},
+        )
+        if not meta.get("projection"):
+            return vectors
+        path = os.path.join(self.vector_dir, meta["projection"])
+        if not os.path.exists(path):
+            raise ValueError(f"{path} is missing. Re-run lawctl project.")
+        with np.load(path) as data:
+            # fingerprint の無い射影は fingerprint 導入前に保存されたもの
+            stamp = str(data["fingerprint"]) if "fingerprint" in data else None
+            if stamp not in (None, vectors.fingerprint()):
+                raise ValueError(
+                    f"{path} was written for other vectors. Re-run lawctl project."
+                )
+            projection = Projection(data["mean"], data["components"])
+        return replace(vectors, projection=projection)
+
+    def save_centroids(self, centroids: CentroidSet) -> None:
+        os.makedirs(self.vector_dir, exist_ok=True)
+        _write_npz(
+            self._centroids_path(),
+            labels=np.array(centroids.labels, dtype=str),
+            law_ids=np.array(centroids.law_ids, dtype=str),
+            means=np.asarray(centroids.means, dtype=np.float32),
+            offsets=np.asarray(centroids.offsets, dtype=np.int64),
+            rows=np.asarray(centroids.rows, dtype=np.int64),
+            fingerprint=np.array(centroids.fingerprint),
+        )
+
+    def load_centroids(self, vectors: VectorSet) -> Optional[CentroidSet]:
+        """保存済みのセントロイド (無い場合・vectors と対応しない場合は None)"""
+        if not os.path.exists(self._centroids_path()):
+            return None
+        with np.load(self._centroids_path()) as data:
+            if str(data["fingerprint"]) != vectors.fingerprint():
+                return None
+            return CentroidSet(
+                labels=data["labels"].tolist(),
+                law_ids=data["law_ids"].tolist(),
+                means=data["means"],
+                offsets=data["offsets"],
+                rows=data["rows"],
+                fingerprint=str(data["fingerprint"]),
+            )
+
+    def save_metadata_index(self, index: PostingLists) -> None:
+        os.makedirs(self.vector_dir, exist_ok=True)
+        _write_npz(
+            self._metadata_index_path(),
+            docs=np.array(index.docs, dtype=str),
+            doc_rows=np.asarray(index.doc_rows, dtype=np.int32),
+            keys=np.array(index.keys, dtype=str),
+            offsets=np.asarray(index.offsets, dtype=np.int64),
+            postings=np.asarray(index.postings, dtype=np.int32),
+            fingerprint=np.array(index.fingerprint),
+        )
+
+    def load_metadata_index(self, vectors: VectorSet) -> Optional[PostingLists]:
+        """保存済みのメタデータ索引 (無い場合・vectors と対応しない場合は None)"""
+        if not os.path.exists(self._metadata_index_path()):
+            return None
+        with np.load(self._metadata_index_path()) as data:
+            if str(data["fingerprint"]) != vectors.fingerprint():
+                return None
+            return PostingLists(
+                docs=data["docs"].tolist(),
+                doc_rows=data["doc_rows"],
+                keys=data["keys"].tolist(),
+                offsets=data["offsets"],
+                postings=data["postings"],
+                fingerprint=str(data["fingerprint"]),
+            )
+
+    def save_neighbors(self, graph: NeighborGraph) -> None:
+        os.makedirs(self.vector_dir, exist_ok=True)
+        _write_npz(
+            self._neighbors_path(),
+            rows=np.asarray(graph.rows, dtype=np.int32),
+            scores=np.asarray(graph.scores, dtype=np.float32),
+            fingerprint=np.array(graph.fingerprint),
+        )
+
+    def load_neighbors(self, vectors: VectorSet) -> Optional[NeighborGraph]:
+        """保存済みの関連条文 (無い場合・vectors と対応しない場合は None)"""
+        if not os.path.exists(self._neighbors_path()):
+            return None
+        with np.load(self._neighbors_path()) as data:
+            if str(data["fingerprint"]) != vectors.fingerprint():
+                return None
+            return NeighborGraph(
+                rows=data["rows"],
+                scores=data["scores"],
+                fingerprint=str(data["fingerprint"]),
+            )
@@ -1,80 +1,604 @@
 import logging
 import sqlite3
-from typing import List, Optional, Tuple
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
 
 from src.core.models import Article, Law
+from src.infrastructure.text_codec import TextCodec, load_codec
+
+# hierarchy は見出しをこの区切りで連結した文字列 ("第一編 総則 > 第二章 通則")
+HIERARCHY_SEP = " > "
+
+_LAW_COLUMNS = (
+    "law_id",
+    "law_num",
+    "law_full_name",
+    "last_updated",
+    "promulgation_date",
+    "amendment_law_num",
+    "amendment_date",
+    "amendment_stamp",
+)
 
 
 class LawRepository:
+    """
+    法令・条文の SQLite リポジトリ
+    法令は整数キー (law_key) で参照し、hierarchy は見出しを1回だけ持つ
+    階層ノード (親ノードへの参照) の ID として条文に持たせる。
+    """
+
     def __init__(self, db_path: str = "welfare_laws_v3.db"):
         self.db_path = db_path
+        # 階層ノードID -> hierarchy 文字列 (ノードは追加のみなので使い回せる)
+        self._hierarchy_paths: Dict[int, str] = {}
+        # text_codecs の ID -> 本文の圧縮辞書
+        self._codecs: Dict[int, TextCodec] = {}
         self._init_db()
 
     def _init_db(self):
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
-            # Laws table
+            # 条文ごとに law_id・hierarchy の文字列を持つ旧スキーマは退避して移行する
+            legacy = self._legacy_tables(cursor)
+            for table in legacy:
+                cursor.execute(f"ALTER TABLE {table} RENAME TO _legacy_{table}")
+            self._upgrade_text_codecs(cursor)
+            self._create_tables(cursor)
+            if legacy:
+                self._migrate_legacy(cursor, legacy)
+            # 辞書圧縮した本文 (codec_id が NULL なら content に平文で持つ)
+            self._ensure_columns(
+                cursor, "articles", {"codec_id": "INTEGER", "content_packed": "BLOB"}
+            )
+            # 安定ID (law_id + article_number) での参照用
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS laws (
-                    law_id TEXT PRIMARY KEY,
-                    law_num TEXT,
-                    law_full_name TEXT,
-                    last_updated TIMESTAMP
-                )
+                CREATE INDEX IF NOT EXISTS idx_articles_law_article
+                ON articles (law_key, article_number)
             """)
-            # Articles table
+            # 時点指定 (as-of) 検索用
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS articles (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    law_id TEXT,
-                    article_number TEXT,
-                    hierarchy TEXT,
-                    content TEXT,
-                    FOREIGN KEY (law_id) REFERENCES laws (law_id)
-                )
+                CREATE INDEX IF NOT EXISTS idx_articles_law_valid
+                ON articles (law_key, valid_from)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_versions_law_valid
+                ON article_versions (law_key, valid_to, valid_from)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_versions_law_article
+                ON article_versions (law_key, article_number)
             """)
             conn.commit()
+        if legacy:
+            # 移行で空いた領域を返す (トランザクションの外で実行する)
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("VACUUM")
 
-    def save_law(self, law: Law):
+    @staticmethod
+    def _create_tables(cursor):
+        # Laws table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS laws (
+                law_key INTEGER PRIMARY KEY,
+                law_id TEXT NOT NULL UNIQUE,
+                law_num TEXT,
+                law_full_name TEXT,
+                last_updated TIMESTAMP,
+                promulgation_date TEXT,
+                amendment_law_num TEXT,
+                amendment_date TEXT,
+                amendment_stamp TEXT
+            )
+        """)
+        # 階層の見出し ("第一章 総則" など)。同じ見出しは1行だけ
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS hierarchy_titles (
+                id INTEGER PRIMARY KEY,
+                title TEXT NOT NULL UNIQUE
+            )
+        """)
+        # 階層ノード (parent_id = 0 は最上位)。条文は末端のノードを参照する
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS hierarchy_nodes (
+                id INTEGER PRIMARY KEY,
+                parent_id INTEGER NOT NULL,
+                title_id INTEGER NOT NULL,
+                UNIQUE (parent_id, title_id),
+                FOREIGN KEY (title_id) REFERENCES hierarchy_titles (id)
+            )
+        """)
+        # Articles table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                law_key INTEGER NOT NULL,
+                article_number TEXT,
+                hierarchy_id INTEGER,
+                content TEXT,
+                valid_from TEXT,
+                FOREIGN KEY (law_key) REFERENCES laws (law_key),
+                FOREIGN KEY (hierarchy_id) REFERENCES hierarchy_nodes (id)
+            )
+        """)
+        # 改正で置き換えられた過去の版 (現行版は articles にのみ持つ)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS article_versions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                law_key INTEGER NOT NULL,
+                article_number TEXT NOT NULL,
+                hierarchy_id INTEGER,
+                content TEXT,
+                valid_from TEXT,
+                valid_to TEXT NOT NULL
+            )
+        """)
+        # 本文の圧縮辞書 (最新のものを新しく保存する本文に使う)
+        # 削除後も ID を使い回さない (他の接続が古い辞書を ID でキャッシュしている)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS text_codecs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                dictionary BLOB NOT NULL
+            )
+        """)
+        # 条文間の参照関係 (参照元 -> 参照先の条名)
+        # 参照先は未登録の法令のこともあるため law_id のまま持つ
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS article_references (
+                src_law_id TEXT NOT NULL,
+                src_article_number TEXT NOT NULL,
+                dst_law_id TEXT NOT NULL,
+                dst_article TEXT NOT NULL,
+                paragraph TEXT
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_references_src
+            ON article_references (src_law_id, src_article_number)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_references_dst
+            ON article_references (dst_law_id, dst_article)
+        """)
+
+    @staticmethod
+    def _legacy_tables(cursor) -> List[str]:
+        """旧スキーマ (articles に hierarchy 列がある) なら移行対象のテーブル"""
+        articles = {row[1] for row in cursor.execute("PRAGMA table_info(articles)")}
+        if "hierarchy" not in articles:
+            return []
+        existing = {
+            row[0]
+            for row in cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type='table'"
+            )
+        }
+        return [t for t in ("laws", "articles", "article_versions") if t in existing]
+
+    def _migrate_legacy(self, cursor, legacy: List[str]):
+        """
+        退避した旧テーブルの内容を新しいテーブルへ移す
+        条文の id (挿入順) はそのまま引き継ぐ。法令情報のない条文
+        (旧スキーマでもコーパスには現れなかったもの) は移さない。
+        """
+        # 旧スキーマのDBに公布・改正情報と版の有効開始日を追加してから写す
+        self._ensure_columns(
+            cursor,
+            "_legacy_laws",
+            {
+                "promulgation_date": "TEXT",
+                "amendment_law_num": "TEXT",
+                "amendment_date": "TEXT",
+                "amendment_stamp": "TEXT",
+            },
+        )
+        self._ensure_columns(cursor, "_legacy_articles", {"valid_from": "TEXT"})
+        columns = ", ".join(_LAW_COLUMNS)
+        cursor.execute(
+            f"INSERT INTO laws ({columns}) "
+            f"SELECT {columns} FROM _legacy_laws WHERE law_id IS NOT NULL"
+        )
+
+        nodes: Dict[str, Optional[int]] = {}
+        for table in ("articles", "article_versions"):
+            if table not in legacy:
+                continue
+            extra = ", valid_to" if table == "article_versions" else ""
+            rows = cursor.execute(
+                "SELECT id, law_id, article_number, hierarchy, content, "
+                f"valid_from{extra} FROM _legacy_{table} "
+                "WHERE law_id IN (SELECT law_id FROM laws) ORDER BY id"
+            ).fetchall()
+            data = [
+                (
+                    r[0],
+                    self._law_key(cursor, r[1]),
+                    r[2],
+                    self._hierarchy_id(cursor, r[3] or "", nodes),
+                    *r[4:],
+                )
+                for r in rows
+            ]
+            placeholders = ", ".join("?" * (7 if extra else 6))
+            cursor.executemany(
+                f"INSERT INTO {table} (id, law_key, article_number, "
+                f"hierarchy_id, content, valid_from{extra}) VALUES ({placeholders})",
+                data,
+            )
+        for table in legacy:
+            cursor.execute(f"DROP TABLE _legacy_{table}")
+
+    @staticmethod
+    def _upgrade_text_codecs(cursor):
+        """AUTOINCREMENT のない text_codecs は作り直す (辞書と ID はそのまま)"""
+        row = cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name='text_codecs'"
+        ).fetchone()
+        if row is None or "AUTOINCREMENT" in row[0].upper():
+            return
+        cursor.execute("ALTER TABLE text_codecs RENAME TO _legacy_text_codecs")
+        cursor.execute("""
+            CREATE TABLE text_codecs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                dictionary BLOB NOT NULL
+            )
+        """)
+        cursor.execute("INSERT INTO text_codecs SELECT * FROM _legacy_text_codecs")
+        cursor.execute("DROP TABLE _legacy_text_codecs")
+
+    @staticmethod
+    def _ensure_columns(cursor, table: str, columns: Dict[str, str]):
+        existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+        for name, decl in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
+    @staticmethod
+    def _write_law(cursor, law: Law):
+        # 置き換え (REPLACE) だと law_key が変わるため、既存の行は更新する
+        columns = ", ".join(_LAW_COLUMNS)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in _LAW_COLUMNS[1:])
+        cursor.execute(
+            f"""
+            INSERT INTO laws ({columns}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (law_id) DO UPDATE SET {updates}
+        """,
+            (
+                law.law_id,
+                law.law_num,
+                law.law_full_name,
+                law.last_updated,
+                law.promulgation_date.isoformat() if law.promulgation_date else None,
+                law.amendment_law_num,
+                law.amendment_date.isoformat() if law.amendment_date else None,
+                law.amendment_stamp,
+            ),
+        )
+
+    @staticmethod
+    def _law_key(cursor, law_id: str) -> int:
+        """法令の整数キー (法令名のない行は作らないので、法令情報を先に保存する)"""
+        row = cursor.execute(
+            "SELECT law_key FROM laws WHERE law_id = ?", (law_id,)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"Save law {law_id} (save_law) before its articles.")
+        return row[0]
+
+    @staticmethod
+    def _hierarchy_id(
+        cursor, hierarchy: str, cache: Dict[str, Optional[int]]
+    ) -> Optional[int]:
+        """hierarchy の末端ノードのID (なければ見出し・ノードを登録する。空なら None)"""
+        if hierarchy in cache:
+            return cache[hierarchy]
+        node = 0
+        for title in hierarchy.split(HIERARCHY_SEP) if hierarchy else []:
+            cursor.execute(
+                "INSERT OR IGNORE INTO hierarchy_titles (title) VALUES (?)", (title,)
+            )
+            (title_id,) = cursor.execute(
+                "SELECT id FROM hierarchy_titles WHERE title = ?", (title,)
+            ).fetchone()
+            cursor.execute(
+                "INSERT OR IGNORE INTO hierarchy_nodes (parent_id, title_id) "
+                "VALUES (?, ?)",
+                (node, title_id),
+            )
+            (node,) = cursor.execute(
+                "SELECT id FROM hierarchy_nodes WHERE parent_id = ? AND title_id = ?",
+                (node, title_id),
+            ).fetchone()
+        cache[hierarchy] = node or None
+        return cache[hierarchy]
+
+    @staticmethod
+    def _load_hierarchy_paths(conn) -> Dict[int, str]:
+        paths: Dict[int, str] = {}
+        # 親ノードは子より先に登録されるので ID 順に連結できる
+        for node, parent, title in conn.execute("""
+            SELECT n.id, n.parent_id, t.title
+            FROM hierarchy_nodes n
+            JOIN hierarchy_titles t ON t.id = n.title_id
+            ORDER BY n.id
+        """):
+            paths[node] = f"{paths[parent]}{HIERARCHY_SEP}{title}" if parent else title
+        return paths
+
+    def hierarchy_path(self, conn, node_id: Optional[int]) -> str:
+        """
+        階層ノードIDから hierarchy 文字列を引く
+        同じ階層の条文は同じ文字列オブジェクトを共有する。
+        """
+        if node_id is None:
+            return ""
+        path = self._hierarchy_paths.get(node_id)
+        if path is None:
+            # 知らないノードがあれば (他の接続で追加された) 読み直す
+            self._hierarchy_paths = self._load_hierarchy_paths(conn)
+            path = self._hierarchy_paths.get(node_id, "")
+        return path
+
+    # --- 本文の辞書圧縮 ---
+
+    def _codec(self, conn, codec_id: int) -> TextCodec:
+        codec = self._codecs.get(codec_id)
+        if codec is None:
+            name, dictionary = conn.execute(
+                "SELECT name, dictionary FROM text_codecs WHERE id = ?", (codec_id,)
+            ).fetchone()
+            codec = self._codecs[codec_id] = load_codec(name, dictionary)
+        return codec
+
+    def article_content(
+        self,
+        conn,
+        content: Optional[str],
+        codec_id: Optional[int],
+        packed: Optional[bytes],
+    ) -> str:
+        """articles の本文 (圧縮されていればこの条文だけ復元する)"""
+        if codec_id is None:
+            return content or ""
+        return self._codec(conn, codec_id).decode(packed)
+
+    def _packer(self, conn) -> Callable[[str], tuple]:
+        """新しく保存する本文を (content, codec_id, content_packed) にする"""
+        (codec_id,) = conn.execute("SELECT MAX(id) FROM text_codecs").fetchone()
+        if codec_id is None:
+            return lambda text: (text, None, None)
+        codec = self._codec(conn, codec_id)
+        return lambda text: (None, codec_id, codec.encode(text))
+
+    def compress_articles(self, codec: TextCodec) -> Tuple[int, int]:
+        """
+        現行の条文の本文を辞書で圧縮し直す (以後に保存する本文にも使う)
+        圧縮前・圧縮後 (辞書を含む) のバイト数を返す。
+        """
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """
-                INSERT OR REPLACE INTO laws (law_id, law_num, law_full_name, last_updated)
-                VALUES (?, ?, ?, ?)
-            """,
-                (law.law_id, law.law_num, law.law_full_name, law.last_updated),
+                "INSERT INTO text_codecs (name, dictionary) VALUES (?, ?)",
+                (codec.name, codec.dictionary),
+            )
+            codec_id = cursor.lastrowid
+            self._codecs[codec_id] = codec
+            plain = packed = 0
+            updates = []
+            for row in cursor.execute(
+                "SELECT id, content, codec_id, content_packed FROM articles"
+            ).fetchall():
+                text = self.article_content(conn, *row[1:])
+                data = codec.encode(text)
+                plain += len(text.encode("utf-8"))
+                packed += len(data)
+                updates.append((codec_id, data, row[0]))
+            cursor.executemany(
+                "UPDATE articles SET content = NULL, codec_id = ?, "
+                "content_packed = ? WHERE id = ?",
+                updates,
             )
+            cursor.execute("DELETE FROM text_codecs WHERE id != ?", (codec_id,))
             conn.commit()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("VACUUM")
+        return plain, packed + len(codec.dictionary)
 
-    def save_articles(self, articles: List[Article]):
+    def decompress_articles(self) -> int:
+        """圧縮した本文を平文に戻し、辞書を削除する (戻した条文数を返す)"""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
-            # まずその法律の条文をクリアするかどうかは更新戦略によるが、
-            # 今回はシンプルに追加（実際はDELETE -> INSERTが良い）
+            updates = [
+                (self.article_content(conn, *row[1:]), row[0])
+                for row in cursor.execute(
+                    "SELECT id, content, codec_id, content_packed FROM articles "
+                    "WHERE codec_id IS NOT NULL"
+                ).fetchall()
+            ]
+            cursor.executemany(
+                "UPDATE articles SET content = ?, codec_id = NULL, "
+                "content_packed = NULL WHERE id = ?",
+                updates,
+            )
+            cursor.execute("DELETE FROM text_codecs")
+            conn.commit()
+        self._codecs.clear()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("VACUUM")
+        return len(updates)
+
+    def _write_articles(self, cursor, articles: List[Article]):
+        """
+        現行版を置き換え、内容が変わった条文・削除された条文の旧版を
+        article_versions に退避する (valid_to = 新しい版の valid_from)
+        """
+        law_id = articles[0].law_id
+        law_key = LawRepository._law_key(cursor, law_id)
+        today = date.today().isoformat()
+        row = cursor.execute(
+            "SELECT amendment_date, promulgation_date FROM laws WHERE law_key = ?",
+            (law_key,),
+        ).fetchone()
+        law_valid_from = row[0] or row[1]
+
+        previous = {
+            number: (
+                hierarchy_id,
+                self.article_content(cursor, content, codec_id, packed),
+                valid_from,
+            )
+            for number, hierarchy_id, content, codec_id, packed, valid_from in (
+                cursor.execute(
+                    "SELECT article_number, hierarchy_id, content, codec_id, "
+                    "content_packed, valid_from FROM articles WHERE law_key = ?",
+                    (law_key,),
+                ).fetchall()
+            )
+        }
+        first_load = not previous
+        pack = self._packer(cursor)
+
+        nodes: Dict[str, Optional[int]] = {}
+        data = []
+        archived = []
+        for a in articles:
+            hierarchy_id = LawRepository._hierarchy_id(cursor, a.hierarchy, nodes)
+            old = previous.pop(a.article_number, None)
+            if old is not None and old[:2] == (hierarchy_id, a.content):
+                valid_from = old[2]
+            elif first_load:
+                valid_from = law_valid_from or today
+            else:
+                # 改正日が旧版より新しければ改正日、分からなければ取り込み日
+                old_from = (old[2] if old else None) or ""
+                valid_from = (
+                    law_valid_from
+                    if law_valid_from and law_valid_from > old_from
+                    else today
+                )
+                if old is not None:
+                    archived.append((law_key, a.article_number, *old, valid_from))
+            data.append(
+                (law_key, a.article_number, hierarchy_id, *pack(a.content), valid_from)
+            )
+
+        # 新しい版に存在しない条文は廃止として退避
+        removed_on = law_valid_from or today
+        for number, old in previous.items():
+            archived.append((law_key, number, *old, max(removed_on, old[2] or "")))
+
+        cursor.executemany(
+            """
+            INSERT INTO article_versions
+                (law_key, article_number, hierarchy_id, content, valid_from, valid_to)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            archived,
+        )
+        cursor.execute("DELETE FROM articles WHERE law_key = ?", (law_key,))
+        cursor.executemany(
+            """
+            INSERT INTO articles (
+                law_key, article_number, hierarchy_id,
+                content, codec_id, content_packed, valid_from
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+            data,
+        )
+
+        cursor.execute("DELETE FROM article_references WHERE src_law_id = ?", (law_id,))
+        cursor.executemany(
+            """
+            INSERT INTO article_references
+                (src_law_id, src_article_number, dst_law_id, dst_article, paragraph)
+            VALUES (?, ?, ?, ?, ?)
+        """,
+            [
+                (a.law_id, a.article_number, r.dst_law_id, r.dst_article, r.paragraph)
+                for a in articles
+                for r in a.references
+            ],
+        )
+
+    def save_law(self, law: Law):
+        with sqlite3.connect(self.db_path) as conn:
+            self._write_law(conn.cursor(), law)
+            conn.commit()
+
+    def save_articles(self, articles: List[Article]):
+        with sqlite3.connect(self.db_path) as conn:
             if not articles:
                 return
+            self._write_articles(conn.cursor(), articles)
+            conn.commit()
 
-            law_id = articles[0].law_id
-            cursor.execute("DELETE FROM articles WHERE law_id = ?", (law_id,))
+    def save_laws_batch(self, items: List[Tuple[Law, List[Article]]]):
+        """複数法令の法令情報と条文を1トランザクションでまとめて保存"""
+        if not items:
+            return
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            for law, articles in items:
+                self._write_law(cursor, law)
+                if articles:
+                    self._write_articles(cursor, articles)
+            conn.commit()
 
-            data = [
-                (a.law_id, a.article_number, a.hierarchy, a.content) for a in articles
-            ]
-            cursor.executemany(
+    def get_amendment_stamps(self) -> Dict[str, str]:
+        """保存済み法令の改正スタンプ (更新ジョブで未改正の法令を飛ばす用)"""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT law_id, amendment_stamp FROM laws "
+                "WHERE amendment_stamp IS NOT NULL"
+            ).fetchall()
+        return dict(rows)
+
+    def get_articles_as_of(self, law_id: str, as_of: date) -> List[Article]:
+        """指定日 (例: 試験日) 時点で有効だった条文を返す"""
+        day = as_of.isoformat()
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
                 """
-                INSERT INTO articles (law_id, article_number, hierarchy, content)
-                VALUES (?, ?, ?, ?)
+                SELECT article_number, hierarchy_id, content, codec_id, content_packed
+                FROM (
+                    SELECT 0 AS src, a.id, a.article_number, a.hierarchy_id,
+                        a.content, a.codec_id, a.content_packed
+                    FROM articles a JOIN laws l ON a.law_key = l.law_key
+                    WHERE l.law_id = ? AND (a.valid_from IS NULL OR a.valid_from <= ?)
+                    UNION ALL
+                    SELECT 1 AS src, v.id, v.article_number, v.hierarchy_id,
+                        v.content, NULL, NULL
+                    FROM article_versions v JOIN laws l ON v.law_key = l.law_key
+                    WHERE l.law_id = ? AND v.valid_to > ?
+                      AND (v.valid_from IS NULL OR v.valid_from <= ?)
+                )
+                ORDER BY src, id
             """,
-                data,
-            )
-            conn.commit()
+                (law_id, day, law_id, day, day),
+            ).fetchall()
+            return [
+                Article(
+                    law_id=law_id,
+                    article_number=r[0],
+                    hierarchy=self.hierarchy_path(conn, r[1]),
+                    content=self.article_content(conn, *r[2:]),
+                )
+                for r in rows
+            ]
 
     def get_all_articles(self) -> List[tuple]:
         """テスト用: 全条文取得"""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT law_id, article_number, content FROM articles LIMIT 5"
+                "SELECT l.law_id, a.article_number, a.content, a.codec_id, "
+                "a.content_packed "
+                "FROM articles a JOIN laws l ON a.law_key = l.law_key LIMIT 5"
             )
-            return cursor.fetchall()
+            return [
+                (r[0], r[1], self.article_content(conn, *r[2:]))
+                for r in cursor.fetchall()
+            ]
@@ -1,12 +1,30 @@
 import requests
 import xml.etree.ElementTree as ET
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, List, Optional
+from datetime import date, datetime
+from src.core.legal_dates import era_to_date, kanji_to_int, parse_japanese_date
 from src.core.models import Law, Article
+from src.core.references import ReferenceExtractor
 
 
 class EGovAPIClient:
     BASE_URL = "https://elaws.e-gov.go.jp/api/1/lawdata"
+    LAW_LIST_URL = "https://elaws.e-gov.go.jp/api/1/lawlists"
+
+    def __init__(self, known_laws: Optional[Dict[str, str]] = None):
+        # 他法令への参照を解決するための 法令名・略称 -> law_id
+        self.known_laws = known_laws or {}
+
+    def fetch_law_list_xml(self, category: int = 1) -> Optional[bytes]:
+        """e-Gov APIから法令名一覧XMLを取得 (1: 全法令)"""
+        try:
+            url = f"{self.LAW_LIST_URL}/{category}"
+            response = requests.get(url, timeout=60)
+            response.raise_for_status()
+            return response.content
+        except requests.RequestException as e:
+            print(f"Error fetching law list {category}: {e}")
+            return None
 
     def fetch_law_xml(self, law_id: str) -> Optional[bytes]:
         """e-Gov APIからXMLデータを取得"""
@@ -19,13 +37,35 @@ class EGovAPIClient:
             print(f"Error fetching law {law_id}: {e}")
             return None
 
-    def parse_law_xml(
-        self, xml_content: bytes, law_id: str
-    ) -> tuple[Law, List[Article]]:
-        """XMLをパースしてLawとArticleのリストを返す"""
-        root = ET.fromstring(xml_content)
-
-        # Law Info
+    @staticmethod
+    def _promulgation_date(law_node: Optional[ET.Element]) -> Optional[date]:
+        """Law要素の Era/Year/PromulgateMonth/PromulgateDay から公布日を得る"""
+        if law_node is None:
+            return None
+        values = [
+            kanji_to_int(law_node.get(key, ""))
+            for key in ("Year", "PromulgateMonth", "PromulgateDay")
+        ]
+        if any(v is None for v in values):
+            return None
+        return era_to_date(law_node.get("Era", ""), *values)
+
+    @staticmethod
+    def _latest_amendment(root: ET.Element) -> tuple[Optional[str], Optional[date]]:
+        """附則 (SupplProvision) の AmendLawNum のうち最も新しい改正を返す"""
+        latest_num: Optional[str] = None
+        latest_date: Optional[date] = None
+        for suppl in root.iter("SupplProvision"):
+            amend_num = suppl.get("AmendLawNum")
+            if not amend_num:
+                continue
+            amend_date = parse_japanese_date(amend_num)
+            # 日付の読めない改正しかない場合は、文書順で後のものを新しいとみなす
+            if latest_date is None or (amend_date and amend_date >= latest_date):
+                latest_num, latest_date = amend_num, amend_date or latest_date
+        return latest_num, latest_date
+
+    def _law_from_root(self, root: ET.Element, law_id: str) -> Law:
         law_num_node = root.find(".//LawNum")
         law_num = (law_num_node.text or "") if law_num_node is not None else ""
 
@@ -36,11 +76,40 @@ class EGovAPIClient:
             else "Unknown"
         )
 
-        law = Law(
+        law_node = root if root.tag == "Law" else root.find(".//Law")
+        promulgation_date = self._promulgation_date(law_node)
+        amendment_law_num, amendment_date = self._latest_amendment(root)
+        changed_on = amendment_date or promulgation_date
+
+        return Law(
             law_id=law_id,
             law_num=law_num,
             law_full_name=law_name,
-            last_updated=datetime.now(),
+            # 取得時刻ではなく、実際に法令が最後に改正(公布)された日
+            last_updated=(
+                datetime.combine(changed_on, datetime.min.time())
+                if changed_on
+                else datetime.now()
+            ),
+            promulgation_date=promulgation_date,
+            amendment_law_num=amendment_law_num,
+            amendment_date=amendment_date,
+        )
+
+    def parse_law_metadata(self, xml_content: bytes, law_id: str) -> Law:
+        """条文を解析せずに法令情報 (公布・改正情報) だけを取り出す"""
+        return self._law_from_root(ET.fromstring(xml_content), law_id)
+
+    def parse_law_xml(
+        self, xml_content: bytes, law_id: str
+    ) -> tuple[Law, List[Article]]:
+        """XMLをパースしてLawとArticleのリストを返す"""
+        root = ET.fromstring(xml_content)
+
+        # Law Info
+        law = self._law_from_root(root, law_id)
+        extractor = ReferenceExtractor(
+            {**self.known_laws, law.law_full_name: law_id}
         )
 
         articles = []
@@ -98,6 +167,9 @@ class EGovAPIClient:
                         article_number=full_article_name,
                         hierarchy=hierarchy_str,
                         content=content_text.strip(),
+                        references=extractor.extract(
+                            law_id, full_article_name, content_text
+                        ),
                     )
                 )
                 return  # Article以下はもう階層構造ではないのでreturn
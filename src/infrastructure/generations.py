@@ -0,0 +1,212 @@
+"""
+世代番号つきの索引ディレクトリ (書き出し -> 検証 -> 原子的な公開)
+
+    backend/data/
+      generations/000001/   index.json, query_transform.json, law_centroids.json,
+      generations/000002/   manifest.json (ファイルごとのサイズと sha256・件数・次元)
+      CURRENT               公開中の世代名 (一時ファイルからの rename で置き換える)
+      current -> generations/000002   (symlink が作れる環境のみ。人とツール向け)
+
+書き出しは generations/.staging-* で行い、manifest と照合して fsync してから
+世代名に rename し、最後に CURRENT を差し替える。読み手は CURRENT だけを見るので、
+書きかけの索引を読むことはない。古い世代は keep 個まで残し、rollback で戻せる。
+稼働中のバックエンドは SIGHUP か CURRENT の変更で新しい世代を読み込み直す。
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from typing import Dict, List, Optional
+
+GENERATIONS_DIR = "generations"
+POINTER_FILE = "CURRENT"
+LINK_NAME = "current"
+MANIFEST_FILE = "manifest.json"
+STAGING_PREFIX = ".staging-"
+DEFAULT_KEEP = 3
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_text(path: str, text: str) -> None:
+    """一時ファイルに書いて fsync してから置き換える"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    fsync_directory(os.path.dirname(path) or ".")
+
+
+def fsync_directory(directory: str) -> None:
+    """ディレクトリのエントリ (作成・rename) をディスクに書き出す"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # ディレクトリを開けない環境 (Windows) では何もしない
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def sync_files(directory: str) -> None:
+    """directory 直下のファイルとディレクトリ自身を fsync する"""
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                os.fsync(f.fileno())
+    fsync_directory(directory)
+
+
+def write_manifest(directory: str, generation: str, **info) -> dict:
+    """directory 内のファイルのサイズと sha256 を manifest.json に記録する"""
+    files: Dict[str, dict] = {}
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name == MANIFEST_FILE or not os.path.isfile(path):
+            continue
+        files[name] = {"bytes": os.path.getsize(path), "sha256": file_digest(path)}
+    manifest = {
+        "generation": generation,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        **info,
+        "files": files,
+    }
+    _write_text(
+        os.path.join(directory, MANIFEST_FILE),
+        json.dumps(manifest, ensure_ascii=False, indent=2),
+    )
+    return manifest
+
+
+def read_manifest(directory: str) -> dict:
+    path = os.path.join(directory, MANIFEST_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Unreadable manifest {path}: {e}") from e
+
+
+def verify_generation(directory: str) -> dict:
+    """manifest のサイズ・チェックサムと一致しなければ ValueError"""
+    manifest = read_manifest(directory)
+    files = manifest.get("files") or {}
+    if not files:
+        raise ValueError(f"Manifest in {directory} lists no files")
+    for name, expected in files.items():
+        path = os.path.join(directory, name)
+        if not os.path.isfile(path):
+            raise ValueError(f"Generation {directory} is missing {name}")
+        if os.path.getsize(path) != expected["bytes"]:
+            raise ValueError(f"Size mismatch for {path}")
+        if file_digest(path) != expected["sha256"]:
+            raise ValueError(f"Checksum mismatch for {path}")
+    return manifest
+
+
+class GenerationStore:
+    """data_dir 以下の世代の作成・公開・切り戻し・削除"""
+
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+        self.generations_dir = os.path.join(data_dir, GENERATIONS_DIR)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.generations_dir, name)
+
+    def names(self) -> List[str]:
+        """公開済みの世代名 (古い順)"""
+        if not os.path.isdir(self.generations_dir):
+            return []
+        return sorted(
+            name
+            for name in os.listdir(self.generations_dir)
+            if name.isdigit() and os.path.isdir(self.path(name))
+        )
+
+    def current(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.data_dir, POINTER_FILE), encoding="utf-8") as f:
+                name = f.read().strip()
+        except OSError:
+            return None
+        return name or None
+
+    def stage(self) -> str:
+        """書き出し用の一時ディレクトリ (publish で世代になる)"""
+        os.makedirs(self.generations_dir, exist_ok=True)
+        staging = os.path.join(
+            self.generations_dir, f"{STAGING_PREFIX}{os.getpid()}-{time.time_ns()}"
+        )
+        os.makedirs(staging)
+        return staging
+
+    def publish(self, staging: str, keep: int = DEFAULT_KEEP, **info) -> str:
+        """
+        staging に manifest を書き、検証してから次の世代番号に rename して公開する
+        検証に失敗した場合は staging を消して ValueError を送出する。
+        """
+        names = self.names()
+        name = f"{int(names[-1]) + 1 if names else 1:06d}"
+        try:
+            write_manifest(staging, name, **info)
+            verify_generation(staging)
+            # 電源断でも公開済みの世代が欠けないよう、rename の前に中身を書き出す
+            sync_files(staging)
+            fsync_directory(self.generations_dir)
+            os.rename(staging, self.path(name))
+            fsync_directory(self.generations_dir)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self.activate(name, verify=False)
+        self.prune(keep)
+        return name
+
+    def activate(self, name: str, verify: bool = True) -> None:
+        """CURRENT (と current の symlink) を name に向ける"""
+        if verify:
+            verify_generation(self.path(name))
+        _write_text(os.path.join(self.data_dir, POINTER_FILE), name + "\n")
+        link = os.path.join(self.data_dir, LINK_NAME)
+        tmp_link = link + ".tmp"
+        try:
+            if os.path.lexists(tmp_link):
+                os.remove(tmp_link)
+            os.symlink(os.path.join(GENERATIONS_DIR, name), tmp_link)
+            os.replace(tmp_link, link)
+        except (OSError, NotImplementedError):
+            pass  # symlink は補助。読み手は CURRENT を見る
+
+    def rollback(self) -> str:
+        """公開中の1つ前の世代に戻す"""
+        names = self.names()
+        current = self.current()
+        older = [n for n in names if current is None or n < current]
+        if not older:
+            raise ValueError("No older generation to roll back to")
+        self.activate(older[-1])
+        return older[-1]
+
+    def prune(self, keep: int = DEFAULT_KEEP) -> List[str]:
+        """新しい順に keep 個と公開中の世代を残して削除する"""
+        current = self.current()
+        names = self.names()
+        stale = [n for n in names[: max(len(names) - keep, 0)] if n != current]
+        for name in stale:
+            shutil.rmtree(self.path(name), ignore_errors=True)
+        return stale
@@ -0,0 +1,150 @@
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from src.core.models import CatalogEntry
+
+PENDING = "pending"
+FETCHED = "fetched"
+PARSED = "parsed"
+STORED = "stored"
+FAILED = "failed"
+
+STATUSES = (PENDING, FETCHED, PARSED, STORED, FAILED)
+
+
+class IngestLedger:
+    """
+    一括取り込みの法令ごとの進捗台帳 (pending/fetched/parsed/stored/failed)
+    再実行時は stored 済みの法令をスキップし、途中状態や失敗分だけを再処理する。
+    """
+
+    def __init__(self, db_path: str = "welfare_laws_v3.db"):
+        self.db_path = db_path
+        # ワーカースレッドからの同時更新を直列化する
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _init_db(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ingest_status (
+                    law_id TEXT PRIMARY KEY,
+                    law_name TEXT,
+                    status TEXT NOT NULL,
+                    attempts INTEGER DEFAULT 0,
+                    article_count INTEGER DEFAULT 0,
+                    error TEXT,
+                    updated_at TIMESTAMP
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_ingest_status "
+                "ON ingest_status (status)"
+            )
+            conn.commit()
+
+    def plan(
+        self,
+        entries: Iterable[CatalogEntry],
+        retry_failed: bool = True,
+        include_stored: bool = False,
+    ) -> List[CatalogEntry]:
+        """
+        対象法令を台帳に登録し、今回処理すべきものを返す
+        stored 済みは除外 (更新ジョブでは include_stored で再確認対象にする)、
+        failed は retry_failed のときのみ再投入する。
+        """
+        entries = list(entries)
+        now = datetime.now()
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO ingest_status
+                    (law_id, law_name, status, updated_at)
+                VALUES (?, ?, ?, ?)
+            """,
+                [(e.law_id, e.law_name, PENDING, now) for e in entries],
+            )
+            conn.commit()
+        return self.preview(entries, retry_failed, include_stored)
+
+    def preview(
+        self,
+        entries: Iterable[CatalogEntry],
+        retry_failed: bool = True,
+        include_stored: bool = False,
+    ) -> List[CatalogEntry]:
+        """plan と同じ対象を返すが台帳には書き込まない (--dry-run 用)"""
+        with sqlite3.connect(self.db_path) as conn:
+            statuses = dict(
+                conn.execute("SELECT law_id, status FROM ingest_status").fetchall()
+            )
+
+        todo = []
+        for entry in entries:
+            status = statuses.get(entry.law_id, PENDING)
+            if status == STORED and not include_stored:
+                continue
+            if status == FAILED and not retry_failed:
+                continue
+            todo.append(entry)
+        return todo
+
+    def start_attempt(self, law_id: str) -> None:
+        """取得を始める (成否によらず試行回数を数える)"""
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "UPDATE ingest_status SET attempts = attempts + 1, updated_at = ? "
+                "WHERE law_id = ?",
+                (datetime.now(), law_id),
+            )
+            conn.commit()
+
+    def mark(
+        self,
+        law_id: str,
+        status: str,
+        error: Optional[str] = None,
+        article_count: Optional[int] = None,
+    ) -> None:
+        if status not in STATUSES:
+            raise ValueError(f"Unknown ingest status: {status}")
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                UPDATE ingest_status
+                SET status = ?,
+                    error = ?,
+                    article_count = COALESCE(?, article_count),
+                    updated_at = ?
+                WHERE law_id = ?
+            """,
+                (status, error, article_count, datetime.now(), law_id),
+            )
+            conn.commit()
+
+    def get_status(self, law_id: str) -> Optional[str]:
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT status FROM ingest_status WHERE law_id = ?", (law_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def summary(self) -> Dict[str, int]:
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) FROM ingest_status GROUP BY status"
+            ).fetchall()
+        counts = {status: 0 for status in STATUSES}
+        counts.update(dict(rows))
+        return counts
+
+    def failures(self) -> List[tuple]:
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(
+                "SELECT law_id, law_name, attempts, error FROM ingest_status "
+                "WHERE status = ? ORDER BY law_id",
+                (FAILED,),
+            ).fetchall()
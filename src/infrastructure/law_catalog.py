@@ -0,0 +1,299 @@
+import json
+import os
+import unicodedata
+import xml.etree.ElementTree as ET
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.core.models import CatalogEntry
+from src.infrastructure.egov_api import EGovAPIClient
+
+# LawId の4文字目以降の種別コード -> 法令種別
+LAW_TYPE_CATEGORIES: List[Tuple[str, str]] = [
+    ("CONSTITUTION", "憲法"),
+    ("AC", "法律"),
+    ("CO", "政令"),
+    ("IO", "勅令"),
+    ("M", "府省令"),
+    ("R", "規則"),
+]
+
+# e-Gov の一覧に載らない通称・略称 -> LawId
+KNOWN_ABBREVIATIONS: Dict[str, str] = {
+    "高齢者虐待防止法": "417AC1000000124",
+    "障害者総合支援法": "417AC0000000123",
+    "精神保健福祉法": "325AC0100000123",
+    "児童虐待防止法": "412AC1000000082",
+    "DV防止法": "413AC0100000031",
+    "配偶者暴力防止法": "413AC0100000031",
+    "障害者虐待防止法": "423AC1000000079",
+}
+
+
+def law_category(law_id: str) -> str:
+    """LawId から法令種別 (法律・政令・府省令など) を判定"""
+    code = law_id[3:]
+    for prefix, label in LAW_TYPE_CATEGORIES:
+        if code.startswith(prefix):
+            return label
+    return "その他"
+
+
+def normalize_name(text: str) -> str:
+    """全角英数などを揃えて比較用に正規化 (NFKC)"""
+    return unicodedata.normalize("NFKC", text).strip()
+
+
+def parse_law_list_xml(xml_content: bytes) -> List[CatalogEntry]:
+    """lawlists API のXMLを CatalogEntry のリストに変換"""
+    root = ET.fromstring(xml_content)
+    entries = []
+    for info in root.iter("LawNameListInfo"):
+        law_id = info.findtext("LawId") or ""
+        if not law_id:
+            continue
+        entries.append(
+            CatalogEntry(
+                law_id=law_id,
+                law_name=info.findtext("LawName") or "",
+                law_no=info.findtext("LawNo") or "",
+                promulgation_date=info.findtext("PromulgationDate") or "",
+                category=law_category(law_id),
+            )
+        )
+    return entries
+
+
+@dataclass(frozen=True)
+class CatalogDiff:
+    added: List[CatalogEntry] = field(default_factory=list)
+    removed: List[CatalogEntry] = field(default_factory=list)
+    changed: List[CatalogEntry] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+def diff_entries(old: List[CatalogEntry], new: List[CatalogEntry]) -> CatalogDiff:
+    """前回の一覧との差分 (追加・廃止・名称/番号/公布日の変更)"""
+    old_by_id = {e.law_id: e for e in old}
+    new_by_id = {e.law_id: e for e in new}
+    return CatalogDiff(
+        added=[e for e in new if e.law_id not in old_by_id],
+        removed=[e for e in old if e.law_id not in new_by_id],
+        changed=[
+            e for e in new if e.law_id in old_by_id and old_by_id[e.law_id] != e
+        ],
+    )
+
+
+class CatalogIndex:
+    """
+    法令名・略称・法令番号の検索インデックス
+    完全一致 (dict)、前方一致 (ソート済み配列 + bisect)、
+    部分一致 (文字bigramの転置インデックス) をすべてローカルで引く。
+    """
+
+    def __init__(
+        self,
+        entries: List[CatalogEntry],
+        abbreviations: Optional[Dict[str, str]] = None,
+    ):
+        self.entries = entries
+        self._by_id = {e.law_id: i for i, e in enumerate(entries)}
+        self._exact: Dict[str, List[int]] = {}
+        # (正規化済みキー, entry番号): 法令名と略称が検索キーになる
+        self._keys: List[Tuple[str, int]] = []
+
+        for i, entry in enumerate(entries):
+            for exact_key in (entry.law_name, entry.law_no, entry.law_id):
+                if exact_key:
+                    self._exact.setdefault(normalize_name(exact_key), []).append(i)
+            if entry.law_name:
+                self._keys.append((normalize_name(entry.law_name), i))
+
+        for abbreviation, law_id in (abbreviations or KNOWN_ABBREVIATIONS).items():
+            i = self._by_id.get(law_id)
+            if i is None:
+                continue
+            key = normalize_name(abbreviation)
+            self._exact.setdefault(key, []).append(i)
+            self._keys.append((key, i))
+
+        self._sorted_keys = sorted(self._keys)
+        self._bigrams: Dict[str, Set[int]] = {}
+        for key_no, (key, _) in enumerate(self._keys):
+            for gram in self._grams(key):
+                self._bigrams.setdefault(gram, set()).add(key_no)
+
+    @staticmethod
+    def _grams(text: str) -> Set[str]:
+        return {text[i : i + 2] for i in range(len(text) - 1)}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, law_id: str) -> Optional[CatalogEntry]:
+        i = self._by_id.get(law_id)
+        return self.entries[i] if i is not None else None
+
+    def exact(self, text: str) -> List[CatalogEntry]:
+        """法令名・略称・法令番号・LawId の完全一致"""
+        return [self.entries[i] for i in self._exact.get(normalize_name(text), [])]
+
+    def prefix(self, text: str, limit: int = 50) -> List[CatalogEntry]:
+        query = normalize_name(text)
+        found: List[int] = []
+        pos = bisect_left(self._sorted_keys, (query, -1))
+        while pos < len(self._sorted_keys) and len(found) < limit:
+            key, i = self._sorted_keys[pos]
+            if not key.startswith(query):
+                break
+            if i not in found:
+                found.append(i)
+            pos += 1
+        return [self.entries[i] for i in found]
+
+    def contains(self, text: str, limit: int = 50) -> List[CatalogEntry]:
+        """部分一致 (bigram の積集合で候補を絞ってから照合)"""
+        query = normalize_name(text)
+        if not query:
+            return []
+        grams = self._grams(query)
+        if grams:
+            postings = sorted(
+                (self._bigrams.get(g, set()) for g in grams), key=len
+            )
+            candidates: Iterable[int] = sorted(set.intersection(*postings))
+        else:
+            candidates = range(len(self._keys))
+
+        found: List[int] = []
+        for key_no in candidates:
+            key, i = self._keys[key_no]
+            if query in key and i not in found:
+                found.append(i)
+                if len(found) >= limit:
+                    break
+        return [self.entries[i] for i in found]
+
+    def search(
+        self,
+        text: str,
+        categories: Optional[Iterable[str]] = None,
+        limit: int = 20,
+    ) -> List[CatalogEntry]:
+        """完全一致 -> 前方一致 -> 部分一致 の順に重複なく返す"""
+        allowed = set(categories) if categories is not None else None
+        results: List[CatalogEntry] = []
+        seen: Set[str] = set()
+        for group in (self.exact(text), self.prefix(text), self.contains(text)):
+            for entry in group:
+                if entry.law_id in seen:
+                    continue
+                if allowed is not None and entry.category not in allowed:
+                    continue
+                seen.add(entry.law_id)
+                results.append(entry)
+        return results[:limit]
+
+    def by_category(self, category: str) -> List[CatalogEntry]:
+        return [e for e in self.entries if e.category == category]
+
+
+class LawCatalog:
+    """e-Gov 法令一覧のローカルキャッシュと検索インデックス"""
+
+    def __init__(
+        self,
+        cache_path: str = os.path.join("cache", "law_catalog.json"),
+        api: Optional[EGovAPIClient] = None,
+    ):
+        self.cache_path = cache_path
+        self.api = api or EGovAPIClient()
+        self._entries: Optional[List[CatalogEntry]] = None
+        self._index: Optional[CatalogIndex] = None
+        self.fetched_at: Optional[str] = None
+
+    def _read_cache(self) -> Optional[List[CatalogEntry]]:
+        if not os.path.exists(self.cache_path):
+            return None
+        with open(self.cache_path, encoding="utf-8") as f:
+            data = json.load(f)
+        self.fetched_at = data.get("fetched_at")
+        return [CatalogEntry(**e) for e in data.get("entries", [])]
+
+    def _write_cache(self, entries: List[CatalogEntry]) -> None:
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.fetched_at = datetime.now().isoformat(timespec="seconds")
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "fetched_at": self.fetched_at,
+                    "entries": [e.model_dump() for e in entries],
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, self.cache_path)
+
+    def _set_entries(self, entries: List[CatalogEntry]) -> None:
+        self._entries = entries
+        self._index = None
+
+    @property
+    def entries(self) -> List[CatalogEntry]:
+        if self._entries is None:
+            cached = self._read_cache()
+            if cached is None:
+                self.refresh()
+            else:
+                self._set_entries(cached)
+        return self._entries or []
+
+    @property
+    def index(self) -> CatalogIndex:
+        if self._index is None:
+            self._index = CatalogIndex(self.entries)
+        return self._index
+
+    def refresh(self) -> CatalogDiff:
+        """一覧を再取得し、キャッシュとの差分を返す (取得失敗時はキャッシュ維持)"""
+        xml_content = self.api.fetch_law_list_xml()
+        if not xml_content:
+            raise RuntimeError("Failed to fetch the e-Gov law list.")
+        new_entries = parse_law_list_xml(xml_content)
+        old_entries = self._read_cache() or []
+        diff = diff_entries(old_entries, new_entries)
+        if not diff.is_empty or not os.path.exists(self.cache_path):
+            self._write_cache(new_entries)
+        self._set_entries(new_entries)
+        return diff
+
+    def search(
+        self,
+        text: str,
+        categories: Optional[Iterable[str]] = None,
+        limit: int = 20,
+    ) -> List[CatalogEntry]:
+        return self.index.search(text, categories=categories, limit=limit)
+
+    def known_laws(self) -> Dict[str, str]:
+        """法令名・略称 -> LawId (条文中の他法令参照の解決用)"""
+        names = {e.law_name: e.law_id for e in self.entries if e.law_name}
+        ids = {e.law_id for e in self.entries}
+        names.update(
+            {name: i for name, i in KNOWN_ABBREVIATIONS.items() if i in ids}
+        )
+        return names
+
+    def resolve(self, name: str) -> Optional[CatalogEntry]:
+        """名称・略称・法令番号から1件に解決 (完全一致のみ)"""
+        matches = self.index.exact(name)
+        return matches[0] if matches else None
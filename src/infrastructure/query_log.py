@@ -0,0 +1,130 @@
+"""
+検索クエリの記録 (抽出率つき・個人情報を伏せた JSONL)
+
+1行1検索で、正規化したクエリ・絞り込み条件・レイテンシ・キャッシュヒットを追記する。
+形式は lawctl loadtest のクエリログと同じなので、そのまま負荷試験で再生できる。
+起動時には頻度の高いクエリ (top_queries) を流してキャッシュを温めておく。
+メールアドレス・電話番号・長い数字列は記録前に伏せ、利用者を識別する情報は持たない。
+"""
+
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERY_LOG = os.path.join("cache", "query_log.jsonl")
+MAX_QUERY_CHARS = 200
+# 記録する絞り込み条件 (/search のリクエストと同じキー)
+FILTER_KEYS = ("target_laws", "ambiguous", "where")
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(\.[\w-]+)+")
+_PHONE = re.compile(r"\d{2,4}-\d{2,4}-\d{3,4}")
+_DIGITS = re.compile(r"\d{6,}")
+
+
+def normalize_query(query: str) -> str:
+    """全角・半角と空白の揺れをそろえる (キャッシュのキーにも使う)"""
+    return " ".join(unicodedata.normalize("NFKC", query).split())
+
+
+def redact_query(query: str) -> str:
+    """正規化したうえで個人を特定しうる文字列を伏せる"""
+    text = normalize_query(query)
+    text = _EMAIL.sub("<email>", text)
+    text = _PHONE.sub("<phone>", text)
+    text = _DIGITS.sub("<number>", text)
+    return text[:MAX_QUERY_CHARS]
+
+
+def search_request(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """ログの1行から /search のリクエストを組み立てる"""
+    payload = {"query": entry["query"]}
+    for key in FILTER_KEYS:
+        if entry.get(key) not in (None, [], False):
+            payload[key] = entry[key]
+    return payload
+
+
+class QueryLog:
+    """sample_rate の割合で検索を JSONL に追記する (スレッドセーフ)"""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_QUERY_LOG,
+        sample_rate: float = 1.0,
+        rng: Optional[random.Random] = None,
+    ):
+        self.path = path
+        self.sample_rate = sample_rate
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["QueryLog"]:
+        """QUERY_LOG_PATH (空なら記録しない) と QUERY_LOG_SAMPLE で設定する"""
+        path = os.getenv("QUERY_LOG_PATH", DEFAULT_QUERY_LOG)
+        if not path:
+            return None
+        return cls(path, float(os.getenv("QUERY_LOG_SAMPLE", "0.5")))
+
+    def record(
+        self,
+        payload: Dict[str, Any],
+        latency_ms: float,
+        cache_hit: Optional[bool] = None,
+    ) -> bool:
+        """抽出に当たった場合だけ1行追記する"""
+        query = redact_query(payload.get("query", ""))
+        if not query:
+            return False
+        with self._lock:
+            if self._rng.random() >= self.sample_rate:
+                return False
+            entry: Dict[str, Any] = {"ts": int(time.time()), "query": query}
+            entry.update(search_request({**payload, "query": query}))
+            entry["latency_ms"] = round(latency_ms, 1)
+            entry["cache_hit"] = cache_hit
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            except OSError as e:
+                # 記録の失敗で検索を止めない
+                logger.warning(f"Could not write the query log: {e}")
+                return False
+        return True
+
+
+def read_query_log(path: str) -> List[Dict[str, Any]]:
+    """記録済みの行 (書きかけの行や壊れた行は飛ばす)"""
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(entry, dict) and entry.get("query"):
+                entries.append(entry)
+    return entries
+
+
+def top_queries(path: str, n: int) -> List[Dict[str, Any]]:
+    """頻度の高い順に n 件の /search リクエスト (絞り込み条件ごとに数える)"""
+    counts: Counter = Counter()
+    for entry in read_query_log(path):
+        payload = search_request(entry)
+        counts[json.dumps(payload, ensure_ascii=False, sort_keys=True)] += 1
+    return [json.loads(key) for key, _ in counts.most_common(n)]
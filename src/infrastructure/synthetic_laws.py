@@ -0,0 +1,457 @@
+"""
+e-Gov 法令XML と同じ構造の合成コーパス (規模を変えた性能測定用)
+
+編・章・節・条・項・号の入れ子、実際の条文に近い長さの文 (対数正規分布)、
+自法令・他法令の条への参照を持つ法令XMLを、10条から数百万条まで生成する。
+要素の並びと属性は e-Gov の法令標準XMLスキーマに合わせてあり、
+EGovAPIClient.parse_law_xml でそのまま取り込める。
+乱数の種は法令ごとに分けているので、同じ seed ならどの法令も同じ内容になる。
+"""
+
+import math
+import random
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.core.legal_dates import int_to_kanji
+
+# 現在のコーパス (21法令・約2000条) を 1x とする
+BASE_LAWS = 21
+BASE_ARTICLES = 2000
+MAX_ARTICLES_PER_LAW = 3000
+
+# 1文の文字数 (中央値と対数正規分布のばらつき)
+SENTENCE_MEDIAN = 70
+SENTENCE_SIGMA = 0.5
+SENTENCE_RANGE = (20, 400)
+ITEM_MEDIAN = 24
+# 文中に条の参照を含める割合と、そのうち他法令を参照する割合
+REFERENCE_RATE = 0.3
+OTHER_LAW_RATE = 0.25
+# 他法令の参照先は直前のこの件数の法令から選ぶ
+REFERENCE_WINDOW = 20
+
+_ERAS = (("Heisei", "平成", 31), ("Reiwa", "令和", 6))
+
+_TOPICS = [
+    "児童",
+    "高齢者",
+    "障害者",
+    "生活困窮者",
+    "母子",
+    "寡婦",
+    "精神障害者",
+    "難病患者",
+    "被災者",
+    "ひとり親家庭",
+    "要介護者",
+    "在宅療養者",
+    "外国人住民",
+    "若年無業者",
+    "犯罪被害者",
+    "ホームレス",
+    "里親",
+    "医療的ケア児",
+    "ヤングケアラー",
+    "引揚者",
+]
+_TARGETS = ["生活", "就労", "住宅", "医療", "教育", "相談", "地域", "権利"]
+_KINDS = [
+    "支援法",
+    "福祉法",
+    "保障法",
+    "援護法",
+    "促進法",
+    "対策基本法",
+    "保護法",
+    "給付法",
+]
+
+_SUBJECTS = [
+    "都道府県知事は、",
+    "市町村長は、",
+    "厚生労働大臣は、",
+    "保護の実施機関は、",
+    "国及び地方公共団体は、",
+    "社会福祉法人その他の者は、",
+    "事業者は、",
+    "前項の申請をした者は、",
+    "児童相談所長は、",
+    "福祉事務所の長は、",
+]
+_CLAUSES = [
+    "厚生労働省令で定めるところにより、",
+    "政令で定める基準に従い、",
+    "当該申請に係る者の生活の状況を調査し、",
+    "必要があると認めるときは、",
+    "関係行政機関の長と協議の上、",
+    "その者の資産及び能力を活用させるとともに、",
+    "あらかじめ、審議会の意見を聴いて、",
+    "特別の事情がある場合を除き、",
+    "その職員に、当該施設に立ち入り、",
+    "要保護者の年齢、性別、健康状態等に応じて、",
+    "地域の実情を踏まえ、",
+    "書面により、",
+    "速やかに、",
+    "適切な支援を行うため、",
+]
+_PREDICATES = [
+    "必要な措置を講じなければならない。",
+    "その旨を公示しなければならない。",
+    "これを行うものとする。",
+    "給付を行うことができる。",
+    "報告を求めることができる。",
+    "届け出なければならない。",
+    "努めなければならない。",
+    "その結果を通知するものとする。",
+]
+_ITEM_PHRASES = [
+    "生活扶助",
+    "教育扶助",
+    "住宅扶助",
+    "医療扶助",
+    "介護扶助",
+    "施設の設備及び運営に関する事項",
+    "職員の資格及び員数",
+    "費用の徴収",
+    "相談及び助言",
+    "関係機関との連絡調整",
+    "前各号に掲げるもののほか、必要な事項",
+]
+_ITEM_MODIFIERS = [
+    "市町村が行う",
+    "厚生労働省令で定める",
+    "前条に規定する",
+    "当該施設における",
+    "地域における",
+    "要保護者に対する",
+]
+_CAPTIONS = [
+    "目的",
+    "定義",
+    "基本理念",
+    "国の責務",
+    "申請",
+    "調査",
+    "費用",
+    "報告等",
+    "立入検査",
+    "届出",
+    "指定",
+    "支給",
+    "実施機関",
+    "委任",
+    "罰則",
+]
+_CHAPTER_TITLES = [
+    "給付",
+    "事業及び施設",
+    "費用",
+    "審査請求",
+    "支援の実施",
+    "計画等",
+    "雑則",
+    "指定事業者",
+    "相談支援",
+]
+_SECTION_TITLES = ["通則", "申請", "給付の実施", "費用の負担", "監督", "雑則"]
+
+
+def _fullwidth(value: int) -> str:
+    return "".join(chr(0xFF10 + int(d)) for d in str(value))
+
+
+@dataclass(frozen=True)
+class SyntheticLaw:
+    index: int
+    law_id: str
+    name: str
+    articles: int
+
+
+def law_name(index: int) -> str:
+    """重複しない法令名 (組み合わせを使い切ったら年度で区別する)"""
+    combos = len(_TOPICS) * len(_TARGETS) * len(_KINDS)
+    rest, round_ = index % combos, index // combos
+    topic = _TOPICS[rest % len(_TOPICS)]
+    target = _TARGETS[rest // len(_TOPICS) % len(_TARGETS)]
+    kind = _KINDS[rest // (len(_TOPICS) * len(_TARGETS))]
+    name = f"{topic}{target}{kind}"
+    return f"令和{int_to_kanji(round_)}年度{name}" if round_ else name
+
+
+def plan_sizes(total_articles: int, laws: int, seed: int = 0) -> List[int]:
+    """条数を法令に割り振る (大小の偏りは対数正規分布、合計は total_articles)"""
+    if laws < 1 or total_articles < laws:
+        raise ValueError("Need at least one article per law.")
+    if total_articles > laws * MAX_ARTICLES_PER_LAW:
+        raise ValueError(
+            f"{total_articles} articles need at least "
+            f"{math.ceil(total_articles / MAX_ARTICLES_PER_LAW)} laws."
+        )
+    rng = random.Random(seed)
+    weights = [rng.lognormvariate(0.0, 0.8) for _ in range(laws)]
+    scale = (total_articles - laws) / sum(weights)
+    sizes = [1 + min(MAX_ARTICLES_PER_LAW - 1, int(w * scale)) for w in weights]
+    remaining = total_articles - sum(sizes)
+    order = sorted(range(laws), key=lambda i: -weights[i])
+    while remaining:
+        for i in order:
+            if remaining == 0:
+                break
+            if sizes[i] < MAX_ARTICLES_PER_LAW:
+                sizes[i] += 1
+                remaining -= 1
+    return sizes
+
+
+def _split(total: int, low: int, high: int, rng: random.Random) -> List[int]:
+    """total を low〜high 件ずつの塊に分ける (最後の塊は小さくてもよい)"""
+    sizes = []
+    while total > 0:
+        size = min(total, rng.randint(low, high))
+        sizes.append(size)
+        total -= size
+    return sizes
+
+
+class SyntheticCorpus:
+    """
+    合成法令の一覧と、各法令の e-Gov 形式 XML
+    law_xml は法令ごとに独立に生成するので、数百万条でも1法令ずつ流せる。
+    """
+
+    def __init__(
+        self,
+        total_articles: int = BASE_ARTICLES,
+        laws: Optional[int] = None,
+        seed: int = 0,
+    ):
+        if laws is None:
+            per_law = BASE_ARTICLES / BASE_LAWS
+            laws = max(
+                1,
+                round(total_articles / per_law),
+                math.ceil(total_articles / MAX_ARTICLES_PER_LAW),
+            )
+            laws = min(laws, total_articles)
+        self.seed = seed
+        sizes = plan_sizes(total_articles, laws, seed)
+        self.laws = [
+            SyntheticLaw(i, self._law_id(i), law_name(i), size)
+            for i, size in enumerate(sizes)
+        ]
+
+    @classmethod
+    def scaled(cls, scale: float, seed: int = 0) -> "SyntheticCorpus":
+        """現在のコーパスの scale 倍 (1x = 21法令・約2000条)"""
+        return cls(
+            max(1, round(BASE_ARTICLES * scale)),
+            max(1, round(BASE_LAWS * scale)),
+            seed,
+        )
+
+    @staticmethod
+    def _law_id(index: int) -> str:
+        # 実在の法令IDと衝突しないよう、法令番号の部分を 9 始まりにする
+        return f"5{index % 6 + 1:02d}AC9{index:09d}"
+
+    @property
+    def total_articles(self) -> int:
+        return sum(law.articles for law in self.laws)
+
+    @property
+    def known_laws(self) -> Dict[str, str]:
+        """他法令への参照を解決するための 法令名 -> law_id"""
+        return {law.name: law.law_id for law in self.laws}
+
+    def _rng(self, law: SyntheticLaw) -> random.Random:
+        return random.Random(f"{self.seed}:{law.index}")
+
+    def _reference(
+        self, rng: random.Random, law: SyntheticLaw, article: int
+    ) -> Optional[str]:
+        if law.index > 0 and rng.random() < OTHER_LAW_RATE:
+            first = max(0, law.index - REFERENCE_WINDOW)
+            other = self.laws[rng.randrange(first, law.index)]
+            target = int_to_kanji(rng.randint(1, other.articles))
+            return f"{other.name}第{target}条の規定による"
+        if article == 1:
+            return None
+        if rng.random() < 0.3:
+            return "前条の規定により"
+        target = int_to_kanji(rng.randint(1, article - 1))
+        if rng.random() < 0.4:
+            return f"第{target}条第{int_to_kanji(rng.randint(1, 2))}項に規定する"
+        return f"第{target}条の規定により"
+
+    def _sentence(self, rng: random.Random, law: SyntheticLaw, article: int) -> str:
+        low, high = SENTENCE_RANGE
+        length = rng.lognormvariate(math.log(SENTENCE_MEDIAN), SENTENCE_SIGMA)
+        target = min(high, max(low, int(length)))
+        parts = [rng.choice(_SUBJECTS)]
+        if rng.random() < REFERENCE_RATE:
+            reference = self._reference(rng, law, article)
+            if reference:
+                parts.append(reference)
+        predicate = rng.choice(_PREDICATES)
+        size = sum(map(len, parts)) + len(predicate)
+        # 同じ言い回しが続かないよう、一巡するまで重複させない
+        clauses: List[str] = []
+        while size < target:
+            if not clauses:
+                clauses = rng.sample(_CLAUSES, len(_CLAUSES))
+            clause = clauses.pop()
+            parts.append(clause)
+            size += len(clause)
+        parts.append(predicate)
+        return "".join(parts)
+
+    def _item(self, rng: random.Random) -> str:
+        phrase = rng.choice(_ITEM_PHRASES)
+        length = rng.lognormvariate(math.log(ITEM_MEDIAN), SENTENCE_SIGMA)
+        modifiers = [m for m in _ITEM_MODIFIERS if len(phrase) + len(m) <= length]
+        return (rng.choice(modifiers) if modifiers else "") + phrase
+
+    def _article(
+        self, parent: ET.Element, rng: random.Random, law: SyntheticLaw, number: int
+    ) -> None:
+        article = ET.SubElement(parent, "Article", Num=str(number))
+        if number == 1:
+            caption: Optional[str] = "目的"
+        else:
+            caption = rng.choice(_CAPTIONS) if rng.random() < 0.8 else None
+        if caption:
+            ET.SubElement(article, "ArticleCaption").text = f"（{caption}）"
+        ET.SubElement(article, "ArticleTitle").text = f"第{int_to_kanji(number)}条"
+
+        roll = rng.random()
+        paragraphs = (
+            1 if roll < 0.55 else rng.randint(2, 3) if roll < 0.9 else rng.randint(4, 8)
+        )
+        for p in range(1, paragraphs + 1):
+            paragraph = ET.SubElement(article, "Paragraph", Num=str(p))
+            ET.SubElement(paragraph, "ParagraphNum").text = (
+                _fullwidth(p) if p > 1 else None
+            )
+            sentences = ET.SubElement(paragraph, "ParagraphSentence")
+            for s in range(1, 1 + (2 if rng.random() < 0.15 else 1)):
+                sentence = ET.SubElement(
+                    sentences, "Sentence", Num=str(s), WritingMode="vertical"
+                )
+                sentence.text = self._sentence(rng, law, number)
+            if rng.random() < 0.15:
+                for i in range(1, rng.randint(2, 7) + 1):
+                    item = ET.SubElement(paragraph, "Item", Num=str(i))
+                    ET.SubElement(item, "ItemTitle").text = int_to_kanji(i)
+                    item_sentence = ET.SubElement(item, "ItemSentence")
+                    ET.SubElement(
+                        item_sentence, "Sentence", Num="1", WritingMode="vertical"
+                    ).text = self._item(rng)
+
+    def _structure(
+        self, law: SyntheticLaw, rng: random.Random
+    ) -> List[List[List[int]]]:
+        """編ごとの [章ごとの [節ごとの条数]] (7条以下の法令は章に分けない)"""
+        if law.articles < 8:
+            return [[[law.articles]]]
+        chapters = []
+        for size in _split(law.articles, 5, 25, rng):
+            if size > 12 and rng.random() < 0.5:
+                chapters.append(_split(size, 4, 10, rng))
+            else:
+                chapters.append([size])
+        if len(chapters) <= 8:
+            return [chapters]
+        parts = []
+        start = 0
+        for size in _split(len(chapters), 3, 6, rng):
+            parts.append(chapters[start : start + size])
+            start += size
+        return parts
+
+    def law_xml(self, law: SyntheticLaw) -> bytes:
+        """1法令分の e-Gov 形式 XML"""
+        rng = self._rng(law)
+        era, era_name, max_year = _ERAS[law.index % len(_ERAS)]
+        year = rng.randint(1, max_year)
+        month, day = rng.randint(1, 12), rng.randint(1, 28)
+        number = rng.randint(1, 150)
+        root = ET.Element(
+            "Law",
+            Era=era,
+            Year=str(year),
+            Num=str(number),
+            PromulgateMonth=f"{month:02d}",
+            PromulgateDay=f"{day:02d}",
+            LawType="Act",
+            Lang="ja",
+        )
+        ET.SubElement(
+            root, "LawNum"
+        ).text = f"{era_name}{int_to_kanji(year)}年法律第{int_to_kanji(number)}号"
+        body = ET.SubElement(root, "LawBody")
+        ET.SubElement(body, "LawTitle").text = law.name
+
+        structure = self._structure(law, rng)
+        has_parts = len(structure) > 1
+        main = ET.SubElement(body, "MainProvision")
+        article = 1
+        chapter_no = 0
+        for part_no, chapters in enumerate(structure, start=1):
+            parent = main
+            if has_parts:
+                parent = ET.SubElement(main, "Part", Num=str(part_no))
+                title = "総則" if part_no == 1 else rng.choice(_CHAPTER_TITLES)
+                ET.SubElement(
+                    parent, "PartTitle"
+                ).text = f"第{int_to_kanji(part_no)}編　{title}"
+            for sections in chapters:
+                container = parent
+                if law.articles >= 8:
+                    chapter_no += 1
+                    container = ET.SubElement(parent, "Chapter", Num=str(chapter_no))
+                    title = "総則" if chapter_no == 1 else rng.choice(_CHAPTER_TITLES)
+                    ET.SubElement(
+                        container, "ChapterTitle"
+                    ).text = f"第{int_to_kanji(chapter_no)}章　{title}"
+                for section_no, size in enumerate(sections, start=1):
+                    holder = container
+                    if len(sections) > 1:
+                        holder = ET.SubElement(
+                            container, "Section", Num=str(section_no)
+                        )
+                        ET.SubElement(holder, "SectionTitle").text = (
+                            f"第{int_to_kanji(section_no)}節　"
+                            f"{rng.choice(_SECTION_TITLES)}"
+                        )
+                    for _ in range(size):
+                        self._article(holder, rng, law, article)
+                        article += 1
+
+        suppl = ET.SubElement(body, "SupplProvision")
+        ET.SubElement(suppl, "SupplProvisionLabel").text = "附　則"
+        paragraph = ET.SubElement(suppl, "Paragraph", Num="1")
+        ET.SubElement(paragraph, "ParagraphNum")
+        ET.SubElement(
+            ET.SubElement(paragraph, "ParagraphSentence"), "Sentence", Num="1"
+        ).text = "この法律は、公布の日から起算して六月を経過した日から施行する。"
+        if rng.random() < 0.5 and era == "Heisei":
+            # 令和の改正 (附則の AmendLawNum が最終改正として読まれる)
+            amend_year = rng.randint(1, 6)
+            amend = ET.SubElement(
+                body,
+                "SupplProvision",
+                AmendLawNum=(
+                    f"令和{int_to_kanji(amend_year)}年{int_to_kanji(month)}月"
+                    f"{int_to_kanji(day)}日法律第{int_to_kanji(number)}号"
+                ),
+                Extract="true",
+            )
+            ET.SubElement(amend, "SupplProvisionLabel").text = "附　則"
+        return ET.tostring(root, encoding="utf-8", xml_declaration=True)
+
+    def iter_xml(self) -> Iterator[Tuple[SyntheticLaw, bytes]]:
+        for law in self.laws:
+            yield law, self.law_xml(law)
@@ -0,0 +1,167 @@
+"""
+条文本文の辞書圧縮 (1条ずつ独立に復元できる)
+
+法令の条文は「の規定により」「厚生労働省令で定める」のような言い回しの繰り返しが多いが、
+1条だけでは短くて普通に圧縮しても効かない。コーパスから学習した辞書を共有して
+1条ずつ圧縮し、読むとき (検索結果の top-k など) に必要な条文だけを復元する。
+zstd は zstandard パッケージ (任意) を使う。入っていない環境では zlib の
+プリセット辞書 (よく現れる言い回しを並べたもの) を使う。
+"""
+
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Dict, Iterable, List, Type
+
+DEFAULT_DICT_SIZE = 64 * 1024
+# zlib はウィンドウ (32KB) より前の辞書を参照できない
+ZLIB_DICT_SIZE = 32 * 1024
+ZSTD_LEVEL = 19
+# zlib 辞書の学習で n-gram を数える本文の量 (文字数)
+_SAMPLE_CHARS = 200_000
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ValueError(
+            "The zstd codec needs the zstandard package (pip install zstandard)."
+        ) from e
+    return zstandard
+
+
+class TextCodec(ABC):
+    """学習済み辞書による1条ずつの圧縮・復元"""
+
+    name = ""
+
+    def __init__(self, dictionary: bytes):
+        self.dictionary = dictionary
+
+    @classmethod
+    @abstractmethod
+    def train(cls, texts: List[str], dict_size: int) -> "TextCodec": ...
+
+    @abstractmethod
+    def encode(self, text: str) -> bytes: ...
+
+    @abstractmethod
+    def decode(self, data: bytes) -> str: ...
+
+
+class ZstdCodec(TextCodec):
+    name = "zstd"
+
+    def __init__(self, dictionary: bytes):
+        super().__init__(dictionary)
+        zstd = _zstandard()
+        self._dict = zstd.ZstdCompressionDict(dictionary)
+        self._dict.precompute_compress(level=ZSTD_LEVEL)
+        # 圧縮・復元オブジェクトはスレッド間で共有できない
+        self._local = threading.local()
+
+    @classmethod
+    def train(cls, texts: List[str], dict_size: int) -> "ZstdCodec":
+        zstd = _zstandard()
+        samples = [t.encode("utf-8") for t in texts if t]
+        # 辞書は学習データより十分小さくないと学習できない
+        size = min(dict_size, max(sum(map(len, samples)) // 10, 1024))
+        try:
+            return cls(zstd.train_dictionary(size, samples).as_bytes())
+        except zstd.ZstdError as e:
+            raise ValueError(f"Could not train a zstd dictionary: {e}") from e
+
+    def _codec(self, attr: str):
+        codec = getattr(self._local, attr, None)
+        if codec is None:
+            zstd = _zstandard()
+            if attr == "compressor":
+                codec = zstd.ZstdCompressor(level=ZSTD_LEVEL, dict_data=self._dict)
+            else:
+                codec = zstd.ZstdDecompressor(dict_data=self._dict)
+            setattr(self._local, attr, codec)
+        return codec
+
+    def encode(self, text: str) -> bytes:
+        return self._codec("compressor").compress(text.encode("utf-8"))
+
+    def decode(self, data: bytes) -> str:
+        return self._codec("decompressor").decompress(data).decode("utf-8")
+
+
+def _frequent_phrases(texts: List[str], size: int) -> bytes:
+    """
+    繰り返し現れる言い回しを (出現回数 - 1) x 長さ の大きい順に選ぶ
+    deflate は近い位置ほど短く参照できるので、よく使うものほど辞書の末尾に置く。
+    """
+    step = max(1, sum(map(len, texts)) // _SAMPLE_CHARS)
+    counts: Counter = Counter()
+    for text in texts[::step]:
+        for n in (4, 8, 16):
+            counts.update(text[i : i + n] for i in range(len(text) - n + 1))
+
+    picked: List[str] = []
+    joined, total = "", 0
+    for phrase, count in sorted(
+        counts.items(), key=lambda kv: (kv[1] - 1) * len(kv[0]), reverse=True
+    ):
+        if count < 2:
+            break
+        if phrase in joined:
+            continue
+        encoded = len(phrase.encode("utf-8"))
+        if total + encoded > size:
+            break
+        picked.append(phrase)
+        joined += phrase
+        total += encoded
+    return "".join(reversed(picked)).encode("utf-8")
+
+
+class ZlibCodec(TextCodec):
+    name = "zlib"
+
+    @classmethod
+    def train(cls, texts: List[str], dict_size: int) -> "ZlibCodec":
+        return cls(_frequent_phrases(texts, min(dict_size, ZLIB_DICT_SIZE)))
+
+    def encode(self, text: str) -> bytes:
+        # 1条ごとのヘッダ・チェックサムを省くため raw deflate にする
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -15, zdict=self.dictionary)
+        return compressor.compress(text.encode("utf-8")) + compressor.flush()
+
+    def decode(self, data: bytes) -> str:
+        decompressor = zlib.decompressobj(-15, zdict=self.dictionary)
+        return (decompressor.decompress(data) + decompressor.flush()).decode("utf-8")
+
+
+CODECS: Dict[str, Type[TextCodec]] = {"zstd": ZstdCodec, "zlib": ZlibCodec}
+
+
+def _codec_class(name: str) -> Type[TextCodec]:
+    if name not in CODECS:
+        raise ValueError(f"Unknown text codec: {name}")
+    return CODECS[name]
+
+
+def train_codec(
+    texts: Iterable[str], name: str = "zstd", dict_size: int = DEFAULT_DICT_SIZE
+) -> TextCodec:
+    """本文から辞書を学習する"""
+    return _codec_class(name).train(list(texts), dict_size)
+
+
+def load_codec(name: str, dictionary: bytes) -> TextCodec:
+    """保存済みの辞書から復元する"""
+    return _codec_class(name)(dictionary)
+
+
+def default_codec_name() -> str:
+    """zstandard が入っていれば zstd、なければ zlib"""
+    try:
+        _zstandard()
+    except ValueError:
+        return "zlib"
+    return "zstd"
@@ -1,12 +1,38 @@
 import os
+import sys
 
 import requests
 import streamlit as st
 
+# streamlit run src/interface/app.py でもプロジェクトの src を import できるように
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from src.infrastructure.corpus_store import CorpusStore  # noqa: E402
+from src.infrastructure.law_catalog import LawCatalog  # noqa: E402
+from src.infrastructure.query_log import QueryLog  # noqa: E402
+from src.interface.backend_client import (  # noqa: E402
+    BackendClient,
+    BackendError,
+    TTLCache,
+)
+from src.interface.search_history import (  # noqa: E402
+    DOCUMENT_CACHE_SIZE,
+    SearchHistory,
+    render_query_html,
+    render_results_html,
+)
+from src.rag_engine.query_targeting import build_law_matcher  # noqa: E402
+
 # --- Configuration ---
-API_URL = "http://localhost:3000/search"
 PAGE_TITLE = "社会福祉士国家試験 法令検索AI (Rust Backend)"
 PAGE_ICON = "⚖️"
+# 法令一覧の先頭から本文を先読みする件数
+PREFETCH_LAWS = 5
+# 検索履歴の保持件数と表示件数
+HISTORY_SIZE = 20
+HISTORY_VISIBLE = 3
+# 閲覧モードで条文ごとに表示する関連条文の件数
+RELATED_VISIBLE = 5
 
 st.set_page_config(page_title=PAGE_TITLE, page_icon=PAGE_ICON, layout="wide")
 
@@ -19,14 +45,65 @@ if os.path.exists(css_path):
     with open(css_path, encoding="utf-8") as f:
         st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
 
+
+@st.cache_resource
+def load_law_matcher():
+    """法令名・略称・条名の照合器 (DBがなければバックエンドの意図推定に任せる)"""
+    store = CorpusStore()
+    if not os.path.exists(store.db_path):
+        return None
+    catalog = LawCatalog()
+    if not os.path.exists(catalog.cache_path):
+        catalog = None
+    return build_law_matcher(store, catalog)
+
+
+@st.cache_resource
+def get_backend() -> BackendClient:
+    """全セッションで共有する keep-alive 接続のクライアント (検索は抽出して記録する)"""
+    return BackendClient(query_log=QueryLog.from_env())
+
+
+@st.cache_data(ttl=300, max_entries=1, show_spinner=False)
+def load_law_list() -> list:
+    laws = get_backend().list_laws()
+    get_backend().prefetch(laws[:PREFETCH_LAWS])
+    return laws
+
+
+@st.cache_data(ttl=600, max_entries=32, show_spinner=False)
+def load_law_content(law_name: str) -> list:
+    return get_backend().law_content(law_name)
+
+
+@st.cache_resource
+def get_document_cache() -> TTLCache:
+    """履歴の条文本文を全セッションで共有する (セッションには参照だけを持つ)"""
+    return TTLCache(max_entries=DOCUMENT_CACHE_SIZE, ttl=24 * 3600)
+
+
+def load_documents(doc_ids: list) -> dict:
+    """共有キャッシュから追い出された条文を SQLite から引き直す"""
+    store = CorpusStore()
+    if not os.path.exists(store.db_path):
+        return {}
+    return {
+        doc_id: (doc.law_full_name, doc.article_number, doc.embedding_text())
+        for doc_id, doc in store.get_documents(doc_ids).items()
+    }
+
+
+law_matcher = load_law_matcher()
+backend = get_backend()
+
 # --- Header ---
 st.title(f"{PAGE_ICON} {PAGE_TITLE}")
 st.markdown("Backend migrated to **Rust** 🦀 for high-performance vector search.")
 st.divider()
 
 # --- Session State ---
-if "messages" not in st.session_state:
-    st.session_state.messages = []
+if "history" not in st.session_state:
+    st.session_state.history = SearchHistory(HISTORY_SIZE, get_document_cache())
 
 # --- Navigation ---
 mode = st.sidebar.radio("モード選択", ["🔎 法令検索", "📖 法令閲覧 (全文)"])
@@ -51,69 +128,37 @@ if mode == "🔎 法令検索":
         prompt and prompt != st.session_state.get("last_prompt", "")
     ):
         st.session_state.last_prompt = prompt
-        st.session_state.messages.insert(0, {"role": "user", "content": prompt})
 
         with st.spinner("Running Search on Rust Backend..."):
             try:
-                # Call Rust API
-                response = requests.post(API_URL, json={"query": prompt}, timeout=30)
-
-                if response.status_code == 200:
-                    data = response.json()
-                    results = data.get("results", [])
-                    intent_msg = data.get("intent")
-                    targeted_laws = data.get("targeted_laws", [])
-
-                    # AI Intent Info
-                    if targeted_laws:
-                        intent_str = intent_msg or "Detected"
-                        laws_str = ", ".join(targeted_laws)
-                        st.info(
-                            f"💡 **AI Intent**: {intent_str} -> 限定検索: {laws_str}"
-                        )
-
-                    # HTML Formatting
-                    if not results:
-                        html_content = (
-                            "<div class='law-card'>"
-                            "該当する条文が見つかりませんでした。"
-                            "</div>"
-                        )
-                    else:
-                        html_content = (
-                            "<div class='result-stats'>関連条文 "
-                            f"<b>{len(results)}件</b> Hit</div>"
-                        )
-
-                        for item in results:
-                            doc_text = item.get("document", "")
-                            metadata = item.get("metadata", {})
-                            distance = item.get("distance", 1.0)
-                            relevance = item.get("relevance", 0.0)
-
-                            law_name = metadata.get("law_full_name", "Unknown Law")
-                            article = metadata.get("article_number", "")
-
-                            # Render Card
-                            card = f"""<div class="law-card">
-    <div class="law-card-header">
-        <span class="law-name">{law_name}</span>
-        <span class="law-article">{article}</span>
-    </div>
-    <div class="law-content">{doc_text}</div>
-    <div class="relevance-container">
-        <span class="relevance-tag">Relevance: {relevance:.1%}</span>
-    </div>
-</div>"""
-                            html_content += card
-
-                    st.session_state.messages.insert(
-                        0, {"role": "assistant", "content": html_content}
-                    )
-
-                else:
-                    st.error(f"Backend Error ({response.status_code}): {response.text}")
+                payload = {"query": prompt}
+                detected_articles = []
+                if law_matcher is not None:
+                    # 法令の特定はローカルで済ませ、曖昧な場合のみLLMに任せる
+                    targets = law_matcher.match(prompt)
+                    payload["target_laws"] = targets.law_names
+                    payload["ambiguous"] = targets.is_ambiguous
+                    detected_articles = [a.article for a in targets.articles]
 
+                # Call Rust API
+                data = backend.search(payload)
+                results = data.get("results", [])
+                intent_msg = data.get("intent")
+                targeted_laws = data.get("targeted_laws", [])
+
+                # AI Intent Info
+                if targeted_laws:
+                    intent_str = intent_msg or "Detected"
+                    laws_str = ", ".join(targeted_laws)
+                    if detected_articles:
+                        laws_str += f" ({', '.join(detected_articles)})"
+                    st.info(f"💡 **AI Intent**: {intent_str} -> 限定検索: {laws_str}")
+
+                # 本文は共有キャッシュへ、セッションには条文IDとスコアだけを残す
+                st.session_state.history.add(prompt, intent_msg, results)
+
+            except BackendError as e:
+                st.error(str(e))
             except requests.exceptions.ConnectionError:
                 st.error(
                     "❌ Cannot connect to Backend. "
@@ -128,82 +173,86 @@ else:
 
     # Fetch list of laws
     try:
-        res = requests.get("http://localhost:3000/laws", timeout=30)
-        if res.status_code == 200:
-            law_list = res.json()
-            selected_law = st.selectbox("閲覧する法令を選択", law_list)
-
-            if selected_law:
-                with st.spinner(f"{selected_law} を読み込み中..."):
-                    res_content = requests.post(
-                        "http://localhost:3000/laws/content",
-                        json={"law_name": selected_law},
-                        timeout=30,
-                    )
-                    if res_content.status_code == 200:
-                        articles = res_content.json().get("articles", [])
-
-                        # --- Sorting ---
-                        # (Keeping original order for now)
-                        pass
-
-                        # --- Sidebar TOC ---
-                        st.sidebar.markdown("### 📑 条注目次")
-
-                        for i, article in enumerate(articles):
-                            meta = article.get("metadata", {})
-                            art_num = meta.get("article_number", f"Article {i + 1}")
-                            # Create a unique clean ID
-                            anchor_id = f"art_{i}"
-
-                            # Add link to sidebar
-                            # Markdown links to anchors work in most Streamlit versions.
-                            st.sidebar.markdown(
-                                f"[{art_num}](#{anchor_id})", unsafe_allow_html=True
-                            )
-
-                        st.success(f"{len(articles)} 条の条文を表示します。")
-
-                        # Display Content
-                        for i, article in enumerate(articles):
-                            meta = article.get("metadata", {})
-                            text = article.get("document", "")
-                            art_num = meta.get("article_number", "条文")
-                            anchor_id = f"art_{i}"
-
-                            # Anchor Point
-                            st.markdown(
-                                f"<div id='{anchor_id}'></div>",
-                                unsafe_allow_html=True,
-                            )
-
-                            # Article Display
-                            st.markdown(f"#### {art_num}")
-                            st.text_area(
-                                "内容",
-                                text,
-                                height=150,
-                                key=f"text_{i}_{selected_law}",
-                            )
-                            st.divider()
-                    else:
-                        st.error("Failed to load content.")
-        else:
-            st.error("Failed to load law list from backend.")
+        law_list = load_law_list()
+        selected_law = st.selectbox("閲覧する法令を選択", law_list)
+
+        if selected_law:
+            with st.spinner(f"{selected_law} を読み込み中..."):
+                articles = load_law_content(selected_law)
+
+            # --- Sorting ---
+            # (Keeping original order for now)
+            pass
+
+            # --- Sidebar TOC ---
+            st.sidebar.markdown("### 📑 条注目次")
+
+            for i, article in enumerate(articles):
+                meta = article.get("metadata", {})
+                art_num = meta.get("article_number", f"Article {i + 1}")
+                # Create a unique clean ID
+                anchor_id = f"art_{i}"
+
+                # Add link to sidebar
+                # Markdown links to anchors work in most Streamlit versions.
+                st.sidebar.markdown(
+                    f"[{art_num}](#{anchor_id})", unsafe_allow_html=True
+                )
+
+            st.success(f"{len(articles)} 条の条文を表示します。")
+
+            # 同じ法令内の関連条文はページ内リンクにする
+            anchors = {
+                article.get("metadata", {}).get("article_number"): f"art_{i}"
+                for i, article in enumerate(articles)
+            }
+
+            # Display Content
+            for i, article in enumerate(articles):
+                meta = article.get("metadata", {})
+                text = article.get("document", "")
+                art_num = meta.get("article_number", "条文")
+                anchor_id = f"art_{i}"
+
+                # Anchor Point
+                st.markdown(
+                    f"<div id='{anchor_id}'></div>",
+                    unsafe_allow_html=True,
+                )
+
+                # Article Display
+                st.markdown(f"#### {art_num}")
+                st.text_area(
+                    "内容",
+                    text,
+                    height=150,
+                    key=f"text_{i}_{selected_law}",
+                )
 
+                # 関連条文 (lawctl related で事前計算したもの)
+                links = []
+                for related in article.get("related", [])[:RELATED_VISIBLE]:
+                    label = related["article_number"]
+                    if related["law_full_name"] != selected_law:
+                        label = f"{related['law_full_name']} {label}"
+                    anchor = anchors.get(related["article_number"])
+                    if related["law_full_name"] == selected_law and anchor:
+                        label = f"[{label}](#{anchor})"
+                    links.append(f"{label} ({related['score']:.2f})")
+                if links:
+                    st.caption("🔗 関連条文: " + " / ".join(links))
+                st.divider()
+
+    except BackendError as e:
+        st.error(f"Failed to load from backend: {e}")
     except Exception as e:
         st.error(f"Error: {e}")
 
 
 # --- History ---
 st.divider()
-for msg in st.session_state.messages[:6]:
-    if msg["role"] == "user":
-        content = msg["content"]
-        st.markdown(
-            f"<div style='display:flex; justify-content:flex-end;'>"
-            f"<div class='user-bubble'>{content}</div></div>",
-            unsafe_allow_html=True,
-        )
-    else:
-        st.markdown(msg["content"], unsafe_allow_html=True)
+history = st.session_state.history
+for entry in history.latest(HISTORY_VISIBLE):
+    documents = history.resolve([doc_id for doc_id, _ in entry.hits], load_documents)
+    st.markdown(render_query_html(entry), unsafe_allow_html=True)
+    st.markdown(render_results_html(entry, documents), unsafe_allow_html=True)
@@ -0,0 +1,170 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.infrastructure.query_log import QueryLog
+
+logger = logging.getLogger(__name__)
+
+BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:3000")
+
+V = TypeVar("V")
+
+
+class BackendError(Exception):
+    """バックエンドが 200 以外を返した"""
+
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"Backend Error ({status_code}): {text}")
+        self.status_code = status_code
+        self.text = text
+
+
+class TTLCache(Generic[V]):
+    """件数上限と有効期限つきの LRU キャッシュ (スレッドセーフ)"""
+
+    def __init__(
+        self,
+        max_entries: int = 32,
+        ttl: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._items: "OrderedDict[str, tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[V]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            stored_at, value = item
+            if self._clock() - stored_at > self.ttl:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: V) -> None:
+        with self._lock:
+            self._items[key] = (self._clock(), value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+
+class BackendClient:
+    """
+    Rust バックエンドへのアクセスをまとめたクライアント
+    1つの requests.Session (keep-alive + コネクションプール) を使い回し、
+    法令本文は TTL つき LRU にキャッシュする。先頭の法令はバックグラウンドで先読みする。
+    query_log を渡すと検索ごとにレイテンシとバックエンドのキャッシュヒットを記録する。
+    """
+
+    def __init__(
+        self,
+        base_url: str = BACKEND_URL,
+        timeout: float = 30.0,
+        pool_size: int = 4,
+        content_cache: Optional[TTLCache[List[Dict[str, Any]]]] = None,
+        query_log: Optional[QueryLog] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.content_cache = content_cache if content_cache is not None else TTLCache()
+        self.query_log = query_log
+        self._prefetcher = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="law-prefetch"
+        )
+        self._inflight: Dict[str, Any] = {}
+        self._inflight_lock = threading.Lock()
+
+    def _post(self, path: str, payload: Dict[str, Any]) -> Any:
+        response = self.session.post(
+            self.base_url + path, json=payload, timeout=self.timeout
+        )
+        if response.status_code != 200:
+            raise BackendError(response.status_code, response.text)
+        return response.json()
+
+    def search(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        data = self._post("/search", payload)
+        if self.query_log is not None:
+            latency_ms = (time.perf_counter() - started) * 1000
+            self.query_log.record(payload, latency_ms, data.get("cached"))
+        return data
+
+    def list_laws(self) -> List[str]:
+        response = self.session.get(self.base_url + "/laws", timeout=self.timeout)
+        if response.status_code != 200:
+            raise BackendError(response.status_code, response.text)
+        return response.json()
+
+    def _fetch_content(self, law_name: str) -> List[Dict[str, Any]]:
+        articles = self._post("/laws/content", {"law_name": law_name}).get(
+            "articles", []
+        )
+        self.content_cache.put(law_name, articles)
+        return articles
+
+    def law_content(self, law_name: str) -> List[Dict[str, Any]]:
+        """法令の全条文 (先読み中なら完了を待って共有する)"""
+        cached = self.content_cache.get(law_name)
+        if cached is not None:
+            return cached
+        with self._inflight_lock:
+            future = self._inflight.get(law_name)
+        if future is not None:
+            try:
+                return future.result()
+            except Exception:
+                pass  # 先読みの失敗はここで取り直す
+        else:
+            # 確認の間に先読みが終わっていた場合
+            cached = self.content_cache.get(law_name)
+            if cached is not None:
+                return cached
+        return self._fetch_content(law_name)
+
+    def prefetch(self, law_names: List[str]) -> None:
+        """未キャッシュの法令本文をバックグラウンドで取得しておく"""
+        for name in law_names:
+            if name in self.content_cache:
+                continue
+            with self._inflight_lock:
+                if name in self._inflight:
+                    continue
+                future = self._prefetcher.submit(self._fetch_content, name)
+                self._inflight[name] = future
+            future.add_done_callback(lambda f, n=name: self._prefetch_done(n, f))
+
+    def _prefetch_done(self, law_name: str, future: Any) -> None:
+        with self._inflight_lock:
+            self._inflight.pop(law_name, None)
+        if future.exception() is not None:
+            logger.warning(f"Prefetch failed for {law_name}: {future.exception()}")
+
+    def close(self) -> None:
+        self._prefetcher.shutdown(wait=False)
+        self.session.close()
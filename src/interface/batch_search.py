@@ -0,0 +1,230 @@
+"""
+問題集 (模擬試験の設問) の一括検索
+
+設問ファイルを読み、正規化 (NFKC・空白の圧縮) して重複を除き、
+SearchService.search_many で埋め込みをまとめて取得し (クエリ埋め込みのキャッシュ経由)、
+行列×行列の積で全設問を一度に採点する。結果は設問ごとの順位つきで JSONL か CSV に書く。
+--compare を指定すると、重複を除いた設問の一部を1件ずつ /search した場合と
+一括検索 (重複を除いた設問の検索のみ) のスループットを比べる
+(--url を指定すると稼働中のバックエンドに HTTP で送る)。
+
+    lawctl batch questions.txt -o results.jsonl
+    lawctl batch exam.csv -o results.csv --compare 50 --url http://localhost:3000
+
+設問ファイル: .jsonl は {"id": ..., "question": ...} ("query" も可)、
+.csv は question (または query) 列と任意の id 列、それ以外は1行1問。
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from src.infrastructure.corpus_store import CorpusStore
+from src.infrastructure.query_log import normalize_query
+from src.interface.backend_client import BackendClient
+from src.interface.search_service import SearchService
+from src.rag_engine.embedder import HashingEmbedder
+
+CSV_FIELDS = [
+    "id",
+    "question",
+    "rank",
+    "law_full_name",
+    "article_number",
+    "distance",
+    "relevance",
+    "document",
+    "error",
+]
+
+
+@dataclass(frozen=True)
+class Question:
+    id: str
+    text: str
+
+
+def _question_text(row: Dict[str, Any]) -> str:
+    return str(row.get("question") or row.get("query") or "")
+
+
+def read_questions(path: str) -> List[Question]:
+    """設問を読み、正規化する (空の設問は飛ばす。id がなければ行番号)"""
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.endswith(".jsonl"):
+            rows = [json.loads(line) for line in f if line.strip()]
+        elif path.endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [{"question": line} for line in f]
+    questions = []
+    for number, row in enumerate(rows, start=1):
+        text = normalize_query(_question_text(row))
+        if text:
+            questions.append(Question(str(row.get("id") or number), text))
+    return questions
+
+
+def unique_payloads(questions: Iterable[Question]) -> List[Dict[str, Any]]:
+    """正規化後に同じ設問は1回だけ検索する"""
+    return [{"query": text} for text in dict.fromkeys(q.text for q in questions)]
+
+
+def result_rows(question: Question, response: Dict[str, Any]) -> Dict[str, Any]:
+    row = {
+        "id": question.id,
+        "question": question.text,
+        "intent": response.get("intent"),
+        "targeted_laws": response.get("targeted_laws", []),
+        "results": [
+            {
+                "rank": rank,
+                "law_full_name": r["metadata"].get("law_full_name"),
+                "article_number": r["metadata"].get("article_number"),
+                "distance": round(r["distance"], 4),
+                "relevance": round(r["relevance"], 4),
+                "document": r["document"],
+            }
+            for rank, r in enumerate(response.get("results", []), start=1)
+        ],
+    }
+    if response.get("error"):
+        row["error"] = response["error"]
+    return row
+
+
+def write_results(path: str, rows: List[Dict[str, Any]]) -> None:
+    """
+    .csv なら1行1件 (設問 x 順位、失敗した設問は error の1行)、
+    それ以外は1行1問の JSONL
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if not path.endswith(".csv"):
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            return
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for row in rows:
+            if row.get("error"):
+                writer.writerow(
+                    {
+                        "id": row["id"],
+                        "question": row["question"],
+                        "error": row["error"],
+                    }
+                )
+            for result in row["results"]:
+                writer.writerow(
+                    {"id": row["id"], "question": row["question"], **result}
+                )
+
+
+def run_batch(
+    service: SearchService, questions: List[Question]
+) -> List[Dict[str, Any]]:
+    """全設問の検索結果 (設問の順)"""
+    payloads = unique_payloads(questions)
+    responses = service.search_many(payloads)
+    by_text = {p["query"]: r for p, r in zip(payloads, responses, strict=True)}
+    return [result_rows(q, by_text[q.text]) for q in questions]
+
+
+def sequential_rate(
+    search: Callable[[Dict[str, Any]], Any], payloads: List[Dict[str, Any]]
+) -> float:
+    """1件ずつ検索した場合の設問/秒"""
+    started = time.perf_counter()
+    for payload in payloads:
+        search(payload)
+    return len(payloads) / max(time.perf_counter() - started, 1e-9)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Search a whole question set at once and write ranked results."
+    )
+    parser.add_argument("questions", help=".txt (one per line), .jsonl or .csv")
+    parser.add_argument(
+        "-o", "--output", required=True, help="results file (.jsonl or .csv)"
+    )
+    parser.add_argument(
+        "--compare",
+        type=int,
+        default=0,
+        help="also time this many questions sent one by one to /search",
+    )
+    parser.add_argument(
+        "--url", help="send the --compare searches to this running backend"
+    )
+    parser.add_argument(
+        "--embedder",
+        choices=["auto", "fake"],
+        default="auto",
+        help="auto: the model recorded in the vector file / fake: offline hashing",
+    )
+    parser.add_argument("--db", default="welfare_laws_v3.db")
+    parser.add_argument("--vector-dir", default="corpus_vectors")
+    args = parser.parse_args(argv)
+
+    store = CorpusStore(args.db, args.vector_dir)
+    if not store.has_vectors():
+        print(f"No vectors in {store.vector_dir}/. Run the indexer first.")
+        return 1
+    embedder = None
+    if args.embedder == "fake":
+        embedder = HashingEmbedder(store.load_vectors().dim)
+    service = SearchService.from_store(store, embedder)
+    try:
+        started = time.perf_counter()
+        questions = read_questions(args.questions)
+        searching = time.perf_counter()
+        rows = run_batch(service, questions)
+        search_elapsed = time.perf_counter() - searching
+        write_results(args.output, rows)
+        elapsed = time.perf_counter() - started
+        unique = len(unique_payloads(questions))
+        print(
+            f"📝 {len(questions)} questions ({unique} unique) -> {args.output} "
+            f"in {elapsed:.2f}s ({len(questions) / max(elapsed, 1e-9):.1f} "
+            "questions/s end-to-end)"
+        )
+
+        if args.compare > 0:
+            sample = unique_payloads(questions)[: args.compare]
+            if args.url:
+                baseline: Callable[[Dict[str, Any]], Any] = BackendClient(
+                    args.url
+                ).search
+                where = args.url
+            else:
+                # 同じ索引でキャッシュが空の /search の処理
+                baseline = SearchService(
+                    service.engine,
+                    store,
+                    service.embedder,
+                    service.matcher,
+                    law_router=service.law_router,
+                ).search
+                where = "in-process"
+            rate = sequential_rate(baseline, sample)
+            # 1件ずつの側と同じく、重複を除いた設問の検索だけの速度で比べる
+            batch_rate = unique / max(search_elapsed, 1e-9)
+            print(
+                f"🐢 Sequential /search ({where}, {len(sample)} unique questions): "
+                f"{rate:.1f} questions/s"
+            )
+            print(
+                f"🚀 Batch search ({unique} unique questions): "
+                f"{batch_rate:.1f} questions/s -> batch is {batch_rate / rate:.1f}x"
+            )
+    finally:
+        service.close()
+    return 0
@@ -0,0 +1,284 @@
+import argparse
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.core.models import Article, CatalogEntry, Law
+from src.infrastructure.database import LawRepository
+from src.infrastructure.egov_api import EGovAPIClient
+from src.infrastructure.ingest_ledger import (
+    FAILED,
+    FETCHED,
+    PARSED,
+    STORED,
+    IngestLedger,
+)
+from src.infrastructure.law_catalog import LawCatalog
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 関連する政令・省令を拾うための接尾辞
+ORDER_SUFFIXES = ("施行令", "施行規則")
+
+
+def select_entries(
+    catalog: LawCatalog,
+    names: Iterable[str] = (),
+    categories: Optional[Iterable[str]] = None,
+    contains: Optional[str] = None,
+    with_orders: bool = False,
+    limit: Optional[int] = None,
+) -> List[CatalogEntry]:
+    """法令カタログへの問い合わせで取り込み対象を決める"""
+    selected: Dict[str, CatalogEntry] = {}
+
+    for name in names:
+        entry = catalog.resolve(name)
+        if entry is None:
+            logger.warning(f"Unknown law in filter: {name}")
+            continue
+        selected[entry.law_id] = entry
+        if with_orders:
+            for suffix in ORDER_SUFFIXES:
+                for order in catalog.index.exact(entry.law_name + suffix):
+                    selected[order.law_id] = order
+
+    if contains:
+        for entry in catalog.index.contains(contains, limit=len(catalog.index)):
+            selected[entry.law_id] = entry
+
+    if not names and not contains:
+        for entry in catalog.entries:
+            selected[entry.law_id] = entry
+
+    entries = list(selected.values())
+    if categories:
+        allowed = set(categories)
+        entries = [e for e in entries if e.category in allowed]
+    return entries[:limit] if limit is not None else entries
+
+
+class ProgressMeter:
+    """処理件数からスループットと残り時間 (ETA) を算出してログに出す"""
+
+    def __init__(self, total: int, report_every: float = 5.0):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.articles = 0
+        self.report_every = report_every
+        self.started = time.perf_counter()
+        self._last_report = self.started
+
+    def update(self, ok: bool, articles: int = 0) -> None:
+        self.done += 1
+        self.articles += articles
+        if not ok:
+            self.failed += 1
+        now = time.perf_counter()
+        if now - self._last_report >= self.report_every or self.done == self.total:
+            self._last_report = now
+            logger.info(self.line())
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def line(self) -> str:
+        elapsed = max(self.elapsed, 1e-9)
+        rate = self.done / elapsed
+        eta = (self.total - self.done) / rate if rate > 0 else float("inf")
+        return (
+            f"[{self.done}/{self.total}] {rate:.2f} laws/s, "
+            f"{self.articles / elapsed:.1f} articles/s, "
+            f"failed {self.failed}, ETA {eta:.0f}s"
+        )
+
+
+def fetch_and_parse(
+    api: EGovAPIClient,
+    ledger: IngestLedger,
+    entry: CatalogEntry,
+    known_stamp: Optional[str] = None,
+) -> Tuple[Law, Optional[List[Article]]]:
+    """
+    ワーカー側の処理 (取得とパース)。失敗時は例外を送出する
+    known_stamp と改正スタンプが一致する法令は条文を解析せず None を返す。
+    """
+    ledger.start_attempt(entry.law_id)
+    xml_content = api.fetch_law_xml(entry.law_id)
+    if not xml_content:
+        raise RuntimeError("fetch returned no content")
+    ledger.mark(entry.law_id, FETCHED)
+    if known_stamp is not None:
+        law = api.parse_law_metadata(xml_content, entry.law_id)
+        if law.amendment_stamp == known_stamp:
+            return law, None
+    law, articles = api.parse_law_xml(xml_content, entry.law_id)
+    ledger.mark(entry.law_id, PARSED, article_count=len(articles))
+    return law, articles
+
+
+def run_bulk_ingest(
+    entries: List[CatalogEntry],
+    repository: LawRepository,
+    ledger: IngestLedger,
+    api: EGovAPIClient,
+    workers: int = 4,
+    store_batch: int = 20,
+    retry_failed: bool = True,
+    update: bool = False,
+) -> Dict[str, int]:
+    """
+    台帳で未完了の法令だけを並列 (workers 件まで) に取得・パースし、
+    store_batch 件ずつ1トランザクションで保存する。
+    update=True の場合は保存済みの法令も再確認し、改正スタンプが
+    変わった法令だけを保存し直す。
+    """
+    todo = ledger.plan(entries, retry_failed=retry_failed, include_stored=update)
+    known_stamps = repository.get_amendment_stamps() if update else {}
+    unchanged = 0
+    logger.info(
+        f"Planned {len(entries)} laws: {len(entries) - len(todo)} already done, "
+        f"{len(todo)} to ingest with {workers} workers."
+    )
+    progress = ProgressMeter(len(todo))
+    buffer: List[Tuple[Law, List[Article]]] = []
+
+    def flush() -> None:
+        if not buffer:
+            return
+        try:
+            repository.save_laws_batch(buffer)
+        except Exception as e:
+            for law, _ in buffer:
+                ledger.mark(law.law_id, FAILED, error=f"store: {e}")
+        else:
+            for law, articles in buffer:
+                ledger.mark(law.law_id, STORED, article_count=len(articles))
+        buffer.clear()
+
+    queue = iter(todo)
+    in_flight: Dict[Future, CatalogEntry] = {}
+    # 同時に保持するXMLを抑えるため、投入数を workers の2倍までに制限する
+    max_in_flight = max(1, workers) * 2
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while True:
+            while len(in_flight) < max_in_flight:
+                entry = next(queue, None)
+                if entry is None:
+                    break
+                future = pool.submit(
+                    fetch_and_parse,
+                    api,
+                    ledger,
+                    entry,
+                    known_stamps.get(entry.law_id),
+                )
+                in_flight[future] = entry
+            if not in_flight:
+                break
+
+            finished: Set[Future] = wait(in_flight, return_when=FIRST_COMPLETED)[0]
+            for future in finished:
+                entry = in_flight.pop(future)
+                try:
+                    law, articles = future.result()
+                except Exception as e:
+                    ledger.mark(entry.law_id, FAILED, error=str(e))
+                    logger.error(f"Failed {entry.law_name} ({entry.law_id}): {e}")
+                    progress.update(ok=False)
+                    continue
+                if articles is None:
+                    # 改正なし: 再保存せず stored のまま
+                    ledger.mark(entry.law_id, STORED)
+                    unchanged += 1
+                    progress.update(ok=True)
+                    continue
+                buffer.append((law, articles))
+                progress.update(ok=True, articles=len(articles))
+                if len(buffer) >= store_batch:
+                    flush()
+        flush()
+
+    logger.info(f"Finished in {progress.elapsed:.1f}s: {progress.line()}")
+    if update:
+        logger.info(f"Unchanged (amendment stamp not moved): {unchanged}")
+    return ledger.summary()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Bulk-ingest laws selected from the e-Gov law catalogue."
+    )
+    parser.add_argument("names", nargs="*", help="Law names or abbreviations")
+    parser.add_argument("--names-file", help="File with one law name per line")
+    parser.add_argument(
+        "--category", action="append", help="Law type filter (法律, 政令, ...)"
+    )
+    parser.add_argument("--contains", help="Substring filter on law names")
+    parser.add_argument(
+        "--with-orders",
+        action="store_true",
+        help="Also ingest the 施行令/施行規則 of each named law",
+    )
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--store-batch", type=int, default=20)
+    parser.add_argument("--no-retry-failed", action="store_true")
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Re-check stored laws and re-ingest only those with new amendments",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only print the ingestion plan"
+    )
+    parser.add_argument("--db", default="welfare_laws_v3.db")
+    args = parser.parse_args(argv)
+
+    names = list(args.names)
+    if args.names_file:
+        with open(args.names_file, encoding="utf-8") as f:
+            names.extend(line.strip() for line in f if line.strip())
+
+    catalog = LawCatalog()
+    entries = select_entries(
+        catalog,
+        names=names,
+        categories=args.category,
+        contains=args.contains,
+        with_orders=args.with_orders,
+        limit=args.limit,
+    )
+    ledger = IngestLedger(args.db)
+
+    if args.dry_run:
+        todo = ledger.preview(
+            entries, retry_failed=not args.no_retry_failed, include_stored=args.update
+        )
+        logger.info(f"{len(entries)} laws selected, {len(todo)} to ingest.")
+        for entry in todo:
+            logger.info(f"  {entry.law_id} [{entry.category}] {entry.law_name}")
+        return
+
+    summary = run_bulk_ingest(
+        entries,
+        LawRepository(args.db),
+        ledger,
+        EGovAPIClient(known_laws=catalog.known_laws()),
+        workers=args.workers,
+        store_batch=args.store_batch,
+        retry_failed=not args.no_retry_failed,
+        update=args.update,
+    )
+    logger.info(f"Ledger: {summary}")
+    for law_id, law_name, attempts, error in ledger.failures():
+        logger.warning(f"  failed {law_id} {law_name} (attempts {attempts}): {error}")
+
+
+if __name__ == "__main__":
+    main()
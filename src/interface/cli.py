@@ -0,0 +1,278 @@
+"""
+lawctl: 取り込み・埋め込み・エクスポート・検索・確認・計測の統合CLI
+
+起動を軽く保つため、このモジュールは標準ライブラリ以外を import しない。
+chromadb / google.generativeai / numpy などは各サブコマンドの実行時にだけ読み込む。
+"""
+
+import argparse
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_DB = "welfare_laws_v3.db"
+DEFAULT_VECTOR_DIR = "corpus_vectors"
+
+
+# --- 既存の CLI に引数をそのまま渡すサブコマンド ---
+
+
+def _run_ingest(argv: List[str]) -> int:
+    from src.interface import bulk_ingest
+
+    bulk_ingest.main(argv)
+    return 0
+
+
+def _run_index(argv: List[str]) -> int:
+    from src.rag_engine import indexer
+
+    indexer.main(argv)
+    return 0
+
+
+def _run_dedup(argv: List[str]) -> int:
+    from src.rag_engine import dedup
+
+    return dedup.main(argv)
+
+
+def _run_project(argv: List[str]) -> int:
+    from src.rag_engine import projection
+
+    return projection.main(argv)
+
+
+def _run_related(argv: List[str]) -> int:
+    from src.rag_engine import related
+
+    return related.main(argv)
+
+
+def _run_compress(argv: List[str]) -> int:
+    from src.interface import compress_text
+
+    return compress_text.main(argv)
+
+
+def _run_export(argv: List[str]) -> int:
+    from src.interface import export_index
+
+    return export_index.main(argv)
+
+
+def _run_serve(argv: List[str]) -> int:
+    from src.interface import search_service
+
+    return search_service.main(argv)
+
+
+def _run_batch(argv: List[str]) -> int:
+    from src.interface import batch_search
+
+    return batch_search.main(argv)
+
+
+def _run_synth(argv: List[str]) -> int:
+    from src.interface import synth_corpus
+
+    return synth_corpus.main(argv)
+
+
+def _run_loadtest(argv: List[str]) -> int:
+    from src.interface import load_test
+
+    return load_test.main(argv)
+
+
+DELEGATED: Dict[str, tuple[Callable[[List[str]], int], str]] = {
+    "ingest": (_run_ingest, "e-Gov から法令を一括取り込み (bulk_ingest)"),
+    "index": (_run_index, "条文を埋め込んで corpus_vectors/ を更新 (indexer)"),
+    "dedup": (_run_dedup, "重複・「削除」条文の除去でベクトルがどれだけ減るかを表示"),
+    "project": (_run_project, "保存済みベクトルを PCA で指定次元に削減"),
+    "related": (_run_related, "条文ごとの関連条文 (類似度上位k件) を事前計算"),
+    "compress": (_run_compress, "条文の本文をコーパスで学習した辞書で圧縮"),
+    "export": (_run_export, "backend/data に索引の新しい世代を公開"),
+    "serve": (_run_serve, "Rust バックエンド互換の検索APIを Python で起動"),
+    "batch": (_run_batch, "問題集の設問をまとめて検索し JSONL/CSV に書き出す"),
+    "synth": (_run_synth, "性能測定用の e-Gov 形式の合成コーパスを生成"),
+    "loadtest": (_run_loadtest, "クエリログを目標レートで再生する開ループ負荷試験"),
+}
+
+
+# --- lawctl 独自のサブコマンド ---
+
+
+def _open_engine(args: argparse.Namespace):
+    from src.infrastructure.corpus_store import CorpusStore
+    from src.rag_engine.embedder import embedder_for_model
+    from src.rag_engine.query_targeting import build_law_matcher
+    from src.rag_engine.vector_engine import VectorEngine
+
+    store = CorpusStore(args.db, args.vector_dir)
+    if not store.has_vectors():
+        raise ValueError(f"No vectors in {store.vector_dir}/. Run `lawctl index`.")
+    engine = VectorEngine.from_store(store)
+    # ベクトルファイルと同じモデルでクエリを埋め込む
+    embedder = embedder_for_model(engine.vectors.model)
+    return engine, embedder, build_law_matcher(store)
+
+
+def _cmd_search(args: argparse.Namespace) -> int:
+    import json
+
+    engine, embedder, matcher = _open_engine(args)
+    targets = matcher.match(args.query)
+    law_ids = None if args.all_laws or targets.is_ambiguous else targets.law_ids
+    if law_ids:
+        print(f"🎯 Targeted: {', '.join(targets.law_names)}")
+    try:
+        where = json.loads(args.where) if args.where else None
+    except json.JSONDecodeError as e:
+        raise ValueError(f"--where is not valid JSON: {e}") from e
+
+    hits = engine.search(
+        embedder.embed_query(args.query),
+        n_results=args.k,
+        law_ids=law_ids,
+        expand_references=args.expand,
+        where=where,
+    )
+    for i, hit in enumerate(hits, start=1):
+        doc = hit.document
+        if doc is None:
+            continue
+        relation = f" ({hit.relation} {hit.expanded_from})" if hit.relation else ""
+        print(f"{i:2d}. [{hit.score:.4f}] {doc.law_full_name} {doc.article_number}")
+        print(f"    {doc.content[:80]}{relation}")
+    return 0
+
+
+def _cmd_inspect(args: argparse.Namespace) -> int:
+    from src.infrastructure.corpus_store import CorpusStore
+    from src.infrastructure.ingest_ledger import IngestLedger
+
+    store = CorpusStore(args.db, args.vector_dir)
+    laws = store.list_laws()
+    print(f"📚 {len(laws)} laws, {sum(law.article_count for law in laws)} articles")
+    for law in laws:
+        print(f"   {law.law_id}  {law.article_count:5d}  {law.law_full_name}")
+
+    if store.has_vectors():
+        vectors = store.load_vectors()
+        print(
+            f"🧮 {len(vectors.ids)} vectors, dim {vectors.dim}, model {vectors.model}"
+        )
+    else:
+        print("🧮 No vectors yet")
+
+    summary = IngestLedger(args.db).summary()
+    if summary:
+        print("📋 Ingest status: " + ", ".join(f"{k}={v}" for k, v in summary.items()))
+    return 0
+
+
+def _cmd_bench(args: argparse.Namespace) -> int:
+    import random
+
+    import numpy as np
+
+    engine, embedder, matcher = _open_engine(args)
+    documents = list(engine.store.iter_documents()) if engine.store else []
+    candidates = [d.content for d in documents if len(d.content) >= 40]
+    if not candidates:
+        print("No articles to sample queries from.")
+        return 1
+    rng = random.Random(args.seed)
+    queries = [
+        text[start : start + 30]
+        for text in rng.choices(candidates, k=args.queries)
+        for start in [rng.randrange(0, len(text) - 30)]
+    ]
+
+    stages: Dict[str, List[float]] = {"target": [], "embed": [], "search": []}
+    for query in queries:
+        t0 = time.perf_counter()
+        targets = matcher.match(query)
+        t1 = time.perf_counter()
+        vector = embedder.embed_query(query)
+        t2 = time.perf_counter()
+        engine.search(vector, n_results=args.k, law_ids=targets.law_ids or None)
+        t3 = time.perf_counter()
+        stages["target"].append(t1 - t0)
+        stages["embed"].append(t2 - t1)
+        stages["search"].append(t3 - t2)
+
+    print(f"⏱️ {len(queries)} queries over {len(engine.vectors.ids)} vectors")
+    for name, samples in stages.items():
+        ms = np.array(samples) * 1000
+        print(
+            f"   {name:<7} p50 {np.percentile(ms, 50):8.3f} ms"
+            f"  p99 {np.percentile(ms, 99):8.3f} ms"
+        )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="lawctl", description="法令コーパスの取り込み・索引・検索ツール"
+    )
+    sub = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    for name, (_, help_text) in DELEGATED.items():
+        # 引数 (--help を含む) はそのまま委譲先の CLI に渡す
+        sub.add_parser(name, help=help_text, add_help=False)
+
+    def add_store_args(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--db", default=DEFAULT_DB)
+        p.add_argument("--vector-dir", default=DEFAULT_VECTOR_DIR)
+
+    search = sub.add_parser("search", help="コーパスを検索して上位の条文を表示")
+    search.add_argument("query")
+    search.add_argument("-k", type=int, default=10)
+    search.add_argument("--expand", type=int, default=0, help="参照条文の展開数")
+    search.add_argument(
+        "--all-laws", action="store_true", help="法令名による絞り込みをしない"
+    )
+    search.add_argument(
+        "--where",
+        help=(
+            "メタデータ条件 (JSON)。hierarchy は最上位 (編があれば編) からのパス "
+            '例: \'{"hierarchy": {"$prefix": "第一編 総則 > 第二章"}}\''
+        ),
+    )
+    add_store_args(search)
+    search.set_defaults(handler=_cmd_search)
+
+    inspect = sub.add_parser("inspect", help="登録済み法令・ベクトル・取り込み状況")
+    add_store_args(inspect)
+    inspect.set_defaults(handler=_cmd_inspect)
+
+    bench = sub.add_parser("bench", help="検索経路 (照合・埋め込み・検索) の計測")
+    bench.add_argument("--queries", type=int, default=200)
+    bench.add_argument("-k", type=int, default=10)
+    bench.add_argument("--seed", type=int, default=0)
+    add_store_args(bench)
+    bench.set_defaults(handler=_cmd_bench)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv and argv[0] in DELEGATED:
+        return DELEGATED[argv[0]][0](argv[1:])
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 0
+    try:
+        return args.handler(args)
+    except ValueError as e:
+        print(f"⚠️ {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
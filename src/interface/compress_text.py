@@ -0,0 +1,51 @@
+import argparse
+from typing import List, Optional
+
+from src.infrastructure.corpus_store import CorpusStore
+from src.infrastructure.text_codec import (
+    CODECS,
+    DEFAULT_DICT_SIZE,
+    default_codec_name,
+    train_codec,
+)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compress article text in SQLite with a dictionary trained "
+        "on the corpus (each article stays individually decodable)."
+    )
+    parser.add_argument("--db", default="welfare_laws_v3.db")
+    parser.add_argument(
+        "--codec",
+        choices=sorted(CODECS),
+        default=None,
+        help="zstd (zstandard が必要) / zlib。既定は使える方",
+    )
+    parser.add_argument("--dict-size", type=int, default=DEFAULT_DICT_SIZE)
+    parser.add_argument(
+        "--decompress", action="store_true", help="平文に戻して辞書を削除する"
+    )
+    args = parser.parse_args(argv)
+
+    store = CorpusStore(args.db)
+    if args.decompress:
+        count = store.repository.decompress_articles()
+        print(f"📖 Restored {count} articles to plain text")
+        return 0
+
+    name = args.codec or default_codec_name()
+    texts = [doc.content for doc in store.iter_documents()]
+    print(f"🧠 Training a {name} dictionary on {len(texts)} articles...")
+    try:
+        codec = train_codec(texts, name, args.dict_size)
+    except ValueError as e:
+        print(f"⚠️ {e}")
+        return 1
+    plain, packed = store.repository.compress_articles(codec)
+    dictionary_kib = len(codec.dictionary) / 1024
+    print(
+        f"🗜️ {plain / 1024:.1f} KiB -> {packed / 1024:.1f} KiB "
+        f"(x{plain / max(packed, 1):.2f}, dictionary {dictionary_kib:.1f} KiB)"
+    )
+    return 0
@@ -0,0 +1,339 @@
+import argparse
+import base64
+import json
+import os
+import shutil
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.core.models import CorpusDocument
+from src.infrastructure.corpus_store import CorpusStore, NeighborGraph, VectorSet
+from src.infrastructure.database import HIERARCHY_SEP
+from src.infrastructure.generations import (
+    DEFAULT_KEEP,
+    GenerationStore,
+    read_manifest,
+)
+from src.infrastructure.text_codec import TextCodec, default_codec_name, train_codec
+from src.rag_engine.embedder import output_dimensionality
+from src.rag_engine.routing import LAW_MARGIN, MAX_TARGET_LAWS, CentroidRouter
+
+DEFAULT_DATA_DIR = os.path.join("backend", "data")
+INDEX_FILE = "index.json"
+DEFAULT_OUTPUT = os.path.join(DEFAULT_DATA_DIR, INDEX_FILE)
+# クエリ側の設定 (出力次元・PCA射影)。Rust バックエンドが index.json と一緒に読む
+QUERY_TRANSFORM_FILE = "query_transform.json"
+# 法令セントロイド。Rust バックエンドは LLM による法令推定の前にこれで推定する
+LAW_CENTROIDS_FILE = "law_centroids.json"
+
+
+def query_transform(vectors: VectorSet) -> dict:
+    projection = vectors.projection
+    return {
+        "output_dimensionality": output_dimensionality(vectors.model),
+        "projection": {
+            "mean": projection.mean.tolist(),
+            "components": projection.components.tolist(),
+        }
+        if projection is not None
+        else None,
+    }
+
+
+def law_centroids(store: CorpusStore, vectors: VectorSet) -> dict:
+    router = CentroidRouter.from_store(store, vectors)
+    names = {law.law_id: law.law_full_name for law in store.list_laws()}
+    return {
+        "margin": LAW_MARGIN,
+        "max_laws": MAX_TARGET_LAWS,
+        "laws": [
+            {"law_full_name": names.get(law_id, law_id), "centroid": unit.tolist()}
+            for law_id, unit in zip(router.law_ids, router.law_unit, strict=True)
+        ],
+    }
+
+
+class CompactTables:
+    """
+    index.json の文字列表 (法令・階層の見出し・階層ノード)
+    条文は法令と末端の階層ノードを添字で参照する。ノードは [親ノード, 見出し] で、
+    親は必ず子より前に並ぶ (最上位の親は null)。
+    """
+
+    def __init__(self):
+        self.laws: List[Dict[str, str]] = []
+        self.titles: List[str] = []
+        self.nodes: List[Tuple[Optional[int], int]] = []
+        self._law: Dict[str, int] = {}
+        self._title: Dict[str, int] = {}
+        self._node: Dict[Tuple[Optional[int], int], int] = {}
+        self._path: Dict[str, Optional[int]] = {}
+
+    def law(self, doc: CorpusDocument) -> int:
+        if doc.law_id not in self._law:
+            self._law[doc.law_id] = len(self.laws)
+            self.laws.append({"law_id": doc.law_id, "law_full_name": doc.law_full_name})
+        return self._law[doc.law_id]
+
+    def hierarchy(self, hierarchy: str) -> Optional[int]:
+        if hierarchy in self._path:
+            return self._path[hierarchy]
+        node: Optional[int] = None
+        for title in hierarchy.split(HIERARCHY_SEP) if hierarchy else []:
+            title_index = self._title.setdefault(title, len(self.titles))
+            if title_index == len(self.titles):
+                self.titles.append(title)
+            key = (node, title_index)
+            if key not in self._node:
+                self._node[key] = len(self.nodes)
+                self.nodes.append(key)
+            node = self._node[key]
+        self._path[hierarchy] = node
+        return node
+
+    def to_json(self) -> dict:
+        return {
+            "laws": self.laws,
+            "titles": self.titles,
+            "hierarchy": [list(node) for node in self.nodes],
+        }
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def compact_index(
+    documents: Iterable[CorpusDocument],
+    vectors: VectorSet,
+    codec: Optional[TextCodec] = None,
+    neighbors: Optional[NeighborGraph] = None,
+) -> dict:
+    """
+    index.json の内容 (法令名・hierarchy は文字列表に1回だけ持つ)
+    doc_id・検索用テキスト・メタデータは読み込み側で法令・階層・条名・本文から組み立てる。
+    codec を渡すと本文を辞書圧縮して base64 で持つ (content_zstd, content_size)。
+    neighbors を渡すと関連条文を docs の添字と類似度の組 (related) で持つ。
+    """
+    rows = vectors.row_of()
+    tables = CompactTables()
+    docs = []
+    doc_rows: List[int] = []
+    # 本文は SQLite から一度だけ読み、ベクトルは doc_id で行を引く
+    # (重複除去で代表に統合された条文は代表のベクトルを使う)
+    for doc in documents:
+        row = rows.get(vectors.aliases.get(doc.doc_id, doc.doc_id))
+        if row is None:
+            continue
+        entry = {
+            "law": tables.law(doc),
+            "article_number": doc.article_number,
+            "hierarchy": tables.hierarchy(doc.hierarchy),
+        }
+        if codec is None:
+            entry["content"] = doc.content
+        else:
+            entry[f"content_{codec.name}"] = _b64(codec.encode(doc.content))
+            entry["content_size"] = len(doc.content.encode("utf-8"))
+        entry["embedding"] = vectors.matrix[row].tolist()
+        docs.append(entry)
+        doc_rows.append(row)
+    if neighbors is not None:
+        # 行 -> その行を使う最初の条文 (統合された重複条文は代表と同じ行)
+        ordinal: Dict[int, int] = {}
+        for i, row in enumerate(doc_rows):
+            ordinal.setdefault(row, i)
+        for entry, row in zip(docs, doc_rows, strict=True):
+            entry["related"] = [
+                [ordinal[r], round(float(score), 4)]
+                for r, score in zip(
+                    neighbors.rows[row].tolist(), neighbors.scores[row], strict=True
+                )
+                if r in ordinal
+            ]
+    index = {**tables.to_json(), "docs": docs}
+    if codec is not None:
+        index["text_codec"] = {
+            "name": codec.name,
+            "dictionary": _b64(codec.dictionary),
+        }
+    return index
+
+
+def _load_export_vectors(store: CorpusStore) -> VectorSet:
+    if not store.has_vectors():
+        raise ValueError(f"No vectors found in {store.vector_dir}/. Run the indexer.")
+    vectors = store.load_vectors(mmap=True)
+    if vectors.model.startswith("local-lsa"):
+        raise ValueError(
+            "Vectors were built with the local embedder; the backend expects "
+            "Gemini. Re-run the indexer with --embedder gemini before exporting."
+        )
+    return vectors
+
+
+def write_index_files(
+    store: CorpusStore,
+    directory: str,
+    compress_text: bool = False,
+    index_file: str = INDEX_FILE,
+) -> dict:
+    """index.json・query_transform.json・law_centroids.json を directory に書く"""
+    # Rust バックエンドが復元できるのは zstd だけなので zlib には切り替えない
+    if compress_text and default_codec_name() != "zstd":
+        raise ValueError(
+            "--compress-text needs the zstandard package (pip install zstandard); "
+            "the backend only decodes zstd. Export without --compress-text."
+        )
+    vectors = _load_export_vectors(store)
+    documents: Iterable[CorpusDocument] = store.iter_documents()
+    codec = None
+    if compress_text:
+        documents = list(documents)
+        codec = train_codec([doc.content for doc in documents], "zstd")
+    export_data = compact_index(
+        documents, vectors, codec, store.load_neighbors(vectors)
+    )
+
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, index_file), "w", encoding="utf-8") as f:
+        json.dump(export_data, f, ensure_ascii=False)
+    with open(
+        os.path.join(directory, QUERY_TRANSFORM_FILE), "w", encoding="utf-8"
+    ) as f:
+        json.dump(query_transform(vectors), f)
+    with open(os.path.join(directory, LAW_CENTROIDS_FILE), "w", encoding="utf-8") as f:
+        json.dump(law_centroids(store, vectors), f, ensure_ascii=False)
+    return {
+        "documents": len(export_data["docs"]),
+        "dimension": int(vectors.matrix.shape[1]),
+        "model": vectors.model,
+        "text_codec": codec.name if codec is not None else None,
+    }
+
+
+def check_index(directory: str, documents: int, dimension: int) -> None:
+    """書き出した index.json を読み直し、件数と次元を確かめる"""
+    path = os.path.join(directory, INDEX_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            docs = json.load(f)["docs"]
+    except (OSError, ValueError, KeyError) as e:
+        raise ValueError(f"Unreadable index {path}: {e}") from e
+    if len(docs) != documents:
+        raise ValueError(f"{path} has {len(docs)} docs, expected {documents}")
+    if any(len(doc["embedding"]) != dimension for doc in docs):
+        raise ValueError(f"{path} has embeddings that are not {dimension}-dim")
+
+
+def export_index(
+    store: CorpusStore, output_path: str = DEFAULT_OUTPUT, compress_text: bool = False
+) -> int:
+    """
+    CorpusStore (SQLite本文 + memmapベクトル) から backend/data/index.json を生成する
+    Rust バックエンドはクエリを Gemini で埋め込むため、ローカルモデルのベクトルは拒否。
+    compress_text では本文を zstd 辞書で圧縮する (バックエンドは読み込み時に復元する)。
+    lawctl related で関連条文を計算済みなら、それも条文ごとに含める。
+    既存のファイルをその場で上書きするので、稼働中の差し替えには publish_index を使う。
+    """
+    info = write_index_files(
+        store,
+        os.path.dirname(output_path),
+        compress_text,
+        index_file=os.path.basename(output_path),
+    )
+    return info["documents"]
+
+
+def publish_index(
+    store: CorpusStore,
+    data_dir: str = DEFAULT_DATA_DIR,
+    compress_text: bool = False,
+    keep: int = DEFAULT_KEEP,
+) -> Tuple[str, dict]:
+    """
+    新しい世代ディレクトリに書き出し、件数・次元・チェックサムを検証してから公開する
+    稼働中のバックエンドは CURRENT の変更を見て読み込み直す。失敗時は何も公開しない。
+    """
+    generations = GenerationStore(data_dir)
+    staging = generations.stage()
+    try:
+        info = write_index_files(store, staging, compress_text)
+        check_index(staging, info["documents"], info["dimension"])
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    name = generations.publish(staging, keep, **info)
+    return name, info
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Export the corpus store to the Rust backend index."
+    )
+    parser.add_argument(
+        "--data-dir",
+        default=DEFAULT_DATA_DIR,
+        help="publish a new index generation here (the backend reloads it)",
+    )
+    parser.add_argument(
+        "--output", help="write a single index.json in place instead (no generations)"
+    )
+    parser.add_argument("--db", default="welfare_laws_v3.db")
+    parser.add_argument("--vector-dir", default="corpus_vectors")
+    parser.add_argument(
+        "--compress-text",
+        action="store_true",
+        help="本文をコーパスで学習した zstd 辞書で圧縮する (zstandard が必要)",
+    )
+    parser.add_argument(
+        "--keep",
+        type=int,
+        default=DEFAULT_KEEP,
+        help="number of generations to keep for rollback",
+    )
+    actions = parser.add_mutually_exclusive_group()
+    actions.add_argument(
+        "--rollback",
+        action="store_true",
+        help="point CURRENT back at the previous generation",
+    )
+    actions.add_argument("--list", action="store_true", help="list generations")
+    args = parser.parse_args(argv)
+
+    generations = GenerationStore(args.data_dir)
+    if args.list:
+        current = generations.current()
+        for name in generations.names():
+            manifest = read_manifest(generations.path(name))
+            marker = "*" if name == current else " "
+            print(
+                f"{marker} {name}  {manifest.get('created_at')}  "
+                f"{manifest.get('documents')} docs  {manifest.get('model')}"
+            )
+        return 0
+    if args.rollback:
+        try:
+            name = generations.rollback()
+        except ValueError as e:
+            print(f"⚠️ {e}")
+            return 1
+        print(f"Rolled back {args.data_dir} to generation {name}")
+        return 0
+
+    print("Initializing CorpusStore...")
+    store = CorpusStore(args.db, args.vector_dir)
+    try:
+        if args.output:
+            count = export_index(store, args.output, args.compress_text)
+            print(f"Successfully exported {count} items to {args.output}")
+            return 0
+        name, info = publish_index(store, args.data_dir, args.compress_text, args.keep)
+    except ValueError as e:
+        print(f"⚠️ {e}")
+        return 1
+    print(
+        f"Published generation {name} ({info['documents']} items) "
+        f"to {generations.path(name)}"
+    )
+    return 0
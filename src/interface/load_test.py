@@ -0,0 +1,437 @@
+"""
+検索APIの開ループ負荷試験 (クエリログの再生)
+
+JSONL のクエリログまたは合成のクエリ構成から、目標の到着レート (req/s) で
+/search と /laws/content を送る。リクエストは前の応答を待たずに予定時刻に発生させ
+(開ループ)、レイテンシは予定時刻から測る (coordinated omission の補正)。
+接続が足りずに送れなかった時間も待ち時間として数え、送信から応答までの時間
+(閉ループのツールが測る値) は service time として別に集計する。
+Rust バックエンドにも Python の検索サービス (lawctl serve) にも使える。
+
+クエリログは1行1リクエスト (検索サービスの QueryLog の記録もそのまま使える):
+    {"query": "生活保護の申請"}                  -> POST /search
+    {"law_name": "生活保護法"}                   -> POST /laws/content
+    {"path": "/search", "body": {"query": "..."}}  (そのまま送る)
+
+    lawctl loadtest --url http://localhost:3000 --rate 50 --duration 30
+    lawctl loadtest --log queries.jsonl --rate 200 --arrivals poisson
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.infrastructure.query_log import search_request
+
+SEARCH_PATH = "/search"
+CONTENT_PATH = "/laws/content"
+
+SYNTHETIC_QUERIES = [
+    "生活保護の申請手続き",
+    "高齢者虐待の通報義務",
+    "児童相談所の一時保護",
+    "介護保険の要介護認定",
+    "障害福祉サービスの支給決定",
+    "生活困窮者自立支援法の目的",
+    "DV防止法の保護命令",
+    "精神保健福祉法の措置入院",
+]
+SYNTHETIC_LAWS = ["生活保護法", "児童福祉法", "介護保険法", "障害者総合支援法"]
+
+# 集計の表示に使うパーセンタイル
+PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """
+    HdrHistogram と同じ形の対数バケットによるレイテンシの集計 (マイクロ秒)
+    各バケットを 2 * 10^digits 以上に細分し、値の大きさによらず有効桁数を保つ。
+    パーセンタイルはそのバケットに入る最大の値 (HdrHistogram と同じ) を返す。
+    """
+
+    def __init__(self, significant_digits: int = 3):
+        sub_buckets = 2 ** math.ceil(math.log2(2 * 10**significant_digits))
+        self._half_magnitude = int(math.log2(sub_buckets)) - 1
+        self._mask = sub_buckets - 1
+        self.counts: Counter = Counter()
+        self.total = 0
+        self.min = 0
+        self.max = 0
+        self._sum = 0
+
+    def _index(self, value: int) -> int:
+        bucket = (value | self._mask).bit_length() - self._half_magnitude - 1
+        sub = value >> bucket
+        return (
+            ((bucket + 1) << self._half_magnitude) + sub - (1 << self._half_magnitude)
+        )
+
+    def _highest_equivalent(self, index: int) -> int:
+        bucket = (index >> self._half_magnitude) - 1
+        sub = (index & ((1 << self._half_magnitude) - 1)) + (1 << self._half_magnitude)
+        if bucket < 0:
+            bucket, sub = 0, sub - (1 << self._half_magnitude)
+        return ((sub + 1) << bucket) - 1
+
+    def record(self, seconds: float) -> None:
+        value = max(0, int(seconds * 1e6))
+        self.counts[self._index(value)] += 1
+        self.min = value if self.total == 0 else min(self.min, value)
+        self.max = max(self.max, value)
+        self.total += 1
+        self._sum += value
+
+    def add(self, other: "LatencyHistogram") -> None:
+        if other.total == 0:
+            return
+        self.min = other.min if self.total == 0 else min(self.min, other.min)
+        self.counts.update(other.counts)
+        self.max = max(self.max, other.max)
+        self.total += other.total
+        self._sum += other._sum
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self.total if self.total else 0.0
+
+    def value_at(self, percentile: float) -> int:
+        """percentile (0-100) 以下に全体のその割合が入る値 (マイクロ秒)"""
+        if self.total == 0:
+            return 0
+        target = max(1, math.ceil(percentile / 100 * self.total))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max)
+        return self.max
+
+
+@dataclass(frozen=True)
+class LoadRequest:
+    method: str
+    path: str
+    body: Optional[Dict[str, Any]] = None
+
+
+def parse_log_line(line: str) -> LoadRequest:
+    entry = json.loads(line)
+    if "path" in entry:
+        return LoadRequest(
+            entry.get("method", "POST"), entry["path"], entry.get("body")
+        )
+    if "law_name" in entry:
+        return LoadRequest("POST", CONTENT_PATH, {"law_name": entry["law_name"]})
+    if "query" in entry:
+        return LoadRequest("POST", SEARCH_PATH, search_request(entry))
+    raise ValueError(f"Unrecognized log entry: {line.strip()[:80]}")
+
+
+def load_log(path: str) -> List[LoadRequest]:
+    """JSONL のクエリログを読む (空行と書きかけの行は飛ばす)"""
+    requests = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                requests.append(parse_log_line(line))
+            except json.JSONDecodeError:
+                continue
+    return requests
+
+
+def synthetic_mix(
+    count: int,
+    queries: List[str],
+    laws: List[str],
+    content_ratio: float,
+    seed: int = 0,
+) -> List[LoadRequest]:
+    """検索と条文一覧の取得を content_ratio の割合で混ぜた合成リクエスト"""
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        if laws and rng.random() < content_ratio:
+            body = {"law_name": rng.choice(laws)}
+            requests.append(LoadRequest("POST", CONTENT_PATH, body))
+        else:
+            body = {"query": rng.choice(queries)}
+            requests.append(LoadRequest("POST", SEARCH_PATH, body))
+    return requests
+
+
+def arrival_offsets(
+    count: int, rate: float, arrivals: str = "constant", seed: int = 0
+) -> List[float]:
+    """開始からの予定送信時刻 (秒)。poisson では指数分布の間隔"""
+    if arrivals == "constant":
+        return [i / rate for i in range(count)]
+    rng = random.Random(seed)
+    offsets, t = [], 0.0
+    for _ in range(count):
+        offsets.append(t)
+        t += rng.expovariate(rate)
+    return offsets
+
+
+class HttpPool:
+    """
+    標準ライブラリの asyncio だけの HTTP/1.1 クライアント (keep-alive の接続プール)
+    同時に使う接続は size 本まで。空きがなければ接続が空くのを待つ。
+    """
+
+    def __init__(self, url: str, size: int):
+        parts = urlsplit(url)
+        if parts.scheme != "http":
+            raise ValueError(f"Only http:// URLs are supported: {url}")
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 80
+        self._slots = asyncio.Semaphore(size)
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def _read_response(self, reader: asyncio.StreamReader) -> Tuple[int, bool]:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by server")
+        status = int(status_line.split()[1])
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+        if headers.get("transfer-encoding") == "chunked":
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        else:
+            await reader.readexactly(int(headers.get("content-length", "0")))
+        return status, headers.get("connection") != "close"
+
+    async def request(self, request: LoadRequest) -> Tuple[int, float]:
+        """ステータスと service time (送信から応答の読み終わりまで、秒)"""
+        body = b"" if request.body is None else json.dumps(request.body).encode()
+        head = (
+            f"{request.method} {request.path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n"
+        )
+        async with self._slots:
+            if self._idle:
+                reader, writer = self._idle.pop()
+            else:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+            started = time.perf_counter()
+            try:
+                writer.write(head.encode("latin-1") + body)
+                await writer.drain()
+                status, keep_alive = await self._read_response(reader)
+            except BaseException:
+                writer.close()
+                raise
+            elapsed = time.perf_counter() - started
+            if keep_alive:
+                self._idle.append((reader, writer))
+            else:
+                writer.close()
+            return status, elapsed
+
+    async def get_json(self, path: str) -> Any:
+        """負荷をかける前の準備用 (GET して JSON を返す)"""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(
+                f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1")
+            )
+            await writer.drain()
+            data = await reader.read()
+        finally:
+            writer.close()
+        head, _, body = data.partition(b"\r\n\r\n")
+        if b" 200 " not in head.split(b"\r\n", 1)[0]:
+            raise ConnectionError(f"GET {path} failed: {head[:60]!r}")
+        return json.loads(body)
+
+    def close(self) -> None:
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
+
+
+@dataclass
+class LoadReport:
+    rate: float
+    arrivals: str
+    sent: int = 0
+    elapsed: float = 0.0
+    # 予定時刻からのレイテンシ (エンドポイントごと)
+    latency: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    # 送信から応答までの時間 (coordinated omission を補正しない値)
+    service: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: Counter = field(default_factory=Counter)
+
+    @property
+    def completed(self) -> int:
+        return sum(h.total for h in self.latency.values())
+
+    def overall(self) -> LatencyHistogram:
+        merged = LatencyHistogram()
+        for histogram in self.latency.values():
+            merged.add(histogram)
+        return merged
+
+    def lines(self) -> List[str]:
+        failed = sum(self.errors.values())
+        lines = [
+            f"target {self.rate:g} req/s ({self.arrivals}), sent {self.sent} "
+            f"in {self.elapsed:.1f} s: {self.completed} ok, {failed} errors "
+            f"({failed / max(self.sent, 1):.2%}), "
+            f"throughput {self.completed / max(self.elapsed, 1e-9):.1f} req/s",
+            "  latency from intended send time (ms):",
+            f"  {'endpoint':<14} {'count':>6} "
+            + " ".join(f"{'p' + format(p, 'g'):>8}" for p in PERCENTILES)
+            + f" {'max':>8} {'mean':>8}",
+        ]
+        rows = [*sorted(self.latency.items()), ("all", self.overall())]
+        rows.append(("(service)", self.service))
+        for name, histogram in rows:
+            values = [histogram.value_at(p) / 1000 for p in PERCENTILES]
+            lines.append(
+                f"  {name:<14} {histogram.total:>6} "
+                + " ".join(f"{v:>8.2f}" for v in values)
+                + f" {histogram.max / 1000:>8.2f} {histogram.mean / 1000:>8.2f}"
+            )
+        if self.errors:
+            lines.append(
+                "  errors: "
+                + ", ".join(f"{k}={v}" for k, v in self.errors.most_common())
+            )
+        return lines
+
+
+async def run_load(
+    url: str,
+    requests: List[LoadRequest],
+    rate: float,
+    arrivals: str = "constant",
+    connections: int = 64,
+    timeout: float = 10.0,
+    seed: int = 0,
+) -> LoadReport:
+    """requests を目標レートで送り、全応答 (またはタイムアウト) を待って集計する"""
+    pool = HttpPool(url, connections)
+    report = LoadReport(rate=rate, arrivals=arrivals, sent=len(requests))
+    loop = asyncio.get_running_loop()
+
+    async def send(request: LoadRequest, intended: float) -> None:
+        try:
+            status, service = await asyncio.wait_for(pool.request(request), timeout)
+        except asyncio.TimeoutError:
+            report.errors["timeout"] += 1
+            return
+        except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+            report.errors[type(e).__name__] += 1
+            return
+        if status >= 400:
+            report.errors[f"HTTP {status}"] += 1
+            return
+        histogram = report.latency.setdefault(request.path, LatencyHistogram())
+        histogram.record(loop.time() - intended)
+        report.service.record(service)
+
+    tasks = []
+    start = loop.time()
+    offsets = arrival_offsets(len(requests), rate, arrivals, seed)
+    for request, offset in zip(requests, offsets, strict=True):
+        intended = start + offset
+        delay = intended - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        # 送信が予定より遅れても、レイテンシは予定時刻から数える
+        tasks.append(asyncio.create_task(send(request, intended)))
+    await asyncio.gather(*tasks)
+    report.elapsed = loop.time() - start
+    pool.close()
+    return report
+
+
+def _plan(args: argparse.Namespace, laws: List[str]) -> List[LoadRequest]:
+    count = max(1, int(args.rate * args.duration))
+    if args.log:
+        logged = load_log(args.log)
+        if not logged:
+            raise ValueError(f"No requests in {args.log}")
+        # 目標の件数に足りなければログを繰り返す
+        return [logged[i % len(logged)] for i in range(count)]
+    return synthetic_mix(
+        count, SYNTHETIC_QUERIES, laws, args.content_ratio, seed=args.seed
+    )
+
+
+async def _main(args: argparse.Namespace) -> int:
+    laws = SYNTHETIC_LAWS
+    if not args.log:
+        try:
+            laws = await HttpPool(args.url, 1).get_json("/laws") or laws
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not list laws ({e}); using built-in names")
+    requests = _plan(args, laws)
+    if args.warmup:
+        await run_load(args.url, requests[: args.warmup], rate=args.rate)
+    report = await run_load(
+        args.url,
+        requests,
+        rate=args.rate,
+        arrivals=args.arrivals,
+        connections=args.connections,
+        timeout=args.timeout,
+        seed=args.seed,
+    )
+    print(f"{args.url}")
+    for line in report.lines():
+        print(line)
+    return 0 if report.completed else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Open-loop load test for /search and /laws/content."
+    )
+    parser.add_argument("--url", default="http://localhost:3000")
+    parser.add_argument("--log", help="JSONL query log to replay")
+    parser.add_argument("--rate", type=float, default=20.0, help="requests per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument(
+        "--arrivals", choices=["constant", "poisson"], default="poisson"
+    )
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument(
+        "--content-ratio",
+        type=float,
+        default=0.1,
+        help="share of /laws/content in the synthetic mix",
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=10, help="requests sent before measuring"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    try:
+        return asyncio.run(_main(args))
+    except (OSError, ValueError) as e:
+        print(f"⚠️ {e}")
+        return 1
@@ -1,44 +1,65 @@
 import logging
 import asyncio
+import sys
 from src.infrastructure.egov_api import EGovAPIClient
 from src.infrastructure.database import LawRepository
+from src.infrastructure.law_catalog import LawCatalog
 
 # セットアップ
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-async def main():
+# 取得したい法律のリスト (e-Gov法令APIの法令番号: 法令名)
+DEFAULT_TARGET_LAWS = {
+    # 既存登録済み
+    "325AC0000000144": "生活保護法",
+    "322AC0000000164": "児童福祉法",
+    "326AC0000000045": "社会福祉法",
+    "417AC1000000124": "高齢者虐待防止法",
+    "409AC0000000123": "介護保険法",
+    "338AC0000000133": "老人福祉法",
+    "417AC0000000123": "障害者総合支援法",
+    "324AC1000000283": "身体障害者福祉法",
+    "335AC0000000037": "知的障害者福祉法",
+    "325AC0100000123": "精神保健福祉法",
+    "412AC1000000082": "児童虐待防止法",
+    "413AC0100000031": "DV防止法",
+    "425AC0000000105": "生活困窮者自立支援法",
+    "423AC1000000079": "障害者虐待防止法",
+    "409AC0000000131": "精神保健福祉士法",
+    "362AC0000000030": "社会福祉士及び介護福祉士法",
+    "323AC0000000168": "少年法",
+    "336AC0000000223": "災害対策基本法",
+    "322AC0000000118": "災害救助法",
+    "140AC0000000045": "刑法",
+    "323AC0000000131": "刑事訴訟法",
+}
+
+
+def resolve_targets(names: list[str]) -> dict[str, str]:
+    """法令名・略称・法令番号を法令カタログで LawId に解決"""
+    catalog = LawCatalog()
+    targets = {}
+    for name in names:
+        entry = catalog.resolve(name)
+        if entry is None:
+            candidates = [e.law_name for e in catalog.search(name, limit=5)]
+            logger.error(f"Unknown law '{name}'. Candidates: {candidates}")
+            continue
+        targets[entry.law_id] = entry.law_name
+    return targets
+
+
+async def main(names: list[str] | None = None):
     db = LawRepository()
-    api = EGovAPIClient()
-
-    # 取得したい法律のリスト (e-Gov法令APIの法令番号: 法令名)
-    target_laws = {
-        # 既存登録済み
-        "325AC0000000144": "生活保護法",
-        "322AC0000000164": "児童福祉法",
-        "326AC0000000045": "社会福祉法",
-        "417AC1000000124": "高齢者虐待防止法",
-        "409AC0000000123": "介護保険法",
-        "338AC0000000133": "老人福祉法",
-        "417AC0000000123": "障害者総合支援法",
-        "324AC1000000283": "身体障害者福祉法",
-        "335AC0000000037": "知的障害者福祉法",
-        "325AC0100000123": "精神保健福祉法",
-        "412AC1000000082": "児童虐待防止法",
-        "413AC0100000031": "DV防止法",
-        "425AC0000000105": "生活困窮者自立支援法",
-        "423AC1000000079": "障害者虐待防止法",
-        "409AC0000000131": "精神保健福祉士法",
-        "362AC0000000030": "社会福祉士及び介護福祉士法",
-        "323AC0000000168": "少年法",
-        "336AC0000000223": "災害対策基本法",
-        "322AC0000000118": "災害救助法",
-        "140AC0000000045": "刑法",
-        "323AC0000000131": "刑事訴訟法",
-    }
+
+    target_laws = resolve_targets(names) if names else DEFAULT_TARGET_LAWS
+    # 取り込み対象同士の参照を解決できるよう法令名を渡す
+    api = EGovAPIClient(known_laws={name: i for i, name in target_laws.items()})
 
     logger.info(f"Target laws: {target_laws}")
+    known_stamps = db.get_amendment_stamps()
 
     for law_id, law_name in target_laws.items():
         logger.info(f"Fetching {law_name} ({law_id})...")
@@ -50,7 +71,11 @@ async def main():
                 logger.error(f"Failed to fetch XML for {law_name}")
                 continue
 
-            # 2. パース
+            # 2. パース (改正スタンプが変わっていなければスキップ)
+            law_meta = api.parse_law_metadata(xml_content, law_id)
+            if known_stamps.get(law_id) == law_meta.amendment_stamp:
+                logger.info(f"{law_name} is unchanged since last ingest. Skipped.")
+                continue
             law_data, articles = api.parse_law_xml(xml_content, law_id)
             logger.info(f"Parsed {law_name}: {len(articles)} articles.")
 
@@ -66,4 +91,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(main(sys.argv[1:]))
@@ -0,0 +1,124 @@
+from collections import deque
+from dataclasses import dataclass
+from html import escape
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.core.models import make_doc_id
+from src.interface.backend_client import TTLCache
+
+# 条文の表示用データ (法令名, 条名, 本文)
+HitDocument = Tuple[str, str, str]
+
+# 全セッションで共有する条文キャッシュの件数上限
+DOCUMENT_CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryEntry:
+    """1回の検索の履歴 (本文やHTMLは持たず、条文IDとスコアだけを持つ)"""
+
+    query: str
+    intent: Optional[str]
+    hits: Tuple[Tuple[str, float], ...]
+
+
+def hit_document(item: dict) -> Tuple[str, HitDocument]:
+    """/search の結果1件から (doc_id, 表示用データ) を取り出す"""
+    metadata = item.get("metadata", {})
+    law_name = metadata.get("law_full_name", "Unknown Law")
+    article = metadata.get("article_number", "")
+    doc_id = make_doc_id(metadata.get("law_id", law_name), article)
+    return doc_id, (law_name, article, item.get("document", ""))
+
+
+class SearchHistory:
+    """
+    セッションごとの検索履歴 (上限つきリングバッファ)
+    条文本文は documents (プロセス共有の LRU) にだけ置き、履歴には参照を積む。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 20,
+        documents: Optional[TTLCache[HitDocument]] = None,
+    ):
+        self._entries: deque[HistoryEntry] = deque(maxlen=max_entries)
+        # 空のキャッシュも len() == 0 で偽になるため None と比較する
+        if documents is None:
+            documents = TTLCache(max_entries=DOCUMENT_CACHE_SIZE, ttl=24 * 3600)
+        self.documents = documents
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[HistoryEntry]:
+        """新しい順"""
+        return reversed(self._entries)
+
+    def add(
+        self, query: str, intent: Optional[str], results: Iterable[dict]
+    ) -> HistoryEntry:
+        hits = []
+        for item in results:
+            doc_id, document = hit_document(item)
+            self.documents.put(doc_id, document)
+            hits.append((doc_id, float(item.get("relevance", 0.0))))
+        entry = HistoryEntry(query=query, intent=intent, hits=tuple(hits))
+        self._entries.append(entry)
+        return entry
+
+    def latest(self, n: int) -> List[HistoryEntry]:
+        return list(self)[:n]
+
+    def resolve(
+        self,
+        doc_ids: List[str],
+        fallback: Optional[Callable[[List[str]], Dict[str, HitDocument]]] = None,
+    ) -> Dict[str, HitDocument]:
+        """表示する条文だけを共有キャッシュ (なければ fallback) から引く"""
+        found: Dict[str, HitDocument] = {}
+        missing = []
+        for doc_id in doc_ids:
+            document = self.documents.get(doc_id)
+            if document is None:
+                missing.append(doc_id)
+            else:
+                found[doc_id] = document
+        if missing and fallback is not None:
+            for doc_id, document in fallback(missing).items():
+                self.documents.put(doc_id, document)
+                found[doc_id] = document
+        return found
+
+
+def render_results_html(entry: HistoryEntry, documents: Dict[str, HitDocument]) -> str:
+    """検索結果カードのHTML (表示する履歴についてのみ都度生成する)"""
+    if not entry.hits:
+        return "<div class='law-card'>該当する条文が見つかりませんでした。</div>"
+
+    html_content = (
+        f"<div class='result-stats'>関連条文 <b>{len(entry.hits)}件</b> Hit</div>"
+    )
+    for doc_id, relevance in entry.hits:
+        document = documents.get(doc_id)
+        if document is None:
+            continue
+        law_name, article, doc_text = document
+        html_content += f"""<div class="law-card">
+    <div class="law-card-header">
+        <span class="law-name">{law_name}</span>
+        <span class="law-article">{article}</span>
+    </div>
+    <div class="law-content">{doc_text}</div>
+    <div class="relevance-container">
+        <span class="relevance-tag">Relevance: {relevance:.1%}</span>
+    </div>
+</div>"""
+    return html_content
+
+
+def render_query_html(entry: HistoryEntry) -> str:
+    return (
+        "<div style='display:flex; justify-content:flex-end;'>"
+        f"<div class='user-bubble'>{escape(entry.query)}</div></div>"
+    )
@@ -0,0 +1,633 @@
+"""
+Rust バックエンドと同じ API (/health, /ready, /search, /laws, /laws/content) を
+Python の CorpusStore + VectorEngine で提供する asyncio HTTP サービス
+
+負荷試験や CI で Rust のビルドなしにフロントエンド・クライアントを動かすためのもの。
+HTTP/1.1 keep-alive に対応し、検索処理はスレッドプールで並行に実行する。
+--batch-window-ms を指定すると、同時に届いた検索を QueryCoalescer でまとめて処理する。
+--shards を指定すると、ベクトル検索をシャードごとのワーカープロセスに分散する。
+--route-groups を指定すると、章セントロイドで選んだ章の条文だけを走査する。
+/search の "where" (MetadataIndex の条件) で法令・階層による絞り込みもできる。
+照合器で法令を特定できない質問は、Rust と同じく法令セントロイドで対象法令を推定する。
+クエリの埋め込みと検索結果はキャッシュし、--query-log を指定すると検索を記録する。
+lawctl related で関連条文を計算済みなら、/laws/content の各条文に related として付ける。
+--warm-top を指定すると、記録の頻出クエリでキャッシュを温めてから待ち受ける。
+
+    python -m src.interface.search_service --port 3000 --embedder fake
+    python -m src.interface.search_service --embedder fake --batch-window-ms 2
+    python -m src.interface.search_service --embedder fake --shards 4
+    python -m src.interface.search_service --embedder fake --route-groups 8
+    python -m src.interface.search_service --query-log queries.jsonl --warm-top 100
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from src.core.law_matcher import LawMatcher
+from src.core.models import SearchHit
+from src.infrastructure.corpus_store import CorpusStore
+from src.infrastructure.query_log import (
+    QueryLog,
+    normalize_query,
+    search_request,
+    top_queries,
+)
+from src.interface.backend_client import TTLCache
+from src.rag_engine.coalescer import QueryCoalescer
+from src.rag_engine.embedder import BaseEmbedder, HashingEmbedder, embedder_for_model
+from src.rag_engine.query_targeting import build_law_matcher
+from src.rag_engine.ranking import rerank
+from src.rag_engine.related import RelatedArticles
+from src.rag_engine.routing import DEFAULT_MARGIN, CentroidRouter
+from src.rag_engine.sharded_engine import BY_HASH, BY_LAW, ShardedEngine
+from src.rag_engine.vector_engine import VectorEngine, project_query
+
+logger = logging.getLogger(__name__)
+
+# 補正前に取る候補数と返却件数 (Rust 側は全件補正して上位15件)
+CANDIDATES = 100
+MAX_RESULTS = 15
+MAX_BODY_BYTES = 1 << 20
+# クエリ埋め込み・検索結果のキャッシュ件数と有効期限 (秒)
+CACHE_SIZE = 1024
+CACHE_TTL = 3600.0
+# search_many で1回の埋め込みAPI呼び出し・1回の行列積にまとめるクエリ数
+EMBED_BATCH = 100
+SCORE_BATCH = 256
+
+_REASONS = {
+    200: "OK",
+    204: "No Content",
+    400: "Bad Request",
+    404: "Not Found",
+    413: "Payload Too Large",
+}
+
+
+class SearchService:
+    """/search・/laws・/laws/content の処理本体 (HTTP から独立した同期処理)"""
+
+    def __init__(
+        self,
+        engine: Union[VectorEngine, ShardedEngine],
+        store: CorpusStore,
+        embedder: BaseEmbedder,
+        matcher: Optional[LawMatcher] = None,
+        coalescer: Optional[QueryCoalescer] = None,
+        query_log: Optional[QueryLog] = None,
+        cache_size: int = CACHE_SIZE,
+        related: Optional[RelatedArticles] = None,
+        law_router: Optional[CentroidRouter] = None,
+    ):
+        self.engine = engine
+        self.store = store
+        self.embedder = embedder
+        self.matcher = matcher
+        self.coalescer = coalescer
+        self.query_log = query_log
+        self.related = related
+        # 照合器で決まらない質問の対象法令を法令セントロイドで推定する
+        self.law_router = law_router
+        self.embeddings: TTLCache[List[float]] = TTLCache(cache_size, CACHE_TTL)
+        self.results: TTLCache[Dict[str, Any]] = TTLCache(cache_size, CACHE_TTL)
+        laws = store.list_laws()
+        self.law_names = sorted(law.law_full_name for law in laws)
+        self._law_ids = {law.law_full_name: law.law_id for law in laws}
+        self._law_names = {law.law_id: law.law_full_name for law in laws}
+
+    @classmethod
+    def from_store(
+        cls,
+        store: CorpusStore,
+        embedder: Optional[BaseEmbedder] = None,
+        batch_window_ms: Optional[float] = None,
+        max_batch: int = 32,
+        shards: int = 0,
+        shard_by: str = BY_LAW,
+        route_groups: int = 0,
+        route_margin: float = DEFAULT_MARGIN,
+        query_log: Optional[QueryLog] = None,
+    ) -> "SearchService":
+        engine: Union[VectorEngine, ShardedEngine]
+        if shards > 0:
+            engine = ShardedEngine.from_store(store, shards, shard_by)
+        else:
+            engine = VectorEngine.from_store(
+                store, route_groups=route_groups, route_margin=route_margin
+            )
+        if embedder is None:
+            embedder = embedder_for_model(engine.vectors.model)
+        coalescer = None
+        if batch_window_ms is not None:
+            coalescer = QueryCoalescer(embedder, engine, batch_window_ms, max_batch)
+        return cls(
+            engine,
+            store,
+            embedder,
+            build_law_matcher(store),
+            coalescer,
+            query_log,
+            related=RelatedArticles.from_store(store, engine.vectors),
+            law_router=getattr(engine, "router", None)
+            or CentroidRouter.from_store(store, engine.vectors),
+        )
+
+    def close(self) -> None:
+        if self.coalescer is not None:
+            self.coalescer.close()
+        if isinstance(self.engine, ShardedEngine):
+            self.engine.close()
+
+    def _targets(
+        self, payload: Dict[str, Any], embedding: Optional[List[float]] = None
+    ) -> Tuple[List[str], Optional[str], Optional[List[float]]]:
+        """
+        クライアント指定 -> 照合器 -> 法令セントロイド の順に対象法令を決める
+        (Rust バックエンドの LLM による推定は行わない)。
+        embedding を省略するとセントロイドでの推定が必要なときだけ埋め込み、
+        そのベクトルを3つ目の値で返す (検索で埋め込み直さないため)。
+        """
+        names = payload.get("target_laws")
+        if names:
+            return list(names), "Client Match", embedding
+        query = payload.get("query", "")
+        if self.matcher is not None:
+            targets = self.matcher.match(query)
+            if not targets.is_ambiguous:
+                return targets.law_names, "Instant Match", embedding
+        if self.law_router is None or not query:
+            return [], None, embedding
+        if embedding is None:
+            embedding = self._embed(query)
+        vector = project_query(embedding, self.engine.vectors.projection)
+        laws = [
+            self._law_names[law_id]
+            for law_id in self.law_router.target_laws(vector)
+            if law_id in self._law_names
+        ]
+        return (laws, "Centroid Match", embedding) if laws else ([], None, embedding)
+
+    def _embed(self, query: str) -> List[float]:
+        """結果キャッシュと同じく正規化したクエリで埋め込み・キャッシュする"""
+        key = normalize_query(query)
+        vector = self.embeddings.get(key)
+        if vector is None:
+            vector = self.embedder.embed_query(key)
+            self.embeddings.put(key, vector)
+        return vector
+
+    def embed_many(
+        self, queries: List[str], batch: int = EMBED_BATCH
+    ) -> List[List[float]]:
+        """キャッシュにないクエリだけ batch 件ずつまとめて埋め込む"""
+        keys = [normalize_query(query) for query in queries]
+        vectors: Dict[str, List[float]] = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            vector = self.embeddings.get(key)
+            if vector is None:
+                missing.append(key)
+            else:
+                vectors[key] = vector
+        for start in range(0, len(missing), batch):
+            chunk = missing[start : start + batch]
+            for key, vector in zip(
+                chunk, self.embedder.embed_texts(chunk), strict=True
+            ):
+                vectors[key] = vector
+                self.embeddings.put(key, vector)
+        return [vectors[key] for key in keys]
+
+    @staticmethod
+    def _cache_key(payload: Dict[str, Any]) -> str:
+        query = normalize_query(payload.get("query", ""))
+        return json.dumps(
+            search_request({**payload, "query": query}),
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+
+    def _cached_search(self, payload: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        key = self._cache_key(payload)
+        response = self.results.get(key)
+        if response is not None:
+            return response, True
+        response = self._search(payload)
+        self.results.put(key, response)
+        return response, False
+
+    def search(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """同じクエリ・絞り込み条件の結果はキャッシュから返す ("cached" で区別)"""
+        started = time.perf_counter()
+        response, cache_hit = self._cached_search(payload)
+        if self.query_log is not None:
+            latency_ms = (time.perf_counter() - started) * 1000
+            self.query_log.record(payload, latency_ms, cache_hit)
+        return {**response, "cached": cache_hit}
+
+    def warm(self, payloads: List[Dict[str, Any]]) -> int:
+        """頻出クエリを流してキャッシュを温める (記録はしない)"""
+        warmed = 0
+        for payload in payloads:
+            try:
+                self._cached_search(payload)
+            except HttpError as e:
+                logger.warning(f"Warm-up skipped {payload.get('query')!r}: {e}")
+                continue
+            warmed += 1
+        return warmed
+
+    def search_many(
+        self, payloads: List[Dict[str, Any]], batch: int = SCORE_BATCH
+    ) -> List[Dict[str, Any]]:
+        """
+        複数の検索をまとめて処理する (結果は /search と同じ、記録はしない)
+        正規化後に同じ検索は1回だけ処理し、キャッシュにないものは埋め込みを
+        まとめて取得して、batch 件ごとに行列×行列の1回の積で採点する。
+        処理できない検索 (シャード構成での where など) は "error" つきの空の結果になる。
+        """
+        keys = [self._cache_key(payload) for payload in payloads]
+        responses: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, Dict[str, Any]] = {}
+        for key, payload in zip(keys, payloads, strict=True):
+            if key in responses or key in pending:
+                continue
+            cached = self.results.get(key)
+            if cached is not None:
+                responses[key] = cached
+            elif payload.get("where") is not None:
+                try:
+                    responses[key] = self._cached_search(payload)[0]
+                except HttpError as e:
+                    # 1件の不正な条件で全体を止めず、その検索の結果に理由を残す
+                    responses[key] = {
+                        "results": [],
+                        "intent": None,
+                        "targeted_laws": [],
+                        "error": str(e),
+                    }
+            else:
+                pending[key] = payload
+
+        items = list(pending.items())
+        embeddings = self.embed_many([payload.get("query", "") for _, payload in items])
+        for start in range(0, len(items), batch):
+            chunk = items[start : start + batch]
+            queries = [payload.get("query", "") for _, payload in chunk]
+            targets = [
+                self._targets(payload, embedding)
+                for (_, payload), embedding in zip(
+                    chunk, embeddings[start : start + batch], strict=True
+                )
+            ]
+            law_ids = [
+                [self._law_ids[n] for n in names if n in self._law_ids]
+                for names, _, _ in targets
+            ]
+            # 既知の法令に当たらない指定は検索しない (_search と同じ)
+            searched = [
+                j for j, (names, _, _) in enumerate(targets) if law_ids[j] or not names
+            ]
+            results: List[List[SearchHit]] = [[] for _ in chunk]
+            if searched:
+                found = self.engine.search_batch(
+                    [embeddings[start + j] for j in searched],
+                    n_results=CANDIDATES,
+                    law_ids=[law_ids[j] or None for j in searched],
+                )
+                for j, hits in zip(searched, found, strict=True):
+                    results[j] = hits
+            for (key, _), query, (names, intent, _), hits in zip(
+                chunk, queries, targets, results, strict=True
+            ):
+                response = self._response(query, hits, intent, names)
+                self.results.put(key, response)
+                responses[key] = response
+        return [responses[key] for key in keys]
+
+    def _search(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        query = payload.get("query", "")
+        target_laws, intent, embedding = self._targets(payload)
+        law_ids = [self._law_ids[n] for n in target_laws if n in self._law_ids]
+        if target_laws and not law_ids:
+            # Rust と同じく、既知の法令に当たらない指定は全件検索にせず結果なし
+            return self._response(query, [], intent, target_laws)
+
+        where = payload.get("where")
+        if self.coalescer is not None and where is None:
+            # セントロイドでの推定に使った埋め込みがあれば、バッチで埋め込み直さない
+            hits = self.coalescer.search(
+                query, CANDIDATES, law_ids or None, embedding=embedding
+            )
+        else:
+            if where is not None and not isinstance(self.engine, VectorEngine):
+                raise HttpError(400, "Metadata filters are not supported with shards.")
+            options = {"where": where} if where is not None else {}
+            try:
+                hits = self.engine.search(
+                    embedding if embedding is not None else self._embed(query),
+                    n_results=CANDIDATES,
+                    law_ids=law_ids or None,
+                    **options,
+                )
+            except ValueError as e:
+                raise HttpError(400, str(e)) from e
+        return self._response(query, hits, intent, target_laws)
+
+    @staticmethod
+    def _response(
+        query: str,
+        hits: List[SearchHit],
+        intent: Optional[str],
+        target_laws: List[str],
+    ) -> Dict[str, Any]:
+        """補正後の上位 MAX_RESULTS 件を Rust バックエンドと同じ形で返す"""
+        results = []
+        for hit, distance in rerank(query, hits, MAX_RESULTS):
+            doc = hit.document
+            if doc is None:
+                continue
+            results.append(
+                {
+                    "document": doc.embedding_text(),
+                    "metadata": doc.metadata(),
+                    "distance": distance,
+                    "relevance": 0.0 if distance > 1.0 else 1.0 - distance,
+                }
+            )
+        return {"results": results, "intent": intent, "targeted_laws": target_laws}
+
+    def list_laws(self) -> List[str]:
+        return self.law_names
+
+    def _related(self, doc_id: str) -> List[Dict[str, Any]]:
+        """事前計算した関連条文 (Rust 側と同じ形)"""
+        if self.related is None:
+            return []
+        related = []
+        for other, score in self.related.related(doc_id):
+            law_id, _, article_number = other.partition("_")
+            related.append(
+                {
+                    "law_full_name": self._law_names.get(law_id, law_id),
+                    "article_number": article_number,
+                    "score": score,
+                }
+            )
+        return related
+
+    def law_content(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        law_name = payload.get("law_name", "")
+        articles = []
+        for doc in self.store.iter_documents(law_full_name=law_name):
+            article = {
+                "document": doc.embedding_text(),
+                "metadata": doc.metadata(),
+                "distance": 0.0,
+                "relevance": 1.0,
+            }
+            related = self._related(doc.doc_id)
+            if related:
+                article["related"] = related
+            articles.append(article)
+        return {"articles": articles}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _response(status: int, body: bytes, content_type: str, keep_alive: bool) -> bytes:
+    reason = _REASONS.get(status, "Error")
+    headers = [
+        f"HTTP/1.1 {status} {reason}",
+        f"Content-Type: {content_type}",
+        f"Content-Length: {len(body)}",
+        "Access-Control-Allow-Origin: *",
+        "Access-Control-Allow-Headers: *",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    return ("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body
+
+
+class SearchServer:
+    """
+    標準ライブラリの asyncio だけで書いた最小限の HTTP/1.1 サーバー
+    接続ごとに keep-alive でリクエストを読み、処理はスレッドプールに渡す。
+    """
+
+    def __init__(self, service: SearchService, workers: int = 4):
+        self.service = service
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="search"
+        )
+        self._routes: Dict[Tuple[str, str], Callable[[Dict[str, Any]], Any]] = {
+            ("POST", "/search"): service.search,
+            ("GET", "/laws"): lambda _: service.list_laws(),
+            ("POST", "/laws/content"): service.law_content,
+        }
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set["asyncio.Task[Any]"] = set()
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        if method == "OPTIONS":
+            return 204, None
+        # キャッシュは待ち受け前に温めるので、/ready は /health と同じ
+        if path in ("/health", "/ready"):
+            return 200, "OK"
+        handler = self._routes.get((method, path))
+        if handler is None:
+            raise HttpError(404, f"No route for {method} {path}")
+        try:
+            payload = json.loads(body) if body else {}
+        except json.JSONDecodeError as e:
+            raise HttpError(400, f"Invalid JSON: {e}") from e
+        loop = asyncio.get_running_loop()
+        return 200, await loop.run_in_executor(self.executor, handler, payload)
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", "0"))
+                if length > MAX_BODY_BYTES:
+                    # 本文は読まずに 413 を返し、続きを読めない接続は閉じる
+                    data = json.dumps({"error": "Request body too large"})
+                    writer.write(
+                        _response(413, data.encode("utf-8"), "application/json", False)
+                    )
+                    await writer.drain()
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                try:
+                    status, result = await self._dispatch(
+                        method, path.split("?", 1)[0], body
+                    )
+                except HttpError as e:
+                    status, result = e.status, {"error": str(e)}
+                except Exception as e:
+                    logger.exception(f"Request failed: {method} {path}")
+                    status, result = 500, {"error": str(e)}
+
+                if result is None:
+                    data, content_type = b"", "text/plain"
+                elif isinstance(result, str):
+                    data, content_type = result.encode("utf-8"), "text/plain"
+                else:
+                    data = json.dumps(result, ensure_ascii=False).encode("utf-8")
+                    content_type = "application/json"
+                writer.write(_response(status, data, content_type, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError):
+            pass  # 壊れたリクエストは接続ごと捨てる
+        except ConnectionError:
+            pass
+        finally:
+            if task is not None:
+                self._connections.discard(task)
+            writer.close()
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        self._server = await asyncio.start_server(self.handle, host, port)
+        return self._server
+
+    async def close(self) -> None:
+        """待ち受けを止め、keep-alive で待機中の接続も切る"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        connections = list(self._connections)
+        for task in connections:
+            task.cancel()
+        await asyncio.gather(*connections, return_exceptions=True)
+        self.executor.shutdown(wait=False)
+
+    async def serve_forever(self, host: str, port: int) -> None:
+        server = await self.start(host, port)
+        logger.info(f"Listening on {host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Serve the backend search API from the Python corpus store."
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--embedder",
+        choices=["auto", "fake"],
+        default="auto",
+        help="auto: the model recorded in the vector file / fake: offline hashing",
+    )
+    parser.add_argument(
+        "--batch-window-ms",
+        type=float,
+        default=None,
+        help="coalesce searches arriving within this window (off by default)",
+    )
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=0,
+        help="search with this many shard worker processes (0: in-process)",
+    )
+    parser.add_argument("--shard-by", choices=[BY_LAW, BY_HASH], default=BY_LAW)
+    parser.add_argument(
+        "--route-groups",
+        type=int,
+        default=0,
+        help="scan only the top N law chapters by centroid similarity (0: off)",
+    )
+    parser.add_argument(
+        "--route-margin",
+        type=float,
+        default=DEFAULT_MARGIN,
+        help="fall back to a full scan when more chapters are this close to the best",
+    )
+    parser.add_argument(
+        "--query-log",
+        default=None,
+        help="append sampled, redacted searches to this JSONL file",
+    )
+    parser.add_argument("--log-sample", type=float, default=1.0)
+    parser.add_argument(
+        "--warm-top",
+        type=int,
+        default=0,
+        help="replay the N most frequent logged queries before listening",
+    )
+    parser.add_argument("--db", default="welfare_laws_v3.db")
+    parser.add_argument("--vector-dir", default="corpus_vectors")
+    args = parser.parse_args(argv)
+
+    if args.warm_top > 0 and not args.query_log:
+        parser.error("--warm-top needs --query-log")
+    if args.shards > 0 and args.route_groups > 0:
+        parser.error("--route-groups cannot be combined with --shards")
+
+    logging.basicConfig(level=logging.INFO)
+    store = CorpusStore(args.db, args.vector_dir)
+    if not store.has_vectors():
+        print(f"No vectors in {store.vector_dir}/. Run the indexer first.")
+        return 1
+    embedder = None
+    if args.embedder == "fake":
+        embedder = HashingEmbedder(store.load_vectors().dim)
+    service = SearchService.from_store(
+        store,
+        embedder,
+        args.batch_window_ms,
+        args.max_batch,
+        args.shards,
+        args.shard_by,
+        args.route_groups,
+        args.route_margin,
+        QueryLog(args.query_log, args.log_sample) if args.query_log else None,
+    )
+    if args.warm_top > 0:
+        payloads = top_queries(args.query_log, args.warm_top)
+        print(f"🔥 Warmed caches with {service.warm(payloads)} frequent queries")
+    print(f"🐍 Serving {len(service.engine)} vectors on {args.host}:{args.port}")
+    try:
+        asyncio.run(
+            SearchServer(service, args.workers).serve_forever(args.host, args.port)
+        )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,145 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Iterable, List, Optional, Tuple
+
+from src.core.models import SearchHit
+from src.rag_engine.embedder import BaseEmbedder
+from src.rag_engine.vector_engine import VectorEngine
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+@dataclass
+class _Pending:
+    query: str
+    n_results: int
+    law_ids: Optional[List[str]]
+    # 呼び出し元で埋め込み済みならそのベクトル (バッチでは埋め込まない)
+    embedding: Optional[List[float]] = None
+    future: "Future[List[SearchHit]]" = field(default_factory=Future)
+
+
+class QueryCoalescer:
+    """
+    同時に届いた検索を短い時間窓でまとめて処理する
+    窓 (window_ms) の間か max_batch 件に達するまで集めたクエリを、埋め込み1回
+    (embed_texts) と行列積1回 (search_batch) で処理し、結果を呼び出し元に返す。
+    window_ms=0 の場合は待たずに、その時点でキューにあるものだけをまとめる。
+    workers>1 の場合、埋め込み API の応答待ちの間に次のバッチを集めて並行に処理する。
+    embedding を渡したクエリは埋め込みを省き、行列積にだけ加える。
+    """
+
+    def __init__(
+        self,
+        embedder: BaseEmbedder,
+        engine: VectorEngine,
+        window_ms: float = 2.0,
+        max_batch: int = 32,
+        workers: int = 1,
+    ):
+        self.embedder = embedder
+        self.engine = engine
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        # 平均バッチサイズの確認用
+        self.batches = 0
+        self.queries = 0
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._executor = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="coalescer")
+            if workers > 1
+            else None
+        )
+        self._thread = threading.Thread(
+            target=self._run, name="query-coalescer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self,
+        query: str,
+        n_results: int = 5,
+        law_ids: Optional[Iterable[str]] = None,
+        embedding: Optional[List[float]] = None,
+    ) -> "Future[List[SearchHit]]":
+        targets = list(law_ids) if law_ids is not None else None
+        pending = _Pending(query, n_results, targets, embedding)
+        self._queue.put(pending)
+        return pending.future
+
+    def search(
+        self,
+        query: str,
+        n_results: int = 5,
+        law_ids: Optional[Iterable[str]] = None,
+        embedding: Optional[List[float]] = None,
+    ) -> List[SearchHit]:
+        return self.submit(query, n_results, law_ids, embedding).result()
+
+    def close(self) -> None:
+        """キュー済みのクエリを処理してからスレッドを止める"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def _collect(self, first: _Pending) -> Tuple[List[_Pending], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch, stop = self._collect(item)
+            if self._executor is not None:
+                self._executor.submit(self._process, batch)
+            else:
+                self._process(batch)
+            if stop:
+                return
+
+    def _process(self, batch: List[_Pending]) -> None:
+        with self._lock:
+            self.batches += 1
+            self.queries += len(batch)
+        try:
+            missing = [p for p in batch if p.embedding is None]
+            if missing:
+                vectors = self.embedder.embed_texts([p.query for p in missing])
+                for p, vector in zip(missing, vectors, strict=True):
+                    p.embedding = vector
+            results = self.engine.search_batch(
+                [p.embedding for p in batch if p.embedding is not None],
+                n_results=max(p.n_results for p in batch),
+                law_ids=[p.law_ids for p in batch],
+            )
+        except Exception as e:
+            logger.exception(f"Batch of {len(batch)} queries failed")
+            for p in batch:
+                p.future.set_exception(e)
+            return
+        for p, hits in zip(batch, results, strict=True):
+            p.future.set_result(hits[: p.n_results])
@@ -14,6 +14,12 @@ class Config:
     # ここではGemini API (AI Studio) の無料枠を前提として0とするが、
     # 意識付けのために概算値を入れておくのもあり。
     EMBEDDING_COST_PER_1M_TOKENS = 0.0  # Free of charge in AI Studio (within limits)
+    # モデル側で出力次元を減らす場合の次元数 (未設定ならモデル既定の768次元)
+    EMBEDDING_DIMENSIONALITY = int(os.getenv("EMBEDDING_DIMENSIONALITY") or 0) or None
+
+    # 埋め込みバックエンド: "gemini" または "local" (コーパス学習の文字n-gram LSA)
+    EMBEDDER_BACKEND = os.getenv("EMBEDDER_BACKEND", "gemini")
+    LOCAL_EMBEDDER_PATH = os.getenv("LOCAL_EMBEDDER_PATH", "models/local_lsa.npz")
 
     CHROMA_DB_DIR = "chroma_db"
     COLLECTION_NAME = "welfare_laws_gemini"
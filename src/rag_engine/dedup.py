@@ -0,0 +1,200 @@
+"""
+埋め込み前の重複除去 (MinHash / LSH)
+
+「削除」だけの条文や空の条文は埋め込まず、読替規定や法・施行令・施行規則の
+並行条文のような本文がほぼ同じ条文はクラスタにまとめ、代表1件だけを埋め込む。
+代表以外はベクトルファイルの aliases で代表の行に紐付ける。
+
+    python -m src.rag_engine.dedup            # 現在のコーパスでの削減量を表示
+"""
+
+import argparse
+import re
+import unicodedata
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from src.core.models import CorpusDocument
+from src.infrastructure.corpus_store import CorpusStore
+
+# 本文全体がこれだけなら「中身のない条文」とみなす (項番号・括弧は除いて比較)
+_PLACEHOLDER = re.compile(r"^[（(]?(削除|略)[)）]?$")
+_PARAGRAPH_NUM = re.compile(r"^[0-9０-９一二三四五六七八九十]+\s")
+_WHITESPACE = re.compile(r"\s+")
+
+# 2^32 より大きい素数 (a * x + b が uint64 に収まる)
+_PRIME = np.uint64(4294967311)
+
+SHINGLE_SIZE = 5
+NUM_PERM = 128
+BANDS = 32
+THRESHOLD = 0.9
+
+
+def normalize(text: str) -> str:
+    return _WHITESPACE.sub("", unicodedata.normalize("NFKC", text))
+
+
+def is_placeholder(doc: CorpusDocument) -> bool:
+    """本文が空、または「削除」などの見出しだけの条文か"""
+    lines = [_PARAGRAPH_NUM.sub("", line) for line in doc.content.splitlines()]
+    body = normalize("".join(lines))
+    return not body or bool(_PLACEHOLDER.match(body))
+
+
+def shingles(text: str, k: int = SHINGLE_SIZE) -> Set[int]:
+    """正規化した本文の文字 k-gram を crc32 で整数化した集合"""
+    text = normalize(text)
+    if len(text) <= k:
+        return {zlib.crc32(text.encode("utf-8"))}
+    return {
+        zlib.crc32(text[i : i + k].encode("utf-8")) for i in range(len(text) - k + 1)
+    }
+
+
+class MinHasher:
+    """(a * x + b) mod p のハッシュ族による MinHash 署名"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, 1 << 32, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 32, num_perm, dtype=np.uint64)
+
+    def signature(self, values: Set[int]) -> np.ndarray:
+        x = np.fromiter(values, dtype=np.uint64, count=len(values))
+        hashed = (self.a[:, None] * x[None, :] + self.b[:, None]) % _PRIME
+        return hashed.min(axis=1)
+
+
+def estimated_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """署名の一致率 (Jaccard 係数の推定値)"""
+    return float(np.mean(a == b))
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            # 若い番号 (先に現れた条文) を根にして代表にする
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+@dataclass
+class DedupPlan:
+    """埋め込む代表条文と、埋め込まない条文の内訳"""
+
+    representatives: List[CorpusDocument]
+    # 重複の doc_id -> 代表の doc_id
+    aliases: Dict[str, str] = field(default_factory=dict)
+    # 空・「削除」のみの条文 (ベクトルを持たない)
+    placeholders: List[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return len(self.representatives) + len(self.aliases) + len(self.placeholders)
+
+
+def plan_dedup(
+    documents: List[CorpusDocument],
+    threshold: float = THRESHOLD,
+    num_perm: int = NUM_PERM,
+    bands: int = BANDS,
+) -> DedupPlan:
+    """
+    空・「削除」条文を除き、本文の推定 Jaccard 係数が threshold 以上の条文をまとめる
+    LSH (bands 本の帯に分けた署名が1本でも一致した組) を候補にし、署名で確かめる。
+    代表は各クラスタで最初に現れた条文。
+    """
+    if num_perm % bands:
+        raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+    rows_per_band = num_perm // bands
+    hasher = MinHasher(num_perm)
+
+    placeholders = [d.doc_id for d in documents if is_placeholder(d)]
+    skipped = set(placeholders)
+    kept = [d for d in documents if d.doc_id not in skipped]
+    signatures = [hasher.signature(shingles(d.content)) for d in kept]
+
+    clusters = _UnionFind(len(kept))
+    for band in range(bands):
+        buckets: Dict[bytes, List[int]] = {}
+        start = band * rows_per_band
+        for i, sig in enumerate(signatures):
+            bucket = buckets.setdefault(
+                sig[start : start + rows_per_band].tobytes(), []
+            )
+            for j in bucket:
+                if clusters.find(j) == clusters.find(i):
+                    continue
+                if estimated_similarity(signatures[j], sig) >= threshold:
+                    clusters.union(j, i)
+            bucket.append(i)
+
+    representatives = []
+    aliases = {}
+    for i, doc in enumerate(kept):
+        root = clusters.find(i)
+        if root == i:
+            representatives.append(doc)
+        else:
+            aliases[doc.doc_id] = kept[root].doc_id
+    return DedupPlan(representatives, aliases, placeholders)
+
+
+def print_report(plan: DedupPlan, tokens_before: int, tokens_after: int) -> None:
+    total = plan.total or 1
+    saved = total - len(plan.representatives)
+    print("\n🧹 Deduplication:")
+    print(f"   Articles:          {plan.total}")
+    print(f"   Placeholders:      {len(plan.placeholders)} (削除・空の条文)")
+    print(f"   Near-duplicates:   {len(plan.aliases)} (linked to a representative)")
+    print(
+        f"   Vectors:           {plan.total} -> {len(plan.representatives)} "
+        f"(-{saved / total:.1%})"
+    )
+    print(
+        f"   Tokens:            {tokens_before:,} -> {tokens_after:,} "
+        f"(-{(tokens_before - tokens_after) / (tokens_before or 1):.1%})"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Report how much MinHash/LSH deduplication shrinks the index."
+    )
+    parser.add_argument("--db", default="welfare_laws_v3.db")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    documents = list(CorpusStore(args.db).iter_documents())
+    if not documents:
+        print("No articles in the database.")
+        return 1
+    plan = plan_dedup(documents, args.threshold)
+    print_report(
+        plan,
+        sum(len(d.embedding_text()) for d in documents),
+        sum(len(d.embedding_text()) for d in plan.representatives),
+    )
+    calls_before = -(-plan.total // args.batch_size)
+    calls_after = -(-len(plan.representatives) // args.batch_size)
+    print(f"   API calls:         {calls_before} -> {calls_after}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,17 +1,118 @@
-from typing import List
-
-import google.generativeai as genai
+import math
+import zlib
+from abc import ABC, abstractmethod
+from typing import List, Optional
 
 from src.rag_engine.config import Config
 
 
-class Embedder:
-    def __init__(self):
+class BaseEmbedder(ABC):
+    """
+    埋め込みバックエンドの共通インターフェース
+    model_name はベクトルファイルに記録され、モデルが変わったら再埋め込みされる。
+    """
+
+    model_name: str = ""
+
+    @abstractmethod
+    def embed_texts(self, texts: List[str]) -> List[List[float]]: ...
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_texts([text])[0]
+
+    def calculate_tokens(self, text: str) -> int:
+        return len(text)
+
+    def calculate_cost(self, total_tokens: int) -> float:
+        return 0.0
+
+
+def create_embedder(backend: Optional[str] = None) -> BaseEmbedder:
+    """
+    設定 (EMBEDDER_BACKEND) に応じた埋め込みバックエンドを返す
+    gemini: Gemini API / local: コーパスで学習した文字n-gram LSA (ネットワーク不要)
+    """
+    backend = (backend or Config.EMBEDDER_BACKEND).lower()
+    if backend == "gemini":
+        return GeminiEmbedder()
+    if backend == "local":
+        from src.rag_engine.local_embedder import LocalLSAEmbedder
+
+        return LocalLSAEmbedder.load(Config.LOCAL_EMBEDDER_PATH)
+    if backend == "fake":
+        return HashingEmbedder()
+    raise ValueError(f"Unknown embedder backend: {backend}")
+
+
+def embedder_for_model(model_name: str) -> BaseEmbedder:
+    """
+    ベクトルファイルに記録されたモデル名に対応するバックエンドを返す
+    ローカルモデルが学習し直されていたら、別の空間で検索しないよう ValueError にする。
+    """
+    if model_name.startswith(HashingEmbedder.PREFIX):
+        return HashingEmbedder(int(model_name[len(HashingEmbedder.PREFIX) :]))
+    if model_name.startswith("local-lsa"):
+        embedder = create_embedder("local")
+        if embedder.model_name != model_name:
+            raise ValueError(
+                f"{Config.LOCAL_EMBEDDER_PATH} holds {embedder.model_name}, but the "
+                f"vectors were embedded with {model_name}. "
+                "Re-run the indexer with --embedder local."
+            )
+        return embedder
+    # 記録されたモデル名を優先する (0 はモデル既定の次元)
+    return GeminiEmbedder(output_dimensionality(model_name) or 0)
+
+
+def output_dimensionality(model_name: str) -> Optional[int]:
+    """モデル名に記録された出力次元 ("models/text-embedding-004@256" -> 256)"""
+    _, sep, dim = model_name.rpartition("@")
+    return int(dim) if sep and dim.isdigit() else None
+
+
+class HashingEmbedder(BaseEmbedder):
+    """
+    学習もネットワークも不要な決定的埋め込み (文字bigramを次元にハッシュ)
+    検索品質は求めず、CI や負荷試験でベクトルの次元だけ合わせたい場合に使う。
+    """
+
+    PREFIX = "hashing-"
+
+    def __init__(self, dim: int = 768):
+        self.dim = dim
+        self.model_name = f"{self.PREFIX}{dim}"
+
+    def _embed_one(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        for i in range(max(len(text) - 1, 1)):
+            gram = text[i : i + 2].encode("utf-8")
+            vector[zlib.crc32(gram) % self.dim] += 1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed_one(t) for t in texts]
+
+
+class GeminiEmbedder(BaseEmbedder):
+    def __init__(self, output_dim: Optional[int] = None):
         if not Config.GOOGLE_API_KEY:
             raise ValueError("GOOGLE_API_KEY not found in environment variables.")
 
+        # ローカルバックエンドだけを使う場合は SDK を読み込まない
+        import google.generativeai as genai
+
         genai.configure(api_key=Config.GOOGLE_API_KEY)
+        self._genai = genai
         self.model = Config.EMBEDDING_MODEL
+        # 出力次元を減らす場合はモデル名に記録し、次元の違うベクトルと混ぜない
+        # (output_dim 未指定なら設定値、0 ならモデル既定の次元)
+        if output_dim is None:
+            output_dim = Config.EMBEDDING_DIMENSIONALITY
+        self.output_dim = output_dim or None
+        self.model_name = Config.EMBEDDING_MODEL
+        if self.output_dim:
+            self.model_name = f"{Config.EMBEDDING_MODEL}@{self.output_dim}"
 
     def calculate_tokens(self, text: str) -> int:
         """
@@ -33,6 +134,7 @@ class Embedder:
         if not texts:
             return []
 
+        genai = self._genai
         cleaned_texts = [t.replace("\n", " ") for t in texts]
 
         try:
@@ -40,11 +142,15 @@ class Embedder:
             # google-generativeai では embed_content をループするか、リストを渡す。
             # 最新SDKでは embed_content(model=..., content=list) が可能。
 
+            options = {}
+            if self.output_dim:
+                options["output_dimensionality"] = self.output_dim
             result = genai.embed_content(
                 model=self.model,
                 content=cleaned_texts,
                 task_type="retrieval_document",  # 検索対象のドキュメントとして埋め込む
                 title="Law Article",  # Optional
+                **options,
             )
 
             # result['embedding'] はリストのリストになっているはず
@@ -58,7 +164,10 @@ class Embedder:
                 embeddings = []
                 for text in cleaned_texts:
                     res = genai.embed_content(
-                        model=self.model, content=text, task_type="retrieval_document"
+                        model=self.model,
+                        content=text,
+                        task_type="retrieval_document",
+                        **options,
                     )
                     embeddings.append(res["embedding"])
                 raw_embeddings = embeddings
@@ -87,3 +196,7 @@ class Embedder:
         except Exception as e:
             print(f"Error during embedding: {e}")
             raise
+
+
+# 既存スクリプト向けの互換名
+Embedder = GeminiEmbedder
@@ -1,142 +1,223 @@
+import argparse
 import logging
+import os
+from typing import Dict, List, Optional
 
-from src.rag_engine.embedder import Embedder
-from src.rag_engine.vector_store import VectorStore
+import numpy as np
+
+from src.core.models import CorpusDocument
+from src.infrastructure.corpus_store import CorpusStore, Projection, text_hash
+from src.rag_engine.config import Config
+from src.rag_engine.dedup import DedupPlan, plan_dedup, print_report
+from src.rag_engine.embedder import BaseEmbedder, create_embedder
+from src.rag_engine.metadata_index import refresh_metadata_index
+from src.rag_engine.routing import refresh_centroids
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def main():
-    # 正しくは database.py に `get_all_articles_with_metadata` を追加すべき。
-    # しかしPhase 2の手順としてまずはここ（Indexer）を完成させる。
-    pass
+def reusable_vectors(
+    store: CorpusStore, documents: List[CorpusDocument], model: str
+) -> Dict[str, np.ndarray]:
+    """本文が変わっていない条文の既存ベクトル (再埋め込み不要なもの)"""
+    if not store.has_vectors():
+        return {}
+    previous = store.load_vectors(mmap=True)
+    if previous.model != model:
+        return {}
+    rows = previous.row_of()
+    reused = {}
+    for doc in documents:
+        row = rows.get(doc.doc_id)
+        if row is not None and previous.text_hashes[row] == text_hash(
+            doc.embedding_text()
+        ):
+            reused[doc.doc_id] = np.array(previous.matrix[row])
+    return reused
+
+
+def current_projection(store: CorpusStore, model: str) -> Optional[Projection]:
+    """既存ベクトルが同じモデルで射影済みなら、その射影 (新しいベクトルにもかける)"""
+    if not store.has_vectors():
+        return None
+    previous = store.load_vectors(mmap=True)
+    return previous.projection if previous.model == model else None
+
+
+def sync_chroma(
+    documents: List[CorpusDocument], matrix: np.ndarray, batch_size: int
+) -> None:
+    """
+    Chroma へは doc_id・ベクトル・フィルタ用メタデータのみを渡す
+    (本文は CorpusStore にのみ保持し、documents は複製しない)
+    """
+    # chromadb は重いため、同期するときだけ読み込む
+    from src.rag_engine.vector_store import VectorStore
 
-    # ユーザー承認プロセス
-    print("🚀 Initializing Indexer...")
+    store = VectorStore()
+    for start in range(0, len(documents), batch_size):
+        batch = documents[start : start + batch_size]
+        store.add_documents(
+            ids=[d.doc_id for d in batch],
+            embeddings=matrix[start : start + batch_size].tolist(),
+            metadatas=[d.metadata() for d in batch],
+        )
 
-    # ここでREPOからデータを取る（未実装なのでモック）
-    # db_articles = repo.get_all_articles_for_embedding()
-    # ...
 
-    embedder = None
-    try:
-        embedder = Embedder()
-    except ValueError as e:
-        print(f"⚠️ Error: {e}")
-        print("Please set GOOGLE_API_KEY in .env file.")
-        return
+def load_embedder(
+    backend: str, documents: List[CorpusDocument], retrain: bool = False
+) -> BaseEmbedder:
+    """
+    埋め込みバックエンドを用意する
+    local の場合、学習済みモデルがなければ (または retrain 時) コーパスから学習する。
+    """
+    model_missing = not os.path.exists(Config.LOCAL_EMBEDDER_PATH)
+    if backend == "local" and (retrain or model_missing):
+        from src.rag_engine.local_embedder import LocalLSAEmbedder
+
+        print(f"🧠 Training local LSA embedder on {len(documents)} articles...")
+        local = LocalLSAEmbedder.fit([d.embedding_text() for d in documents])
+        local.save(Config.LOCAL_EMBEDDER_PATH)
+        print(f"   Saved {local.model_name} to {Config.LOCAL_EMBEDDER_PATH}")
+        return local
+    return create_embedder(backend)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Embed the corpus store.")
+    parser.add_argument(
+        "--embedder",
+        choices=["gemini", "local"],
+        default=Config.EMBEDDER_BACKEND,
+        help="Embedding backend (local needs no API key)",
+    )
+    parser.add_argument(
+        "--retrain", action="store_true", help="Retrain the local embedder"
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Embed every article (skip MinHash/LSH near-duplicate detection)",
+    )
+    parser.add_argument(
+        "--no-projection",
+        action="store_true",
+        help="Drop the PCA projection and re-embed everything at full width",
+    )
+    args = parser.parse_args(argv)
 
-    # データ読み込み（仮）
-    import sqlite3
+    print("🚀 Initializing Indexer...")
 
-    conn = sqlite3.connect("welfare_laws_v3.db")
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT a.law_id, l.law_full_name, a.article_number, a.hierarchy, a.content
-        FROM articles a
-        JOIN laws l ON a.law_id = l.law_id
-    """)
-    rows = cursor.fetchall()
-    conn.close()
+    # データ読み込み (CorpusStore が唯一の本文ソース)
+    store = CorpusStore()
+    documents = list(store.iter_documents())
 
-    print(f"📚 Found {len(rows)} articles in database.")
+    print(f"📚 Found {len(documents)} articles in database.")
 
-    if len(rows) == 0:
+    if len(documents) == 0:
         print("No data found. Please run populate_db.py first.")
         return
 
-    # コスト試算
-    total_tokens = 0
+    try:
+        embedder = load_embedder(args.embedder, documents, args.retrain)
+    except ValueError as e:
+        print(f"⚠️ Error: {e}")
+        print("Please set GOOGLE_API_KEY in .env file, or use --embedder local.")
+        return
+
     batch_size = 100  # API制限考慮
 
-    # プレビューループ
-    print("Calculating token usage...")
-    for row in rows:
-        # row: (law_id, law_name, article_num, hierarchy, content)
-        text_to_embed = f"{row[1]} {row[2]}\n{row[3]}\n{row[4]}"
-        total_tokens += embedder.calculate_tokens(text_to_embed)
+    # 空・「削除」の条文を除き、ほぼ同じ本文の条文は代表1件だけを埋め込む
+    if args.no_dedup:
+        plan = DedupPlan(representatives=documents)
+    else:
+        plan = plan_dedup(documents)
+        tokens_all = sum(
+            embedder.calculate_tokens(d.embedding_text()) for d in documents
+        )
+        tokens_kept = sum(
+            embedder.calculate_tokens(d.embedding_text()) for d in plan.representatives
+        )
+        print_report(plan, tokens_all, tokens_kept)
+        print(
+            f"   Estimated Cost:    ${embedder.calculate_cost(tokens_all):.5f} -> "
+            f"${embedder.calculate_cost(tokens_kept):.5f}"
+        )
+    targets = plan.representatives
+
+    # 本文が変わっていない条文は既存ベクトルを再利用する
+    # (射影済みの場合、新しいベクトルにも同じ射影をかける)
+    if args.no_projection:
+        projection, reused = None, {}
+    else:
+        projection = current_projection(store, embedder.model_name)
+        reused = reusable_vectors(store, targets, embedder.model_name)
+    pending = [d for d in targets if d.doc_id not in reused]
 
+    # コスト試算
+    total_tokens = sum(embedder.calculate_tokens(d.embedding_text()) for d in pending)
     cost = embedder.calculate_cost(total_tokens)
-    print(f"\n📊 Estimation:")
-    print(f"   Total Articles: {len(rows)}")
+    print("\n📊 Estimation:")
+    print(f"   Total Articles: {len(documents)}")
+    print(f"   Unique Vectors: {len(targets)}")
+    print(f"   Reused Vectors: {len(reused)}")
+    print(f"   To Embed:       {len(pending)}")
     print(f"   Total Tokens:   {total_tokens:,}")
     print(f"   Estimated Cost: ${cost:.5f}")
 
-    # 自動実行のため確認スキップ
-    print("Auto-proceeding with embedding...")
-
-    # 本番処理
-    store = VectorStore()
-
-    current_batch_ids = []
-    current_batch_texts = []
-    current_batch_metas = []
-
     print("\nProcessing batches...")
 
-    for i, row in enumerate(rows):
-        law_id, law_name, article_num, hierarchy, content = row
-
-        # ID作成 (Uniqueness確保: law_id + article_num)
-        # ※ article_numが日本語("第一条")なので、URLセーフではないがChromaDBのIDとしては文字列でOK
-        doc_id = f"{law_id}_{article_num}"
-
-        # 埋め込みテキストの構築
-        # 検索精度向上のため、法律名や階層情報もテキストに含める
-        text_to_embed = f"{law_name} {article_num}\n{hierarchy}\n{content}"
-
-        # メタデータ
-        metadata = {
-            "law_id": law_id,
-            "law_full_name": law_name,
-            "article_number": article_num,
-            "hierarchy": hierarchy,
-        }
-
-        current_batch_ids.append(doc_id)
-        current_batch_texts.append(text_to_embed)
-        current_batch_metas.append(metadata)
-
-        # バッチサイズに達したら実行
-        if len(current_batch_texts) >= batch_size:
-            print(f"  Embedding batch {i - batch_size + 1} to {i}...")
-            try:
-                embeddings = embedder.embed_texts(current_batch_texts)
-
-                # Debug: Check shape
-                if embeddings and len(embeddings) > 0:
-                    print(
-                        f"    Debug: Got {len(embeddings)} embeddings. Type: {type(embeddings[0])}"
-                    )
-                    if isinstance(embeddings[0], list):
-                        print(f"    Debug: Dim: {len(embeddings[0])}")
-
-                store.add_documents(
-                    ids=current_batch_ids,
-                    documents=current_batch_texts,
-                    embeddings=embeddings,
-                    metadatas=current_batch_metas,
-                )
-            except Exception as e:
-                print(f"❌ Error indexing batch: {e}")
-                # Log raw error for debugging without crashing everything immediatey (optional)
-                # raise e
-            # リセット
-            current_batch_ids = []
-            current_batch_texts = []
-            current_batch_metas = []
-
-    # 残りのバッチを処理
-    if current_batch_texts:
-        print(f"  Embedding final batch...")
-        embeddings = embedder.embed_texts(current_batch_texts)
-        store.add_documents(
-            ids=current_batch_ids,
-            documents=current_batch_texts,
-            embeddings=embeddings,
-            metadatas=current_batch_metas,
-        )
+    embedded: Dict[str, np.ndarray] = {}
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start : start + batch_size]
+        print(f"  Embedding batch {start} to {start + len(batch) - 1}...")
+        try:
+            embeddings = embedder.embed_texts([d.embedding_text() for d in batch])
+        except Exception as e:
+            print(f"❌ Error indexing batch: {e}")
+            continue
+        if projection is not None:
+            embeddings = projection.apply(np.asarray(embeddings)).tolist()
+        for doc, vector in zip(batch, embeddings):
+            embedded[doc.doc_id] = np.asarray(vector, dtype=np.float32)
+
+    # 埋め込み済みの条文だけをベクトルファイルに書き出す
+    indexed = [d for d in targets if d.doc_id in reused or d.doc_id in embedded]
+    if not indexed:
+        print("No embeddings were produced.")
+        return
+    matrix = np.stack(
+        [
+            reused[d.doc_id] if d.doc_id in reused else embedded[d.doc_id]
+            for d in indexed
+        ]
+    )
+    store.save_vectors(
+        ids=[d.doc_id for d in indexed],
+        embeddings=matrix,
+        model=embedder.model_name,
+        text_hashes=[text_hash(d.embedding_text()) for d in indexed],
+        aliases={
+            duplicate: representative
+            for duplicate, representative in plan.aliases.items()
+            if representative in reused or representative in embedded
+        },
+        projection=projection,
+    )
+    print(f"💾 Saved {len(indexed)} vectors to {store.vector_dir}/")
+    centroids = refresh_centroids(store)
+    print(f"🧭 Computed {len(centroids)} law/chapter centroids for routing")
+    postings = refresh_metadata_index(store)
+    print(f"🗂️ Indexed {len(postings.keys)} metadata values for filtered search")
+
+    # Chroma コレクションは Gemini の全次元ベクトル専用
+    full_width = projection is None and embedder.model_name == Config.EMBEDDING_MODEL
+    if args.embedder == "gemini" and full_width:
+        try:
+            sync_chroma(indexed, matrix, batch_size)
+        except Exception as e:
+            print(f"⚠️ Chroma sync skipped: {e}")
 
     print("\n🎉 Indexing Complete! Vector DB is ready.")
 
@@ -0,0 +1,234 @@
+import hashlib
+import math
+import os
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from src.rag_engine.embedder import BaseEmbedder
+
+
+def char_ngrams(text: str, ngram_range: Tuple[int, int] = (1, 3)) -> Counter:
+    """正規化したテキストの文字n-gram出現数 (空白・改行は区切りとして除外)"""
+    normalized = unicodedata.normalize("NFKC", text)
+    counts: Counter = Counter()
+    for chunk in normalized.split():
+        for n in range(ngram_range[0], ngram_range[1] + 1):
+            for i in range(len(chunk) - n + 1):
+                counts[chunk[i : i + n]] += 1
+    return counts
+
+
+class _CSR:
+    """
+    scipy を使わない最小限の CSR 行列
+    行ブロックごとに密行列へ展開して BLAS の行列積に載せる。
+    """
+
+    def __init__(
+        self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, n_cols: int
+    ):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = (len(indptr) - 1, n_cols)
+
+    def _blocks(self, block_rows: int) -> Iterator[Tuple[int, int, np.ndarray]]:
+        for start in range(0, self.shape[0], block_rows):
+            end = min(start + block_rows, self.shape[0])
+            lo, hi = self.indptr[start], self.indptr[end]
+            rows = np.repeat(
+                np.arange(end - start), np.diff(self.indptr[start : end + 1])
+            )
+            block = np.zeros((end - start, self.shape[1]), dtype=np.float32)
+            block[rows, self.indices[lo:hi]] = self.data[lo:hi]
+            yield start, end, block
+
+    def matmul(self, dense: np.ndarray, block_rows: int = 256) -> np.ndarray:
+        """X @ dense"""
+        out = np.empty((self.shape[0], dense.shape[1]), dtype=np.float32)
+        for start, end, block in self._blocks(block_rows):
+            out[start:end] = block @ dense
+        return out
+
+    def rmatmul(self, dense: np.ndarray, block_rows: int = 256) -> np.ndarray:
+        """X^T @ dense"""
+        out = np.zeros((self.shape[1], dense.shape[1]), dtype=np.float32)
+        for start, end, block in self._blocks(block_rows):
+            out += block.T @ dense[start:end]
+        return out
+
+
+class LocalLSAEmbedder(BaseEmbedder):
+    """
+    コーパスで学習する完全ローカルな埋め込み
+    文字n-gram TF-IDF (sublinear tf) を乱択 truncated SVD で低次元に射影する。
+    クエリの埋め込みは出現n-gramの射影行ベクトルの重み付き和だけで計算できる。
+    """
+
+    def __init__(
+        self,
+        vocabulary: Dict[str, int],
+        idf: np.ndarray,
+        components: np.ndarray,
+        ngram_range: Tuple[int, int] = (1, 3),
+    ):
+        self.vocabulary = vocabulary
+        self.idf = idf.astype(np.float32)
+        # (n_features, dim): TF-IDF 空間 -> LSA 空間
+        self.components = np.ascontiguousarray(components, dtype=np.float32)
+        self.ngram_range = ngram_range
+        fingerprint = hashlib.sha1(self.components[:64].tobytes()).hexdigest()[:8]
+        self.model_name = f"local-lsa-{self.dim}-{fingerprint}"
+
+    @property
+    def dim(self) -> int:
+        return int(self.components.shape[1])
+
+    # --- Training ---
+
+    @classmethod
+    def fit(
+        cls,
+        texts: Iterable[str],
+        dim: int = 256,
+        max_features: int = 30000,
+        min_df: int = 2,
+        ngram_range: Tuple[int, int] = (1, 3),
+        n_iter: int = 4,
+        seed: int = 0,
+    ) -> "LocalLSAEmbedder":
+        docs = [char_ngrams(t, ngram_range) for t in texts]
+        if not docs:
+            raise ValueError("Cannot fit the local embedder on an empty corpus.")
+
+        df: Counter = Counter()
+        for counts in docs:
+            df.update(counts.keys())
+        terms = [t for t, c in df.most_common() if c >= min_df][:max_features]
+        if not terms:
+            terms = [t for t, _ in df.most_common(max_features)]
+        vocabulary = {t: i for i, t in enumerate(terms)}
+        n_docs = len(docs)
+        idf = np.array(
+            [math.log((1 + n_docs) / (1 + df[t])) + 1.0 for t in terms],
+            dtype=np.float32,
+        )
+
+        tfidf = cls._tfidf_matrix(docs, vocabulary, idf)
+        components = _randomized_svd_components(
+            tfidf, min(dim, len(terms), n_docs), n_iter, seed
+        )
+        return cls(vocabulary, idf, components, ngram_range)
+
+    @staticmethod
+    def _tfidf_matrix(
+        docs: List[Counter], vocabulary: Dict[str, int], idf: np.ndarray
+    ) -> _CSR:
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for counts in docs:
+            row = [(vocabulary[t], c) for t, c in counts.items() if t in vocabulary]
+            row.sort()
+            weights = np.array(
+                [(1.0 + math.log(c)) * idf[i] for i, c in row], dtype=np.float32
+            )
+            norm = float(np.linalg.norm(weights)) or 1.0
+            indices.extend(i for i, _ in row)
+            data.extend((weights / norm).tolist())
+            indptr.append(len(indices))
+        return _CSR(
+            np.array(indptr, dtype=np.int64),
+            np.array(indices, dtype=np.int64),
+            np.array(data, dtype=np.float32),
+            len(vocabulary),
+        )
+
+    # --- Inference ---
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        counts = char_ngrams(text, self.ngram_range)
+        ids = []
+        weights = []
+        for term, c in counts.items():
+            i = self.vocabulary.get(term)
+            if i is not None:
+                ids.append(i)
+                weights.append((1.0 + math.log(c)) * self.idf[i])
+        if not ids:
+            return np.zeros(self.dim, dtype=np.float32)
+        w = np.asarray(weights, dtype=np.float32)
+        vector = w @ self.components[ids]
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack([self._embed_one(t) for t in texts])
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_array(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed_one(text).tolist()
+
+    # --- Persistence ---
+
+    def save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        terms = sorted(self.vocabulary, key=self.vocabulary.__getitem__)
+        tmp_path = path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            terms=np.array(terms, dtype=str),
+            idf=self.idf,
+            components=self.components,
+            ngram_range=np.array(self.ngram_range),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "LocalLSAEmbedder":
+        if not os.path.exists(path):
+            raise ValueError(
+                f"Local embedder model not found at {path}. "
+                "Train it with the indexer (--embedder local) first."
+            )
+        with np.load(path, allow_pickle=False) as data:
+            terms = data["terms"].tolist()
+            ngram_range = tuple(int(n) for n in data["ngram_range"])
+            return cls(
+                {t: i for i, t in enumerate(terms)},
+                data["idf"],
+                data["components"],
+                (ngram_range[0], ngram_range[1]),
+            )
+
+
+def _randomized_svd_components(
+    matrix: _CSR, k: int, n_iter: int, seed: int, oversample: int = 10
+) -> np.ndarray:
+    """
+    乱択 truncated SVD (Halko et al.) で右特異ベクトル V (n_features, k) を求める
+    疎行列との積だけで計算するため、TF-IDF を密行列に展開しない。
+    """
+    rng = np.random.default_rng(seed)
+    n_features = matrix.shape[1]
+    width = min(k + oversample, n_features, matrix.shape[0])
+
+    omega = rng.standard_normal((n_features, width)).astype(np.float32)
+    q, _ = np.linalg.qr(matrix.matmul(omega))
+    for _ in range(n_iter):
+        z, _ = np.linalg.qr(matrix.rmatmul(q))
+        q, _ = np.linalg.qr(matrix.matmul(z))
+
+    # B = Q^T X を (X^T Q)^T として計算し、小さな密行列を SVD
+    b = matrix.rmatmul(q).T
+    _, _, vt = np.linalg.svd(b, full_matrices=False)
+    return vt[:k].T.astype(np.float32)
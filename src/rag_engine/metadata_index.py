@@ -0,0 +1,193 @@
+"""
+メタデータ索引 (条文の並びの昇順配列) による絞り込み検索
+
+法令ID・法令名・条名と、hierarchy の各階層ノード ("第一編 総則",
+"第一編 総則 > 第二章 通則", ...) ごとに該当する条文の添字を昇順配列で持ち、
+Chroma の where と同じ形の条件を配列の積・和で評価する。
+VectorEngine は条件に合う条文の行だけを走査する (検索後の除外はしない)。
+
+    {"law_full_name": "生活保護法"}
+    {"$and": [{"law_id": {"$in": ["325AC0000000144"]}},
+              {"hierarchy": {"$prefix": "第四章"}}]}
+
+hierarchy の条件はそのノード以下のすべての条文に一致し、$prefix はパスの前方一致
+("第一編 総則 > 第二" は第一編の第二章・第二十章などに一致する)。
+"""
+
+import bisect
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from src.core.models import CorpusDocument
+from src.infrastructure.corpus_store import CorpusStore, PostingLists, VectorSet
+
+FIELDS = ("law_id", "law_full_name", "article_number", "hierarchy")
+_SEP = "\t"
+
+
+def hierarchy_nodes(hierarchy: str) -> List[str]:
+    """hierarchy の各階層までのパス ("A > B" -> ["A", "A > B"])"""
+    parts = [p.strip() for p in hierarchy.split(">") if p.strip()]
+    return [" > ".join(parts[: i + 1]) for i in range(len(parts))]
+
+
+def build_postings(
+    vectors: VectorSet, documents: Iterable[CorpusDocument]
+) -> PostingLists:
+    """
+    条文 (CorpusDocument) ごとにフィールド値の配列へ登録する
+    docs はベクトルの行順 (添字 = 行番号) に、重複除去で統合された条文を続ける。
+    """
+    row_of = vectors.row_of()
+    docs = list(vectors.ids)
+    extra = sorted(d for d, rep in vectors.aliases.items() if rep in row_of)
+    doc_rows = list(range(len(docs))) + [row_of[vectors.aliases[d]] for d in extra]
+    ordinal = {doc_id: i for i, doc_id in enumerate(docs + extra)}
+
+    lists: Dict[str, List[int]] = {}
+    for doc in documents:
+        i = ordinal.get(doc.doc_id)
+        if i is None:
+            continue
+        metadata = doc.metadata()
+        for field in FIELDS:
+            if field == "hierarchy":
+                values = hierarchy_nodes(metadata[field])
+            else:
+                values = [metadata[field]]
+            for value in values:
+                lists.setdefault(f"{field}{_SEP}{value}", []).append(i)
+
+    keys = sorted(lists)
+    sizes = [len(lists[key]) for key in keys]
+    return PostingLists(
+        docs=docs + extra,
+        doc_rows=np.array(doc_rows, dtype=np.int32),
+        keys=keys,
+        offsets=np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64),
+        postings=np.concatenate(
+            [np.array(sorted(lists[key]), dtype=np.int32) for key in keys]
+            or [np.empty(0, dtype=np.int32)]
+        ),
+        fingerprint=vectors.fingerprint(),
+    )
+
+
+def refresh_metadata_index(store: CorpusStore) -> PostingLists:
+    """保存済みのベクトルと SQLite の条文から索引を作り直して保存する"""
+    postings = build_postings(store.load_vectors(mmap=True), store.iter_documents())
+    store.save_metadata_index(postings)
+    return postings
+
+
+class MetadataIndex:
+    """Chroma の where 形式の条件を、条文の添字の昇順配列として評価する"""
+
+    def __init__(self, postings: PostingLists):
+        self.postings = postings
+        self.docs = postings.docs
+        self.doc_rows = postings.doc_rows
+        self._keys = postings.keys
+        self._ordinal = {doc_id: i for i, doc_id in enumerate(self.docs)}
+        self._all = np.arange(len(self.docs), dtype=np.int32)
+
+    @classmethod
+    def from_store(cls, store: CorpusStore, vectors: VectorSet) -> "MetadataIndex":
+        postings = store.load_metadata_index(vectors)
+        if postings is None:
+            postings = build_postings(vectors, store.iter_documents())
+        return cls(postings)
+
+    def _list(self, j: int) -> np.ndarray:
+        offsets = self.postings.offsets
+        return self.postings.postings[offsets[j] : offsets[j + 1]]
+
+    def _equal(self, field: str, value: str) -> np.ndarray:
+        key = f"{field}{_SEP}{value}"
+        j = bisect.bisect_left(self._keys, key)
+        if j < len(self._keys) and self._keys[j] == key:
+            return self._list(j)
+        return np.empty(0, dtype=np.int32)
+
+    def _prefix(self, field: str, prefix: str) -> np.ndarray:
+        start = f"{field}{_SEP}{prefix}"
+        parts: List[np.ndarray] = []
+        parent = None
+        j = bisect.bisect_left(self._keys, start)
+        while j < len(self._keys) and self._keys[j].startswith(start):
+            # 直前に採った階層ノードの子孫はその配列に含まれているので飛ばす
+            if parent is None or not self._keys[j].startswith(parent + " > "):
+                parts.append(self._list(j))
+                parent = self._keys[j]
+            j += 1
+        return self._union(parts)
+
+    def _intersect(self, parts: List[np.ndarray]) -> np.ndarray:
+        """短い配列から順に積を取る"""
+        if not parts:
+            return self._all
+        parts = sorted(parts, key=len)
+        result = parts[0]
+        for part in parts[1:]:
+            if result.size == 0:
+                break
+            result = np.intersect1d(result, part, True)
+        return result
+
+    def _union(self, parts: List[np.ndarray]) -> np.ndarray:
+        if not parts:
+            return np.empty(0, dtype=np.int32)
+        if len(parts) == 1:
+            return parts[0]
+        return np.unique(np.concatenate(parts))
+
+    def _condition(self, field: str, condition: Any) -> np.ndarray:
+        if field not in FIELDS:
+            raise ValueError(f"Unknown metadata field: {field}")
+        if not isinstance(condition, dict):
+            return self._equal(field, condition)
+        if len(condition) != 1:
+            raise ValueError(f"Expected one operator for {field}: {condition}")
+        [(op, value)] = condition.items()
+        if op == "$eq":
+            return self._equal(field, value)
+        if op == "$ne":
+            return np.setdiff1d(self._all, self._equal(field, value), True)
+        if op == "$in":
+            return self._union([self._equal(field, v) for v in value])
+        if op == "$nin":
+            excluded = self._union([self._equal(field, v) for v in value])
+            return np.setdiff1d(self._all, excluded, True)
+        if op == "$prefix":
+            return self._prefix(field, value)
+        raise ValueError(f"Unknown operator: {op}")
+
+    def match(self, where: Dict[str, Any]) -> np.ndarray:
+        """条件に合う条文の添字 (昇順)。同じ辞書に並べた条件は AND"""
+        result: Optional[np.ndarray] = None
+        for key, value in where.items():
+            if key == "$and":
+                part = self._intersect([self.match(clause) for clause in value])
+            elif key == "$or":
+                part = self._union([self.match(clause) for clause in value])
+            else:
+                part = self._condition(key, value)
+            result = part if result is None else self._intersect([result, part])
+        return self._all if result is None else result
+
+    def rows(self, docs: np.ndarray) -> np.ndarray:
+        """条文の添字からベクトルの行 (昇順、重複なし)"""
+        return np.unique(self.doc_rows[docs])
+
+    def accepts(self, docs: np.ndarray) -> Callable[[str], bool]:
+        """doc_id が docs に含まれるかの判定 (統合された条文の付け替え用)"""
+
+        def accept(doc_id: str) -> bool:
+            i = self._ordinal.get(doc_id)
+            if i is None:
+                return False
+            j = np.searchsorted(docs, i)
+            return bool(j < docs.size and docs[j] == i)
+
+        return accept
@@ -0,0 +1,104 @@
+"""
+保存済みベクトルの次元削減 (PCA)
+
+コーパスのベクトルで PCA を学習し、行列を target 次元に射影して保存し直す。
+射影は corpus_vectors/projection.npz に保存され、VectorEngine / ShardedEngine は
+元の次元のクエリに同じ射影を自動でかける。export 時は query_transform.json で
+Rust バックエンドにも渡される。
+
+    python -m src.rag_engine.projection --dim 256
+"""
+
+import argparse
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.infrastructure.corpus_store import CorpusStore, Projection
+from src.rag_engine.metadata_index import refresh_metadata_index
+from src.rag_engine.routing import refresh_centroids
+
+# PCA の学習に使う最大行数 (それ以上は無作為抽出)
+FIT_SAMPLE = 20000
+
+
+def fit_pca(
+    matrix: np.ndarray, dim: int, sample: int = FIT_SAMPLE, seed: int = 0
+) -> Tuple[Projection, float]:
+    """
+    行列の主成分 dim 本への射影と、その寄与率 (保持される分散の割合) を返す
+    """
+    n, source_dim = matrix.shape
+    if not 0 < dim < source_dim:
+        raise ValueError(f"Target dim must be between 1 and {source_dim - 1}.")
+    if n > sample:
+        rows = np.sort(np.random.default_rng(seed).choice(n, sample, replace=False))
+        data = np.asarray(matrix[rows], dtype=np.float64)
+    else:
+        data = np.asarray(matrix, dtype=np.float64)
+    mean = data.mean(axis=0)
+    _, singular, vt = np.linalg.svd(data - mean, full_matrices=False)
+    variance = singular**2
+    retained = float(variance[:dim].sum() / (variance.sum() or 1.0))
+    projection = Projection(mean.astype(np.float32), vt[:dim].astype(np.float32))
+    return projection, retained
+
+
+def project_matrix(
+    matrix: np.ndarray, projection: Projection, chunk: int = 8192
+) -> np.ndarray:
+    """memmap の行列を少しずつ読んで射影する"""
+    out = np.empty((matrix.shape[0], projection.dim), dtype=np.float32)
+    for start in range(0, matrix.shape[0], chunk):
+        out[start : start + chunk] = projection.apply(matrix[start : start + chunk])
+    return out
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Project the stored vectors onto their top principal components."
+    )
+    parser.add_argument("--dim", type=int, required=True)
+    parser.add_argument("--db", default="welfare_laws_v3.db")
+    parser.add_argument("--vector-dir", default="corpus_vectors")
+    args = parser.parse_args(argv)
+
+    store = CorpusStore(args.db, args.vector_dir)
+    if not store.has_vectors():
+        print(f"No vectors in {store.vector_dir}/. Run the indexer first.")
+        return 1
+    vectors = store.load_vectors(mmap=True)
+    if vectors.projection is not None:
+        print(
+            f"⚠️ Vectors are already projected to {vectors.dim} dims. "
+            "Re-run the indexer with --no-projection to start from full vectors."
+        )
+        return 1
+
+    try:
+        projection, retained = fit_pca(vectors.matrix, args.dim)
+    except ValueError as e:
+        print(f"⚠️ {e}")
+        return 1
+    projected = project_matrix(vectors.matrix, projection)
+    before_mib = vectors.matrix.nbytes / 2**20
+    store.save_vectors(
+        ids=vectors.ids,
+        embeddings=projected,
+        model=vectors.model,
+        text_hashes=vectors.text_hashes,
+        aliases=vectors.aliases,
+        projection=projection,
+    )
+    # セントロイドは射影後の空間で計算し直す (メタデータ索引も新しいベクトルに合わせる)
+    refresh_centroids(store)
+    refresh_metadata_index(store)
+    print(f"📉 Projected {len(vectors.ids)} vectors: {vectors.dim} -> {args.dim} dims")
+    print(f"   Variance retained: {retained:.1%}")
+    after_mib = projected.nbytes / 2**20
+    print(f"   Matrix size:       {before_mib:.1f} MiB -> {after_mib:.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+from typing import Dict, List, Optional
+
+from src.core.law_matcher import LawMatcher
+from src.infrastructure.corpus_store import CorpusStore
+from src.infrastructure.law_catalog import KNOWN_ABBREVIATIONS, LawCatalog
+
+# 分野キーワード -> 法令名 (backend/src/static_data.rs の alias map と同じ対応)
+TOPIC_KEYWORDS: Dict[str, List[str]] = {
+    "高齢者虐待": ["高齢者虐待の防止、高齢者の養護者に対する支援等に関する法律"],
+    "障害者虐待": ["障害者虐待の防止、障害者の養護者に対する支援等に関する法律"],
+    "児童虐待": ["児童虐待の防止等に関する法律"],
+    "配偶者暴力": ["配偶者からの暴力の防止及び被害者の保護等に関する法律"],
+    "生活困窮": ["生活困窮者自立支援法"],
+    "身体障害": ["身体障害者福祉法"],
+    "自立支援": [
+        "生活困窮者自立支援法",
+        "障害者の日常生活及び社会生活を総合的に支援するための法律",
+    ],
+    "精神障害": ["精神保健及び精神障害者福祉に関する法律"],
+    "知的障害": ["知的障害者福祉法"],
+    "虐待": [
+        "児童虐待の防止等に関する法律",
+        "高齢者虐待の防止、高齢者の養護者に対する支援等に関する法律",
+        "障害者虐待の防止、障害者の養護者に対する支援等に関する法律",
+        "配偶者からの暴力の防止及び被害者の保護等に関する法律",
+    ],
+    "高齢": [
+        "老人福祉法",
+        "介護保険法",
+        "高齢者虐待の防止、高齢者の養護者に対する支援等に関する法律",
+    ],
+    "介護": ["介護保険法", "老人福祉法"],
+    "障害": [
+        "障害者の日常生活及び社会生活を総合的に支援するための法律",
+        "身体障害者福祉法",
+        "知的障害者福祉法",
+        "精神保健及び精神障害者福祉に関する法律",
+        "障害者虐待の防止、障害者の養護者に対する支援等に関する法律",
+        "児童福祉法",
+    ],
+    "児童": ["児童福祉法", "児童虐待の防止等に関する法律"],
+    "子供": ["児童福祉法", "児童虐待の防止等に関する法律"],
+    "DV": ["配偶者からの暴力の防止及び被害者の保護等に関する法律"],
+    "生活保護": ["生活保護法"],
+    "生保": ["生活保護法"],
+}
+
+
+def build_law_matcher(
+    store: CorpusStore, catalog: Optional[LawCatalog] = None
+) -> LawMatcher:
+    """
+    コーパスに登録済みの法令だけを対象に照合器を組み立てる
+    catalog があれば法令番号 (「昭和二十五年法律第百四十四号」) も別名として使う。
+    """
+    law_names = {law.law_id: law.law_full_name for law in store.list_laws()}
+    ids_by_name = {name: law_id for law_id, name in law_names.items()}
+
+    aliases = dict(KNOWN_ABBREVIATIONS)
+    if catalog is not None:
+        for law_id in law_names:
+            entry = catalog.index.get(law_id)
+            if entry is not None and entry.law_no:
+                aliases[entry.law_no] = law_id
+
+    keywords = {
+        keyword: [ids_by_name[n] for n in names if n in ids_by_name]
+        for keyword, names in TOPIC_KEYWORDS.items()
+    }
+    return LawMatcher(
+        law_names,
+        aliases=aliases,
+        keywords=keywords,
+        article_titles=store.article_titles(),
+    )
@@ -0,0 +1,58 @@
+from typing import List, Tuple
+
+from src.core.models import SearchHit
+
+# backend/src/static_data.rs と同じキーワード (Rust バックエンドと同じ並びにするため)
+CHILD_KEYWORDS = [
+    "子供",
+    "児童",
+    "保育",
+    "幼",
+    "児",
+    "母子",
+    "虐待",
+    "障害児",
+    "未成年",
+]
+PENALTY_KEYWORDS = ["罰金", "懲役", "処する", "過料", "併科"]
+PENALTY_REQUEST_KEYWORDS = ["罰", "罪", "違反", "ペナルティ"]
+BOOST_ARTICLES = ["第一条", "第二条", "第三条", "１条", "２条", "３条", "目的", "定義"]
+
+CHILD_LAW_PENALTY = 0.15
+PENALTY_ARTICLE_PENALTY = 0.25
+PURPOSE_BOOST = 0.15
+# これ以上離れた結果は返さない (Rust 側の distance < 2.0 と同じ)
+MAX_DISTANCE = 2.0
+
+
+def adjusted_distance(query: str, hit: SearchHit) -> float:
+    """
+    ベクトル距離に Rust バックエンドと同じ補正をかける
+    (児童福祉法の抑制・罰則条文の抑制・目的/定義条文の優先)
+    """
+    distance = hit.distance
+    doc = hit.document
+    if doc is None:
+        return distance
+    text = doc.embedding_text()
+
+    if doc.law_full_name == "児童福祉法" and not any(
+        k in query for k in CHILD_KEYWORDS
+    ):
+        distance += CHILD_LAW_PENALTY
+    wants_penalty = any(k in query for k in PENALTY_REQUEST_KEYWORDS)
+    if not wants_penalty and any(k in text for k in PENALTY_KEYWORDS):
+        distance += PENALTY_ARTICLE_PENALTY
+    if any(k in doc.article_number for k in BOOST_ARTICLES) or "目的" in text[:50]:
+        distance -= PURPOSE_BOOST
+    return distance
+
+
+def rerank(
+    query: str, hits: List[SearchHit], limit: int = 15
+) -> List[Tuple[SearchHit, float]]:
+    """補正後の距離で並べ替え、(hit, distance) を上位 limit 件返す"""
+    scored = [(hit, adjusted_distance(query, hit)) for hit in hits]
+    scored = [(hit, d) for hit, d in scored if d < MAX_DISTANCE]
+    scored.sort(key=lambda item: item[1])
+    return scored[:limit]
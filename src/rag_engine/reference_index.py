@@ -0,0 +1,37 @@
+from typing import Dict, Iterable, List, Tuple
+
+from src.infrastructure.corpus_store import CorpusStore
+
+CITES = "cites"
+CITED_BY = "cited_by"
+
+
+class ReferenceIndex:
+    """
+    条文参照グラフの隣接リスト (参照先・被参照の両方向)
+    起動時に一度だけ構築し、検索時の展開は辞書引きのみで済ませる。
+    """
+
+    def __init__(self, edges: Iterable[Tuple[str, str]]):
+        self.cites: Dict[str, List[str]] = {}
+        self.cited_by: Dict[str, List[str]] = {}
+        for src, dst in edges:
+            if src == dst:
+                continue
+            targets = self.cites.setdefault(src, [])
+            if dst not in targets:
+                targets.append(dst)
+                self.cited_by.setdefault(dst, []).append(src)
+
+    @classmethod
+    def from_store(cls, store: CorpusStore) -> "ReferenceIndex":
+        return cls(store.iter_reference_edges())
+
+    def __len__(self) -> int:
+        return sum(len(targets) for targets in self.cites.values())
+
+    def neighbors(self, doc_id: str, limit: int = 3) -> List[Tuple[str, str]]:
+        """(doc_id, 関係) を参照先 -> 被参照の順に最大 limit 件返す"""
+        found = [(d, CITES) for d in self.cites.get(doc_id, [])]
+        found += [(d, CITED_BY) for d in self.cited_by.get(doc_id, [])]
+        return found[:limit]
@@ -0,0 +1,170 @@
+"""
+関連条文 (条文ごとのコサイン類似度上位 k 件) の事前計算
+
+全条文どうしの類似度を block 行ずつの float32 行列積で求め、行ごとに上位 k 件だけを
+残す (同時に持つのはワーカーごとに block x block の類似度と block x k の候補だけ)。
+行のブロックはスレッドで並列に処理する (行列積の間は GIL が外れる)。
+結果は corpus_vectors/neighbors.npz に保存され、検索API・エクスポートは
+条文の行から関連条文をそのまま引く。
+
+    python -m src.rag_engine.related --k 10
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.infrastructure.corpus_store import CorpusStore, NeighborGraph, VectorSet
+
+DEFAULT_K = 10
+DEFAULT_BLOCK = 2048
+DEFAULT_WORKERS = 4
+
+
+def _row_norms(matrix: np.ndarray, block: int) -> np.ndarray:
+    norms = np.empty(matrix.shape[0], dtype=np.float32)
+    for start in range(0, matrix.shape[0], block):
+        rows = np.asarray(matrix[start : start + block], dtype=np.float32)
+        norms[start : start + len(rows)] = np.linalg.norm(rows, axis=1)
+    norms[norms == 0] = 1.0
+    return norms
+
+
+def _top_k_block(
+    matrix: np.ndarray, norms: np.ndarray, start: int, k: int, block: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """行 start から block 行について、全行との類似度の上位 k 件 (自分自身を除く)"""
+    n = matrix.shape[0]
+    stop = min(start + block, n)
+    q = np.asarray(matrix[start:stop], dtype=np.float32) / norms[start:stop, None]
+    best_scores = np.full((stop - start, k), -np.inf, dtype=np.float32)
+    best_rows = np.full((stop - start, k), -1, dtype=np.int64)
+    for col in range(0, n, block):
+        end = min(col + block, n)
+        c = np.asarray(matrix[col:end], dtype=np.float32) / norms[col:end, None]
+        scores = q @ c.T
+        lo, hi = max(start, col), min(stop, end)
+        if lo < hi:
+            diagonal = np.arange(lo, hi)
+            scores[diagonal - start, diagonal - col] = -np.inf
+        candidates = np.concatenate([best_scores, scores], axis=1)
+        candidate_rows = np.concatenate(
+            [best_rows, np.broadcast_to(np.arange(col, end), scores.shape)], axis=1
+        )
+        top = np.argpartition(-candidates, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(candidates, top, axis=1)
+        best_rows = np.take_along_axis(candidate_rows, top, axis=1)
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    best_scores = np.take_along_axis(best_scores, order, axis=1)
+    best_rows = np.take_along_axis(best_rows, order, axis=1)
+    best_rows[~np.isfinite(best_scores)] = -1
+    return best_rows, np.where(np.isfinite(best_scores), best_scores, 0.0)
+
+
+def build_neighbors(
+    vectors: VectorSet,
+    k: int = DEFAULT_K,
+    block: int = DEFAULT_BLOCK,
+    workers: int = DEFAULT_WORKERS,
+) -> NeighborGraph:
+    """ベクトルの全行について、他の行とのコサイン類似度の上位 k 件を求める"""
+    matrix = vectors.matrix
+    n = matrix.shape[0]
+    k = max(0, min(k, n - 1))
+    rows = np.full((n, k), -1, dtype=np.int32)
+    scores = np.zeros((n, k), dtype=np.float32)
+    if k > 0:
+        norms = _row_norms(matrix, block)
+
+        def run(start: int) -> None:
+            top_rows, top_scores = _top_k_block(matrix, norms, start, k, block)
+            rows[start : start + len(top_rows)] = top_rows
+            scores[start : start + len(top_rows)] = top_scores
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            list(pool.map(run, range(0, n, block)))
+    return NeighborGraph(rows=rows, scores=scores, fingerprint=vectors.fingerprint())
+
+
+def refresh_neighbors(
+    store: CorpusStore,
+    k: int = DEFAULT_K,
+    block: int = DEFAULT_BLOCK,
+    workers: int = DEFAULT_WORKERS,
+) -> NeighborGraph:
+    """保存済みのベクトルから関連条文を作り直して保存する"""
+    graph = build_neighbors(store.load_vectors(mmap=True), k, block, workers)
+    store.save_neighbors(graph)
+    return graph
+
+
+class RelatedArticles:
+    """doc_id から関連条文 (doc_id, 類似度) を引く (重複条文は代表の行で引く)"""
+
+    def __init__(self, vectors: VectorSet, graph: NeighborGraph):
+        self.ids = vectors.ids
+        self.aliases = vectors.aliases
+        self.graph = graph
+        self._row_of: Dict[str, int] = vectors.row_of()
+
+    @classmethod
+    def from_store(
+        cls, store: CorpusStore, vectors: Optional[VectorSet] = None
+    ) -> Optional["RelatedArticles"]:
+        """関連条文が未計算・ベクトルと対応しない場合は None"""
+        if vectors is None:
+            vectors = store.load_vectors(mmap=True)
+        graph = store.load_neighbors(vectors)
+        return cls(vectors, graph) if graph is not None else None
+
+    def related(self, doc_id: str, n: Optional[int] = None) -> List[Tuple[str, float]]:
+        row = self._row_of.get(self.aliases.get(doc_id, doc_id))
+        if row is None:
+            return []
+        rows = self.graph.rows[row][:n]
+        scores = self.graph.scores[row][:n]
+        return [
+            (self.ids[r], float(s))
+            for r, s in zip(rows.tolist(), scores, strict=True)
+            if r >= 0
+        ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Precompute each article's most similar articles (related links)."
+    )
+    parser.add_argument("--k", type=int, default=DEFAULT_K)
+    parser.add_argument(
+        "--block", type=int, default=DEFAULT_BLOCK, help="rows per matrix product"
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--db", default="welfare_laws_v3.db")
+    parser.add_argument("--vector-dir", default="corpus_vectors")
+    args = parser.parse_args(argv)
+
+    store = CorpusStore(args.db, args.vector_dir)
+    if not store.has_vectors():
+        print(f"No vectors in {store.vector_dir}/. Run the indexer first.")
+        return 1
+    if args.k < 1 or args.block < 1:
+        print("⚠️ --k and --block must be positive.")
+        return 1
+    started = time.perf_counter()
+    graph = refresh_neighbors(store, args.k, args.block, args.workers)
+    elapsed = time.perf_counter() - started
+    n = graph.rows.shape[0]
+    print(f"🔗 Computed top-{graph.k} related articles for {n} vectors")
+    print(
+        f"   {elapsed:.1f}s ({n * n / max(elapsed, 1e-9) / 1e6:.0f}M pairs/s, "
+        f"block {args.block}, {args.workers} workers)"
+    )
+    print(f"   Saved to {store.vector_dir}/neighbors.npz")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,208 @@
+"""
+法令・章セントロイドによる2段階検索
+
+索引作成時に法令ごと・章ごと (hierarchy の「第…章」まで) のセントロイドを計算しておき、
+検索時はまずクエリとセントロイドの類似度で上位の章を選び、その章の条文だけを走査する。
+最上位の章と差が margin 以内の章が多すぎる (答えの場所に確信が持てない) 場合は
+全件走査に戻す。法令単位のセントロイドは、照合器で法令を特定できない質問の
+対象法令の推定 (LLM による推定の代わり) にも使う。
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.infrastructure.corpus_store import CentroidSet, CorpusStore, VectorSet
+
+logger = logging.getLogger(__name__)
+
+# 細かく走査する章の数と、最上位の章との類似度の差がこれ以内の章を候補とみなす幅
+# (scripts/bench_routing.py で recall と走査量の兼ね合いを確認して決めた値)
+DEFAULT_GROUPS = 8
+DEFAULT_MARGIN = 0.15
+# 法令の推定で返す最大の法令数と、候補とみなす幅 (章より狭くして誤推定を避ける)
+MAX_TARGET_LAWS = 3
+LAW_MARGIN = 0.05
+
+_CHAPTER = re.compile(r"^第\S+章")
+
+
+def chapter_of(hierarchy: str) -> str:
+    """hierarchy ("第一編 総則 > 第二章 通則 > 第一節 …") のうち章までの部分"""
+    parts = [p.strip() for p in hierarchy.split(">") if p.strip()]
+    for i, part in enumerate(parts):
+        if _CHAPTER.match(part):
+            return " > ".join(parts[: i + 1])
+    return parts[0] if parts else ""
+
+
+def _unit(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def build_centroids(
+    vectors: VectorSet, hierarchies: Dict[str, str], chunk: int = 8192
+) -> CentroidSet:
+    """
+    章ごとに正規化した行の平均を計算する
+    重複除去で代表に統合された条文は、自分の章のグループに代表の行を入れる。
+    """
+    row_of = vectors.row_of()
+    members = list(row_of.items()) + [
+        (duplicate, row_of[representative])
+        for duplicate, representative in vectors.aliases.items()
+        if representative in row_of
+    ]
+    groups: Dict[Tuple[str, str], Set[int]] = {}
+    for doc_id, row in members:
+        law_id = doc_id.partition("_")[0]
+        key = (law_id, chapter_of(hierarchies.get(doc_id, "")))
+        groups.setdefault(key, set()).add(row)
+
+    keys = sorted(groups)
+    member_groups = np.array(
+        [g for g, key in enumerate(keys) for _ in groups[key]], dtype=np.int64
+    )
+    member_rows = np.array([row for key in keys for row in groups[key]], dtype=np.int64)
+    order = np.argsort(member_rows, kind="stable")
+    member_groups, member_rows = member_groups[order], member_rows[order]
+
+    # 行列は memmap のまま少しずつ読み、各行を所属グループに足し込む
+    sums = np.zeros((len(keys), vectors.dim), dtype=np.float64)
+    for start in range(0, len(vectors.ids), chunk):
+        block = _unit(np.asarray(vectors.matrix[start : start + chunk]))
+        lo, hi = np.searchsorted(member_rows, [start, start + len(block)])
+        np.add.at(sums, member_groups[lo:hi], block[member_rows[lo:hi] - start])
+
+    sizes = np.array([len(groups[key]) for key in keys], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+    rows = np.concatenate(
+        [np.array(sorted(groups[key]), dtype=np.int64) for key in keys]
+        or [np.empty(0, dtype=np.int64)]
+    )
+    return CentroidSet(
+        labels=[f"{law_id} {chapter}".rstrip() for law_id, chapter in keys],
+        law_ids=[law_id for law_id, _ in keys],
+        means=(sums / np.maximum(sizes, 1)[:, None]).astype(np.float32),
+        offsets=offsets,
+        rows=rows,
+        fingerprint=vectors.fingerprint(),
+    )
+
+
+def refresh_centroids(store: CorpusStore) -> CentroidSet:
+    """保存済みのベクトルからセントロイドを計算し直して保存する (索引作成の最後)"""
+    vectors = store.load_vectors(mmap=True)
+    hierarchies = {d.doc_id: d.hierarchy for d in store.iter_documents()}
+    centroids = build_centroids(vectors, hierarchies)
+    store.save_centroids(centroids)
+    return centroids
+
+
+def _plausible(scores: np.ndarray, limit: int, margin: float) -> Optional[np.ndarray]:
+    """
+    上位 limit 件の添字 (降順)
+    最上位との差が margin 以内の候補が limit 件を超える場合は確信なしとして None。
+    """
+    order = np.argsort(-scores, kind="stable")
+    close = int(np.count_nonzero(scores >= scores[order[0]] - margin))
+    if close > limit:
+        return None
+    return order[:limit]
+
+
+class CentroidRouter:
+    """章セントロイドで走査する行を絞り込む (VectorEngine の粗い検索段)"""
+
+    def __init__(
+        self,
+        centroids: CentroidSet,
+        n_groups: int = DEFAULT_GROUPS,
+        margin: float = DEFAULT_MARGIN,
+    ):
+        self.centroids = centroids
+        self.n_groups = n_groups
+        self.margin = margin
+        self.unit = _unit(np.asarray(centroids.means, dtype=np.float32))
+
+        group_ids: Dict[str, List[int]] = {}
+        for g, law_id in enumerate(centroids.law_ids):
+            group_ids.setdefault(law_id, []).append(g)
+        self.groups_of_law = {
+            law_id: np.array(g, dtype=np.int64) for law_id, g in group_ids.items()
+        }
+        # 法令のセントロイド = 章のセントロイドを条文数で重み付けした平均
+        self.law_ids = sorted(group_ids)
+        weighted = centroids.means * centroids.sizes[:, None]
+        self.law_unit = _unit(
+            np.stack(
+                [weighted[self.groups_of_law[t]].sum(axis=0) for t in self.law_ids]
+            )
+            if self.law_ids
+            else np.empty((0, centroids.means.shape[1]), dtype=np.float32)
+        )
+
+    @classmethod
+    def from_store(
+        cls,
+        store: CorpusStore,
+        vectors: VectorSet,
+        n_groups: int = DEFAULT_GROUPS,
+        margin: float = DEFAULT_MARGIN,
+    ) -> "CentroidRouter":
+        centroids = store.load_centroids(vectors)
+        if centroids is None:
+            logger.info("Centroids missing or stale; computing them in memory.")
+            hierarchies = {d.doc_id: d.hierarchy for d in store.iter_documents()}
+            centroids = build_centroids(vectors, hierarchies)
+        return cls(centroids, n_groups, margin)
+
+    def route(
+        self, query: np.ndarray, law_ids: Optional[Set[str]] = None
+    ) -> Optional[np.ndarray]:
+        """
+        細かく走査する行 (昇順)
+        None は絞り込まない (全件、law_ids 指定時はその法令全体を走査する) ことを表す。
+        query は行列と同じ空間 (射影済み) のベクトル。
+        """
+        if law_ids is None:
+            candidates = np.arange(len(self.centroids))
+        else:
+            picked = [self.groups_of_law[t] for t in law_ids if t in self.groups_of_law]
+            if not picked:
+                return None
+            candidates = np.concatenate(picked)
+        if candidates.size <= self.n_groups:
+            return None
+
+        scores = self.unit[candidates] @ _unit(np.asarray(query, dtype=np.float32))
+        top = _plausible(scores, self.n_groups, self.margin)
+        if top is None:
+            return None
+        return np.unique(
+            np.concatenate([self.centroids.group_rows(g) for g in candidates[top]])
+        )
+
+    def target_laws(
+        self,
+        query: np.ndarray,
+        max_laws: int = MAX_TARGET_LAWS,
+        margin: float = LAW_MARGIN,
+    ) -> List[str]:
+        """
+        法令セントロイドで対象法令を推定する
+        最上位との差が margin 以内の法令が max_laws 件以下ならそれらを、
+        それより多い (確信なし) 場合は空リストを返す。
+        """
+        if not self.law_ids:
+            return []
+        scores = self.law_unit @ _unit(np.asarray(query, dtype=np.float32))
+        top = _plausible(scores, max_laws, margin)
+        if top is None:
+            return []
+        best = scores[top[0]]
+        return [self.law_ids[i] for i in top if scores[i] >= best - margin]
@@ -0,0 +1,310 @@
+import heapq
+import itertools
+import logging
+import multiprocessing
+import threading
+import zlib
+from concurrent.futures import Future
+from itertools import islice
+from multiprocessing.connection import Connection
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from src.core.models import SearchHit
+from src.infrastructure.corpus_store import CorpusStore, VectorSet
+from src.rag_engine.vector_engine import AliasIndex, project_query, top_k
+
+logger = logging.getLogger(__name__)
+
+BY_LAW = "law"
+BY_HASH = "hash"
+
+# シャードごとの1クエリ分の結果 (全体の行番号, スコア) をスコア降順で
+ShardResult = Tuple[np.ndarray, np.ndarray]
+
+
+def plan_shards(
+    law_ids: Sequence[str], n_shards: int, by: str = BY_LAW
+) -> List[np.ndarray]:
+    """
+    各行 (law_ids[i] は i 行目の法令) をシャードに割り当て、シャードごとの行番号を返す
+    law: 法令の境目で連続区間に切る (ワーカーは memmap のスライスをそのまま使える)
+    hash: doc の行を crc32 で均等に振り分ける (ワーカーは自分の行を複製して持つ)
+    """
+    n_rows = len(law_ids)
+    n_shards = max(1, min(n_shards, n_rows or 1))
+    if by == BY_HASH:
+        keys = np.array(
+            [zlib.crc32(f"{law_id}:{i}".encode()) for i, law_id in enumerate(law_ids)],
+            dtype=np.int64,
+        )
+        return [np.flatnonzero(keys % n_shards == s) for s in range(n_shards)]
+    if by != BY_LAW:
+        raise ValueError(f"Unknown shard key: {by}")
+
+    bounds = [0]
+    for s in range(1, n_shards):
+        cut = max(bounds[-1], n_rows * s // n_shards)
+        # 法令の途中で切らないよう、次の法令の先頭まで進める
+        while 0 < cut < n_rows and law_ids[cut] == law_ids[cut - 1]:
+            cut += 1
+        bounds.append(cut)
+    bounds.append(n_rows)
+    shards = [np.arange(a, b, dtype=np.int64) for a, b in itertools.pairwise(bounds)]
+    return [rows for rows in shards if rows.size] or [np.arange(0, dtype=np.int64)]
+
+
+def _local_law_rows(
+    rows: np.ndarray, law_rows: Dict[str, np.ndarray]
+) -> Dict[str, np.ndarray]:
+    """法令ごとの全体の行番号を、シャード内の位置 (rows は昇順) に変換する"""
+    local: Dict[str, np.ndarray] = {}
+    for law_id, targets in law_rows.items():
+        # targets も昇順なので、範囲外 (== rows.size) になるのは末尾だけ
+        pos = np.searchsorted(rows, targets)
+        pos = pos[pos < rows.size]
+        pos = pos[rows[pos] == targets[: pos.size]] if pos.size else pos
+        if pos.size:
+            local[law_id] = pos
+    return local
+
+
+def _serve_shard(
+    conn: Connection,
+    vector_path: str,
+    rows: np.ndarray,
+    law_rows: Dict[str, np.ndarray],
+) -> None:
+    """ワーカープロセス本体: 担当行だけを持ち、来たクエリ群の上位 k 件を返す"""
+    matrix = np.load(vector_path, mmap_mode="r")
+    if rows.size and rows[-1] - rows[0] + 1 == rows.size:
+        local = matrix[int(rows[0]) : int(rows[-1]) + 1]  # 連続区間は memmap のまま
+    else:
+        local = np.ascontiguousarray(matrix[rows])
+    norms = np.linalg.norm(local, axis=1).astype(np.float32)
+    norms[norms == 0] = 1.0
+    conn.send(("ready", int(rows.size)))
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        request_id, queries, n_results, filters = message
+        try:
+            q_norms = np.linalg.norm(queries, axis=1)
+            q_norms[q_norms == 0] = 1.0
+            # 絞り込みなしのクエリがあるときだけ担当行全体との積を取る
+            full = None
+            if any(targets is None for targets in filters):
+                full = (local @ queries.T) / (norms[:, None] * q_norms[None, :])
+            results: List[ShardResult] = []
+            for j, targets in enumerate(filters):
+                if targets is None:
+                    column = full[:, j]  # type: ignore[index]
+                    top = top_k(column, n_results)
+                    results.append((rows[top], column[top]))
+                    continue
+                picked = [law_rows[t] for t in targets if t in law_rows]
+                candidates = np.concatenate(picked) if picked else np.empty(0, np.int64)
+                scores = (local[candidates] @ queries[j]) / (
+                    norms[candidates] * q_norms[j]
+                )
+                top = top_k(scores, n_results)
+                results.append((rows[candidates[top]], scores[top]))
+            conn.send((request_id, results))
+        except Exception as e:
+            conn.send((request_id, e))
+
+
+class _Shard:
+    """ワーカープロセス1つへの送受信 (受信スレッドが request_id ごとに Future を解決)"""
+
+    def __init__(
+        self,
+        context: Any,
+        vector_path: str,
+        rows: np.ndarray,
+        law_rows: Dict[str, np.ndarray],
+    ):
+        self.rows = rows
+        self.laws: Set[str] = set(law_rows)
+        self._conn, child = context.Pipe()
+        self.process = context.Process(
+            target=_serve_shard,
+            args=(child, vector_path, rows, law_rows),
+            daemon=True,
+        )
+        self.process.start()
+        child.close()
+        self._send_lock = threading.Lock()
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count()
+        self._reader: Optional[threading.Thread] = None
+
+    def wait_ready(self) -> None:
+        status, _ = self._conn.recv()
+        if status != "ready":
+            raise RuntimeError(f"Shard worker failed to start: {status}")
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    def _read(self) -> None:
+        while True:
+            try:
+                request_id, result = self._conn.recv()
+            except (EOFError, OSError):
+                break
+            future = self._pending.pop(request_id)
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+        for future in self._pending.values():
+            future.set_exception(RuntimeError("Shard worker exited"))
+
+    def submit(
+        self,
+        queries: np.ndarray,
+        n_results: int,
+        filters: List[Optional[List[str]]],
+    ) -> "Future[List[ShardResult]]":
+        future: "Future[List[ShardResult]]" = Future()
+        with self._send_lock:
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+            self._conn.send((request_id, queries, n_results, filters))
+        return future
+
+    def close(self) -> None:
+        try:
+            with self._send_lock:
+                self._conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self._conn.close()
+
+
+class ShardedEngine:
+    """
+    ベクトル行列をシャードに分け、ワーカープロセスで並列に総当たり検索する
+    コーディネーターはクエリを各シャードに配り (法令の絞り込みはシャードへ渡し、
+    対象法令を持たないシャードには送らない)、シャードごとの top-k をヒープでマージする。
+    VectorEngine の search / search_batch と同じ呼び出し方で使える。
+    """
+
+    def __init__(
+        self,
+        vectors: VectorSet,
+        n_shards: int,
+        by: str = BY_LAW,
+        store: Optional[CorpusStore] = None,
+        start_method: str = "spawn",
+    ):
+        vector_path = getattr(vectors.matrix, "filename", None)
+        if vector_path is None:
+            raise ValueError("ShardedEngine needs a memory-mapped vector file")
+        self.vectors = vectors
+        self.store = store
+        self.ids = vectors.ids
+        self.aliases = AliasIndex(vectors)
+        context = multiprocessing.get_context(start_method)
+        self.shards = [
+            _Shard(
+                context,
+                str(vector_path),
+                rows,
+                _local_law_rows(rows, self.aliases.law_rows),
+            )
+            for rows in plan_shards(self.aliases.law_of_row, n_shards, by)
+        ]
+        try:
+            for shard in self.shards:
+                shard.wait_ready()
+        except Exception:
+            self.close()
+            raise
+        logger.info(f"Started {len(self.shards)} shard workers ({by})")
+
+    @classmethod
+    def from_store(
+        cls, store: CorpusStore, n_shards: int, by: str = BY_LAW
+    ) -> "ShardedEngine":
+        return cls(store.load_vectors(mmap=True), n_shards, by, store)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __enter__(self) -> "ShardedEngine":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for shard in self.shards:
+            shard.close()
+
+    def search(
+        self,
+        query_embedding: List[float],
+        n_results: int = 5,
+        law_ids: Optional[Iterable[str]] = None,
+        resolve: bool = True,
+    ) -> List[SearchHit]:
+        return self.search_batch([query_embedding], n_results, [law_ids], resolve)[0]
+
+    def search_batch(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 5,
+        law_ids: Optional[List[Optional[Iterable[str]]]] = None,
+        resolve: bool = True,
+    ) -> List[List[SearchHit]]:
+        q = project_query(query_embeddings, self.vectors.projection)
+        if q.size == 0:
+            return []
+        filters = [
+            list(targets) if targets is not None else None
+            for targets in (law_ids or [None] * q.shape[0])
+        ]
+
+        # scatter: 各シャードには対象法令を含むクエリだけを送る
+        sent: List[Tuple[List[int], "Future[List[ShardResult]]"]] = []
+        for shard in self.shards:
+            columns = [
+                j
+                for j, targets in enumerate(filters)
+                if targets is None or not shard.laws.isdisjoint(targets)
+            ]
+            if columns:
+                future = shard.submit(
+                    q[columns], n_results, [filters[j] for j in columns]
+                )
+                sent.append((columns, future))
+
+        # gather: シャードごとの降順リストをヒープでマージして上位 k 件
+        per_query: List[List[Iterable[Tuple[float, int]]]] = [[] for _ in filters]
+        for columns, future in sent:
+            for j, (rows, scores) in zip(columns, future.result(), strict=True):
+                per_query[j].append(zip((-scores).tolist(), rows.tolist(), strict=True))
+        target_sets = [set(t) if t is not None else None for t in filters]
+        results = [
+            [
+                self.aliases.hit(row, -neg, targets)
+                for neg, row in islice(heapq.merge(*streams), n_results)
+            ]
+            for streams, targets in zip(per_query, target_sets, strict=True)
+        ]
+        if resolve and self.store is not None:
+            hits = [hit for hits in results for hit in hits]
+            documents = self.store.get_documents([h.doc_id for h in hits])
+            for hit in hits:
+                hit.document = documents.get(hit.doc_id)
+        return results
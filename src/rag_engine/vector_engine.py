@@ -0,0 +1,307 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.core.models import SearchHit
+from src.infrastructure.corpus_store import CorpusStore, Projection, VectorSet
+from src.rag_engine.metadata_index import MetadataIndex
+from src.rag_engine.reference_index import ReferenceIndex
+from src.rag_engine.routing import DEFAULT_MARGIN, CentroidRouter
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """スコア上位 k 件の添字を降順で返す (全体のソートはしない)"""
+    k = min(k, scores.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+def project_query(query: object, projection: Optional[Projection]) -> np.ndarray:
+    """
+    クエリを行列と同じ空間に揃える
+    行列が射影済みで、クエリが元の次元 (埋め込みモデルの出力そのまま) なら射影する。
+    """
+    q = np.asarray(query, dtype=np.float32)
+    if projection is not None and q.shape[-1] == projection.source_dim:
+        q = projection.apply(q)
+    return q
+
+
+class AliasIndex:
+    """
+    行と法令・重複条文の対応
+    重複除去で代表に統合された条文は、その法令の絞り込みでも代表の行を対象にし、
+    結果は対象法令側の doc_id に付け替えて返す。
+    """
+
+    def __init__(self, vectors: VectorSet):
+        self.ids = vectors.ids
+        self.law_of_row = [doc_id.partition("_")[0] for doc_id in self.ids]
+        row_of = vectors.row_of()
+        self.duplicates: Dict[int, List[str]] = {}
+        for duplicate, representative in vectors.aliases.items():
+            row = row_of.get(representative)
+            if row is not None:
+                self.duplicates.setdefault(row, []).append(duplicate)
+
+        rows: Dict[str, List[int]] = {}
+        for row, law_id in enumerate(self.law_of_row):
+            rows.setdefault(law_id, []).append(row)
+        for row, duplicates in self.duplicates.items():
+            for duplicate in duplicates:
+                rows.setdefault(duplicate.partition("_")[0], []).append(row)
+        self.law_rows = {
+            law_id: np.unique(np.array(r, dtype=np.int64)) for law_id, r in rows.items()
+        }
+
+    def rows_for_laws(self, law_ids: Iterable[str]) -> np.ndarray:
+        picked = [self.law_rows[t] for t in set(law_ids) if t in self.law_rows]
+        if not picked:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(picked))
+
+    def hit(
+        self,
+        row: int,
+        score: float,
+        law_ids: Optional[Set[str]],
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> SearchHit:
+        """accept: メタデータ条件に合う条文か (合う重複条文があればそちらを返す)"""
+        candidates = (self.ids[row], *self.duplicates.get(row, []))
+        doc_id = next(
+            (
+                d
+                for d in candidates
+                if (law_ids is None or d.partition("_")[0] in law_ids)
+                and (accept is None or accept(d))
+            ),
+            self.ids[row],
+        )
+        others = [d for d in candidates if d != doc_id]
+        return SearchHit(doc_id=doc_id, score=score, duplicates=others)
+
+
+class VectorEngine:
+    """
+    CorpusStore のベクトルファイル (memmap) に対する総当たりコサイン検索
+    本文は保持せず、返却する top-k だけ doc_id で CorpusStore から解決する。
+    router があれば、章セントロイドで選んだ章の行だけを走査する。
+    """
+
+    def __init__(
+        self,
+        vectors: VectorSet,
+        store: Optional[CorpusStore] = None,
+        references: Optional[ReferenceIndex] = None,
+        router: Optional[CentroidRouter] = None,
+        metadata: Optional[MetadataIndex] = None,
+    ):
+        self.vectors = vectors
+        self.store = store
+        self.references = references
+        self.router = router
+        self.metadata = metadata
+        self.ids = vectors.ids
+        self.matrix = vectors.matrix
+        # ノルムだけ事前計算 (行列本体は memmap のまま触らない)
+        norms = np.linalg.norm(self.matrix, axis=1).astype(np.float32)
+        norms[norms == 0] = 1.0
+        self.norms = norms
+        self.aliases = AliasIndex(vectors)
+        self.projection = vectors.projection
+        self._row_of = vectors.row_of()
+
+    @classmethod
+    def from_store(
+        cls,
+        store: CorpusStore,
+        mmap: bool = True,
+        with_references: bool = True,
+        route_groups: int = 0,
+        route_margin: float = DEFAULT_MARGIN,
+        with_metadata: bool = True,
+    ) -> "VectorEngine":
+        """route_groups > 0 で章セントロイドによる絞り込みを有効にする"""
+        vectors = store.load_vectors(mmap=mmap)
+        references = ReferenceIndex.from_store(store) if with_references else None
+        router = None
+        if route_groups > 0:
+            router = CentroidRouter.from_store(
+                store, vectors, route_groups, route_margin
+            )
+        metadata = MetadataIndex.from_store(store, vectors) if with_metadata else None
+        return cls(vectors, store, references, router, metadata)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _rows_for_laws(self, law_ids: Iterable[str]) -> np.ndarray:
+        return self.aliases.rows_for_laws(law_ids)
+
+    def _plan(
+        self,
+        q: np.ndarray,
+        targets: Optional[Set[str]],
+        where: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[Optional[np.ndarray], bool, Optional[Callable[[str], bool]]]:
+        """
+        走査する行 (None は全件)・セントロイドで絞り込んだかどうか・
+        メタデータ条件に合う条文の判定 (where 指定時のみ)
+        """
+        if where is not None:
+            if self.metadata is None:
+                raise ValueError("Metadata filters need a MetadataIndex.")
+            docs = self.metadata.match(where)
+            rows = self.metadata.rows(docs)
+            if targets is not None:
+                rows = np.intersect1d(rows, self._rows_for_laws(targets), True)
+            return rows, False, self.metadata.accepts(docs)
+        if self.router is not None:
+            routed = self.router.route(q, targets)
+            if routed is not None:
+                return routed, True, None
+        rows = self._rows_for_laws(targets) if targets is not None else None
+        return rows, False, None
+
+    def scores(
+        self, query_embedding: List[float], rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """クエリと各行のコサイン類似度 (rows 指定時はその行のみ)"""
+        q = project_query(query_embedding, self.projection)
+        q_norm = float(np.linalg.norm(q)) or 1.0
+        if rows is None:
+            return (self.matrix @ q) / (self.norms * q_norm)
+        return (self.matrix[rows] @ q) / (self.norms[rows] * q_norm)
+
+    def search(
+        self,
+        query_embedding: List[float],
+        n_results: int = 5,
+        law_ids: Optional[Iterable[str]] = None,
+        resolve: bool = True,
+        expand_references: int = 0,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[SearchHit]:
+        """
+        ベクトル検索を実行
+        law_ids: 対象法令の絞り込み (該当行だけを走査する)
+        resolve: True の場合、結果の条文本文を CorpusStore から取得する
+        expand_references: 各結果につき、参照先・被参照の条文を最大この件数追加する
+        where: メタデータ条件 (MetadataIndex の形式、該当行だけを走査する)
+        """
+        targets = set(law_ids) if law_ids is not None else None
+        q = project_query(query_embedding, self.projection)
+        rows, _, accept = self._plan(q, targets, where)
+        scores = self.scores(q, rows)
+        hits = self._top_hits(scores, rows, n_results, targets, accept)
+        if expand_references and self.references is not None:
+            hits = self._expand(hits, query_embedding, expand_references)
+        if resolve:
+            self._resolve(hits)
+        return hits
+
+    def search_batch(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 5,
+        law_ids: Optional[List[Optional[Iterable[str]]]] = None,
+        resolve: bool = True,
+        expand_references: int = 0,
+        where: Optional[List[Optional[Dict[str, Any]]]] = None,
+    ) -> List[List[SearchHit]]:
+        """
+        複数クエリをまとめて検索 (行列×行列の1回の積で全クエリを採点する)
+        law_ids・where: クエリごとの絞り込み (None の要素は全件)
+        """
+        q = project_query(query_embeddings, self.projection)
+        if q.size == 0:
+            return []
+        plans = []
+        for j in range(q.shape[0]):
+            filter_j = law_ids[j] if law_ids is not None else None
+            targets = set(filter_j) if filter_j is not None else None
+            where_j = where[j] if where is not None else None
+            plans.append((targets, *self._plan(q[j], targets, where_j)))
+
+        # 全件を走査するクエリだけ、行列×行列の1回の積でまとめて採点する
+        # (絞り込んだクエリは該当行だけを採点する)
+        full = [j for j, (_, rows, _, _) in enumerate(plans) if rows is None]
+        column_of = {j: c for c, j in enumerate(full)}
+        if full:
+            q_full = q[full]
+            q_norms = np.linalg.norm(q_full, axis=1)
+            q_norms[q_norms == 0] = 1.0
+            all_scores = (self.matrix @ q_full.T) / (
+                self.norms[:, None] * q_norms[None, :]
+            )
+
+        results = []
+        for j, (targets, rows, _, accept) in enumerate(plans):
+            if rows is None:
+                scores = all_scores[:, column_of[j]]
+            else:
+                scores = self.scores(q[j], rows)
+            hits = self._top_hits(scores, rows, n_results, targets, accept)
+            if expand_references and self.references is not None:
+                hits = self._expand(hits, q[j].tolist(), expand_references)
+            results.append(hits)
+        if resolve:
+            self._resolve([hit for hits in results for hit in hits])
+        return results
+
+    def _top_hits(
+        self,
+        scores: np.ndarray,
+        rows: Optional[np.ndarray],
+        n_results: int,
+        law_ids: Optional[Set[str]] = None,
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> List[SearchHit]:
+        top = top_k(scores, n_results)
+        row_ids = rows[top] if rows is not None else top
+        return [
+            self.aliases.hit(int(r), float(scores[int(t)]), law_ids, accept)
+            for r, t in zip(row_ids, top)
+        ]
+
+    def _resolve(self, hits: List[SearchHit]) -> None:
+        """結果の条文本文を CorpusStore から取得して埋める"""
+        if self.store is None or not hits:
+            return
+        documents = self.store.get_documents([h.doc_id for h in hits])
+        for hit in hits:
+            hit.document = documents.get(hit.doc_id)
+
+    def _expand(
+        self, hits: List[SearchHit], query_embedding: List[float], per_hit: int
+    ) -> List[SearchHit]:
+        """上位結果の直後に、事前計算済みの参照先・被参照の条文を差し込む"""
+        if self.references is None:
+            return hits
+        seen = {h.doc_id for h in hits}
+        expanded: List[SearchHit] = []
+        for hit in hits:
+            expanded.append(hit)
+            neighbors = [
+                (doc_id, relation)
+                for doc_id, relation in self.references.neighbors(hit.doc_id, per_hit)
+                if doc_id not in seen and doc_id in self._row_of
+            ]
+            if not neighbors:
+                continue
+            rows = np.array([self._row_of[d] for d, _ in neighbors], dtype=np.int64)
+            scores = self.scores(query_embedding, rows)
+            for (doc_id, relation), score in zip(neighbors, scores, strict=True):
+                seen.add(doc_id)
+                expanded.append(
+                    SearchHit(
+                        doc_id=doc_id,
+                        score=float(score),
+                        expanded_from=hit.doc_id,
+                        relation=relation,
+                    )
+                )
+        return expanded
@@ -25,16 +25,16 @@ class VectorStore:
     def add_documents(
         self,
         ids: List[str],
-        documents: List[str],
         embeddings: List[List[float]],
         metadatas: List[Dict],
+        documents: Optional[List[str]] = None,
     ):
         """
         ドキュメントをベクトルDBに追加
-        ids: 一意のID（例: law_id + article_num）
-        documents: 元のテキスト（条文）
+        ids: 一意のID（CorpusStore の doc_id: law_id + article_num）
         embeddings: ベクトル
         metadatas: 検索用のメタ情報（法律名、重要度など）
+        documents: 元のテキスト。本文は CorpusStore が持つため通常は渡さない
         """
         self.collection.upsert(
             ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas
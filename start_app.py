@@ -6,9 +6,14 @@ import urllib.request
 import urllib.error
 import signal
 
-BACKEND_URL = "http://localhost:3000/health"
+# /ready turns green once the backend has warmed its caches from the query log
+BACKEND_URL = "http://localhost:3000/ready"
 BACKEND_DIR = "backend"
 FRONTEND_SCRIPT = "src/interface/app.py"
+# Query log written by the frontend (see src/infrastructure/query_log.py),
+# replayed by the backend at startup
+QUERY_LOG = os.environ.get("QUERY_LOG_PATH", os.path.join("cache", "query_log.jsonl"))
+WARM_TOP_QUERIES = os.environ.get("WARM_TOP_QUERIES", "50")
 
 
 def is_port_in_use(port):
@@ -30,6 +35,14 @@ def kill_port_process(port):
         )
 
 
+def backend_env():
+    """The backend runs in backend/, so pass it the query log as an absolute path."""
+    env = dict(os.environ)
+    env["QUERY_LOG_PATH"] = os.path.abspath(QUERY_LOG) if QUERY_LOG else ""
+    env["WARM_TOP_QUERIES"] = WARM_TOP_QUERIES
+    return env
+
+
 def start_backend():
     print("\n🦀 [1/2] Starting Rust Backend...")
     # Check if port 3000 is occupied
@@ -47,6 +60,7 @@ def start_backend():
             proc = subprocess.Popen(
                 [binary_path],
                 cwd=BACKEND_DIR,
+                env=backend_env(),
             )
             return proc
         except Exception as e:
@@ -63,6 +77,7 @@ def start_backend():
                 "--release",
             ],  # Use release for speed if possible
             cwd=BACKEND_DIR,
+            env=backend_env(),
         )
         return proc
     except FileNotFoundError:
@@ -81,7 +96,7 @@ def wait_for_backend(timeout=300):
                     print(f"✅ Backend is ready at {BACKEND_URL}!")
                     return True
         except urllib.error.URLError:
-            pass  # Connection refused means not ready yet
+            pass  # Connection refused (or 503 while warming up) means not ready yet
         except Exception as e:
             print(f"Warning: {e}")
 
@@ -141,6 +156,7 @@ def main():
     backend_proc = start_backend()
 
     try:
+        # The backend reports ready only after warming its caches
         if wait_for_backend():
             # Check for PORT environment variable (common in PaaS like Render)
             # Default to 8501 if not set
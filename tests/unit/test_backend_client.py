@@ -0,0 +1,67 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.interface.backend_client import BackendClient, BackendError, TTLCache
+
+
+def test_ttl_cache_evicts_oldest_and_expired_entries() -> None:
+    now = [0.0]
+    cache: TTLCache[int] = TTLCache(max_entries=2, ttl=10, clock=lambda: now[0])
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # a が最近使われた側になる
+    cache.put("c", 3)
+    assert "b" not in cache
+    now[0] = 11
+    assert cache.get("a") is None
+    assert len(cache) == 1
+
+
+class _Backend(BaseHTTPRequestHandler):
+    calls: list = []
+
+    def _reply(self, status: int, body: object) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:  # noqa: N802
+        self.calls.append(("GET", self.path))
+        self._reply(200, ["生活保護法", "児童福祉法"])
+
+    def do_POST(self) -> None:  # noqa: N802
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.calls.append(("POST", self.path))
+        if self.path != "/laws/content":
+            self._reply(500, {"error": "boom"})
+            return
+        name = payload["law_name"]
+        self._reply(200, {"articles": [{"document": f"{name} 第一条"}]})
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def test_prefetched_content_is_served_without_another_request() -> None:
+    _Backend.calls = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Backend)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = BackendClient(f"http://127.0.0.1:{server.server_port}")
+    try:
+        laws = client.list_laws()
+        client.prefetch(laws)
+        assert client.law_content("生活保護法") == [{"document": "生活保護法 第一条"}]
+        assert client.law_content("児童福祉法") == [{"document": "児童福祉法 第一条"}]
+        assert _Backend.calls.count(("POST", "/laws/content")) == 2
+
+        with pytest.raises(BackendError):
+            client.search({"query": "生活保護"})
+    finally:
+        client.close()
+        server.shutdown()
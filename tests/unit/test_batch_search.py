@@ -0,0 +1,110 @@
+import csv
+import json
+
+from src.interface.batch_search import (
+    Question,
+    main,
+    read_questions,
+    result_rows,
+    unique_payloads,
+    write_results,
+)
+from src.interface.search_service import SearchService
+from src.rag_engine.embedder import HashingEmbedder
+from tests.unit.test_search_service import _store
+
+
+class CountingEmbedder(HashingEmbedder):
+    def __init__(self, dim: int):
+        super().__init__(dim)
+        self.calls: list = []
+
+    def embed_texts(self, texts):
+        self.calls.append(len(texts))
+        return super().embed_texts(texts)
+
+
+def test_questions_are_normalized_and_deduplicated(tmp_path) -> None:
+    txt = tmp_path / "exam.txt"
+    txt.write_text("生活保護の　申請\n\n生活保護の 申請\n児童相談所の役割\n", "utf-8")
+    questions = read_questions(str(txt))
+    assert [(q.id, q.text) for q in questions] == [
+        ("1", "生活保護の 申請"),
+        ("3", "生活保護の 申請"),
+        ("4", "児童相談所の役割"),
+    ]
+    assert len(unique_payloads(questions)) == 2
+
+    jsonl = tmp_path / "exam.jsonl"
+    jsonl.write_text('{"id": "q1", "question": "ＡＢＣ"}\n{"query": "罰則"}\n', "utf-8")
+    assert [(q.id, q.text) for q in read_questions(str(jsonl))] == [
+        ("q1", "ABC"),
+        ("2", "罰則"),
+    ]
+    exam_csv = tmp_path / "exam.csv"
+    exam_csv.write_text("id,question\nA-1,保護の種類\nA-2,\n", "utf-8")
+    assert [(q.id, q.text) for q in read_questions(str(exam_csv))] == [
+        ("A-1", "保護の種類")
+    ]
+
+
+def test_batch_matches_one_by_one_search(tmp_path) -> None:
+    store = _store(tmp_path)
+    embedder = CountingEmbedder(64)
+    service = SearchService.from_store(store, embedder)
+    try:
+        payloads = [
+            {"query": q}
+            for q in ("生活保護法の申請", "児童福祉法の罰則", "目的", "保護の種類")
+        ]
+        service.embed_many(["目的"])
+        embedder.calls.clear()
+
+        batched = service.search_many(payloads + payloads[:1], batch=3)
+        # キャッシュ済みの "目的" を除いた3件を1回で埋め込む
+        assert embedder.calls == [3]
+        assert batched[0] == batched[-1]
+        for payload, response in zip(payloads, batched[:4], strict=True):
+            assert response == service._search(payload)
+        assert service.search(payloads[1])["cached"] is True
+    finally:
+        service.close()
+
+
+def test_batch_command_writes_jsonl_and_csv(tmp_path, capsys) -> None:
+    store = _store(tmp_path)
+    questions = tmp_path / "exam.txt"
+    questions.write_text("生活保護の申請\n児童福祉法の罰則\n生活保護の申請\n", "utf-8")
+    argv = [str(questions), "--embedder", "fake", "--db", store.db_path]
+    argv += ["--vector-dir", store.vector_dir]
+
+    assert main([*argv, "-o", str(tmp_path / "out.jsonl"), "--compare", "2"]) == 0
+    assert "batch is" in capsys.readouterr().out
+    lines = (tmp_path / "out.jsonl").read_text("utf-8").splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [row["id"] for row in rows] == ["1", "2", "3"]
+    assert rows[0]["results"] == rows[2]["results"]
+    assert [r["rank"] for r in rows[1]["results"]][:2] == [1, 2]
+
+    assert main([*argv, "-o", str(tmp_path / "out.csv")]) == 0
+    with open(tmp_path / "out.csv", encoding="utf-8", newline="") as f:
+        records = list(csv.DictReader(f))
+    assert len(records) == sum(len(row["results"]) for row in rows)
+    assert records[0]["question"] == "生活保護の申請" and records[0]["rank"] == "1"
+
+
+def test_a_failing_question_does_not_abort_the_batch(tmp_path) -> None:
+    service = SearchService.from_store(_store(tmp_path), HashingEmbedder(64), shards=2)
+    try:
+        where = {"query": "申請", "where": {"law_full_name": "生活保護法"}}
+        failed, ok = service.search_many([where, {"query": "申請"}])
+        assert failed["results"] == [] and "not supported" in failed["error"]
+        assert ok["results"] and "error" not in ok
+    finally:
+        service.close()
+
+    rows = [result_rows(Question("1", "申請"), failed)]
+    write_results(str(tmp_path / "out.csv"), rows)
+    with open(tmp_path / "out.csv", encoding="utf-8", newline="") as f:
+        [record] = list(csv.DictReader(f))
+    assert record["id"] == "1" and record["error"] == failed["error"]
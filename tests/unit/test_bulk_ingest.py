@@ -0,0 +1,64 @@
+from datetime import datetime
+
+from src.core.models import Article, CatalogEntry, Law
+from src.infrastructure.database import LawRepository
+from src.infrastructure.ingest_ledger import FAILED, STORED, IngestLedger
+from src.interface.bulk_ingest import run_bulk_ingest
+
+
+class _FakeAPI:
+    def __init__(self, broken: set[str]) -> None:
+        self.broken = broken
+        self.fetched: list[str] = []
+
+    def fetch_law_xml(self, law_id: str) -> bytes | None:
+        self.fetched.append(law_id)
+        return None if law_id in self.broken else law_id.encode()
+
+    def parse_law_xml(self, xml_content: bytes, law_id: str):  # type: ignore[no-untyped-def]
+        law = Law(
+            law_id=law_id,
+            law_num="",
+            law_full_name=f"法令{law_id}",
+            last_updated=datetime(2024, 1, 1),
+        )
+        return law, [
+            Article(law_id=law_id, article_number="第一条", hierarchy="", content="x")
+        ]
+
+
+def _entries(n: int) -> list[CatalogEntry]:
+    return [
+        CatalogEntry(law_id=f"L{i}", law_name=f"法令L{i}", law_no="", category="法律")
+        for i in range(n)
+    ]
+
+
+def test_bulk_ingest_is_idempotent(tmp_path) -> None:
+    db_path = str(tmp_path / "laws.db")
+    repo = LawRepository(db_path)
+    ledger = IngestLedger(db_path)
+    api = _FakeAPI(broken={"L3"})
+
+    # 計画の確認 (--dry-run) では台帳に書き込まない
+    assert len(ledger.preview(_entries(5))) == 5
+    assert ledger.get_status("L0") is None
+
+    summary = run_bulk_ingest(
+        _entries(5), repo, ledger, api, workers=2, store_batch=2  # type: ignore[arg-type]
+    )
+    assert summary[STORED] == 4
+    assert summary[FAILED] == 1
+    assert ledger.failures()[0][0] == "L3"
+    assert ledger.failures()[0][2] == 1
+
+    # 失敗した再試行も試行回数に数える
+    run_bulk_ingest(_entries(5), repo, ledger, api)  # type: ignore[arg-type]
+    assert ledger.failures()[0][2] == 2
+
+    # 再実行では失敗分だけを処理する
+    api.broken = set()
+    api.fetched.clear()
+    summary = run_bulk_ingest(_entries(5), repo, ledger, api)  # type: ignore[arg-type]
+    assert api.fetched == ["L3"]
+    assert summary[STORED] == 5
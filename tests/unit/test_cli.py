@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+from src.core.models import Article, Law
+from src.infrastructure.database import LawRepository
+from src.interface.cli import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# `lawctl --help` で読み込んではいけない重い依存
+HEAVY_MODULES = ("chromadb", "google", "numpy", "streamlit", "dotenv", "requests")
+# src.interface.cli の import にかけてよい時間 (累積, マイクロ秒)
+STARTUP_BUDGET_US = 100_000
+
+
+def _importtime(*args: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum, name = (part.strip() for part in line[12:].split("|"))
+        cumulative[name] = int(cum)
+    return cumulative
+
+
+def test_help_stays_within_startup_budget() -> None:
+    imported = _importtime("-m", "src.interface.cli", "--help")
+    heavy = [m for m in imported if m.split(".")[0] in HEAVY_MODULES]
+    assert heavy == []
+
+    cli = _importtime("-c", "import src.interface.cli")
+    assert cli["src.interface.cli"] < STARTUP_BUDGET_US
+
+
+def test_inspect_and_export_use_the_given_store(tmp_path, capsys) -> None:
+    db_path = str(tmp_path / "laws.db")
+    repo = LawRepository(db_path)
+    repo.save_law(
+        Law(
+            law_id="325AC0000000144",
+            law_num="昭和二十五年法律第百四十四号",
+            law_full_name="生活保護法",
+            last_updated=datetime(2024, 1, 1),
+        )
+    )
+    repo.save_articles(
+        [
+            Article(
+                law_id="325AC0000000144",
+                article_number="第一条",
+                hierarchy="",
+                content="目的",
+            )
+        ]
+    )
+    store_args = ["--db", db_path, "--vector-dir", str(tmp_path / "vectors")]
+
+    assert main(["inspect", *store_args]) == 0
+    out = capsys.readouterr().out
+    assert "1 laws, 1 articles" in out and "生活保護法" in out
+
+    # ベクトル未作成ならエクスポートは失敗を返す
+    assert main(["export", *store_args, "--output", str(tmp_path / "i.json")]) == 1
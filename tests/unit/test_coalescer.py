@@ -0,0 +1,86 @@
+import threading
+from typing import List
+
+import numpy as np
+import pytest
+
+from src.infrastructure.corpus_store import VectorSet
+from src.rag_engine.coalescer import QueryCoalescer
+from src.rag_engine.embedder import HashingEmbedder
+from src.rag_engine.vector_engine import VectorEngine
+
+QUERIES = ["生活保護の申請", "児童の一時保護", "介護保険の認定", "障害福祉の支給"]
+
+
+def _engine(n_laws: int = 3, per_law: int = 40, dim: int = 16) -> VectorEngine:
+    rng = np.random.default_rng(0)
+    ids = [f"LAW{law}_第{i}条" for law in range(n_laws) for i in range(per_law)]
+    matrix = rng.standard_normal((len(ids), dim)).astype(np.float32)
+    return VectorEngine(VectorSet(ids, matrix, "test", [""] * len(ids)))
+
+
+class RecordingEmbedder(HashingEmbedder):
+    """embed_texts の呼び出しごとの件数を記録する"""
+
+    def __init__(self, dim: int):
+        super().__init__(dim)
+        self.calls: List[int] = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        self.release.wait(5)
+        self.calls.append(len(texts))
+        return super().embed_texts(texts)
+
+
+def test_search_batch_matches_single_searches() -> None:
+    engine = _engine()
+    embeddings = HashingEmbedder(16).embed_texts(QUERIES)
+    filters = [None, ["LAW1"], ["LAW0", "LAW2"], []]
+
+    batched = engine.search_batch(embeddings, n_results=7, law_ids=filters)
+    for embedding, targets, hits in zip(embeddings, filters, batched, strict=True):
+        single = engine.search(embedding, n_results=7, law_ids=targets)
+        assert [h.doc_id for h in hits] == [h.doc_id for h in single]
+        assert [h.score for h in hits] == pytest.approx([h.score for h in single])
+    assert batched[3] == []
+    assert {h.doc_id.partition("_")[0] for h in batched[1]} == {"LAW1"}
+
+
+def test_concurrent_queries_share_one_batch() -> None:
+    engine = _engine()
+    embedder = RecordingEmbedder(16)
+    coalescer = QueryCoalescer(embedder, engine, window_ms=50, max_batch=8)
+    try:
+        # 1件目の処理中に残りを積み、次のバッチにまとめさせる
+        embedder.release.clear()
+        first = coalescer.submit(QUERIES[0], n_results=3)
+        futures = [coalescer.submit(q, n_results=5) for q in QUERIES]
+        embedder.release.set()
+
+        assert len(first.result(5)) == 3
+        hits = [future.result(5) for future in futures]
+        assert embedder.calls in ([1, 4], [5])
+        assert coalescer.queries == 5
+
+        for query, found in zip(QUERIES, hits, strict=True):
+            expected = engine.search(embedder.embed_query(query), n_results=5)
+            assert [h.doc_id for h in found] == [h.doc_id for h in expected]
+    finally:
+        coalescer.close()
+
+
+def test_errors_reach_every_caller_in_the_batch() -> None:
+    class BrokenEmbedder(HashingEmbedder):
+        def embed_texts(self, texts: List[str]) -> List[List[float]]:
+            raise RuntimeError("embedding backend down")
+
+    coalescer = QueryCoalescer(BrokenEmbedder(16), _engine(), window_ms=10)
+    try:
+        futures = [coalescer.submit(q) for q in QUERIES]
+        for future in futures:
+            with pytest.raises(RuntimeError, match="backend down"):
+                future.result(5)
+    finally:
+        coalescer.close()
@@ -0,0 +1,158 @@
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.core.models import Article, Law
+from src.infrastructure.corpus_store import CorpusStore, VectorSet
+from src.infrastructure.database import LawRepository
+from src.interface.export_index import compact_index
+from src.rag_engine.vector_engine import VectorEngine
+
+
+def _seed(db_path: str) -> None:
+    repo = LawRepository(db_path)
+    repo.save_law(
+        Law(
+            law_id="325AC0000000144",
+            law_num="昭和二十五年法律第百四十四号",
+            law_full_name="生活保護法",
+            last_updated=datetime(2024, 1, 1),
+        )
+    )
+    repo.save_articles(
+        [
+            Article(
+                law_id="325AC0000000144",
+                article_number=f"第{n}条",
+                hierarchy="第一章 総則",
+                content=f"本文{n}",
+            )
+            for n in ("一", "二", "三")
+        ]
+    )
+
+
+def test_documents_are_read_once_from_sqlite(tmp_path) -> None:
+    db_path = str(tmp_path / "laws.db")
+    _seed(db_path)
+    store = CorpusStore(db_path, str(tmp_path / "vectors"))
+
+    docs = list(store.iter_documents())
+    assert [d.doc_id for d in docs] == [
+        "325AC0000000144_第一条",
+        "325AC0000000144_第二条",
+        "325AC0000000144_第三条",
+    ]
+    assert docs[0].embedding_text() == "生活保護法 第一条\n第一章 総則\n本文一"
+    assert store.get_documents(["325AC0000000144_第二条"])[
+        "325AC0000000144_第二条"
+    ].content == "本文二"
+    assert store.list_laws()[0].article_count == 3
+
+
+def test_vectors_roundtrip_and_search(tmp_path) -> None:
+    db_path = str(tmp_path / "laws.db")
+    _seed(db_path)
+    store = CorpusStore(db_path, str(tmp_path / "vectors"))
+    ids = [d.doc_id for d in store.iter_documents()]
+    store.save_vectors(ids, np.eye(3, dtype=np.float32), model="test-model")
+
+    vectors = store.load_vectors()
+    assert isinstance(vectors.matrix, np.memmap)
+    assert vectors.model == "test-model"
+
+    engine = VectorEngine(vectors, store)
+    hits = engine.search([0.0, 1.0, 0.1], n_results=2)
+    assert [h.doc_id for h in hits] == ids[1:3]
+    assert hits[0].document is not None
+    assert hits[0].document.content == "本文二"
+    assert engine.search([0.0, 1.0, 0.0], law_ids=["other"]) == []
+
+
+def test_legacy_schema_is_migrated_to_keys_and_hierarchy_nodes(tmp_path) -> None:
+    db_path = str(tmp_path / "laws.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE laws (law_id TEXT PRIMARY KEY, law_num TEXT, "
+            "law_full_name TEXT, last_updated TIMESTAMP)"
+        )
+        conn.execute(
+            "CREATE TABLE articles (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "law_id TEXT, article_number TEXT, hierarchy TEXT, content TEXT)"
+        )
+        conn.execute("INSERT INTO laws VALUES ('L1', 'n', 'テスト法', NULL)")
+        conn.executemany(
+            "INSERT INTO articles VALUES (?, 'L1', ?, ?, ?)",
+            [
+                (5, "第一条", "第一章 総則 > 第一節 通則", "本文一"),
+                (9, "第二条", "第一章 総則 > 第一節 通則", "本文二"),
+                (12, "第三条", "第二章 保護 > 第一節 通則", "本文三"),
+                (13, "附則", "", "附則"),
+            ],
+        )
+        # 法令情報のない条文は移さない (法令名のない laws 行を作らない)
+        conn.execute("INSERT INTO articles VALUES (14, 'L9', '第一条', '', '孤立')")
+
+    store = CorpusStore(db_path, str(tmp_path / "vectors"))
+    docs = list(store.iter_documents())
+    assert [d.hierarchy for d in docs] == [
+        "第一章 総則 > 第一節 通則",
+        "第一章 総則 > 第一節 通則",
+        "第二章 保護 > 第一節 通則",
+        "",
+    ]
+    # 同じ階層の条文は同じ文字列を共有する
+    assert docs[0].hierarchy is docs[1].hierarchy
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM hierarchy_titles").fetchone()[0] == 3
+        assert conn.execute("SELECT COUNT(*) FROM hierarchy_nodes").fetchone()[0] == 4
+
+    # 移行後も law_key を保ったまま法令情報を更新できる
+    repo = LawRepository(db_path)
+    repo.save_law(
+        Law(
+            law_id="L1",
+            law_num="n",
+            law_full_name="新テスト法",
+            last_updated=datetime(2024, 1, 1),
+        )
+    )
+    repo.save_articles(
+        [
+            Article(
+                law_id="L1",
+                article_number="第四条",
+                hierarchy="第二章 保護",
+                content="",
+            )
+        ]
+    )
+    assert [(law.law_full_name, law.article_count) for law in store.list_laws()] == [
+        ("新テスト法", 1)
+    ]
+    with pytest.raises(ValueError, match="before its articles"):
+        repo.save_articles(
+            [Article(law_id="L9", article_number="第一条", hierarchy="", content="")]
+        )
+    assert [law.law_id for law in store.list_laws()] == ["L1"]
+
+
+def test_export_references_law_and_hierarchy_tables(tmp_path) -> None:
+    db_path = str(tmp_path / "laws.db")
+    _seed(db_path)
+    store = CorpusStore(db_path, str(tmp_path / "vectors"))
+    ids = [d.doc_id for d in store.iter_documents()]
+    vectors = VectorSet(ids[:2], np.eye(2, dtype=np.float32), "test", [""] * 2)
+
+    index = compact_index(store.iter_documents(), vectors)
+    assert index["laws"] == [
+        {"law_id": "325AC0000000144", "law_full_name": "生活保護法"}
+    ]
+    assert index["titles"] == ["第一章 総則"]
+    assert index["hierarchy"] == [[None, 0]]
+    assert [(d["law"], d["article_number"], d["hierarchy"]) for d in index["docs"]] == [
+        (0, "第一条", 0),
+        (0, "第二条", 0),
+    ]
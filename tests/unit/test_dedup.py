@@ -0,0 +1,79 @@
+import numpy as np
+
+from src.core.models import CorpusDocument
+from src.infrastructure.corpus_store import CorpusStore
+from src.rag_engine.dedup import is_placeholder, plan_dedup
+from src.rag_engine.vector_engine import VectorEngine
+
+READING = (
+    "第三条の規定は、{}の場合について準用する。この場合において、同条中「市町村長」とある"
+    "のは「都道府県知事」と、「福祉事務所」とあるのは「児童相談所」と読み替えるものとする。"
+)
+
+
+def _doc(law_id: str, article: str, content: str) -> CorpusDocument:
+    return CorpusDocument(
+        doc_id=f"{law_id}_{article}",
+        law_id=law_id,
+        law_full_name=law_id,
+        article_number=article,
+        hierarchy="",
+        content=content,
+    )
+
+
+def test_placeholders_are_not_embedded() -> None:
+    for content in ["削除", "（削除）", " 削除\n", "", "２ 削除"]:
+        assert is_placeholder(_doc("LAW", "第一条", content))
+    assert not is_placeholder(_doc("LAW", "第一条", "この法律は、削除された規定を…"))
+
+
+def test_near_duplicates_share_the_first_representative() -> None:
+    docs = [
+        _doc(
+            "ACT",
+            "第一条",
+            "この法律は、生活に困窮する国民の最低限度の生活を保障する。",
+        ),
+        _doc("ACT", "第九条", READING.format("第七条第一項")),
+        _doc("ACT", "第十条", "削除"),
+        _doc("ORDER", "第五条", READING.format("第七条第一項")),
+        _doc("RULE", "第二条", READING.format("第七条第一項").rstrip("。")),
+        _doc("RULE", "第四条", READING.format("第八条第二項")),
+        _doc(
+            "RULE",
+            "第三条",
+            "保護の実施機関は、要保護者の資産及び収入の状況を調査する。",
+        ),
+    ]
+    plan = plan_dedup(docs)
+
+    assert plan.placeholders == ["ACT_第十条"]
+    assert plan.aliases == {"ORDER_第五条": "ACT_第九条", "RULE_第二条": "ACT_第九条"}
+    assert [d.doc_id for d in plan.representatives] == [
+        "ACT_第一条",
+        "ACT_第九条",
+        "RULE_第四条",
+        "RULE_第三条",
+    ]
+    assert plan.total == len(docs)
+
+
+def test_aliases_round_trip_and_filter_to_the_duplicate(tmp_path) -> None:
+    store = CorpusStore(str(tmp_path / "laws.db"), str(tmp_path / "vectors"))
+    store.save_vectors(
+        ["ACT_第一条", "ACT_第九条"],
+        np.array([[1.0, 0.0], [0.0, 1.0]]),
+        "test",
+        aliases={"ORDER_第五条": "ACT_第九条"},
+    )
+    engine = VectorEngine(store.load_vectors())
+
+    [hit] = engine.search([0.0, 1.0], n_results=1, resolve=False)
+    assert (hit.doc_id, hit.duplicates) == ("ACT_第九条", ["ORDER_第五条"])
+
+    hits = engine.search([0.0, 1.0], n_results=5, law_ids=["ORDER"], resolve=False)
+    assert [(h.doc_id, h.duplicates) for h in hits] == [
+        ("ORDER_第五条", ["ACT_第九条"])
+    ]
+    assert engine.search([0.0, 1.0], law_ids=["RULE"], resolve=False) == []
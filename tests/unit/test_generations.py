@@ -0,0 +1,121 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from src.infrastructure.corpus_store import CorpusStore
+from src.infrastructure.generations import (
+    MANIFEST_FILE,
+    GenerationStore,
+    verify_generation,
+)
+from src.interface import export_index
+from tests.unit.test_corpus_store import _seed
+
+IDS = [f"325AC0000000144_第{n}条" for n in ("一", "二", "三")]
+
+
+def _store(tmp_path) -> CorpusStore:
+    db_path = str(tmp_path / "laws.db")
+    _seed(db_path)
+    store = CorpusStore(db_path, str(tmp_path / "vectors"))
+    store.save_vectors(IDS, np.eye(3), "models/text-embedding-004")
+    return store
+
+
+def test_exports_publish_new_generations_and_roll_back(tmp_path) -> None:
+    store = _store(tmp_path)
+    data_dir = str(tmp_path / "data")
+    generations = GenerationStore(data_dir)
+
+    name, info = export_index.publish_index(store, data_dir, keep=2)
+    assert name == "000001" and generations.current() == "000001"
+    assert info["documents"] == 3 and info["dimension"] == 3
+    manifest = verify_generation(generations.path(name))
+    assert set(manifest["files"]) == {
+        "index.json",
+        "query_transform.json",
+        "law_centroids.json",
+    }
+    assert manifest["model"] == "models/text-embedding-004"
+    if hasattr(os, "symlink"):
+        assert os.readlink(os.path.join(data_dir, "current")) == os.path.join(
+            "generations", "000001"
+        )
+
+    store.save_vectors(IDS[:2], np.eye(3)[:2], "models/text-embedding-004")
+    argv = ["--data-dir", data_dir, "--db", store.db_path, "--keep", "2"]
+    assert export_index.main([*argv, "--vector-dir", store.vector_dir]) == 0
+    assert export_index.main([*argv, "--vector-dir", store.vector_dir]) == 0
+    # keep=2: 最古の世代は消え、公開中と1つ前が残る
+    assert generations.names() == ["000002", "000003"]
+    assert generations.current() == "000003"
+    assert not [n for n in os.listdir(generations.generations_dir) if n[0] == "."]
+
+    assert export_index.main(["--data-dir", data_dir, "--rollback"]) == 0
+    assert generations.current() == "000002"
+    assert export_index.main(["--data-dir", data_dir, "--rollback"]) == 1
+    # 切り戻した世代は次の prune でも消えない
+    assert generations.prune(keep=1) == []
+
+
+def test_broken_exports_are_never_published(tmp_path, monkeypatch) -> None:
+    store = _store(tmp_path)
+    data_dir = str(tmp_path / "data")
+    generations = GenerationStore(data_dir)
+    name, _ = export_index.publish_index(store, data_dir)
+
+    def truncated(store, directory, compress_text=False):
+        info = write_index_files(store, directory, compress_text)
+        info["documents"] += 1
+        return info
+
+    write_index_files = export_index.write_index_files
+    monkeypatch.setattr(export_index, "write_index_files", truncated)
+    with pytest.raises(ValueError, match="expected 4"):
+        export_index.publish_index(store, data_dir)
+    assert generations.names() == [name] and generations.current() == name
+    assert os.listdir(generations.generations_dir) == [name]
+
+    # 公開後に書き換えられた世代には切り替えない
+    with open(os.path.join(generations.path(name), "index.json"), "a") as f:
+        f.write(" ")
+    with pytest.raises(ValueError, match="Size mismatch"):
+        generations.activate(name)
+    os.remove(os.path.join(generations.path(name), MANIFEST_FILE))
+    with pytest.raises(ValueError, match="Unreadable manifest"):
+        verify_generation(generations.path(name))
+
+
+def test_legacy_output_still_writes_in_place(tmp_path) -> None:
+    store = _store(tmp_path)
+    out = tmp_path / "flat" / "index.json"
+    argv = ["--db", store.db_path, "--vector-dir", store.vector_dir]
+    assert export_index.main([*argv, "--output", str(out)]) == 0
+    assert len(json.loads(out.read_text("utf-8"))["docs"]) == 3
+    assert not (tmp_path / "flat" / "generations").exists()
+
+
+def test_generation_files_are_synced_before_the_rename(tmp_path, monkeypatch) -> None:
+    store = _store(tmp_path)
+    synced: set = set()
+    renamed: list = []
+    fsync, rename = os.fsync, os.rename
+
+    def record_fsync(fd: int) -> None:
+        synced.add(os.fstat(fd).st_ino)
+        fsync(fd)
+
+    def record_rename(src: str, dst: str) -> None:
+        renamed.append(set(synced))
+        rename(src, dst)
+
+    monkeypatch.setattr(os, "fsync", record_fsync)
+    monkeypatch.setattr(os, "rename", record_rename)
+    name, _ = export_index.publish_index(store, str(tmp_path / "data"))
+    directory = GenerationStore(str(tmp_path / "data")).path(name)
+    # 世代のファイルとディレクトリは rename の前に fsync 済み
+    [before_rename] = renamed
+    paths = [os.path.join(directory, n) for n in os.listdir(directory)]
+    assert {os.stat(p).st_ino for p in [*paths, directory]} <= before_rename
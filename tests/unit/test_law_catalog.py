@@ -0,0 +1,87 @@
+from src.core.models import CatalogEntry
+from src.infrastructure.law_catalog import (
+    CatalogIndex,
+    LawCatalog,
+    diff_entries,
+    law_category,
+    parse_law_list_xml,
+)
+
+LAW_LIST_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<DataRoot>
+  <Result><Code>0</Code><Message/></Result>
+  <ApplData>
+    <Category>1</Category>
+    <LawNameListInfo>
+      <LawId>325AC0000000144</LawId>
+      <LawName>生活保護法</LawName>
+      <LawNo>昭和二十五年法律第百四十四号</LawNo>
+      <PromulgationDate>19500504</PromulgationDate>
+    </LawNameListInfo>
+    <LawNameListInfo>
+      <LawId>325CO0000000148</LawId>
+      <LawName>生活保護法施行令</LawName>
+      <LawNo>昭和二十五年政令第百四十八号</LawNo>
+      <PromulgationDate>19500520</PromulgationDate>
+    </LawNameListInfo>
+    <LawNameListInfo>
+      <LawId>413AC0100000031</LawId>
+      <LawName>配偶者からの暴力の防止及び被害者の保護等に関する法律</LawName>
+      <LawNo>平成十三年法律第三十一号</LawNo>
+      <PromulgationDate>20010413</PromulgationDate>
+    </LawNameListInfo>
+  </ApplData>
+</DataRoot>""".encode("utf-8")
+
+
+class _FakeAPI:
+    def __init__(self, xml_content: bytes) -> None:
+        self.xml_content = xml_content
+        self.calls = 0
+
+    def fetch_law_list_xml(self, category: int = 1) -> bytes:
+        self.calls += 1
+        return self.xml_content
+
+
+def test_parse_and_categorize() -> None:
+    entries = parse_law_list_xml(LAW_LIST_XML)
+    assert [e.category for e in entries] == ["法律", "政令", "法律"]
+    assert law_category("322M40000100001") == "府省令"
+
+
+def test_index_lookups() -> None:
+    index = CatalogIndex(parse_law_list_xml(LAW_LIST_XML))
+    assert index.exact("ＤＶ防止法")[0].law_id == "413AC0100000031"
+    assert index.exact("昭和二十五年法律第百四十四号")[0].law_name == "生活保護法"
+    assert [e.law_name for e in index.prefix("生活保護")] == [
+        "生活保護法",
+        "生活保護法施行令",
+    ]
+    assert index.contains("被害者の保護")[0].law_id == "413AC0100000031"
+    assert [e.law_name for e in index.search("保護法", categories=["政令"])] == [
+        "生活保護法施行令"
+    ]
+
+
+def test_refresh_reports_diff_and_caches(tmp_path) -> None:
+    api = _FakeAPI(LAW_LIST_XML)
+    catalog = LawCatalog(str(tmp_path / "catalog.json"), api=api)  # type: ignore[arg-type]
+    first = catalog.refresh()
+    assert len(first.added) == 3
+
+    cached = LawCatalog(str(tmp_path / "catalog.json"), api=api)  # type: ignore[arg-type]
+    assert cached.resolve("生活保護法") is not None
+    assert api.calls == 1
+
+    api.xml_content = LAW_LIST_XML.replace(
+        "生活保護法施行令".encode(), "生活保護法施行令改".encode()
+    )
+    diff = cached.refresh()
+    assert [e.law_id for e in diff.changed] == ["325CO0000000148"]
+    assert not diff.added and not diff.removed
+
+
+def test_diff_detects_removed() -> None:
+    old = [CatalogEntry(law_id="1", law_name="a", law_no="x")]
+    assert diff_entries(old, []).removed == old
@@ -0,0 +1,71 @@
+from src.core.law_matcher import (
+    AhoCorasick,
+    LawMatcher,
+    article_variants,
+    leftmost_longest,
+)
+
+LAWS = {
+    "325AC0000000144": "生活保護法",
+    "322AC0000000164": "児童福祉法",
+    "412AC1000000082": "児童虐待の防止等に関する法律",
+}
+
+
+def _matcher() -> LawMatcher:
+    return LawMatcher(
+        LAWS,
+        aliases={"児童虐待防止法": "412AC1000000082", "DV防止法": "unknown"},
+        keywords={
+            "児童": ["322AC0000000164", "412AC1000000082"],
+            "生活保護": ["325AC0000000144"],
+        },
+        article_titles=["第二十四条 （申請）", "第一条 （目的）", "第六条の三"],
+    )
+
+
+def test_automaton_reports_overlapping_patterns() -> None:
+    automaton: AhoCorasick[str] = AhoCorasick()
+    for word in ("he", "she", "his", "hers"):
+        automaton.add(word, word)
+    found = sorted(automaton.iter_matches("ushers"))
+    assert found == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+    assert leftmost_longest(found) == [(1, 4, "she")]
+
+    # build() を繰り返しても、build() 後に追加しても出力は重複しない
+    automaton.build().build()
+    automaton.add("us", "us")
+    found = sorted(automaton.iter_matches("ushers"))
+    assert found == [(0, 2, "us"), (1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+
+def test_article_variants_include_arabic_numerals() -> None:
+    assert article_variants("第六条の三") == ["第六条の三", "第6条の3", "6条の3"]
+
+
+def test_name_and_article_are_found_in_one_pass() -> None:
+    targets = _matcher().match("生活保護法の第２４条の申請について")
+    assert targets.law_names == ["生活保護法"]
+    assert [(a.law_id, a.article) for a in targets.articles] == [
+        ("325AC0000000144", "第二十四条")
+    ]
+    assert targets.source == "name"
+    assert not targets.is_ambiguous
+
+
+def test_specific_names_win_over_topic_keywords() -> None:
+    matcher = _matcher()
+    assert matcher.match("児童虐待防止法と児童福祉法").law_ids == [
+        "412AC1000000082",
+        "322AC0000000164",
+    ]
+    broad = matcher.match("児童の一時保護")
+    assert broad.source == "keyword"
+    assert broad.law_ids == ["322AC0000000164", "412AC1000000082"]
+
+
+def test_unmatched_query_is_ambiguous() -> None:
+    targets = _matcher().match("DV防止法の21条")
+    # 未登録法令の略称は無視され、「21条」の一部の「1条」も拾わない
+    assert targets.is_ambiguous
+    assert targets.articles == []
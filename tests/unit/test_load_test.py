@@ -0,0 +1,120 @@
+import asyncio
+import json
+import time
+
+from src.interface.load_test import (
+    CONTENT_PATH,
+    SEARCH_PATH,
+    LatencyHistogram,
+    LoadRequest,
+    arrival_offsets,
+    load_log,
+    run_load,
+)
+from src.interface.search_service import SearchServer, SearchService
+from tests.unit.test_search_service import _store
+
+
+def test_histogram_keeps_three_significant_digits() -> None:
+    histogram = LatencyHistogram()
+    for us in range(1, 100_001):
+        histogram.record(us / 1e6)
+
+    for percentile, expected in ((50, 50_000), (99, 99_000), (99.9, 99_900)):
+        assert abs(histogram.value_at(percentile) - expected) / expected < 1e-3
+    assert histogram.value_at(100) == histogram.max == 100_000
+    assert histogram.min == 1
+
+    other = LatencyHistogram()
+    other.record(2.0)
+    histogram.add(other)
+    assert histogram.total == 100_001
+    assert histogram.max == 2_000_000
+
+
+def test_log_lines_and_arrival_schedule(tmp_path) -> None:
+    log = tmp_path / "queries.jsonl"
+    log.write_text(
+        "\n".join(
+            json.dumps(entry, ensure_ascii=False)
+            for entry in (
+                {"query": "生活保護の申請", "ts": 1},
+                {"law_name": "児童福祉法"},
+                {"path": "/health", "method": "GET"},
+            )
+        )
+        + "\n\n",
+        encoding="utf-8",
+    )
+    assert load_log(str(log)) == [
+        LoadRequest("POST", SEARCH_PATH, {"query": "生活保護の申請"}),
+        LoadRequest("POST", CONTENT_PATH, {"law_name": "児童福祉法"}),
+        LoadRequest("GET", "/health", None),
+    ]
+    assert arrival_offsets(3, 10.0) == [0.0, 0.1, 0.2]
+    poisson = arrival_offsets(2000, 100.0, "poisson")
+    assert abs(poisson[-1] - 20.0) < 2.0
+
+
+class _SlowService:
+    """1件 20ms かかる検索 (ワーカー1本で 50 req/s が上限)"""
+
+    def search(self, payload):
+        time.sleep(0.02)
+        return {"results": []}
+
+    def list_laws(self):
+        return []
+
+    def law_content(self, payload):
+        return []
+
+
+def test_latency_counts_from_intended_send_time() -> None:
+    async def scenario():
+        search_server = SearchServer(_SlowService(), workers=1)
+        server = await search_server.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            # 100 req/s を1接続で送る: 送れずに待った時間もレイテンシに入る
+            requests = [LoadRequest("POST", SEARCH_PATH, {"query": "q"})] * 30
+            return await run_load(
+                f"http://127.0.0.1:{port}", requests, rate=100.0, connections=1
+            )
+        finally:
+            await search_server.close()
+
+    report = asyncio.run(scenario())
+    assert report.completed == 30 and not report.errors
+    assert report.service.value_at(50) < 100_000
+    assert report.latency[SEARCH_PATH].value_at(99) > 5 * report.service.value_at(50)
+
+
+def test_run_load_against_the_search_service(tmp_path) -> None:
+    service = SearchService.from_store(_store(tmp_path))
+
+    async def scenario():
+        search_server = SearchServer(service, workers=2)
+        server = await search_server.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            requests = [
+                LoadRequest("POST", SEARCH_PATH, {"query": "生活保護法の申請"}),
+                LoadRequest("POST", CONTENT_PATH, {"law_name": "児童福祉法"}),
+                LoadRequest("GET", "/unknown"),
+            ] * 4
+            return await run_load(
+                f"http://127.0.0.1:{port}", requests, rate=200.0, arrivals="poisson"
+            )
+        finally:
+            await search_server.close()
+
+    try:
+        report = asyncio.run(scenario())
+    finally:
+        service.close()
+    assert report.sent == 12
+    assert report.latency[SEARCH_PATH].total == 4
+    assert report.latency[CONTENT_PATH].total == 4
+    assert sum(report.errors.values()) == 4
+    assert "errors:" in report.lines()[-1]
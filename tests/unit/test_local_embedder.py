@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from src.rag_engine.config import Config
+from src.rag_engine.embedder import BaseEmbedder, embedder_for_model
+from src.rag_engine.local_embedder import LocalLSAEmbedder
+
+CORPUS = [
+    "生活保護法 第一条 この法律は生活に困窮するすべての国民に対し最低限度の生活を保障",
+    "生活保護法 第七条 保護は要保護者の申請に基いて開始するものとする",
+    "児童福祉法 第一条 全て児童は適切に養育されること",
+    "児童福祉法 第六条の三 この法律で児童自立生活援助事業とは",
+    "介護保険法 第一条 加齢に伴って生ずる心身の変化に起因する疾病等により要介護状態",
+    "介護保険法 第七条 この法律において要介護状態とは",
+]
+
+
+def test_fit_embeds_and_ranks_related_text_first() -> None:
+    embedder = LocalLSAEmbedder.fit(CORPUS, dim=4, min_df=1)
+    docs = embedder.embed_array(CORPUS)
+    assert docs.shape == (6, 4)
+    assert np.allclose(np.linalg.norm(docs, axis=1), 1.0, atol=1e-5)
+
+    query = np.asarray(embedder.embed_query("要介護状態とは"), dtype=np.float32)
+    best = int(np.argmax(docs @ query))
+    assert CORPUS[best].startswith("介護保険法")
+
+
+def test_save_and_load_roundtrip(tmp_path) -> None:
+    embedder = LocalLSAEmbedder.fit(CORPUS, dim=3, min_df=1)
+    path = str(tmp_path / "lsa.npz")
+    embedder.save(path)
+    loaded = LocalLSAEmbedder.load(path)
+    assert loaded.model_name == embedder.model_name
+    assert np.allclose(
+        loaded.embed_query("児童の養育"), embedder.embed_query("児童の養育")
+    )
+
+
+def test_base_embedder_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        BaseEmbedder()  # type: ignore[abstract]
+
+
+def test_embedder_for_model_rejects_a_retrained_model(tmp_path, monkeypatch) -> None:
+    path = str(tmp_path / "lsa.npz")
+    monkeypatch.setattr(Config, "LOCAL_EMBEDDER_PATH", path)
+    recorded = LocalLSAEmbedder.fit(CORPUS, dim=3, min_df=1)
+    recorded.save(path)
+    assert embedder_for_model(recorded.model_name).model_name == recorded.model_name
+
+    LocalLSAEmbedder.fit(CORPUS[:4], dim=3, min_df=1).save(path)
+    with pytest.raises(ValueError, match="Re-run the indexer"):
+        embedder_for_model(recorded.model_name)
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from src.core.models import CorpusDocument
+from src.infrastructure.corpus_store import CorpusStore, VectorSet
+from src.rag_engine.metadata_index import (
+    MetadataIndex,
+    build_postings,
+    hierarchy_nodes,
+    refresh_metadata_index,
+)
+from src.rag_engine.vector_engine import VectorEngine
+from tests.unit.test_corpus_store import _seed
+
+
+def _doc(law_id: str, article: str, hierarchy: str) -> CorpusDocument:
+    return CorpusDocument(
+        doc_id=f"{law_id}_{article}",
+        law_id=law_id,
+        law_full_name=f"{law_id}法",
+        article_number=article,
+        hierarchy=hierarchy,
+        content="",
+    )
+
+
+DOCS = [
+    _doc("ACT", "第一条", "第一章 総則"),
+    _doc("ACT", "第二条", "第二章 保護 > 第一節 通則"),
+    _doc("ACT", "第三条", "第二章 保護 > 第二節 扶助"),
+    _doc("ORDER", "第一条", "第一章 総則"),
+    # ACT_第三条 と同じ本文で、代表の行を共有する
+    _doc("ORDER", "第二条", "第二章 扶助"),
+]
+
+
+def _index() -> tuple[VectorSet, MetadataIndex]:
+    vectors = VectorSet(
+        [d.doc_id for d in DOCS[:4]],
+        np.eye(4, dtype=np.float32),
+        "test",
+        [""] * 4,
+        aliases={"ORDER_第二条": "ACT_第三条"},
+    )
+    return vectors, MetadataIndex(build_postings(vectors, DOCS))
+
+
+def _ids(index: MetadataIndex, where: dict) -> list:
+    return [index.docs[i] for i in index.match(where)]
+
+
+def test_hierarchy_nodes_are_every_ancestor_path() -> None:
+    assert hierarchy_nodes("第二章 保護 > 第一節 通則") == [
+        "第二章 保護",
+        "第二章 保護 > 第一節 通則",
+    ]
+    assert hierarchy_nodes("") == []
+
+
+def test_where_conditions_combine_sorted_id_arrays() -> None:
+    _, index = _index()
+
+    assert _ids(index, {"law_full_name": "ORDER法"}) == ["ORDER_第一条", "ORDER_第二条"]
+    assert _ids(index, {"hierarchy": "第二章 保護"}) == ["ACT_第二条", "ACT_第三条"]
+    assert _ids(index, {"hierarchy": {"$prefix": "第二章"}}) == [
+        "ACT_第二条",
+        "ACT_第三条",
+        "ORDER_第二条",
+    ]
+    assert _ids(
+        index, {"$and": [{"law_id": "ACT"}, {"hierarchy": {"$prefix": "第二章"}}]}
+    ) == ["ACT_第二条", "ACT_第三条"]
+    assert _ids(
+        index,
+        {"$or": [{"article_number": "第一条"}, {"hierarchy": "第二章 扶助"}]},
+    ) == ["ACT_第一条", "ORDER_第一条", "ORDER_第二条"]
+    assert _ids(index, {"law_id": {"$ne": "ACT"}, "article_number": "第一条"}) == [
+        "ORDER_第一条"
+    ]
+    assert _ids(index, {"law_id": {"$in": ["NONE"]}}) == []
+    with pytest.raises(ValueError):
+        index.match({"content": "x"})
+
+
+def test_filtered_search_scans_matching_rows_and_relabels_duplicates() -> None:
+    vectors, index = _index()
+    engine = VectorEngine(vectors, metadata=index)
+    query = [0.1, 0.2, 0.9, 0.3]
+
+    hits = engine.search(query, n_results=5, resolve=False, where={"law_id": "ORDER"})
+    assert [h.doc_id for h in hits] == ["ORDER_第二条", "ORDER_第一条"]
+    assert hits[0].duplicates == ["ACT_第三条"]
+
+    [hits] = engine.search_batch(
+        [query], 5, resolve=False, where=[{"hierarchy": {"$prefix": "第一章"}}]
+    )
+    assert [h.doc_id for h in hits] == ["ORDER_第一条", "ACT_第一条"]
+    with pytest.raises(ValueError):
+        VectorEngine(vectors).search(query, where={"law_id": "ACT"})
+
+
+def test_index_is_saved_next_to_the_vectors(tmp_path) -> None:
+    db_path = str(tmp_path / "laws.db")
+    _seed(db_path)
+    store = CorpusStore(db_path, str(tmp_path / "vectors"))
+    ids = [f"325AC0000000144_第{n}条" for n in ("一", "二", "三")]
+    store.save_vectors(ids, np.eye(3), "test")
+
+    saved = refresh_metadata_index(store)
+    engine = VectorEngine.from_store(store)
+    assert engine.metadata.postings.keys == saved.keys
+    where = {"law_full_name": "生活保護法", "hierarchy": "第一章 総則"}
+    assert len(engine.search([1.0, 0.0, 0.0], 5, resolve=False, where=where)) == 3
+
+    store.save_vectors(ids[:2], np.eye(3)[:2], "test")
+    assert store.load_metadata_index(store.load_vectors()) is None
@@ -0,0 +1,87 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from src.infrastructure.corpus_store import CorpusStore
+from src.interface.export_index import QUERY_TRANSFORM_FILE, export_index
+from src.rag_engine.embedder import output_dimensionality
+from src.rag_engine.projection import fit_pca, main, project_matrix
+from src.rag_engine.vector_engine import VectorEngine
+from tests.unit.test_corpus_store import _seed
+
+IDS = ["325AC0000000144_第一条", "325AC0000000144_第二条", "325AC0000000144_第三条"]
+
+
+def _low_rank(n: int = 300, dim: int = 32, rank: int = 4) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    latent = rng.standard_normal((n, rank)) * 8.0 / 2.0 ** np.arange(rank)
+    basis = np.linalg.qr(rng.standard_normal((dim, rank)))[0].T
+    return (latent @ basis + 0.01 * rng.standard_normal((n, dim))).astype(np.float32)
+
+
+def test_pca_keeps_the_low_rank_structure() -> None:
+    matrix = _low_rank()
+    projection, retained = fit_pca(matrix, 4)
+
+    assert (projection.source_dim, projection.dim) == (32, 4)
+    assert retained > 0.99
+    projected = project_matrix(matrix, projection, chunk=64)
+    assert projected.shape == (300, 4)
+    # 射影後の内積は中心化した元の内積をほぼ保つ
+    centered = matrix - projection.mean
+    np.testing.assert_allclose(
+        projected[:5] @ projected[5:10].T,
+        centered[:5] @ centered[5:10].T,
+        atol=0.05,
+    )
+
+
+def test_projected_store_answers_full_width_queries(tmp_path) -> None:
+    db_path = str(tmp_path / "laws.db")
+    _seed(db_path)
+    store = CorpusStore(db_path, str(tmp_path / "vectors"))
+    matrix = _low_rank(n=3, dim=8, rank=2)
+    store.save_vectors(IDS, matrix, "models/text-embedding-004@8")
+    full = VectorEngine(store.load_vectors())
+    query = matrix[1] + 0.01
+
+    assert main(["--dim", "2", "--db", db_path, "--vector-dir", store.vector_dir]) == 0
+    vectors = store.load_vectors()
+    assert vectors.dim == 2 and vectors.projection.source_dim == 8
+    projected = VectorEngine(vectors)
+    assert [h.doc_id for h in projected.search(query.tolist(), resolve=False)] == [
+        h.doc_id for h in full.search(query.tolist(), resolve=False)
+    ]
+    # 射影済みのベクトルをさらに射影し直すことはしない
+    assert main(["--dim", "1", "--db", db_path, "--vector-dir", store.vector_dir]) == 1
+
+    out = tmp_path / "data" / "index.json"
+    assert export_index(store, str(out)) == 3
+    transform = json.loads((tmp_path / "data" / QUERY_TRANSFORM_FILE).read_text())
+    assert transform["output_dimensionality"] == 8
+    assert np.array(transform["projection"]["components"]).shape == (2, 8)
+    assert len(json.loads(out.read_text())["docs"][0]["embedding"]) == 2
+
+    # 射影が書き終わる前に中断した場合 (古い射影が残る) は使わない
+    saved = os.path.join(store.vector_dir, "projection.npz")
+    shutil.copy(saved, tmp_path / "old.npz")
+    store.save_vectors(
+        IDS[:2], vectors.matrix[:2], vectors.model, None, None, vectors.projection
+    )
+    assert store.load_vectors().projection is not None
+    shutil.copy(tmp_path / "old.npz", saved)
+    with pytest.raises(ValueError, match="other vectors"):
+        store.load_vectors()
+
+    # 射影なしで保存し直すと古い射影は消える
+    store.save_vectors(IDS, matrix, "models/text-embedding-004")
+    assert store.load_vectors().projection is None
+
+
+def test_output_dimensionality_is_read_from_the_model_name() -> None:
+    assert output_dimensionality("models/text-embedding-004@256") == 256
+    assert output_dimensionality("models/text-embedding-004") is None
+    assert output_dimensionality("local-lsa-v1") is None
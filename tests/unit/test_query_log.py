@@ -0,0 +1,79 @@
+import json
+import random
+
+from src.infrastructure.query_log import (
+    QueryLog,
+    read_query_log,
+    redact_query,
+    top_queries,
+)
+from src.interface.load_test import load_log
+from src.interface.search_service import SearchService
+from tests.unit.test_search_service import _store
+
+
+def test_queries_are_normalized_and_redacted() -> None:
+    assert redact_query("  生活保護の　申請  ") == "生活保護の 申請"
+    assert redact_query("ＡＢＣ第２５条") == "ABC第25条"
+    assert (
+        redact_query("taro@example.com 090-1234-5678 番号123456789")
+        == "<email> <phone> 番号<number>"
+    )
+
+
+def test_sampled_log_feeds_top_queries_and_load_test(tmp_path) -> None:
+    path = str(tmp_path / "logs" / "queries.jsonl")
+    log = QueryLog(path, sample_rate=0.5, rng=random.Random(0))
+    recorded = sum(
+        log.record({"query": "生活保護の申請"}, 12.34, cache_hit=False)
+        for _ in range(200)
+    )
+    assert 70 < recorded < 130
+
+    log = QueryLog(path)
+    payload = {"query": "児童相談所", "target_laws": ["児童福祉法"], "ambiguous": False}
+    log.record(payload, 3.0, cache_hit=True)
+    log.record(payload, 3.0, cache_hit=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"query": "書きかけ')
+
+    entries = read_query_log(path)
+    assert len(entries) == recorded + 2
+    assert entries[-1] == {
+        "ts": entries[-1]["ts"],
+        "query": "児童相談所",
+        "target_laws": ["児童福祉法"],
+        "latency_ms": 3.0,
+        "cache_hit": True,
+    }
+    assert top_queries(path, 2) == [
+        {"query": "生活保護の申請"},
+        {"query": "児童相談所", "target_laws": ["児童福祉法"]},
+    ]
+    # 負荷試験でそのまま再生できる
+    assert load_log(path)[-1].body == {
+        "query": "児童相談所",
+        "target_laws": ["児童福祉法"],
+    }
+
+
+def test_service_caches_logs_and_warms(tmp_path) -> None:
+    path = tmp_path / "queries.jsonl"
+    service = SearchService.from_store(_store(tmp_path), query_log=QueryLog(str(path)))
+    try:
+        assert service.warm([{"query": "生活保護法の 申請"}]) == 1
+        assert not path.exists()
+
+        first = service.search({"query": "生活保護法の 申請"})
+        second = service.search({"query": "生活保護法の　申請"})
+        assert first["cached"] and second["cached"]
+        assert service.search({"query": "児童福祉法の罰則"})["cached"] is False
+        assert len(service.embeddings) == 2
+        # 絞り込みが違えば結果は別だが、表記揺れのクエリの埋め込みは使い回す
+        targeted = {"query": "生活保護法の　申請", "target_laws": ["生活保護法"]}
+        assert service.search(targeted)["cached"] is False
+        assert len(service.embeddings) == 2
+    finally:
+        service.close()
+    lines = [json.loads(line) for line in path.read_text("utf-8").splitlines()]
+    assert [e["cache_hit"] for e in lines] == [True, True, False, False]
@@ -0,0 +1,42 @@
+import numpy as np
+
+from src.core.references import ReferenceExtractor, article_title
+from src.infrastructure.corpus_store import VectorSet
+from src.rag_engine.reference_index import CITED_BY, CITES, ReferenceIndex
+from src.rag_engine.vector_engine import VectorEngine
+
+
+def test_extracts_intra_and_inter_law_references() -> None:
+    extractor = ReferenceExtractor({"児童福祉法": "322AC0000000164"})
+    refs = extractor.extract(
+        "325AC0000000144",
+        "第十条 （申請）",
+        "第二十四条第一項の規定により、児童福祉法第六条の三に規定する者及び"
+        "同法第七条の施設、地方自治法第二条の事務並びに第十条を除く。",
+    )
+    assert [(r.dst_law_id, r.dst_article, r.paragraph) for r in refs] == [
+        ("325AC0000000144", "第二十四条", "一"),
+        ("322AC0000000164", "第六条の三", None),
+        ("322AC0000000164", "第七条", None),
+    ]
+
+
+def test_article_title_strips_caption() -> None:
+    assert article_title("第六条の三 （定義）") == "第六条の三"
+
+
+def test_search_expands_with_precomputed_neighbors() -> None:
+    ids = ["L_第一条", "L_第二条", "L_第三条"]
+    vectors = VectorSet(
+        ids=ids, matrix=np.eye(3, dtype=np.float32), model="m", text_hashes=[""] * 3
+    )
+    references = ReferenceIndex([("L_第一条", "L_第三条"), ("L_第二条", "L_第一条")])
+    engine = VectorEngine(vectors, references=references)
+
+    hits = engine.search([1.0, 0.0, 0.0], n_results=1, expand_references=2)
+    assert [(h.doc_id, h.relation) for h in hits] == [
+        ("L_第一条", None),
+        ("L_第三条", CITES),
+        ("L_第二条", CITED_BY),
+    ]
+    assert hits[1].expanded_from == "L_第一条"
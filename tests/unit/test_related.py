@@ -0,0 +1,71 @@
+import json
+
+import numpy as np
+
+from src.infrastructure.corpus_store import VectorSet
+from src.interface.export_index import export_index
+from src.interface.search_service import SearchService
+from src.rag_engine.related import RelatedArticles, build_neighbors, refresh_neighbors
+from tests.unit.test_search_service import _store
+
+
+def _brute_force(matrix: np.ndarray, k: int) -> np.ndarray:
+    unit = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+    scores = unit @ unit.T
+    np.fill_diagonal(scores, -np.inf)
+    return np.argsort(-scores, axis=1, kind="stable")[:, :k]
+
+
+def test_blocked_neighbors_match_the_full_similarity_matrix() -> None:
+    matrix = np.random.default_rng(0).normal(size=(53, 16)).astype(np.float32)
+    ids = [f"L_{i}" for i in range(len(matrix))]
+    vectors = VectorSet(ids, matrix, "test", [])
+
+    graph = build_neighbors(vectors, k=5, block=7, workers=3)
+    np.testing.assert_array_equal(graph.rows, _brute_force(matrix, 5))
+    assert (np.diff(graph.scores, axis=1) <= 0).all()
+    assert graph.fingerprint == vectors.fingerprint()
+    # ブロックの大きさ・並列度によらず同じ結果
+    single = build_neighbors(vectors, k=5, block=64, workers=1)
+    np.testing.assert_allclose(graph.scores, single.scores, rtol=1e-5)
+
+    # 行数より大きい k は埋められる分だけ
+    small = VectorSet(ids[:3], matrix[:3], "test", [])
+    assert build_neighbors(small, k=10).rows.shape == (3, 2)
+    assert build_neighbors(VectorSet(ids[:1], matrix[:1], "test", []), k=3).k == 0
+
+
+def test_related_articles_are_saved_exported_and_served(tmp_path) -> None:
+    store = _store(tmp_path)
+    vectors = store.load_vectors()
+    assert RelatedArticles.from_store(store) is None
+
+    refresh_neighbors(store, k=2, block=4)
+    related = RelatedArticles.from_store(store)
+    assert related is not None
+    [(doc_id, score), _] = related.related("325AC0000000144_第二条")
+    assert doc_id != "325AC0000000144_第二条" and -1.0 <= score <= 1.0
+    assert related.related("unknown") == []
+
+    export_index(store, str(tmp_path / "data" / "index.json"))
+    index = json.loads((tmp_path / "data" / "index.json").read_text("utf-8"))
+    assert all(len(doc["related"]) == 2 for doc in index["docs"])
+    assert all(
+        i not in [r for r, _ in doc["related"]] for i, doc in enumerate(index["docs"])
+    )
+
+    service = SearchService.from_store(store)
+    try:
+        articles = service.law_content({"law_name": "生活保護法"})["articles"]
+        assert [len(a["related"]) for a in articles] == [2, 2, 2]
+        assert set(articles[0]["related"][0]) == {
+            "law_full_name",
+            "article_number",
+            "score",
+        }
+    finally:
+        service.close()
+
+    # ベクトルを保存し直すと古い関連条文は使わない
+    store.save_vectors(vectors.ids[:4], vectors.matrix[:4], vectors.model)
+    assert RelatedArticles.from_store(store) is None
@@ -0,0 +1,105 @@
+import json
+
+import numpy as np
+
+from src.infrastructure.corpus_store import CorpusStore, VectorSet
+from src.interface.export_index import LAW_CENTROIDS_FILE, export_index
+from src.rag_engine.routing import (
+    CentroidRouter,
+    build_centroids,
+    chapter_of,
+    refresh_centroids,
+)
+from src.rag_engine.vector_engine import VectorEngine
+from tests.unit.test_corpus_store import _seed
+
+# 法令 A は2章、法令 B は3章。章ごとに別の軸の近くに2条ずつ
+CHAPTERS = [
+    ("A", "第一章"),
+    ("A", "第二章"),
+    ("B", "第一章"),
+    ("B", "第二章"),
+    ("B", "第三章"),
+]
+
+
+def _vectors() -> tuple[VectorSet, dict]:
+    ids, hierarchies, rows = [], {}, []
+    for axis, (law_id, chapter) in enumerate(CHAPTERS):
+        for n, noise_axis in enumerate([5, 6]):
+            doc_id = f"{law_id}_{chapter}{n}"
+            ids.append(doc_id)
+            hierarchies[doc_id] = f"第一編 総則 > {chapter} 通則 > 第一節"
+            row = np.zeros(8)
+            row[axis], row[noise_axis] = 1.0, 0.2
+            rows.append(row)
+    return VectorSet(ids, np.array(rows, dtype=np.float32), "test", []), hierarchies
+
+
+def _axis(*axes: int) -> np.ndarray:
+    q = np.zeros(8, dtype=np.float32)
+    q[list(axes)] = 1.0
+    return q
+
+
+def test_chapter_is_cut_from_the_hierarchy() -> None:
+    assert (
+        chapter_of("第一編 総則 > 第二章 通則 > 第一節 定義")
+        == "第一編 総則 > 第二章 通則"
+    )
+    assert chapter_of("第三章 保護の種類") == "第三章 保護の種類"
+    assert chapter_of("第一節 定義") == "第一節 定義"
+    assert chapter_of("") == ""
+
+
+def test_route_scans_the_nearest_chapter_or_falls_back() -> None:
+    vectors, hierarchies = _vectors()
+    centroids = build_centroids(vectors, hierarchies)
+    assert len(centroids) == 5
+    router = CentroidRouter(centroids, n_groups=1, margin=0.05)
+
+    assert router.route(_axis(0)).tolist() == [0, 1]
+    # 2つの章が同程度に近い (確信なし) なら全件走査
+    assert router.route(_axis(0, 1)) is None
+    # 法令の絞り込みがあれば、その法令の章の中から選ぶ
+    assert router.route(_axis(0, 3), {"B"}).tolist() == [6, 7]
+    assert router.target_laws(_axis(3)) == ["B"]
+    assert router.target_laws(_axis(3), max_laws=1, margin=1.0) == []
+
+
+def test_routed_engine_matches_full_scan_for_clear_queries() -> None:
+    vectors, hierarchies = _vectors()
+    router = CentroidRouter(build_centroids(vectors, hierarchies), 1, 0.05)
+    full, routed = VectorEngine(vectors), VectorEngine(vectors, router=router)
+
+    queries = [_axis(2, 5), _axis(0, 1), _axis(4, 6)]
+    expected = [[h.doc_id for h in full.search(q, 2, resolve=False)] for q in queries]
+    assert [
+        [h.doc_id for h in routed.search(q, 2, resolve=False)] for q in queries
+    ] == expected
+    assert [
+        [h.doc_id for h in hits]
+        for hits in routed.search_batch(queries, 2, resolve=False)
+    ] == expected
+
+
+def test_centroids_are_saved_with_the_vectors_and_exported(tmp_path) -> None:
+    db_path = str(tmp_path / "laws.db")
+    _seed(db_path)
+    store = CorpusStore(db_path, str(tmp_path / "vectors"))
+    ids = [f"325AC0000000144_第{n}条" for n in ("一", "二", "三")]
+    store.save_vectors(ids, np.eye(3), "models/text-embedding-004")
+
+    centroids = refresh_centroids(store)
+    assert centroids.labels == ["325AC0000000144 第一章 総則"]
+    assert store.load_centroids(store.load_vectors()).labels == centroids.labels
+    # ベクトルを保存し直すと古いセントロイドは使わない
+    store.save_vectors(ids[:2], np.eye(3)[:2], "models/text-embedding-004")
+    assert store.load_centroids(store.load_vectors()) is None
+
+    out = tmp_path / "data" / "index.json"
+    export_index(store, str(out))
+    exported = json.loads((tmp_path / "data" / LAW_CENTROIDS_FILE).read_text())
+    [law] = exported["laws"]
+    assert law["law_full_name"] == "生活保護法"
+    np.testing.assert_allclose(law["centroid"], np.array([1, 1, 0]) / np.sqrt(2))
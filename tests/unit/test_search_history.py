@@ -0,0 +1,38 @@
+from src.interface.backend_client import TTLCache
+from src.interface.search_history import SearchHistory, render_results_html
+
+
+def _result(n: int) -> dict:
+    return {
+        "document": f"本文{n}",
+        "relevance": 0.5,
+        "metadata": {
+            "law_id": "325AC0000000144",
+            "law_full_name": "生活保護法",
+            "article_number": f"第{n}条",
+        },
+    }
+
+
+def test_history_keeps_only_references_in_a_ring_buffer() -> None:
+    history = SearchHistory(max_entries=3)
+    for n in range(5):
+        history.add(f"質問{n}", None, [_result(n)])
+
+    assert len(history) == 3
+    latest = history.latest(2)
+    assert [e.query for e in latest] == ["質問4", "質問3"]
+    assert latest[0].hits == (("325AC0000000144_第4条", 0.5),)
+
+
+def test_evicted_documents_are_resolved_through_fallback() -> None:
+    history = SearchHistory(documents=TTLCache(max_entries=1))
+    entry = history.add("質問", None, [_result(1), _result(2)])
+    ids = [doc_id for doc_id, _ in entry.hits]
+
+    documents = history.resolve(
+        ids, lambda missing: {d: ("生活保護法", "第1条", "再取得") for d in missing}
+    )
+    html = render_results_html(entry, documents)
+    assert "再取得" in html and "本文2" in html
+    assert "2件" in html
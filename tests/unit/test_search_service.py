@@ -0,0 +1,183 @@
+import asyncio
+import threading
+from datetime import datetime
+from typing import List
+
+import numpy as np
+import pytest
+
+from src.core.models import Article, Law
+from src.infrastructure.corpus_store import CorpusStore
+from src.infrastructure.database import LawRepository
+from src.interface.backend_client import BackendClient
+from src.interface.search_service import MAX_BODY_BYTES, SearchServer, SearchService
+from src.rag_engine.embedder import HashingEmbedder
+
+LAWS = [("325AC0000000144", "生活保護法"), ("322AC0000000164", "児童福祉法")]
+
+
+class CountingEmbedder(HashingEmbedder):
+    """embed_texts に渡されたテキストを記録する"""
+
+    def __init__(self, dim: int):
+        super().__init__(dim)
+        self.calls: List[List[str]] = []
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(list(texts))
+        return super().embed_texts(texts)
+
+
+def _store(tmp_path) -> CorpusStore:
+    db_path = str(tmp_path / "laws.db")
+    repo = LawRepository(db_path)
+    for law_id, name in LAWS:
+        repo.save_law(
+            Law(
+                law_id=law_id,
+                law_num="",
+                law_full_name=name,
+                last_updated=datetime(2024, 1, 1),
+            )
+        )
+        repo.save_articles(
+            [
+                Article(
+                    law_id=law_id,
+                    article_number=f"第{n}条",
+                    hierarchy="",
+                    content=f"{name}の{topic}について定める。",
+                )
+                for n, topic in (("一", "目的"), ("二", "申請"), ("三", "罰則"))
+            ]
+        )
+    store = CorpusStore(db_path, str(tmp_path / "vectors"))
+    docs = list(store.iter_documents())
+    embedder = HashingEmbedder(64)
+    store.save_vectors(
+        [d.doc_id for d in docs],
+        np.array(embedder.embed_texts([d.embedding_text() for d in docs])),
+        embedder.model_name,
+    )
+    return store
+
+
+@pytest.mark.parametrize(
+    ("batch_window_ms", "shards"), [(None, 0), (5.0, 0), (None, 2)]
+)
+def test_service_answers_the_backend_contract(
+    tmp_path, batch_window_ms, shards
+) -> None:
+    service = SearchService.from_store(
+        _store(tmp_path), batch_window_ms=batch_window_ms, shards=shards
+    )
+    loop = asyncio.new_event_loop()
+    search_server = SearchServer(service, workers=2)
+    server = loop.run_until_complete(search_server.start("127.0.0.1", 0))
+    port = server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    client = BackendClient(f"http://127.0.0.1:{port}")
+    try:
+        assert client.list_laws() == ["児童福祉法", "生活保護法"]
+
+        data = client.search({"query": "生活保護法の申請"})
+        assert data["targeted_laws"] == ["生活保護法"]
+        assert data["intent"] == "Instant Match"
+        assert {r["metadata"]["law_full_name"] for r in data["results"]} == {
+            "生活保護法"
+        }
+        assert {"document", "distance", "relevance"} <= set(data["results"][0])
+
+        articles = client.law_content("児童福祉法")
+        assert [a["metadata"]["article_number"] for a in articles] == [
+            "第一条",
+            "第二条",
+            "第三条",
+        ]
+    finally:
+        client.close()
+        asyncio.run_coroutine_threadsafe(search_server.close(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+        service.close()
+
+
+def test_unknown_client_targets_return_no_results(tmp_path) -> None:
+    service = SearchService.from_store(_store(tmp_path))
+    try:
+        # Rust バックエンドと同じく、全件検索には戻らない
+        payload = {"query": "申請", "target_laws": ["存在しない法"]}
+        data = service.search(payload)
+        assert data["results"] == [] and data["targeted_laws"] == ["存在しない法"]
+        [batched, known] = service.search_many(
+            [{**payload, "query": "保護"}, {**payload, "target_laws": ["生活保護法"]}]
+        )
+        assert batched["results"] == [] and known["results"]
+    finally:
+        service.close()
+
+
+def test_centroids_pick_targets_when_the_matcher_cannot(tmp_path) -> None:
+    service = SearchService.from_store(_store(tmp_path))
+    try:
+        data = service.search({"query": "罰則について"})
+        assert data["intent"] == "Centroid Match"
+        assert data["targeted_laws"] and set(data["targeted_laws"]) <= {
+            "生活保護法",
+            "児童福祉法",
+        }
+        laws = {r["metadata"]["law_full_name"] for r in data["results"]}
+        assert laws <= set(data["targeted_laws"])
+        [batched] = service.search_many([{"query": "罰則について "}])
+        assert batched["targeted_laws"] == data["targeted_laws"]
+    finally:
+        service.close()
+
+
+def test_centroid_targeting_embeds_once_with_the_coalescer(tmp_path) -> None:
+    embedder = CountingEmbedder(64)
+    service = SearchService.from_store(
+        _store(tmp_path), embedder=embedder, batch_window_ms=1.0
+    )
+    try:
+        data = service.search({"query": "罰則について"})
+        assert data["intent"] == "Centroid Match" and data["results"]
+        # セントロイドでの推定に使った埋め込みをバッチでも使う
+        assert embedder.calls == [["罰則について"]]
+
+        data = service.search({"query": "生活保護法の申請"})
+        assert data["intent"] == "Instant Match"
+        assert embedder.calls[1:] == [["生活保護法の申請"]]
+    finally:
+        service.close()
+
+
+def test_oversized_body_gets_413(tmp_path) -> None:
+    service = SearchService.from_store(_store(tmp_path))
+    search_server = SearchServer(service, workers=1)
+
+    async def request() -> bytes:
+        server = await search_server.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(
+            b"POST /search HTTP/1.1\r\nHost: x\r\n"
+            + f"Content-Length: {MAX_BODY_BYTES + 1}\r\n\r\n".encode()
+        )
+        await writer.drain()
+        # 本文を送らなくても応答が返り、接続が閉じられる
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+        await search_server.close()
+        return response
+
+    try:
+        response = asyncio.run(request())
+    finally:
+        service.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 413 Payload Too Large")
+    assert b"Connection: close" in head
+    assert b"Request body too large" in body
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from src.infrastructure.corpus_store import VectorSet
+from src.rag_engine.sharded_engine import BY_HASH, BY_LAW, ShardedEngine, plan_shards
+from src.rag_engine.vector_engine import VectorEngine
+
+LAW_SIZES = {"LAW0": 30, "LAW1": 5, "LAW2": 45, "LAW3": 20}
+
+
+def _vectors(tmp_path, dim: int = 16) -> VectorSet:
+    ids = [f"{law}_第{i}条" for law, n in LAW_SIZES.items() for i in range(n)]
+    rng = np.random.default_rng(1)
+    path = tmp_path / "vectors.npy"
+    np.save(path, rng.standard_normal((len(ids), dim)).astype(np.float32))
+    return VectorSet(ids, np.load(path, mmap_mode="r"), "test", [""] * len(ids))
+
+
+def test_law_shards_are_contiguous_and_keep_laws_whole() -> None:
+    law_ids = [law for law, n in LAW_SIZES.items() for _ in range(n)]
+    shards = plan_shards(law_ids, 3, BY_LAW)
+
+    assert np.array_equal(np.concatenate(shards), np.arange(len(law_ids)))
+    owners = {}
+    for s, rows in enumerate(shards):
+        assert rows[-1] - rows[0] + 1 == rows.size
+        for r in rows:
+            assert owners.setdefault(law_ids[r], s) == s
+
+    hashed = plan_shards(law_ids, 3, BY_HASH)
+    assert sorted(np.concatenate(hashed).tolist()) == list(range(len(law_ids)))
+
+
+@pytest.mark.parametrize("by", [BY_LAW, BY_HASH])
+def test_scatter_gather_matches_single_process_search(tmp_path, by) -> None:
+    vectors = _vectors(tmp_path)
+    single = VectorEngine(vectors)
+    queries = np.random.default_rng(2).standard_normal((4, 16)).tolist()
+    filters = [None, ["LAW1"], ["LAW0", "LAW3"], ["LAW9"]]
+
+    with ShardedEngine(vectors, n_shards=3, by=by) as engine:
+        batched = engine.search_batch(queries, n_results=8, law_ids=filters)
+        for query, targets, hits in zip(queries, filters, batched, strict=True):
+            expected = single.search(query, n_results=8, law_ids=targets)
+            assert [h.doc_id for h in hits] == [h.doc_id for h in expected]
+            assert [h.score for h in hits] == pytest.approx(
+                [h.score for h in expected], abs=1e-5
+            )
+        assert len(engine.search(queries[0], n_results=3)) == 3
+    assert batched[3] == []
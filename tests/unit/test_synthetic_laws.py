@@ -0,0 +1,67 @@
+import pytest
+
+from src.core.legal_dates import int_to_kanji, kanji_to_int
+from src.infrastructure.corpus_store import CorpusStore
+from src.infrastructure.egov_api import EGovAPIClient
+from src.infrastructure.synthetic_laws import SyntheticCorpus, plan_sizes
+from src.interface.synth_corpus import main
+from src.rag_engine.embedder import HashingEmbedder
+from src.rag_engine.vector_engine import VectorEngine
+
+
+def test_kanji_numbers_roundtrip() -> None:
+    assert int_to_kanji(144) == "百四十四"
+    assert int_to_kanji(2003) == "二千三"
+    assert all(kanji_to_int(int_to_kanji(n)) == n for n in range(1, 3001))
+    with pytest.raises(ValueError):
+        int_to_kanji(10000)
+
+
+def test_sizes_add_up_from_tiny_to_large() -> None:
+    assert plan_sizes(10, 1) == [10]
+    sizes = plan_sizes(100_000, 1_000)
+    assert sum(sizes) == 100_000 and min(sizes) >= 1
+    assert len(SyntheticCorpus(10).laws) == 1
+    with pytest.raises(ValueError):
+        plan_sizes(10, 20)
+
+
+def test_generated_xml_parses_into_nested_articles_with_references() -> None:
+    corpus = SyntheticCorpus(3000, laws=6, seed=1)
+    assert len(set(corpus.known_laws)) == 6
+    api = EGovAPIClient(corpus.known_laws)
+    law_ids = set(corpus.known_laws.values())
+
+    hierarchies, references = set(), []
+    for law, xml in corpus.iter_xml():
+        parsed, articles = api.parse_law_xml(xml, law.law_id)
+        assert parsed.law_full_name == law.name
+        assert parsed.promulgation_date is not None
+        assert len(articles) == law.articles
+        assert articles[0].article_number == "第一条 （目的）"
+        hierarchies.update(a.hierarchy for a in articles)
+        references.extend(r for a in articles for r in a.references)
+
+    depths = {h.count(" > ") + 1 for h in hierarchies}
+    assert {2, 3} <= depths  # 編 > 章 > 節
+    assert {r.dst_law_id for r in references} <= law_ids
+    assert len({r.dst_law_id for r in references}) > 1
+
+    law = corpus.laws[2]
+    assert corpus.law_xml(law) == SyntheticCorpus(3000, 6, seed=1).law_xml(law)
+    assert corpus.law_xml(law) != SyntheticCorpus(3000, 6, seed=2).law_xml(law)
+
+
+def test_synth_command_writes_a_searchable_corpus(tmp_path) -> None:
+    db_path = str(tmp_path / "synthetic.db")
+    vector_dir = str(tmp_path / "vectors")
+    argv = ["--articles", "60", "--laws", "3", "--dim", "32"]
+    assert main([*argv, "--db", db_path, "--vector-dir", vector_dir]) == 0
+    assert main([*argv, "--db", db_path]) == 1
+
+    store = CorpusStore(db_path, vector_dir)
+    assert len(store.list_laws()) == 3
+    engine = VectorEngine.from_store(store)
+    assert len(engine) == 60
+    hits = engine.search(HashingEmbedder(32).embed_query("申請"), n_results=5)
+    assert len(hits) == 5
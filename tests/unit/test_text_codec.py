@@ -0,0 +1,104 @@
+import sqlite3
+import zlib
+
+import pytest
+
+from src.core.models import Article
+from src.infrastructure.corpus_store import CorpusStore
+from src.infrastructure.text_codec import (
+    TextCodec,
+    default_codec_name,
+    load_codec,
+    train_codec,
+)
+from src.interface.export_index import export_index
+from tests.unit.test_corpus_store import _seed
+
+TEXTS = [
+    f"第{n}条 この法律の規定により、厚生労働省令で定めるところにより{n}日以内に"
+    "都道府県知事に届け出なければならない。"
+    for n in range(200)
+]
+
+
+def test_dictionary_codec_decodes_each_article_on_its_own() -> None:
+    codec = train_codec(TEXTS, "zlib")
+    packed = [codec.encode(t) for t in TEXTS]
+
+    restored = load_codec("zlib", codec.dictionary)
+    assert restored.decode(packed[17]) == TEXTS[17]
+    plain = [zlib.compress(t.encode("utf-8"), 9) for t in TEXTS]
+    assert sum(map(len, packed)) < sum(map(len, plain)) / 2
+    with pytest.raises(ValueError):
+        train_codec(TEXTS, "lz4")
+    with pytest.raises(TypeError):
+        TextCodec(b"")
+
+
+def test_zstd_codec_roundtrip() -> None:
+    pytest.importorskip("zstandard")
+    codec = train_codec(TEXTS * 5, "zstd", dict_size=4096)
+    restored = load_codec("zstd", codec.dictionary)
+    assert restored.decode(codec.encode(TEXTS[3])) == TEXTS[3]
+
+
+def test_store_reads_compressed_articles_and_keeps_compressing(tmp_path) -> None:
+    db_path = str(tmp_path / "laws.db")
+    _seed(db_path)
+    store = CorpusStore(db_path, str(tmp_path / "vectors"))
+    before = [d.content for d in store.iter_documents()]
+
+    store.repository.compress_articles(train_codec(before * 10, "zlib"))
+    assert [d.content for d in store.iter_documents()] == before
+    # 新しく保存した本文も同じ辞書で圧縮される
+    store.repository.save_articles(
+        [
+            Article(
+                law_id="325AC0000000144",
+                article_number="第一条",
+                hierarchy="第一章 総則",
+                content="改正後の本文",
+            )
+        ]
+    )
+    reopened = CorpusStore(db_path, str(tmp_path / "vectors"))
+    [doc] = reopened.get_documents(["325AC0000000144_第一条"]).values()
+    assert doc.content == "改正後の本文"
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute(
+            "SELECT COUNT(*) FROM articles WHERE content IS NOT NULL"
+        ).fetchone() == (0,)
+
+    assert store.repository.decompress_articles() == 1
+    assert [d.content for d in store.iter_documents()] == ["改正後の本文"]
+
+
+def test_codec_ids_are_not_reused_across_repositories(tmp_path) -> None:
+    db_path = str(tmp_path / "laws.db")
+    _seed(db_path)
+    with sqlite3.connect(db_path) as conn:
+        # AUTOINCREMENT のない旧スキーマも開いたときに作り直される
+        conn.execute("DROP TABLE text_codecs")
+        conn.execute(
+            "CREATE TABLE text_codecs (id INTEGER PRIMARY KEY, "
+            "name TEXT NOT NULL, dictionary BLOB NOT NULL)"
+        )
+    writer = CorpusStore(db_path, str(tmp_path / "vectors"))
+    reader = CorpusStore(db_path, str(tmp_path / "vectors"))
+    before = [d.content for d in reader.iter_documents()]
+
+    writer.repository.compress_articles(train_codec(before * 10, "zlib"))
+    assert [d.content for d in reader.iter_documents()] == before  # 辞書をキャッシュ
+    writer.repository.decompress_articles()
+    writer.repository.compress_articles(train_codec(["別の本文"] * 50, "zlib"))
+    assert [d.content for d in reader.iter_documents()] == before
+
+
+def test_compressed_export_needs_zstd(tmp_path) -> None:
+    if default_codec_name() == "zstd":
+        pytest.skip("zstandard is installed")
+    db_path = str(tmp_path / "laws.db")
+    _seed(db_path)
+    store = CorpusStore(db_path, str(tmp_path / "vectors"))
+    with pytest.raises(ValueError, match="zstandard"):
+        export_index(store, str(tmp_path / "index.json"), compress_text=True)
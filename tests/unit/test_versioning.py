@@ -0,0 +1,75 @@
+from datetime import date, datetime
+
+from src.core.legal_dates import kanji_to_int, parse_japanese_date
+from src.core.models import Article, Law
+from src.infrastructure.database import LawRepository
+from src.infrastructure.egov_api import EGovAPIClient
+
+LAW_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<Law Era="Showa" Year="25" Num="144" LawType="Act" PromulgateMonth="05"
+     PromulgateDay="04">
+  <LawNum>昭和二十五年法律第百四十四号</LawNum>
+  <LawBody>
+    <LawTitle>生活保護法</LawTitle>
+    <MainProvision>
+      <Article Num="1">
+        <ArticleTitle>第一条</ArticleTitle>
+        <Paragraph Num="1"><ParagraphNum/>
+          <ParagraphSentence><Sentence>目的</Sentence></ParagraphSentence>
+        </Paragraph>
+      </Article>
+    </MainProvision>
+    <SupplProvision AmendLawNum="平成一一年一二月二二日法律第一六〇号"/>
+    <SupplProvision AmendLawNum="令和四年六月一七日法律第六八号"/>
+  </LawBody>
+</Law>""".encode("utf-8")
+
+
+def test_kanji_numbers_and_dates() -> None:
+    assert kanji_to_int("百四十四") == 144
+    assert kanji_to_int("一六〇") == 160
+    assert kanji_to_int("元") == 1
+    assert parse_japanese_date("令和四年六月一七日法律第六八号") == date(2022, 6, 17)
+
+
+def test_parser_captures_promulgation_and_amendment() -> None:
+    law, articles = EGovAPIClient().parse_law_xml(LAW_XML, "325AC0000000144")
+    assert law.promulgation_date == date(1950, 5, 4)
+    assert law.amendment_law_num == "令和四年六月一七日法律第六八号"
+    assert law.amendment_date == date(2022, 6, 17)
+    assert law.last_updated == datetime(2022, 6, 17)
+    assert len(articles) == 1
+
+
+def _law(amendment: date | None) -> Law:
+    return Law(
+        law_id="L1",
+        law_num="n",
+        law_full_name="テスト法",
+        last_updated=datetime(2020, 1, 1),
+        promulgation_date=date(2000, 1, 1),
+        amendment_law_num=str(amendment) if amendment else None,
+        amendment_date=amendment,
+    )
+
+
+def _article(number: str, content: str) -> Article:
+    return Article(law_id="L1", article_number=number, hierarchy="", content=content)
+
+
+def test_as_of_queries_return_historic_versions(tmp_path) -> None:
+    repo = LawRepository(str(tmp_path / "laws.db"))
+    repo.save_laws_batch(
+        [(_law(None), [_article("第一条", "旧"), _article("第二条", "廃止予定")])]
+    )
+    repo.save_laws_batch([(_law(date(2020, 4, 1)), [_article("第一条", "新")])])
+
+    before = repo.get_articles_as_of("L1", date(2019, 1, 1))
+    assert [(a.article_number, a.content) for a in before] == [
+        ("第一条", "旧"),
+        ("第二条", "廃止予定"),
+    ]
+    after = repo.get_articles_as_of("L1", date(2021, 1, 1))
+    assert [(a.article_number, a.content) for a in after] == [("第一条", "新")]
+    assert repo.get_articles_as_of("L1", date(1999, 1, 1)) == []
+    assert repo.get_amendment_stamps()["L1"] == "2020-04-01|2020-04-01"
@@ -1,6 +1,4 @@
-import chromadb
-from chromadb.config import Settings
-from src.rag_engine.config import Config
+from src.infrastructure.corpus_store import CorpusStore
 
 
 def verify_logic():
@@ -8,12 +6,7 @@ def verify_logic():
 
     # DB接続確認
     try:
-        client = chromadb.Client(
-            Settings(
-                chroma_db_impl="duckdb+parquet", persist_directory=Config.CHROMA_DB_DIR
-            )
-        )
-        collection = client.get_collection(name=Config.COLLECTION_NAME)
+        store = CorpusStore()
         print("✅ DB Connection OK")
     except Exception as e:
         print(f"❌ DB Connection Failed: {e}")
@@ -26,25 +19,19 @@ def verify_logic():
     detected_law = "生活困窮者自立支援法"  # ロジック上はこうなるはず
 
     try:
-        # app.py で実装したのと同じメソッドを実行
-        raw_results = collection.get(
-            where={"law_full_name": detected_law},
-            limit=20,
-            include=["documents", "metadatas"],
-        )
-
-        doc_count = len(raw_results["documents"]) if raw_results["documents"] else 0
+        docs = list(store.iter_documents(law_full_name=detected_law, limit=20))
+
+        doc_count = len(docs)
         print(f"📊 Direct Fetch Result Count: {doc_count}")
 
         if doc_count > 0:
-            print(f"✅ Success! First Metadata: {raw_results['metadatas'][0]}")
+            print(f"✅ Success! First Metadata: {docs[0].metadata()}")
         else:
             print("⚠️ Direct fetch returned 0 documents! (Why?)")
 
             # 念のため全件メタデータから探す
             print("   Listing all available law names in DB...")
-            all_meta = collection.get(include=["metadatas"])["metadatas"]
-            seen_laws = set(m.get("law_full_name") for m in all_meta)
+            seen_laws = set(law.law_full_name for law in store.list_laws())
             print(f"   Available Laws: {seen_laws}")
 
     except Exception as e: